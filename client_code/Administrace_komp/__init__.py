@@ -5,9 +5,12 @@ import anvil.tables as tables
 import anvil.tables.query as q
 from anvil.tables import app_tables
 import anvil.users
-from .. import Konstanty, Spravce_stavu, Navigace, Utils
+from .. import Konstanty, Spravce_stavu, Navigace, Sledovani_uloh, Utils
 from ..Pridej_uzivatele_form import Pridej_uzivatele_form
 
+# Počet uživatelů načtených najednou (jedna stránka přehledu)
+VELIKOST_STRANKY_UZIVATELU = 100
+
 
 class Administrace_komp(Administrace_kompTemplate):
     def __init__(self, **properties):
@@ -19,6 +22,9 @@ class Administrace_komp(Administrace_kompTemplate):
         
         self.zvoleny_uzivatel = None
         
+        # Stav stránkování přehledu uživatelů
+        self.dalsi_offset_uzivatelu = None
+        
         # Nastavení handleru pro události z x_Row
         self.repeating_panel_uzivatele.set_event_handler('x-uzivatel-zvolen', self.nacti_analyzy_uzivatele)
         self.repeating_panel_uzivatele.set_event_handler('x-refresh', self.nacti_uzivatele)
@@ -43,36 +49,68 @@ class Administrace_komp(Administrace_kompTemplate):
                 return
 
             Utils.zapsat_info("Načítám seznam uživatelů")
-            uzivatele = anvil.server.call('nacti_vsechny_uzivatele')
+            prehled = anvil.server.call('nacti_prehled_uzivatelu', 0, VELIKOST_STRANKY_UZIVATELU)
             
-            if not uzivatele:
+            if not prehled['uzivatele']:
                 self.label_zadni_uzivatele.visible = True
                 self.data_grid_uzivatele.visible = False
+                self.button_nacist_dalsi_uzivatele.visible = False
                 Utils.zapsat_info("Nebyli nalezeni žádní uživatelé")
                 return
             
             self.label_zadni_uzivatele.visible = False
             self.data_grid_uzivatele.visible = True
             
-            # Formátování dat pro repeating panel
-            self.repeating_panel_uzivatele.items = [
-                {
-                    'id': u.get_id(),
-                    'email': u['email'],
-                    'vytvoreni': u['signed_up'].strftime("%d.%m.%Y") if u['signed_up'] else '',
-                    'prihlaseni': u['last_login'].strftime("%d.%m.%Y") if u['last_login'] else '',
-                    'role': 'admin' if u['role'] == 'admin' else 'uživatel',
-                    'pocet_analyz': anvil.server.call('vrat_pocet_analyz_pro_uzivatele', u)
-                } 
-                for u in uzivatele
-            ]
+            self.repeating_panel_uzivatele.items = self._polozky_uzivatelu(prehled['uzivatele'])
+            self._nastav_strankovani_uzivatelu(prehled)
             
-            Utils.zapsat_info(f"Načteno {len(uzivatele)} uživatelů")
+            Utils.zapsat_info(f"Načteno {len(prehled['uzivatele'])} z {prehled['celkem']} uživatelů")
                 
         except Exception as e:
             Utils.zapsat_chybu(f"Chyba při načítání uživatelů: {str(e)}")
             alert(Konstanty.ZPRAVY_CHYB['CHYBA_NACTENI_UZIVATELU'].format(str(e)))
 
+    def button_nacist_dalsi_uzivatele_click(self, **event_args):
+        """Připojí k přehledu další stránku uživatelů."""
+        try:
+            prehled = anvil.server.call('nacti_prehled_uzivatelu', self.dalsi_offset_uzivatelu, VELIKOST_STRANKY_UZIVATELU)
+            self.repeating_panel_uzivatele.items = (
+                list(self.repeating_panel_uzivatele.items) + self._polozky_uzivatelu(prehled['uzivatele'])
+            )
+            self._nastav_strankovani_uzivatelu(prehled)
+        except Exception as e:
+            Utils.zapsat_chybu(f"Chyba při načítání uživatelů: {str(e)}")
+            alert(Konstanty.ZPRAVY_CHYB['CHYBA_NACTENI_UZIVATELU'].format(str(e)))
+
+    def _polozky_uzivatelu(self, uzivatele):
+        """Převede přehled uživatelů ze serveru na položky data gridu."""
+        return [
+            {
+                'id': u['id'],
+                'email': u['email'],
+                'vytvoreni': u['signed_up'].strftime("%d.%m.%Y") if u['signed_up'] else '',
+                'prihlaseni': u['last_login'].strftime("%d.%m.%Y") if u['last_login'] else '',
+                'role': 'admin' if u['role'] == 'admin' else 'uživatel',
+                'pocet_analyz': u['pocet_analyz'],
+                'detail_analyz': self._popis_analyz(u)
+            }
+            for u in uzivatele
+        ]
+
+    def _popis_analyz(self, uzivatel):
+        """Sestaví popisek s poslední aktivitou a velikostí dat analýz uživatele."""
+        aktivita = uzivatel['posledni_aktivita'].strftime("%d.%m.%Y") if uzivatel['posledni_aktivita'] else '-'
+        velikost_kb = uzivatel['velikost_dat'] / 1024
+        return f"Poslední úprava analýzy: {aktivita}, velikost dat: {velikost_kb:.1f} kB"
+
+    def _nastav_strankovani_uzivatelu(self, prehled):
+        """Zapamatuje si pozici další stránky a upraví tlačítko pro její načtení."""
+        self.dalsi_offset_uzivatelu = prehled['dalsi_offset']
+        self.button_nacist_dalsi_uzivatele.visible = self.dalsi_offset_uzivatelu is not None
+        if self.dalsi_offset_uzivatelu is not None:
+            zbyva = prehled['celkem'] - self.dalsi_offset_uzivatelu
+            self.button_nacist_dalsi_uzivatele.text = f"Načíst další uživatele (zbývá {zbyva})"
+
     def nacti_analyzy_uzivatele(self, sender, uzivatel, **event_args):
         """Načte a zobrazí analýzy zvoleného uživatele."""
         try:
@@ -190,3 +228,41 @@ class Administrace_komp(Administrace_kompTemplate):
                     pridej_form.label_chyba.text = str(e)
                     pridej_form.label_chyba.visible = True
 
+    def button_smazat_vice_click(self, **event_args):
+        """
+        Hromadné smazání účtů zadaných seznamem emailů (např. odchod týmu).
+        Nejprve se zobrazí počet mazaných analýz, samotné mazání běží
+        jako úloha na pozadí.
+        """
+        pole_emailu = TextArea(placeholder="Emaily účtů ke smazání, každý na samostatném řádku", height=200)
+        if not alert(content=pole_emailu, title="Smazat více účtů", large=True,
+                     buttons=[("Pokračovat", True), ("Zrušit", False)]):
+            return
+        
+        emaily = [radek.strip() for radek in (pole_emailu.text or "").splitlines() if radek.strip()]
+        if not emaily:
+            return
+        
+        try:
+            pocty = anvil.server.call('smaz_uzivatele_hromadne', emaily, True)
+            if not Utils.zobraz_potvrzovaci_dialog(
+                f"Bude smazáno {pocty['uzivatele']} účtů, {pocty['analyzy']} analýz "
+                f"a {pocty['ulohy']} úloh. Tuto akci nelze vrátit. Pokračovat?"
+            ):
+                return
+            
+            self.button_smazat_vice.enabled = False
+            
+            def pri_postupu(postup, zprava):
+                self.button_smazat_vice.text = f"Mažu... {int(postup * 100)} %"
+            
+            smazano = Sledovani_uloh.spust_a_cekej('smazani_uzivatelu', {'emaily': emaily}, pri_postupu)
+            self.vycisti_analyzy()
+            self.nacti_uzivatele()
+            alert(f"Smazáno {smazano['uzivatele']} účtů a {smazano['analyzy']} analýz.")
+        except Exception as e:
+            Utils.zapsat_chybu(f"Chyba při hromadném mazání uživatelů: {str(e)}")
+            alert(f"Chyba při hromadném mazání uživatelů: {str(e)}")
+        finally:
+            self.button_smazat_vice.text = "Smazat více účtů"
+            self.button_smazat_vice.enabled = True
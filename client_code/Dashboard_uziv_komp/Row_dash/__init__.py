@@ -6,7 +6,7 @@ import anvil.users
 import anvil.tables as tables
 import anvil.tables.query as q
 from anvil.tables import app_tables
-from ... import Konstanty, Navigace, Spravce_stavu, Utils
+from ... import Konstanty, Navigace, Sledovani_uloh, Spravce_stavu, Utils
 
 
 class Row_dash(Row_dashTemplate):
@@ -159,8 +159,17 @@ class Row_dash(Row_dashTemplate):
                     # Validace dat pomocí funkce z Utils
                     Utils.validuj_data_analyzy(data_json)
                     
-                    # Uložení změn na server
-                    anvil.server.call('uprav_analyzu', analyza_id, nazev, data_json)
+                    # Uložení změn na server - jen pokud analýzu od načtení neuložil nikdo jiný
+                    try:
+                        anvil.server.call('uprav_analyzu', analyza_id, nazev, data_json, analyza_data.get('verze'))
+                    except Exception as e:
+                        if Konstanty.ZPRAVY_CHYB['KONFLIKT_VERZE'] not in str(e):
+                            raise
+                        Utils.zapsat_chybu(f"Konflikt verzí při ukládání JSON dat analýzy {analyza_id}")
+                        alert(f"{Konstanty.ZPRAVY_CHYB['KONFLIKT_VERZE']} Změny nebyly uloženy, "
+                              "otevřete editor znovu s aktuálními daty.")
+                        self.parent.parent.raise_event('x-refresh')
+                        return
                     
                     # Informujeme uživatele o úspěchu
                     alert("Změny byly úspěšně uloženy.")
@@ -216,8 +225,13 @@ class Row_dash(Row_dashTemplate):
             self.link_export.tooltip = "Generuji Excel..."
             self.link_export.enabled = False
             
-            # Volání serverové funkce pro komplexní export
-            excel = anvil.server.call('vytvor_komplexni_excel_report', self.item['id'])
+            # Export běží jako úloha na pozadí, průběh se zobrazuje v tooltipu
+            def pri_postupu(postup, zprava):
+                self.link_export.tooltip = f"Generuji Excel... {int(postup * 100)} % {zprava}"
+            
+            excel = Sledovani_uloh.spust_a_cekej(
+                'excel', {'analyza_id': self.item['id']}, pri_postupu
+            )
             
             # Stažení Excel souboru
             download(excel)
@@ -6,7 +6,10 @@ import anvil.tables as tables
 import anvil.tables.query as q
 from anvil.tables import app_tables
 import anvil.users
-from .. import Navigace, Spravce_stavu, Utils
+from .. import Navigace, Sledovani_uloh, Spravce_stavu, Utils
+
+# Počet analýz načtených najednou (jedna stránka výpisu)
+VELIKOST_STRANKY = 50
 
 
 class Dashboard_uziv_komp(Dashboard_uziv_kompTemplate):
@@ -15,6 +18,10 @@ class Dashboard_uziv_komp(Dashboard_uziv_kompTemplate):
         # Inicializace správce stavu
         self.spravce = Spravce_stavu.Spravce_stavu()
         
+        # Stav stránkování seznamu analýz
+        self.dalsi_offset = None
+        self.celkem_analyz = 0
+        
         # Nastavení handlerů pro aktualizaci seznamu analýz
         self.data_grid_dash.set_event_handler('x-refresh', self.nahraj_analyzy)
         
@@ -31,40 +38,72 @@ class Dashboard_uziv_komp(Dashboard_uziv_kompTemplate):
     
     def nahraj_analyzy(self, **event_args):
         """
-        Načte seznam analýz ze serveru a zobrazí je v UI.
+        Načte první stránku seznamu analýz ze serveru a zobrazí ji v UI.
         """
         Utils.zapsat_info("Načítám seznam analýz")
         try:
-            # Načtení analýz z nového serverového modulu
-            analyzy = anvil.server.call('nacti_analyzy_uzivatele')
+            stranka = anvil.server.call('nacti_stranku_analyz', 0, VELIKOST_STRANKY)
             
-            if not analyzy:
+            if not stranka['analyzy']:
                 # Žádné analýzy k zobrazení
                 self.label_no_analyzy.visible = True
                 self.data_grid_dash.visible = False
+                self.button_nacist_dalsi.visible = False
                 Utils.zapsat_info("Žádné analýzy nenalezeny")
                 return
             
             # Máme analýzy k zobrazení
-            self.label_no_analyzy.visible = False         
-            # Formátování dat pro data grid
-            self.repeating_panel_dash.items = [
-                {
-                    # ID musí být vždy přítomno pro fungování akcí
-                    'id': a['id'],
-                    # Mapování pro zobrazení v UI podle data_key v data_grid_dash
-                    'nazev': a['nazev'],  # Sloupec Název
-                    'datum_upravy': a['datum_upravy'].strftime("%d.%m.%Y") if a['datum_upravy'] else "",  # Sloupec Upraveno
-                    'datum_vytvoreni': a['datum_vytvoreni'].strftime("%d.%m.%Y") if a['datum_vytvoreni'] else ""  # Sloupec Vytvořeno
-                } for a in analyzy
-            ]
+            self.label_no_analyzy.visible = False
+            self.data_grid_dash.visible = True
+            self.repeating_panel_dash.items = self._polozky_gridu(stranka['analyzy'])
+            self._nastav_strankovani(stranka)
             
-            Utils.zapsat_info(f"Načteno {len(analyzy)} analýz")
+            Utils.zapsat_info(f"Načteno {len(stranka['analyzy'])} z {stranka['celkem']} analýz")
             
         except Exception as e:
             Utils.zapsat_chybu(f"Chyba při načítání analýz: {str(e)}")
             alert(f"Chyba při načítání analýz: {str(e)}")
 
+    def button_nacist_dalsi_click(self, **event_args):
+        """
+        Připojí k seznamu další stránku analýz.
+        """
+        try:
+            stranka = anvil.server.call('nacti_stranku_analyz', self.dalsi_offset, VELIKOST_STRANKY)
+            self.repeating_panel_dash.items = list(self.repeating_panel_dash.items) + self._polozky_gridu(stranka['analyzy'])
+            self._nastav_strankovani(stranka)
+        except Exception as e:
+            Utils.zapsat_chybu(f"Chyba při načítání dalších analýz: {str(e)}")
+            alert(f"Chyba při načítání dalších analýz: {str(e)}")
+
+    def _polozky_gridu(self, analyzy):
+        """
+        Převede metadata analýz na položky data gridu.
+        """
+        return [
+            {
+                # ID musí být vždy přítomno pro fungování akcí
+                'id': a['id'],
+                # Mapování pro zobrazení v UI podle data_key v data_grid_dash
+                'nazev': a['nazev'],  # Sloupec Název
+                'datum_upravy': a['datum_upravy'].strftime("%d.%m.%Y") if a['datum_upravy'] else "",  # Sloupec Upraveno
+                'datum_vytvoreni': a['datum_vytvoreni'].strftime("%d.%m.%Y") if a['datum_vytvoreni'] else "",  # Sloupec Vytvořeno
+                'popis': a['popis'],
+                'pocet_kriterii': a['pocet_kriterii'],
+                'pocet_variant': a['pocet_variant']
+            } for a in analyzy
+        ]
+
+    def _nastav_strankovani(self, stranka):
+        """
+        Zapamatuje si pozici další stránky a upraví tlačítko pro její načtení.
+        """
+        self.dalsi_offset = stranka['dalsi_offset']
+        self.celkem_analyz = stranka['celkem']
+        self.button_nacist_dalsi.visible = self.dalsi_offset is not None
+        if self.dalsi_offset is not None:
+            self.button_nacist_dalsi.text = f"Načíst další (zbývá {stranka['celkem'] - self.dalsi_offset})"
+
     def button_pridat_analyzu_click(self, **event_args):
         """
         Přechod na stránku pro přidání nové analýzy.
@@ -73,4 +112,33 @@ class Dashboard_uziv_komp(Dashboard_uziv_kompTemplate):
         self.spravce.vycisti_data_analyzy()
         
         # Přejdeme na stránku pro zadání dat analýzy
-        Navigace.go('pridat_analyzu')
\ No newline at end of file
+        Navigace.go('pridat_analyzu')
+
+    def button_export_vse_click(self, **event_args):
+        """
+        Exportuje všechny analýzy uživatele do jednoho ZIP archivu.
+        Archiv se sestavuje jako úloha na pozadí.
+        """
+        analyza_ids = [polozka['id'] for polozka in (self.repeating_panel_dash.items or [])]
+        if self.dalsi_offset is not None:
+            # Seznam není načtený celý - ID zbývajících analýz se doplní ze serveru
+            analyza_ids = [a['id'] for a in anvil.server.call('nacti_analyzy_uzivatele')]
+        if not analyza_ids:
+            alert("Není k dispozici žádná analýza pro export.")
+            return
+        
+        self.button_export_vse.enabled = False
+        try:
+            def pri_postupu(postup, zprava):
+                self.button_export_vse.text = f"Exportuji... {int(postup * 100)} %"
+            
+            archiv = Sledovani_uloh.spust_a_cekej(
+                'zip', {'analyza_ids': analyza_ids, 'formaty': ['xlsx', 'json', 'csv']}, pri_postupu
+            )
+            download(archiv)
+        except Exception as e:
+            Utils.zapsat_chybu(f"Chyba při hromadném exportu: {str(e)}")
+            alert(f"Chyba při hromadném exportu: {str(e)}")
+        finally:
+            self.button_export_vse.text = "Exportovat vše (ZIP)"
+            self.button_export_vse.enabled = True
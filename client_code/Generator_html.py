@@ -2,8 +2,262 @@
 # -------------------------------------------------------
 # Modul: Generator_html
 # Pokročilejší generátory HTML obsahu
+#
+# Modul nemá klientské závislosti, používá ho i serverový PDF report
+# (Pdf_report).
 # -------------------------------------------------------
-from . import Utils
+
+# Výchozí počet variant zobrazených ve velkých tabulkách výstupních
+# formulářů. Další řádky se nevykreslují, tabulka místo nich ukáže
+# informační řádek a souhrnné statistiky přes všechny varianty.
+# Formuláře okno zvětšují odkazem pro zobrazení dalších řádků.
+MAX_RADKU_TABULKY = 50
+
+# Styly pomocných řádků zkrácených tabulek
+_STYL_CELKEM = "background-color:#f0f0f0; font-weight:bold; text-align:right;"
+_STYL_STATISTIK = "background-color:#FAFAFA; font-style:italic;"
+_STYL_VYNECHANYCH = "text-align: center; color: #666;"
+_BUNKA_DIAGONALY = "<td style='text-align: center;'>-</td>"
+
+def _prumer(hodnoty):
+    """Vrátí aritmetický průměr hodnot."""
+    return sum(hodnoty) / len(hodnoty)
+
+def _soucin(hodnoty):
+    """Vrátí součin hodnot."""
+    vysledek = 1.0
+    for hodnota in hodnoty:
+        vysledek *= hodnota
+    return vysledek
+
+# Souhrnné statistiky zkrácených tabulek (popisek, funkce)
+_STATISTIKY = (("Minimum", min), ("Průměr", _prumer), ("Maximum", max))
+
+def _pocet_zobrazenych(pocet, max_radku):
+    """Vrátí počet zobrazených řádků tabulky (max_radku None = všechny)."""
+    return pocet if max_radku is None else min(pocet, max_radku)
+
+def _html_bunky(hodnoty, format_hodnoty, styl_bunky=None):
+    """
+    Složí buňky řádku tabulky z číselných hodnot.
+
+    Args:
+        hodnoty: Hodnoty buněk
+        format_hodnoty: Formát čísel (např. ".3f")
+        styl_bunky: Funkce (hodnota) -> CSS styl buňky (volitelné)
+
+    Returns:
+        str: HTML buňky
+    """
+    if styl_bunky is None:
+        return "".join(f"<td>{format(hodnota, format_hodnoty)}</td>" for hodnota in hodnoty)
+    return "".join(
+        f"<td style='{styl_bunky(hodnota)}'>{format(hodnota, format_hodnoty)}</td>" for hodnota in hodnoty
+    )
+
+def _html_radek_vynechanych(zobrazeno, celkem, pocet_sloupcu, se_statistikami=False):
+    """Vytvoří informační řádek o variantách, které se v tabulce nezobrazily."""
+    text = f"Zobrazeno prvních {zobrazeno} z {celkem} variant."
+    if se_statistikami:
+        text += " Minimum, průměr a maximum jsou spočítány ze všech variant."
+    return f"<tr><td colspan='{pocet_sloupcu}' style='{_STYL_VYNECHANYCH}'>{text}</td></tr>"
+
+def _html_radky_statistik(sloupce, format_hodnoty):
+    """
+    Vytvoří řádky s minimem, průměrem a maximem každého sloupce.
+
+    Args:
+        sloupce: List sloupců tabulky, každý s hodnotami všech variant
+        format_hodnoty: Formát čísel (např. ".3f")
+
+    Returns:
+        str: HTML řádky tabulky
+    """
+    radky = []
+    for nazev, funkce in _STATISTIKY:
+        bunky = "".join(
+            f"<td>{format(funkce(sloupec), format_hodnoty)}</td>" if sloupec else "<td>-</td>"
+            for sloupec in sloupce
+        )
+        radky.append(f"<tr style='{_STYL_STATISTIK}'><td>{nazev}</td>{bunky}</tr>")
+    return "".join(radky)
+
+def _html_zahlavi_statistik():
+    """Vytvoří záhlaví sloupců se statistikami (transponované tabulky)."""
+    return "".join(f"<th style='{_STYL_STATISTIK}'>{nazev}</th>" for nazev, _ in _STATISTIKY)
+
+def _html_bunky_statistik(hodnoty, format_hodnoty):
+    """Vytvoří buňky s minimem, průměrem a maximem hodnot jednoho řádku."""
+    if not hodnoty:
+        return f"<td style='{_STYL_STATISTIK}'>-</td>" * len(_STATISTIKY)
+    return "".join(
+        f"<td style='{_STYL_STATISTIK}'>{format(funkce(hodnoty), format_hodnoty)}</td>"
+        for _, funkce in _STATISTIKY
+    )
+
+def _html_radky_variant(varianty, matice, format_hodnoty, max_radku=None, celkem=None,
+                        styl_bunky=None, tucne_nazvy=False):
+    """
+    Vytvoří řádky tabulky [varianty][kritéria] pro prvních max_radku variant.
+    Pokud se některé varianty nevejdou, doplní informační řádek a minimum,
+    průměr a maximum každého sloupce spočítané ze všech variant.
+
+    Args:
+        varianty: Seznam názvů variant
+        matice: 2D list hodnot [varianty][kriteria]
+        format_hodnoty: Formát čísel (např. ".3f")
+        max_radku: Nejvyšší počet zobrazených variant (None = všechny)
+        celkem: List celkových skóre variant pro závěrečný sloupec (volitelné)
+        styl_bunky: Funkce (hodnota) -> CSS styl buňky (volitelné)
+        tucne_nazvy: Zda zobrazit názvy variant tučně
+
+    Returns:
+        str: HTML řádky tabulky
+    """
+    zobrazeno = _pocet_zobrazenych(len(varianty), max_radku)
+    radky = []
+    for i in range(zobrazeno):
+        nazev = f"<strong>{varianty[i]}</strong>" if tucne_nazvy else varianty[i]
+        bunky = _html_bunky(matice[i], format_hodnoty, styl_bunky)
+        if celkem is not None:
+            bunky += f"<td style='{_STYL_CELKEM}'>{format(celkem[i], format_hodnoty)}</td>"
+        radky.append(f"<tr><td>{nazev}</td>{bunky}</tr>")
+
+    if zobrazeno < len(varianty):
+        sloupce = [list(sloupec) for sloupec in zip(*matice)]
+        if celkem is not None:
+            sloupce.append(celkem)
+        radky.append(_html_radek_vynechanych(zobrazeno, len(varianty), len(sloupce) + 1, True))
+        radky.append(_html_radky_statistik(sloupce, format_hodnoty))
+    return "".join(radky)
+
+def _styl_radku_poradi(varianta, vysledky):
+    """Vrátí atribut style řádku tabulky pořadí (zvýraznění nejlepší a nejhorší varianty)."""
+    if varianta == vysledky['nejlepsi_varianta']:
+        return " style='background-color: #E0F7FA;'"  # Light Cyan for best
+    if varianta == vysledky['nejhorsi_varianta']:
+        return " style='background-color: #FFEBEE;'"  # Light Red for worst
+    return ""
+
+def _html_parova_tabulka(matice, varianty, oznaceni, trida, bunka, splnuje, popis_poctu,
+                         format_statistik=".3f", max_radku=None):
+    """
+    Vytvoří tabulku čtvercové matice porovnání variant (ELECTRE).
+
+    Zobrazí se prvních max_radku řádků i sloupců. Pokud se některé varianty
+    nevejdou, doplní se pod tabulku souhrn hodnot všech dvojic variant.
+
+    Args:
+        matice: 2D čtvercová matice [varianty][varianty]
+        varianty: Seznam názvů variant
+        oznaceni: Text levé horní buňky (např. "C(i,j)")
+        trida: CSS třída tabulky
+        bunka: Funkce (hodnota) -> HTML buňky mimo diagonálu
+        splnuje: Funkce (hodnota) -> bool, zda dvojice splňuje podmínku
+        popis_poctu: Začátek věty o počtu dvojic splňujících podmínku
+        format_statistik: Formát minima, průměru a maxima (None = bez nich)
+        max_radku: Nejvyšší počet zobrazených variant (None = všechny)
+
+    Returns:
+        str: HTML kód tabulky
+    """
+    pocet = len(varianty)
+    zobrazeno = _pocet_zobrazenych(pocet, max_radku)
+    zkraceno = zobrazeno < pocet
+
+    zahlavi = "".join(f"<th>{var}</th>" for var in varianty[:zobrazeno])
+    if zkraceno:
+        zahlavi += f"<th>… (+{pocet - zobrazeno})</th>"
+
+    radky = []
+    for i in range(zobrazeno):
+        radek = matice[i]
+        bunky = "".join(_BUNKA_DIAGONALY if i == j else bunka(radek[j]) for j in range(zobrazeno))
+        if zkraceno:
+            bunky += "<td style='text-align: center;'>…</td>"
+        radky.append(f"<tr><td><strong>{varianty[i]}</strong></td>{bunky}</tr>")
+
+    souhrn = ""
+    if zkraceno:
+        radky.append(_html_radek_vynechanych(zobrazeno, pocet, zobrazeno + 2))
+        # Souhrn se počítá po řádcích bez diagonály, bez kopie celé matice
+        pocet_dvojic = pocet * (pocet - 1)
+        minimum, maximum, soucet, splnenych = None, None, 0, 0
+        for i, radek in enumerate(matice):
+            mimo_diagonalu = radek[:i] + radek[i + 1:]
+            if not mimo_diagonalu:
+                continue
+            minimum = min(mimo_diagonalu) if minimum is None else min(minimum, min(mimo_diagonalu))
+            maximum = max(mimo_diagonalu) if maximum is None else max(maximum, max(mimo_diagonalu))
+            soucet += sum(mimo_diagonalu)
+            splnenych += sum(1 for hodnota in mimo_diagonalu if splnuje(hodnota))
+
+        vety = [f"Souhrn všech {pocet_dvojic} dvojic variant."]
+        if format_statistik and minimum is not None:
+            vety.append(
+                f"Minimum {format(minimum, format_statistik)}, průměr {format(soucet / pocet_dvojic, format_statistik)}, "
+                f"maximum {format(maximum, format_statistik)}."
+            )
+        vety.append(f"{popis_poctu} {splnenych} z {pocet_dvojic} dvojic.")
+        souhrn = f'<div class="mcapp-note"><p>{" ".join(vety)}</p></div>'
+
+    return f"""
+    <div class="mcapp-table-container">
+        <table class="mcapp-table {trida}">
+            <thead>
+                <tr>
+                    <th>{oznaceni}</th>
+                    {zahlavi}
+                </tr>
+            </thead>
+            <tbody>
+                {"".join(radky)}
+            </tbody>
+        </table>
+    </div>
+    {souhrn}
+    """
+
+def _html_tabulka_souhlasu(concordance_matrix, varianty, index_souhlasu, max_radku=None):
+    """Vytvoří tabulku matice souhlasu se zvýrazněním hodnot nad prahem."""
+    def bunka(hodnota):
+        styl = "background-color: #E0F7FA; font-weight: bold;" if hodnota >= index_souhlasu else ""  # Světle modrá pro hodnoty nad prahem
+        return f"<td style='text-align: center; {styl}'>{hodnota:.3f}</td>"
+
+    return _html_parova_tabulka(
+        concordance_matrix, varianty, "C(i,j)", "mcapp-concordance-table", bunka,
+        lambda hodnota: hodnota >= index_souhlasu,
+        f"Podmínku C(i,j) ≥ {index_souhlasu:.3f} splňuje",
+        max_radku=max_radku
+    )
+
+def _html_tabulka_nesouhlasu(discordance_matrix, varianty, index_nesouhlasu, max_radku=None):
+    """Vytvoří tabulku matice nesouhlasu se zvýrazněním hodnot pod prahem."""
+    def bunka(hodnota):
+        styl = "background-color: #FFEBEE; font-weight: bold;" if hodnota <= index_nesouhlasu else ""  # Světle červená pro hodnoty pod prahem
+        return f"<td style='text-align: center; {styl}'>{hodnota:.3f}</td>"
+
+    return _html_parova_tabulka(
+        discordance_matrix, varianty, "D(i,j)", "mcapp-discordance-table", bunka,
+        lambda hodnota: hodnota <= index_nesouhlasu,
+        f"Podmínku D(i,j) ≤ {index_nesouhlasu:.3f} splňuje",
+        max_radku=max_radku
+    )
+
+def _html_tabulka_prevahy(outranking_matrix, varianty, max_radku=None):
+    """Vytvoří tabulku matice převahy (Ano/Ne)."""
+    def bunka(hodnota):
+        if hodnota == 1:
+            return "<td style='text-align: center; background-color: #E8F5E9; font-weight: bold;'>Ano</td>"  # Světle zelená pro 1
+        return "<td style='text-align: center; '>Ne</td>"
+
+    return _html_parova_tabulka(
+        outranking_matrix, varianty, "O(i,j)", "mcapp-outranking-table", bunka,
+        lambda hodnota: hodnota == 1,
+        "Převaha (Ano) platí u",
+        format_statistik=None,
+        max_radku=max_radku
+    )
 
 def vytvor_html_sekci_metodologie(metoda="WSM", default_open=True):
     """
@@ -116,7 +370,7 @@ def vytvor_html_sekci_metodologie(metoda="WSM", default_open=True):
         </div>
         """
 
-def vytvor_sekci_postupu_wsm(norm_matice, vazene_matice, vahy, varianty, kriteria, typy_kriterii):
+def vytvor_sekci_postupu_wsm(norm_matice, vazene_matice, vahy, varianty, kriteria, typy_kriterii, max_radku=None):
     """
     Vytvoří HTML sekci s postupem výpočtu.
     
@@ -127,6 +381,7 @@ def vytvor_sekci_postupu_wsm(norm_matice, vazene_matice, vahy, varianty, kriteri
         varianty: Seznam názvů variant
         kriteria: Seznam názvů kritérií
         typy_kriterii: Seznam typů kritérií (max/min)
+        max_radku: Nejvyšší počet zobrazených variant (None = všechny)
             
     Returns:
         str: HTML kód pro sekci postupu výpočtu
@@ -153,7 +408,7 @@ def vytvor_sekci_postupu_wsm(norm_matice, vazene_matice, vahy, varianty, kriteri
     """
     
     # Přidání tabulky normalizovaných hodnot
-    normalizace_html += vytvor_html_normalizacni_tabulku(norm_matice, varianty, kriteria)
+    normalizace_html += vytvor_html_normalizacni_tabulku(norm_matice, varianty, kriteria, max_radku)
     
     # Tabulka vah
     vahy_html = vytvor_html_tabulku_vah(vahy, kriteria)
@@ -182,7 +437,7 @@ def vytvor_sekci_postupu_wsm(norm_matice, vazene_matice, vahy, varianty, kriteri
     """
     
     # Tabulka vážených hodnot
-    vazene_html = vytvor_html_tabulku_vazenych_hodnot(vazene_matice, varianty, kriteria)
+    vazene_html = vytvor_html_tabulku_vazenych_hodnot(vazene_matice, varianty, kriteria, max_radku)
 
     # Sloučení do sekce
     return f"""
@@ -201,7 +456,7 @@ def vytvor_sekci_postupu_wsm(norm_matice, vazene_matice, vahy, varianty, kriteri
     </div>
     """
 
-def vytvor_kompletni_html_analyzy(analyza_data, vysledky_vypoctu, metoda="WSM"):
+def vytvor_kompletni_html_analyzy(analyza_data, vysledky_vypoctu, metoda="WSM", max_radku=None):
     """
     Vytvoří kompletní HTML strukturu pro zobrazení výsledků analýzy s použitím CSS místo JavaScriptu.
     
@@ -209,6 +464,8 @@ def vytvor_kompletni_html_analyzy(analyza_data, vysledky_vypoctu, metoda="WSM"):
         analyza_data: Slovník s daty analýzy v JSON formátu
         vysledky_vypoctu: Slovník s výsledky výpočtů
         metoda: Kód metody analýzy
+        max_radku: Nejvyšší počet variant zobrazených v tabulkách (None = všechny),
+                   u větších analýz tabulky ukážou souhrnné statistiky
         
     Returns:
         str: HTML kód pro zobrazení
@@ -219,7 +476,6 @@ def vytvor_kompletni_html_analyzy(analyza_data, vysledky_vypoctu, metoda="WSM"):
     
     # Vytvoření částí HTML dokumentu
     hlavicka_html = vytvor_hlavicku_analyzy(analyza_data['nazev'], metoda)
-    vstupni_data_html = vytvor_sekci_vstupnich_dat(analyza_data)
 
     if metoda.upper() == "ELECTRE" and "electre_vysledky" in vysledky_vypoctu:
         # Vytvoříme kopii analyza_data, abychom nemodifikovali originál
@@ -232,9 +488,9 @@ def vytvor_kompletni_html_analyzy(analyza_data, vysledky_vypoctu, metoda="WSM"):
             "index_nesouhlasu": vysledky_vypoctu["electre_vysledky"]["index_nesouhlasu"]
         }
         
-        vstupni_data_html = vytvor_sekci_vstupnich_dat(analyza_data_local)
+        vstupni_data_html = vytvor_sekci_vstupnich_dat(analyza_data_local, max_radku)
     else:
-        vstupni_data_html = vytvor_sekci_vstupnich_dat(analyza_data)
+        vstupni_data_html = vytvor_sekci_vstupnich_dat(analyza_data, max_radku)
     
     # Rozdílný postup podle metody
     if metoda.upper() == "WSM":
@@ -245,9 +501,10 @@ def vytvor_kompletni_html_analyzy(analyza_data, vysledky_vypoctu, metoda="WSM"):
             vysledky_vypoctu['vahy'],
             varianty,
             kriteria,
-            vysledky_vypoctu['typy_kriterii']
+            vysledky_vypoctu['typy_kriterii'],
+            max_radku
         )
-        vysledky_html = vytvor_sekci_vysledku(vysledky_vypoctu['wsm_vysledky'])
+        vysledky_html = vytvor_sekci_vysledku(vysledky_vypoctu['wsm_vysledky'], max_radku)
     elif metoda.upper() == "WPM":
         metodologie_html = vytvor_html_sekci_metodologie(metoda, default_open=True)
         postup_html = vytvor_sekci_postupu_wpm(
@@ -256,9 +513,10 @@ def vytvor_kompletni_html_analyzy(analyza_data, vysledky_vypoctu, metoda="WSM"):
             vysledky_vypoctu['vahy'],
             varianty,
             kriteria,
-            vysledky_vypoctu['typy_kriterii']
+            vysledky_vypoctu['typy_kriterii'],
+            max_radku
         )
-        vysledky_html = vytvor_sekci_vysledku(vysledky_vypoctu['wpm_vysledky'])
+        vysledky_html = vytvor_sekci_vysledku(vysledky_vypoctu['wpm_vysledky'], max_radku)
     elif metoda.upper() == "TOPSIS":
         metodologie_html = vytvor_html_sekci_metodologie_topsis(default_open=True)
         
@@ -288,9 +546,10 @@ def vytvor_kompletni_html_analyzy(analyza_data, vysledky_vypoctu, metoda="WSM"):
             relativni_blizkost,        # Relativní blízkost
             varianty,
             kriteria,
-            vysledky_vypoctu['typy_kriterii']
+            vysledky_vypoctu['typy_kriterii'],
+            max_radku
         )
-        vysledky_html = vytvor_sekci_vysledku_topsis(topsis_results)
+        vysledky_html = vytvor_sekci_vysledku_topsis(topsis_results, max_radku)
     elif metoda.upper() == "ELECTRE":
         # Extrakce dat specifických pro ELECTRE
         electre_results = vysledky_vypoctu['electre_vysledky']
@@ -307,14 +566,17 @@ def vytvor_kompletni_html_analyzy(analyza_data, vysledky_vypoctu, metoda="WSM"):
             kriteria,
             vysledky_vypoctu['typy_kriterii'],
             electre_results['index_souhlasu'],
-            electre_results['index_nesouhlasu']
+            electre_results['index_nesouhlasu'],
+            max_radku,
+            electre_results.get('souhrn_prevahy')
         )
         
         vysledky_html = vytvor_sekci_vysledku_electre(
             electre_results,
             varianty,
             electre_results['index_souhlasu'],
-            electre_results['index_nesouhlasu']
+            electre_results['index_nesouhlasu'],
+            max_radku
         )
     elif metoda.upper() == "MABAC":
         metodologie_html = vytvor_html_sekci_metodologie_mabac(default_open=True)
@@ -326,9 +588,10 @@ def vytvor_kompletni_html_analyzy(analyza_data, vysledky_vypoctu, metoda="WSM"):
             vysledky_vypoctu['vahy'],
             varianty,
             kriteria,
-            vysledky_vypoctu['typy_kriterii']
+            vysledky_vypoctu['typy_kriterii'],
+            max_radku
         )
-        vysledky_html = vytvor_sekci_vysledku_mabac(vysledky_vypoctu['mabac_vysledky'])
+        vysledky_html = vytvor_sekci_vysledku_mabac(vysledky_vypoctu['mabac_vysledky'], max_radku)
     else:
         # Pro ostatní metody (budoucí implementace)
         metodologie_html = f"<div class='mcapp-card'><h2>Metodologie</h2><p>Metodologie pro metodu {metoda}</p></div>"
@@ -350,161 +613,128 @@ def vytvor_kompletni_html_analyzy(analyza_data, vysledky_vypoctu, metoda="WSM"):
     
     return html_obsah
 
-def vytvor_html_normalizacni_tabulku(norm_matice, varianty, kriteria):
+def vytvor_html_normalizacni_tabulku(norm_matice, varianty, kriteria, max_radku=None):
     """
     Vytvoří HTML tabulku s normalizovanými hodnotami.
-    
+
     Args:
         norm_matice: 2D list s normalizovanými hodnotami [varianty][kriteria]
         varianty: Seznam názvů variant
         kriteria: Seznam názvů kritérií
-        
+        max_radku: Nejvyšší počet zobrazených variant (None = všechny)
+
     Returns:
         str: HTML kód tabulky s normalizovanými hodnotami
     """
-    html = """
+    zahlavi = "".join(f"<th>{krit}</th>" for krit in kriteria)
+    radky = _html_radky_variant(varianty, norm_matice, ".3f", max_radku)
+
+    return f"""
     <h3>Normalizovaná matice</h3>
     <div class="mcapp-table-container">
         <table class="mcapp-table mcapp-normalized-table">
             <thead>
                 <tr>
                     <th>Varianta / Kritérium</th>
-    """
-    
-    for krit in kriteria:
-        html += f"<th>{krit}</th>"
-    
-    html += """
+                    {zahlavi}
                 </tr>
             </thead>
             <tbody>
-    """
-    
-    for i, var in enumerate(varianty):
-        html += f"<tr><td>{var}</td>"
-        for j in range(len(kriteria)):
-            html += f"<td>{norm_matice[i][j]:.3f}</td>"
-        html += "</tr>"
-    
-    html += """
+                {radky}
             </tbody>
         </table>
     </div>
     """
-    
-    return html
 
 def vytvor_html_tabulku_vah(vahy, kriteria):
     """
     Vytvoří HTML tabulku s vahami kritérií.
-    
+
     Args:
         vahy: Seznam vah kritérií
         kriteria: Seznam názvů kritérií
-        
+
     Returns:
         str: HTML kód tabulky s vahami kritérií
     """
-    html = """
+    zahlavi = "".join(f"<th>{krit}</th>" for krit in kriteria)
+    bunky = "".join(f"<td style='text-align: right;'>{vaha:.3f}</td>" for vaha in vahy)
+
+    return f"""
     <h3>Váhy kritérií</h3>
     <div class="mcapp-table-container">
         <table class="mcapp-table mcapp-weights-table">
             <thead>
                 <tr>
                     <th>Kritérium</th>
-    """
-    
-    for krit in kriteria:
-        html += f"<th>{krit}</th>"
-    
-    html += """
+                    {zahlavi}
                 </tr>
             </thead>
             <tbody>
                 <tr>
                     <td>Váha</td>
-    """
-    
-    for i, vaha in enumerate(vahy):
-        html += f"<td style='text-align: right;'>{vaha:.3f}</td>"
-        
-    html += """
+                    {bunky}
                 </tr>
             </tbody>
         </table>
     </div>
     """
-    
-    return html
 
-def vytvor_html_tabulku_vazenych_hodnot(vazene_matice, varianty, kriteria):
+def vytvor_html_tabulku_vazenych_hodnot(vazene_matice, varianty, kriteria, max_radku=None):
     """
     Vytvoří HTML tabulku s váženými hodnotami včetně sloupce s celkovým skóre.
-    
+
     Args:
         vazene_matice: 2D list s váženými hodnotami [varianty][kriteria]
         varianty: Seznam názvů variant
         kriteria: Seznam názvů kritérií
-        
+        max_radku: Nejvyšší počet zobrazených variant (None = všechny)
+
     Returns:
         str: HTML kód tabulky s váženými hodnotami
     """
-    html = """
+    zahlavi = "".join(f"<th>{krit}</th>" for krit in kriteria)
+    # Celkové skóre je součtem vážených hodnot v řádku
+    soucty = [sum(radek) for radek in vazene_matice]
+    radky = _html_radky_variant(varianty, vazene_matice, ".3f", max_radku, celkem=soucty)
+
+    return f"""
     <h3>Vážené hodnoty (normalizované hodnoty × váhy)</h3>
     <div class="mcapp-table-container">
         <table class="mcapp-table mcapp-weighted-table">
             <thead>
                 <tr>
                     <th>Varianta / Kritérium</th>
-    """
-    
-    for krit in kriteria:
-        html += f"<th>{krit}</th>"
-    
-    # Přidáme sloupec součtu
-    html += "<th style='background-color:#f0f0f0; font-weight:bold;'>Celkové skóre</th>"
-    
-    html += """
+                    {zahlavi}
+                    <th style='background-color:#f0f0f0; font-weight:bold;'>Celkové skóre</th>
                 </tr>
             </thead>
             <tbody>
-    """
-    
-    for i, var in enumerate(varianty):
-        html += f"<tr><td>{var}</td>"
-        
-        soucet = 0
-        for j in range(len(kriteria)):
-            hodnota = vazene_matice[i][j]
-            soucet += hodnota
-            html += f"<td>{hodnota:.3f}</td>"
-            
-        # Přidáme buňku s celkovým skóre
-        html += f"<td style='background-color:#f0f0f0; font-weight:bold; text-align:right;'>{soucet:.3f}</td>"
-        
-        html += "</tr>"
-    
-    html += """
+                {radky}
             </tbody>
         </table>
     </div>
     """
-    
-    return html
 
-def vytvor_html_produktovou_tabulku(produkt_prispevek, varianty, kriteria):
+def vytvor_html_produktovou_tabulku(produkt_prispevek, varianty, kriteria, max_radku=None):
     """
     Vytvoří HTML tabulku s produktovými příspěvky pro WPM metodu.
-    
+
     Args:
         produkt_prispevek: 2D list s hodnotami umocněnými na váhy [varianty][kriteria]
         varianty: Seznam názvů variant
         kriteria: Seznam názvů kritérií
-        
+        max_radku: Nejvyšší počet zobrazených variant (None = všechny)
+
     Returns:
         str: HTML kód tabulky s produktovými příspěvky
     """
-    html = """
+    zahlavi = "".join(f"<th>{krit}</th>" for krit in kriteria)
+    # Celkové skóre je součinem hodnot v řádku
+    souciny = [_soucin(radek) for radek in produkt_prispevek]
+    radky = _html_radky_variant(varianty, produkt_prispevek, ".3f", max_radku, celkem=souciny)
+
+    return f"""
     <h3>Hodnoty umocněné na váhy kritérií</h3>
     <p class="mcapp-note">
         Metoda WPM používá násobení hodnot kritérií umocněných na váhy místo sčítání.
@@ -516,53 +746,47 @@ def vytvor_html_produktovou_tabulku(produkt_prispevek, varianty, kriteria):
             <thead>
                 <tr>
                     <th>Varianta / Kritérium</th>
-    """
-    
-    for krit in kriteria:
-        html += f"<th>{krit}</th>"
-    
-    # Přidáme sloupec součinu
-    html += "<th style='background-color:#f0f0f0; font-weight:bold;'>Celkové skóre</th>"
-    
-    html += """
+                    {zahlavi}
+                    <th style='background-color:#f0f0f0; font-weight:bold;'>Celkové skóre</th>
                 </tr>
             </thead>
             <tbody>
-    """
-    
-    for i, var in enumerate(varianty):
-        html += f"<tr><td>{var}</td>"
-        
-        soucin = 1.0
-        for j in range(len(kriteria)):
-            hodnota = produkt_prispevek[i][j]
-            soucin *= hodnota
-            html += f"<td>{hodnota:.3f}</td>"
-            
-        # Přidáme buňku s celkovým skóre
-        html += f"<td style='background-color:#f0f0f0; font-weight:bold; text-align:right;'>{soucin:.3f}</td>"
-        
-        html += "</tr>"
-    
-    html += """
+                {radky}
             </tbody>
         </table>
     </div>
     """
-    
-    return html
 
-def vytvor_html_tabulku_vysledku_s_procenty(wsm_vysledky):
+def vytvor_html_tabulku_vysledku_s_procenty(wsm_vysledky, max_radku=None):
     """
     Vytvoří HTML tabulku s výsledky analýzy včetně procenta z maxima.
-    
+
     Args:
         wsm_vysledky: Slovník s výsledky WSM analýzy
-        
+        max_radku: Nejvyšší počet zobrazených variant (None = všechny)
+
     Returns:
         str: HTML kód tabulky s výsledky
     """
-    html = """
+    max_skore = wsm_vysledky['nejlepsi_skore']
+    serazene = sorted(wsm_vysledky['results'], key=lambda x: x[1])
+    zobrazeno = _pocet_zobrazenych(len(serazene), max_radku)
+
+    radky = []
+    for varianta, poradi, skore in serazene[:zobrazeno]:
+        procento = (skore / max_skore) * 100 if max_skore > 0 else 0
+        radky.append(f"""
+            <tr{_styl_radku_poradi(varianta, wsm_vysledky)}>
+                <td>{poradi}.</td>
+                <td>{varianta}</td>
+                <td style="text-align: right;">{skore:.3f}</td>
+                <td style="text-align: right;">{procento:.1f}%</td>
+            </tr>
+        """)
+    if zobrazeno < len(serazene):
+        radky.append(_html_radek_vynechanych(zobrazeno, len(serazene), 4))
+
+    return f"""
     <h3>Pořadí variant</h3>
     <div class="mcapp-table-container">
         <table class="mcapp-table mcapp-results-table">
@@ -575,36 +799,11 @@ def vytvor_html_tabulku_vysledku_s_procenty(wsm_vysledky):
                 </tr>
             </thead>
             <tbody>
-    """
-    
-    max_skore = wsm_vysledky['nejlepsi_skore']
-    
-    for varianta, poradi, skore in sorted(wsm_vysledky['results'], key=lambda x: x[1]):
-        procento = (skore / max_skore) * 100 if max_skore > 0 else 0
-        radek_styl = ""
-        
-        # Zvýraznění nejlepší a nejhorší varianty
-        if varianta == wsm_vysledky['nejlepsi_varianta']:
-            radek_styl = " style='background-color: #E0F7FA;'"  # Light Cyan for best
-        elif varianta == wsm_vysledky['nejhorsi_varianta']:
-            radek_styl = " style='background-color: #FFEBEE;'"  # Light Red for worst
-            
-        html += f"""
-            <tr{radek_styl}>
-                <td>{poradi}.</td>
-                <td>{varianta}</td>
-                <td style="text-align: right;">{skore:.3f}</td>
-                <td style="text-align: right;">{procento:.1f}%</td>
-            </tr>
-        """
-    
-    html += """
+                {"".join(radky)}
             </tbody>
         </table>
     </div>
     """
-    
-    return html
 
 def vytvor_html_shrnuti_vysledku_rozsirene(wsm_vysledky):
     """
@@ -633,18 +832,33 @@ def vytvor_html_shrnuti_vysledku_rozsirene(wsm_vysledky):
     
     return html
 
-def vytvor_sekci_vstupnich_dat(analyza_data):
+def _formatuj_vstupni_hodnotu(hodnota):
+    """Zformátuje hodnotu hodnotící matice (desetinná čísla na 2 místa)."""
+    if isinstance(hodnota, float):
+        return f"{hodnota:.2f}"
+    return str(hodnota)
+
+def vytvor_sekci_vstupnich_dat(analyza_data, max_radku=None):
     """
     Vytvoří HTML sekci se vstupními daty analýzy.
-    
+
     Args:
         analyza_data: Slovník s daty analýzy
-    
+        max_radku: Nejvyšší počet zobrazených variant (None = všechny)
+
     Returns:
         str: HTML kód pro sekci vstupních dat
     """
     # Tabulka kritérií
-    kriteria_html = """
+    radky_kriterii = "".join(f"""
+            <tr>
+                <td>{nazev_krit}</td>
+                <td>{krit_data['typ'].upper()}</td>
+                <td style="text-align: right;">{krit_data['vaha']:.3f}</td>
+            </tr>
+        """ for nazev_krit, krit_data in analyza_data.get('kriteria', {}).items())
+
+    kriteria_html = f"""
     <h3>Přehled kritérií</h3>
     <div class="mcapp-table-container">
         <table class="mcapp-table mcapp-criteria-table">
@@ -656,37 +870,26 @@ def vytvor_sekci_vstupnich_dat(analyza_data):
                 </tr>
             </thead>
             <tbody>
-    """
-    
-    for nazev_krit, krit_data in analyza_data.get('kriteria', {}).items():
-        kriteria_html += f"""
-            <tr>
-                <td>{nazev_krit}</td>
-                <td>{krit_data['typ'].upper()}</td>
-                <td style="text-align: right;">{krit_data['vaha']:.3f}</td>
-            </tr>
-        """
-    
-    kriteria_html += """
+                {radky_kriterii}
             </tbody>
         </table>
     </div>
     """
-    
+
     # Zobrazení prahových hodnot pro ELECTRE
     prahove_hodnoty_html = ""
     # Kontrola, zda jde o metodu ELECTRE a zda existují parametry v analyza_data nebo parametry
     je_electre = analyza_data.get('metoda', '').upper() == 'ELECTRE'
-    
+
     if je_electre and 'parametry' in analyza_data:
         index_souhlasu = analyza_data.get('parametry', {}).get('index_souhlasu', 0.7)
         index_nesouhlasu = analyza_data.get('parametry', {}).get('index_nesouhlasu', 0.3)
-        
+
         prahove_hodnoty_html = f"""
         <h3>Nastavené prahové hodnoty</h3>
         <div class="mcapp-explanation">
             <p>Metoda ELECTRE používá dvě prahové hodnoty, které určují, kdy jedna varianta převyšuje druhou:</p>
-            
+
             <div class="mcapp-formula-box">
                 <div class="mcapp-formula-row">
                     <span class="mcapp-formula-label">Index souhlasu (c*):</span>
@@ -697,7 +900,7 @@ def vytvor_sekci_vstupnich_dat(analyza_data):
                     <span class="mcapp-formula-content">{index_nesouhlasu:.2f}</span>
                 </div>
             </div>
-            
+
             <div class="mcapp-note">
                 <p><strong>Index souhlasu (c*)</strong> - Čím vyšší hodnota, tím přísnější je podmínka pro "souhlas" s tvrzením, že jedna varianta je lepší než druhá.</p>
                 <p><strong>Index nesouhlasu (d*)</strong> - Čím nižší hodnota, tím přísnější je podmínka pro "nesouhlas" s tvrzením, že jedna varianta je lepší než druhá.</p>
@@ -705,9 +908,23 @@ def vytvor_sekci_vstupnich_dat(analyza_data):
             <p>Tyto hodnoty lze upravit v sekci Nastavení aplikace.</p>
         </div>
         """
-    
-    # Tabulka variant (zůstává stejná)
-    varianty_html = """
+
+    varianty_dict = analyza_data.get('varianty', {})
+    varianty = list(varianty_dict.keys())
+    zobrazeno = _pocet_zobrazenych(len(varianty), max_radku)
+    zkraceno = zobrazeno < len(varianty)
+
+    # Tabulka variant
+    radky_variant = [f"""
+            <tr>
+                <td>{nazev_var}</td>
+                <td>{varianty_dict[nazev_var].get('popis_varianty', '')}</td>
+            </tr>
+        """ for nazev_var in varianty[:zobrazeno]]
+    if zkraceno:
+        radky_variant.append(_html_radek_vynechanych(zobrazeno, len(varianty), 2))
+
+    varianty_html = f"""
     <h3>Přehled variant</h3>
     <div class="mcapp-table-container">
         <table class="mcapp-table mcapp-variants-table">
@@ -718,68 +935,56 @@ def vytvor_sekci_vstupnich_dat(analyza_data):
                 </tr>
             </thead>
             <tbody>
-    """
-    
-    for nazev_var, var_data in analyza_data.get('varianty', {}).items():
-        popis = var_data.get('popis_varianty', '')
-        varianty_html += f"""
-            <tr>
-                <td>{nazev_var}</td>
-                <td>{popis}</td>
-            </tr>
-        """
-    
-    varianty_html += """
+                {"".join(radky_variant)}
             </tbody>
         </table>
     </div>
     """
-    
-    # Původní hodnotící matice
-    matice_html = """
+
+    # Původní hodnotící matice (kritéria v řádcích, varianty ve sloupcích);
+    # u zkrácené tabulky doplníme statistiky každého kritéria přes všechny varianty
+    zahlavi_matice = "".join(f"<th>{var}</th>" for var in varianty[:zobrazeno])
+    if zkraceno:
+        zahlavi_matice += _html_zahlavi_statistik()
+
+    radky_matice = []
+    for krit in analyza_data.get('kriteria', {}):
+        hodnoty = [varianty_dict[var].get(krit, "N/A") for var in varianty]
+        bunky = "".join(
+            f"<td style='text-align: right;'>{_formatuj_vstupni_hodnotu(hodnota)}</td>"
+            for hodnota in hodnoty[:zobrazeno]
+        )
+        if zkraceno:
+            cisla = [h for h in hodnoty if isinstance(h, (int, float))]
+            bunky += _html_bunky_statistik(cisla, ".2f")
+        radky_matice.append(f"<tr><td>{krit}</td>{bunky}</tr>")
+
+    poznamka_matice = ""
+    if zkraceno:
+        poznamka_matice = f"""
+    <div class="mcapp-note">
+        <p>Zobrazeno prvních {zobrazeno} z {len(varianty)} variant. Minimum, průměr a maximum jsou spočítány ze všech variant.</p>
+    </div>
+    """
+
+    matice_html = f"""
     <h3>Hodnotící matice</h3>
     <div class="mcapp-table-container">
         <table class="mcapp-table mcapp-matrix-table">
             <thead>
                 <tr>
                     <th>Kritérium</th>
-    """
-    
-    # Přidání názvů variant do záhlaví
-    varianty = list(analyza_data.get('varianty', {}).keys())
-    for var in varianty:
-        matice_html += f"<th>{var}</th>"
-    
-    matice_html += """
+                    {zahlavi_matice}
                 </tr>
             </thead>
             <tbody>
-    """
-    
-    # Přidání hodnot kritérií pro jednotlivé varianty
-    kriteria_nazvy = list(analyza_data.get('kriteria', {}).keys())
-    for krit in kriteria_nazvy:
-        matice_html += f"<tr><td>{krit}</td>"
-        
-        for var in varianty:
-            hodnota = analyza_data.get('varianty', {}).get(var, {}).get(krit, "N/A")
-            
-            # Formátování hodnoty pokud je číslo
-            if isinstance(hodnota, (int, float)):
-                hodnota_str = f"{hodnota:.2f}" if isinstance(hodnota, float) else str(hodnota)
-            else:
-                hodnota_str = str(hodnota)
-                
-            matice_html += f"<td style='text-align: right;'>{hodnota_str}</td>"
-            
-        matice_html += "</tr>"
-    
-    matice_html += """
+                {"".join(radky_matice)}
             </tbody>
         </table>
     </div>
+    {poznamka_matice}
     """
-    
+
     # Pokud existuje popis analýzy, přidáme ho
     popis_html = ""
     if analyza_data.get('popis_analyzy'):
@@ -789,7 +994,7 @@ def vytvor_sekci_vstupnich_dat(analyza_data):
             <p>{analyza_data.get('popis_analyzy')}</p>
         </div>
         """
-    
+
     # Sloučení do sekce
     return f"""
     <div class="mcapp-section mcapp-input-data">
@@ -834,22 +1039,23 @@ def vytvor_hlavicku_analyzy(nazev_analyzy, metoda="WSM"):
     </div>
     """
 
-def vytvor_sekci_vysledku(wsm_vysledky):
+def vytvor_sekci_vysledku(wsm_vysledky, max_radku=None):
     """
     Vytvoří HTML sekci s výsledky analýzy.
-    
+
     Args:
         wsm_vysledky: Slovník s výsledky WSM analýzy
-        
+        max_radku: Nejvyšší počet zobrazených variant (None = všechny)
+
     Returns:
         str: HTML kód pro sekci výsledků
     """
     # Tabulka výsledků
-    vysledky_html = vytvor_html_tabulku_vysledku_s_procenty(wsm_vysledky)
-    
+    vysledky_html = vytvor_html_tabulku_vysledku_s_procenty(wsm_vysledky, max_radku)
+
     # Shrnutí výsledků
     shrnuti_html = vytvor_html_shrnuti_vysledku_rozsirene(wsm_vysledky)
-    
+
     # Sloučení do sekce
     return f"""
     <div class="mcapp-section mcapp-results">
@@ -860,10 +1066,10 @@ def vytvor_sekci_vysledku(wsm_vysledky):
         </div>
     </div>
     """
-def vytvor_sekci_postupu_wpm(matice, produkt_prispevek, vahy, varianty, kriteria, typy_kriterii):
+def vytvor_sekci_postupu_wpm(matice, produkt_prispevek, vahy, varianty, kriteria, typy_kriterii, max_radku=None):
     """
     Vytvoří HTML sekci s postupem výpočtu WPM s použitím CSS místo JavaScriptu.
-    
+
     Args:
         matice: Původní matice hodnot
         produkt_prispevek: 2D list s příspěvky jednotlivých kritérií
@@ -871,7 +1077,8 @@ def vytvor_sekci_postupu_wpm(matice, produkt_prispevek, vahy, varianty, kriteria
         varianty: Seznam názvů variant
         kriteria: Seznam názvů kritérií
         typy_kriterii: Seznam typů kritérií (max/min)
-            
+        max_radku: Nejvyšší počet zobrazených variant (None = všechny)
+
     Returns:
         str: HTML kód pro sekci postupu výpočtu
     """
@@ -883,16 +1090,16 @@ def vytvor_sekci_postupu_wpm(matice, produkt_prispevek, vahy, varianty, kriteria
             hodnota = matice[i][j]
             if hodnota <= 0:
                 hodnota = 0.001  # Ochrana proti nule
-                
+
             # Pro minimalizační kritéria použijeme převrácenou hodnotu
             if typy_kriterii[j].lower() in ("min", "cost"):
                 norm_hodnota = 1.0 / hodnota
             else:
                 norm_hodnota = hodnota
-                
+
             radek.append(norm_hodnota)
         norm_matice.append(radek)
-    
+
     # Krok 1: Normalizace rozhodovací matice - vysvětlení
     normalizace_vysvetleni = """
     <div class="mcapp-explanation">
@@ -911,46 +1118,36 @@ def vytvor_sekci_postupu_wpm(matice, produkt_prispevek, vahy, varianty, kriteria
         </div>
         <p>kde x<sub>ij</sub> je původní hodnota i-té varianty pro j-té kritérium.</p>
         <div class="mcapp-note">
-            <p>Na rozdíl od metody WSM, metoda WPM používá násobení místo sčítání, což eliminuje potřebu normalizace jednotek. 
-            Pro minimalizační kritéria (kde menší hodnota je lepší) používáme převrácenou hodnotu, aby všechna kritéria 
+            <p>Na rozdíl od metody WSM, metoda WPM používá násobení místo sčítání, což eliminuje potřebu normalizace jednotek.
+            Pro minimalizační kritéria (kde menší hodnota je lepší) používáme převrácenou hodnotu, aby všechna kritéria
             byla hodnocena ve stejném směru (větší = lepší).</p>
         </div>
     </div>
     """
-    
+
     # Tabulka normalizovaných hodnot
-    normalizace_html = """
+    zahlavi_normalizace = "".join(
+        f"<th>{krit} ({typy_kriterii[i].upper()})</th>" for i, krit in enumerate(kriteria)
+    )
+    radky_normalizace = _html_radky_variant(varianty, norm_matice, ".6f", max_radku, tucne_nazvy=True)
+
+    normalizace_html = f"""
     <h3>Normalizovaná rozhodovací matice</h3>
     <div class="mcapp-table-container">
         <table class="mcapp-table mcapp-normalized-table">
             <thead>
                 <tr>
                     <th>Varianta / Kritérium</th>
-    """
-    
-    for i, krit in enumerate(kriteria):
-        typ = typy_kriterii[i].upper()
-        normalizace_html += f"<th>{krit} ({typ})</th>"
-    
-    normalizace_html += """
+                    {zahlavi_normalizace}
                 </tr>
             </thead>
             <tbody>
-    """
-    
-    for i, var in enumerate(varianty):
-        normalizace_html += f"<tr><td><strong>{var}</strong></td>"
-        for j in range(len(kriteria)):
-            hodnota = norm_matice[i][j]
-            normalizace_html += f"<td>{hodnota:.6f}</td>"
-        normalizace_html += "</tr>"
-    
-    normalizace_html += """
+                {radky_normalizace}
             </tbody>
         </table>
     </div>
     """
-    
+
     # Krok 2: Výpočet metodou WPM - vysvětlení
     wpm_vysvetleni = """
     <div class="mcapp-explanation">
@@ -963,16 +1160,20 @@ def vytvor_sekci_postupu_wpm(matice, produkt_prispevek, vahy, varianty, kriteria
             </div>
         </div>
         <p>kde r<sub>ij</sub> je normalizovaná hodnota i-té varianty podle j-tého kritéria a w<sub>j</sub> je váha j-tého kritéria.</p>
-        <p>Pro každé kritérium se nejprve hodnota umocní na váhu tohoto kritéria, čímž vznikne příspěvek tohoto kritéria k celkovému skóre. 
+        <p>Pro každé kritérium se nejprve hodnota umocní na váhu tohoto kritéria, čímž vznikne příspěvek tohoto kritéria k celkovému skóre.
         Celkové skóre varianty se pak získá vynásobením všech těchto příspěvků.</p>
     </div>
     """
-    
+
     # Tabulka vah
     vahy_html = vytvor_html_tabulku_vah(vahy, kriteria)
-    
-    # Tabulka produktových příspěvků
-    produkty_html = """
+
+    # Tabulka produktových příspěvků se sloupcem součinu
+    zahlavi_produktu = "".join(f"<th>{krit}</th>" for krit in kriteria)
+    souciny = [_soucin(radek) for radek in produkt_prispevek]
+    radky_produktu = _html_radky_variant(varianty, produkt_prispevek, ".6f", max_radku, celkem=souciny)
+
+    produkty_html = f"""
     <h3>Hodnoty umocněné na váhy kritérií</h3>
     <div class="mcapp-explanation">
         <p>Níže jsou zobrazeny hodnoty po transformaci (1/x pro minimalizační kritéria) a umocnění na váhy.
@@ -983,40 +1184,17 @@ def vytvor_sekci_postupu_wpm(matice, produkt_prispevek, vahy, varianty, kriteria
             <thead>
                 <tr>
                     <th>Varianta / Kritérium</th>
-    """
-    
-    for krit in kriteria:
-        produkty_html += f"<th>{krit}</th>"
-    
-    # Přidáme sloupec součinu
-    produkty_html += "<th style='background-color:#f0f0f0; font-weight:bold;'>Celkové skóre</th>"
-    
-    produkty_html += """
+                    {zahlavi_produktu}
+                    <th style='background-color:#f0f0f0; font-weight:bold;'>Celkové skóre</th>
                 </tr>
             </thead>
             <tbody>
-    """
-    
-    for i, var in enumerate(varianty):
-        produkty_html += f"<tr><td>{var}</td>"
-        
-        soucin = 1.0
-        for j in range(len(kriteria)):
-            hodnota = produkt_prispevek[i][j]
-            soucin *= hodnota
-            produkty_html += f"<td>{hodnota:.6f}</td>"
-            
-        # Přidáme buňku s celkovým skóre
-        produkty_html += f"<td style='background-color:#f0f0f0; font-weight:bold; text-align:right;'>{soucin:.6f}</td>"
-        
-        produkty_html += "</tr>"
-    
-    produkty_html += """
+                {radky_produktu}
             </tbody>
         </table>
     </div>
     """
-    
+
     # Alternativní přístup - nyní na konci Kroku 2
     alternativni_pristup_html = """
     <h3>Alternativní přístup - poměry mezi variantami</h3>
@@ -1103,21 +1281,50 @@ def vytvor_html_sekci_metodologie_topsis(default_open=True):
     </div>
     """
 
-def vytvor_html_normalizacni_tabulku_euklidovska(matice, norm_matice, varianty, kriteria):
+def vytvor_html_normalizacni_tabulku_euklidovska(matice, norm_matice, varianty, kriteria, max_radku=None):
     """
     Vytvoří HTML tabulku s normalizovanými hodnotami podle Euklidovské normy
     s rozšířeným vysvětlením principu.
-    
+
     Args:
         matice: 2D list s původními hodnotami [varianty][kriteria]
         norm_matice: 2D list s normalizovanými hodnotami [varianty][kriteria]
         varianty: Seznam názvů variant
         kriteria: Seznam názvů kritérií
-        
+        max_radku: Nejvyšší počet zobrazených variant (None = všechny)
+
     Returns:
         str: HTML kód tabulky s normalizovanými hodnotami
     """
-    html = """
+    # Varianty jsou ve sloupcích; u zkrácené tabulky doplníme statistiky
+    # každého kritéria přes všechny varianty
+    zobrazeno = _pocet_zobrazenych(len(varianty), max_radku)
+    zkraceno = zobrazeno < len(varianty)
+
+    zahlavi = "".join(f"<th>{var}</th>" for var in varianty[:zobrazeno])
+    if zkraceno:
+        zahlavi += _html_zahlavi_statistik()
+
+    radky = []
+    for j in range(len(kriteria)):
+        # Výpočet Euklidovské normy pro dané kritérium
+        norma = (sum(radek[j] ** 2 for radek in matice)) ** 0.5
+        norm_sloupec = [radek[j] for radek in norm_matice]
+
+        bunky = _html_bunky(norm_sloupec[:zobrazeno], ".4f")
+        if zkraceno:
+            bunky += _html_bunky_statistik(norm_sloupec, ".4f")
+        radky.append(f"<tr><td>{kriteria[j]}</td><td>{norma:.4f}</td>{bunky}</tr>")
+
+    poznamka = ""
+    if zkraceno:
+        poznamka = f"""
+    <div class="mcapp-note">
+        <p>Zobrazeno prvních {zobrazeno} z {len(varianty)} variant. Minimum, průměr a maximum jsou spočítány ze všech variant.</p>
+    </div>
+    """
+
+    return f"""
     <h3>Normalizovaná matice pomocí Euklidovské normy</h3>
     <div class="mcapp-explanation">
         <p>
@@ -1139,50 +1346,28 @@ def vytvor_html_normalizacni_tabulku_euklidovska(matice, norm_matice, varianty,
             <p>Na rozdíl od min-max normalizace, Euklidovská normalizace zachovává vzájemné vztahy mezi hodnotami.</p>
         </div>
     </div>
-    
+
     <div class="mcapp-table-container">
         <table class="mcapp-table mcapp-normalized-table">
             <thead>
                 <tr>
                     <th>Kritérium</th>
                     <th>Euklidovská norma</th>
-    """
-    
-    for var in varianty:
-        html += f"<th>{var}</th>"
-    
-    html += """
+                    {zahlavi}
                 </tr>
             </thead>
             <tbody>
-    """
-    
-    for j in range(len(kriteria)):
-        html += f"<tr><td>{kriteria[j]}</td>"
-        
-        # Výpočet Euklidovské normy pro dané kritérium
-        sloupec = [matice[i][j] for i in range(len(varianty))]
-        norma = (sum(x**2 for x in sloupec)) ** 0.5
-        
-        html += f"<td>{norma:.4f}</td>"
-        
-        for i in range(len(varianty)):
-            html += f"<td>{norm_matice[i][j]:.4f}</td>"
-            
-        html += "</tr>"
-    
-    html += """
+                {"".join(radky)}
             </tbody>
         </table>
     </div>
+    {poznamka}
     """
-    
-    return html
 
-def vytvor_html_tabulku_vazenych_hodnot_topsis(vazena_matice, ideal, anti_ideal, varianty, kriteria, typy_kriterii):
+def vytvor_html_tabulku_vazenych_hodnot_topsis(vazena_matice, ideal, anti_ideal, varianty, kriteria, typy_kriterii, max_radku=None):
     """
     Vytvoří HTML tabulku s váženými hodnotami a ideálním/anti-ideálním řešením.
-    
+
     Args:
         vazena_matice: 2D list s váženými hodnotami [varianty][kriteria]
         ideal: Seznam ideálních hodnot pro každé kritérium
@@ -1190,11 +1375,18 @@ def vytvor_html_tabulku_vazenych_hodnot_topsis(vazena_matice, ideal, anti_ideal,
         varianty: Seznam názvů variant
         kriteria: Seznam názvů kritérií
         typy_kriterii: Seznam typů kritérií (max/min)
-        
+        max_radku: Nejvyšší počet zobrazených variant (None = všechny)
+
     Returns:
         str: HTML kód tabulky s váženými hodnotami
     """
-    html = """
+    zahlavi = "".join(
+        f"<th>{krit} ({typy_kriterii[j].upper() if j < len(typy_kriterii) else '?'})</th>"
+        for j, krit in enumerate(kriteria)
+    )
+    radky = _html_radky_variant(varianty, vazena_matice, ".4f", max_radku)
+
+    return f"""
     <h3>Vážené hodnoty a ideální/anti-ideální řešení</h3>
     <p>
         V tomto kroku vynásobíme normalizované hodnoty váhami jednotlivých kritérií a určíme ideální a anti-ideální řešení.
@@ -1204,40 +1396,13 @@ def vytvor_html_tabulku_vazenych_hodnot_topsis(vazena_matice, ideal, anti_ideal,
             <thead>
                 <tr>
                     <th>Varianta / Kritérium</th>
-    """
-    
-    for j, krit in enumerate(kriteria):
-        typ = typy_kriterii[j].upper() if j < len(typy_kriterii) else "?"
-        html += f"<th>{krit} ({typ})</th>"
-    
-    html += """
+                    {zahlavi}
                 </tr>
             </thead>
             <tbody>
-    """
-    
-    for i, var in enumerate(varianty):
-        html += f"<tr><td>{var}</td>"
-        
-        for j in range(len(kriteria)):
-            hodnota = vazena_matice[i][j]
-            html += f"<td>{hodnota:.4f}</td>"
-            
-        html += "</tr>"
-    
-    # Přidáme řádek pro ideální řešení
-    html += "<tr style='background-color:#E0F7FA; font-weight:bold;'><td>Ideální řešení (A*)</td>"
-    for j in range(len(kriteria)):
-        html += f"<td>{ideal[j]:.4f}</td>"
-    html += "</tr>"
-    
-    # Přidáme řádek pro anti-ideální řešení
-    html += "<tr style='background-color:#FFEBEE; font-weight:bold;'><td>Anti-ideální řešení (A-)</td>"
-    for j in range(len(kriteria)):
-        html += f"<td>{anti_ideal[j]:.4f}</td>"
-    html += "</tr>"
-    
-    html += """
+                {radky}
+                <tr style='background-color:#E0F7FA; font-weight:bold;'><td>Ideální řešení (A*)</td>{_html_bunky(ideal[:len(kriteria)], ".4f")}</tr>
+                <tr style='background-color:#FFEBEE; font-weight:bold;'><td>Anti-ideální řešení (A-)</td>{_html_bunky(anti_ideal[:len(kriteria)], ".4f")}</tr>
             </tbody>
         </table>
     </div>
@@ -1246,23 +1411,35 @@ def vytvor_html_tabulku_vazenych_hodnot_topsis(vazena_matice, ideal, anti_ideal,
         Pro minimalizační kritéria je to naopak - ideální hodnota je minimum a anti-ideální maximum.
     </p>
     """
-    
-    return html
 
-def vytvor_html_tabulku_vzdalenosti_topsis(dist_ideal, dist_anti_ideal, relativni_blizkost, varianty):
+def vytvor_html_tabulku_vzdalenosti_topsis(dist_ideal, dist_anti_ideal, relativni_blizkost, varianty, max_radku=None):
     """
     Vytvoří HTML tabulku se vzdálenostmi a relativní blízkostí k ideálnímu řešení.
-    
+
     Args:
         dist_ideal: Seznam vzdáleností od ideálního řešení
         dist_anti_ideal: Seznam vzdáleností od anti-ideálního řešení
         relativni_blizkost: Seznam relativních blízkostí k ideálnímu řešení
         varianty: Seznam názvů variant
-        
+        max_radku: Nejvyšší počet zobrazených variant (None = všechny)
+
     Returns:
         str: HTML kód tabulky se vzdálenostmi
     """
-    html = """
+    zobrazeno = _pocet_zobrazenych(len(varianty), max_radku)
+    radky = [f"""
+            <tr>
+                <td>{varianty[i]}</td>
+                <td style="text-align: right;">{dist_ideal[i]:.4f}</td>
+                <td style="text-align: right;">{dist_anti_ideal[i]:.4f}</td>
+                <td style="text-align: right; font-weight: bold;">{relativni_blizkost[i]:.4f}</td>
+            </tr>
+        """ for i in range(zobrazeno)]
+    if zobrazeno < len(varianty):
+        radky.append(_html_radek_vynechanych(zobrazeno, len(varianty), 4, True))
+        radky.append(_html_radky_statistik([dist_ideal, dist_anti_ideal, relativni_blizkost], ".4f"))
+
+    return f"""
     <div class="mcapp-explanation">
         <h4>Výpočet vzdáleností a relativní blízkosti k ideálnímu řešení:</h4>
         <div class="mcapp-formula-box">
@@ -1287,7 +1464,7 @@ def vytvor_html_tabulku_vzdalenosti_topsis(dist_ideal, dist_anti_ideal, relativn
             a hodnota blížící se 0 znamená anti-ideální řešení.</p>
         </div>
     </div>
-    
+
     <div class="mcapp-table-container">
         <table class="mcapp-table mcapp-distances-table">
             <thead>
@@ -1299,19 +1476,7 @@ def vytvor_html_tabulku_vzdalenosti_topsis(dist_ideal, dist_anti_ideal, relativn
                 </tr>
             </thead>
             <tbody>
-    """
-    
-    for i, var in enumerate(varianty):
-        html += f"""
-            <tr>
-                <td>{var}</td>
-                <td style="text-align: right;">{dist_ideal[i]:.4f}</td>
-                <td style="text-align: right;">{dist_anti_ideal[i]:.4f}</td>
-                <td style="text-align: right; font-weight: bold;">{relativni_blizkost[i]:.4f}</td>
-            </tr>
-        """
-    
-    html += """
+                {"".join(radky)}
             </tbody>
         </table>
     </div>
@@ -1320,13 +1485,11 @@ def vytvor_html_tabulku_vzdalenosti_topsis(dist_ideal, dist_anti_ideal, relativn
         Varianta s nejvyšší hodnotou C* je považována za nejlepší.
     </p>
     """
-    
-    return html
 
-def vytvor_sekci_postupu_topsis(matice, norm_matice, vazena_matice, vahy, ideal, anti_ideal, dist_ideal, dist_anti_ideal, relativni_blizkost, varianty, kriteria, typy_kriterii):
+def vytvor_sekci_postupu_topsis(matice, norm_matice, vazena_matice, vahy, ideal, anti_ideal, dist_ideal, dist_anti_ideal, relativni_blizkost, varianty, kriteria, typy_kriterii, max_radku=None):
     """
     Vytvoří HTML sekci s postupem výpočtu TOPSIS.
-    
+
     Args:
         matice: Původní matice hodnot
         norm_matice: Normalizovaná matice hodnot podle Euklidovské normy
@@ -1340,21 +1503,22 @@ def vytvor_sekci_postupu_topsis(matice, norm_matice, vazena_matice, vahy, ideal,
         varianty: Seznam názvů variant
         kriteria: Seznam názvů kritérií
         typy_kriterii: Seznam typů kritérií (max/min)
-            
+        max_radku: Nejvyšší počet zobrazených variant (None = všechny)
+
     Returns:
         str: HTML kód pro sekci postupu výpočtu
     """
     # Normalizační tabulka podle Euklidovské normy
-    normalizace_html = vytvor_html_normalizacni_tabulku_euklidovska(matice, norm_matice, varianty, kriteria)
-    
+    normalizace_html = vytvor_html_normalizacni_tabulku_euklidovska(matice, norm_matice, varianty, kriteria, max_radku)
+
     # Tabulka vah
     vahy_html = vytvor_html_tabulku_vah(vahy, kriteria)
-    
+
     # Tabulka vážených hodnot
-    vazene_html = vytvor_html_tabulku_vazenych_hodnot_topsis(vazena_matice, ideal, anti_ideal, varianty, kriteria, typy_kriterii)
-    
+    vazene_html = vytvor_html_tabulku_vazenych_hodnot_topsis(vazena_matice, ideal, anti_ideal, varianty, kriteria, typy_kriterii, max_radku)
+
     # Tabulka vzdáleností a relativní blízkosti
-    vzdalenosti_html = vytvor_html_tabulku_vzdalenosti_topsis(dist_ideal, dist_anti_ideal, relativni_blizkost, varianty)
+    vzdalenosti_html = vytvor_html_tabulku_vzdalenosti_topsis(dist_ideal, dist_anti_ideal, relativni_blizkost, varianty, max_radku)
 
     # Sloučení do sekce
     return f"""
@@ -1376,17 +1540,36 @@ def vytvor_sekci_postupu_topsis(matice, norm_matice, vazena_matice, vahy, ideal,
     </div>
     """
 
-def vytvor_html_tabulku_vysledku_topsis(topsis_vysledky):
+def vytvor_html_tabulku_vysledku_topsis(topsis_vysledky, max_radku=None):
     """
     Vytvoří HTML tabulku s výsledky TOPSIS analýzy včetně relativní blízkosti.
-    
+
     Args:
         topsis_vysledky: Slovník s výsledky TOPSIS analýzy
-        
+        max_radku: Nejvyšší počet zobrazených variant (None = všechny)
+
     Returns:
         str: HTML kód tabulky s výsledky
     """
-    html = """
+    max_skore = topsis_vysledky['nejlepsi_skore']
+    serazene = sorted(topsis_vysledky['results'], key=lambda x: x[1])
+    zobrazeno = _pocet_zobrazenych(len(serazene), max_radku)
+
+    radky = []
+    for varianta, poradi, skore in serazene[:zobrazeno]:
+        procento = (skore / max_skore) * 100 if max_skore > 0 else 0
+        radky.append(f"""
+            <tr{_styl_radku_poradi(varianta, topsis_vysledky)}>
+                <td>{poradi}.</td>
+                <td>{varianta}</td>
+                <td style="text-align: right;">{skore:.4f}</td>
+                <td style="text-align: right;">{procento:.1f}%</td>
+            </tr>
+        """)
+    if zobrazeno < len(serazene):
+        radky.append(_html_radek_vynechanych(zobrazeno, len(serazene), 4))
+
+    return f"""
     <h3>Pořadí variant</h3>
     <div class="mcapp-table-container">
         <table class="mcapp-table mcapp-results-table">
@@ -1399,36 +1582,11 @@ def vytvor_html_tabulku_vysledku_topsis(topsis_vysledky):
                 </tr>
             </thead>
             <tbody>
-    """
-    
-    max_skore = topsis_vysledky['nejlepsi_skore']
-    
-    for varianta, poradi, skore in sorted(topsis_vysledky['results'], key=lambda x: x[1]):
-        procento = (skore / max_skore) * 100 if max_skore > 0 else 0
-        radek_styl = ""
-        
-        # Zvýraznění nejlepší a nejhorší varianty
-        if varianta == topsis_vysledky['nejlepsi_varianta']:
-            radek_styl = " style='background-color: #E0F7FA;'"  # Light Cyan for best
-        elif varianta == topsis_vysledky['nejhorsi_varianta']:
-            radek_styl = " style='background-color: #FFEBEE;'"  # Light Red for worst
-            
-        html += f"""
-            <tr{radek_styl}>
-                <td>{poradi}.</td>
-                <td>{varianta}</td>
-                <td style="text-align: right;">{skore:.4f}</td>
-                <td style="text-align: right;">{procento:.1f}%</td>
-            </tr>
-        """
-    
-    html += """
+                {"".join(radky)}
             </tbody>
         </table>
     </div>
     """
-    
-    return html
 
 def vytvor_html_shrnuti_vysledku_topsis(topsis_vysledky):
     """
@@ -1467,22 +1625,23 @@ def vytvor_html_shrnuti_vysledku_topsis(topsis_vysledky):
     
     return html
 
-def vytvor_sekci_vysledku_topsis(topsis_vysledky):
+def vytvor_sekci_vysledku_topsis(topsis_vysledky, max_radku=None):
     """
     Vytvoří HTML sekci s výsledky TOPSIS analýzy.
-    
+
     Args:
         topsis_vysledky: Slovník s výsledky TOPSIS analýzy
-        
+        max_radku: Nejvyšší počet zobrazených variant (None = všechny)
+
     Returns:
         str: HTML kód pro sekci výsledků
     """
     # Tabulka výsledků
-    vysledky_html = vytvor_html_tabulku_vysledku_topsis(topsis_vysledky)
-    
+    vysledky_html = vytvor_html_tabulku_vysledku_topsis(topsis_vysledky, max_radku)
+
     # Shrnutí výsledků
     shrnuti_html = vytvor_html_shrnuti_vysledku_topsis(topsis_vysledky)
-    
+
     # Sloučení do sekce
     return f"""
     <div class="mcapp-section mcapp-results">
@@ -1554,84 +1713,49 @@ def vytvor_html_sekci_metodologie_electre(default_open=True):
     """
 
 
-def vytvor_html_tabulku_concordance_matrix(concordance_matrix, varianty, index_souhlasu):
+def vytvor_html_tabulku_concordance_matrix(concordance_matrix, varianty, index_souhlasu, max_radku=None):
     """
     Vytvoří HTML tabulku zobrazující matici souhlasu metody ELECTRE.
-    
+
     Args:
         concordance_matrix: 2D matice hodnot souhlasu mezi variantami
         varianty: Seznam názvů variant
         index_souhlasu: Prahová hodnota indexu souhlasu
-        
+        max_radku: Nejvyšší počet zobrazených variant (None = všechny)
+
     Returns:
         str: HTML kód tabulky s maticí souhlasu
     """
-    html = """
+    return f"""
     <h3>Matice souhlasu (Concordance matrix)</h3>
     <div class="mcapp-explanation">
         <p>
-            Matice souhlasu vyjadřuje, do jaké míry kritéria podporují tvrzení, že varianta v řádku i je alespoň tak dobrá jako varianta 
+            Matice souhlasu vyjadřuje, do jaké míry kritéria podporují tvrzení, že varianta v řádku i je alespoň tak dobrá jako varianta
             ve sloupci j. Hodnoty blízké 1 znamenají silný souhlas, hodnoty blízké 0 slabý souhlas.
         </p>
     </div>
-    <div class="mcapp-table-container">
-        <table class="mcapp-table mcapp-concordance-table">
-            <thead>
-                <tr>
-                    <th>C(i,j)</th>
-    """
-    
-    for var in varianty:
-        html += f"<th>{var}</th>"
-    
-    html += """
-                </tr>
-            </thead>
-            <tbody>
-    """
-    
-    for i, var_i in enumerate(varianty):
-        html += f"<tr><td><strong>{var_i}</strong></td>"
-        
-        for j, _ in enumerate(varianty):
-            if i == j:
-                # Diagonální prvky jsou vždy "-"
-                html += "<td style='text-align: center;'>-</td>"
-            else:
-                hodnota = concordance_matrix[i][j]
-                buňka_styl = ""
-                if hodnota >= index_souhlasu:
-                    buňka_styl = "background-color: #E0F7FA; font-weight: bold;"  # Světle modrá pro hodnoty nad prahem
-                html += f"<td style='text-align: center; {buňka_styl}'>{hodnota:.3f}</td>"
-                
-        html += "</tr>"
-    
-    html += """
-            </tbody>
-        </table>
-    </div>
+    {_html_tabulka_souhlasu(concordance_matrix, varianty, index_souhlasu, max_radku)}
     <div class="mcapp-note">
         <p>
-            Poznámka: Buňky zvýrazněné světle modrou barvou splňují podmínku C(i,j) ≥ {0}, tedy hodnoty nad prahem souhlasu.
+            Poznámka: Buňky zvýrazněné světle modrou barvou splňují podmínku C(i,j) ≥ {index_souhlasu}, tedy hodnoty nad prahem souhlasu.
         </p>
     </div>
-    """.format(index_souhlasu)
-    
-    return html
+    """
 
-def vytvor_html_tabulku_discordance_matrix(discordance_matrix, varianty, index_nesouhlasu):
+def vytvor_html_tabulku_discordance_matrix(discordance_matrix, varianty, index_nesouhlasu, max_radku=None):
     """
     Vytvoří HTML tabulku zobrazující matici nesouhlasu metody ELECTRE.
-    
+
     Args:
         discordance_matrix: 2D matice hodnot nesouhlasu mezi variantami
         varianty: Seznam názvů variant
         index_nesouhlasu: Prahová hodnota indexu nesouhlasu
-        
+        max_radku: Nejvyšší počet zobrazených variant (None = všechny)
+
     Returns:
         str: HTML kód tabulky s maticí nesouhlasu
     """
-    html = """
+    return f"""
     <h3>Matice nesouhlasu (Discordance matrix)</h3>
     <div class="mcapp-explanation">
         <p>
@@ -1639,63 +1763,27 @@ def vytvor_html_tabulku_discordance_matrix(discordance_matrix, varianty, index_n
             alespoň tak dobrá jako varianta ve sloupci j. Hodnoty blízké 0 znamenají slabý nesouhlas, hodnoty blízké 1 silný nesouhlas.
         </p>
     </div>
-    <div class="mcapp-table-container">
-        <table class="mcapp-table mcapp-discordance-table">
-            <thead>
-                <tr>
-                    <th>D(i,j)</th>
-    """
-    
-    for var in varianty:
-        html += f"<th>{var}</th>"
-    
-    html += """
-                </tr>
-            </thead>
-            <tbody>
-    """
-    
-    for i, var_i in enumerate(varianty):
-        html += f"<tr><td><strong>{var_i}</strong></td>"
-        
-        for j, _ in enumerate(varianty):
-            if i == j:
-                # Diagonální prvky jsou vždy "-"
-                html += "<td style='text-align: center;'>-</td>"
-            else:
-                hodnota = discordance_matrix[i][j]
-                buňka_styl = ""
-                if hodnota <= index_nesouhlasu:
-                    buňka_styl = "background-color: #FFEBEE; font-weight: bold;"  # Světle červená pro hodnoty pod prahem
-                html += f"<td style='text-align: center; {buňka_styl}'>{hodnota:.3f}</td>"
-                
-        html += "</tr>"
-    
-    html += """
-            </tbody>
-        </table>
-    </div>
+    {_html_tabulka_nesouhlasu(discordance_matrix, varianty, index_nesouhlasu, max_radku)}
     <div class="mcapp-note">
         <p>
-            Poznámka: Buňky zvýrazněné světle červenou barvou splňují podmínku D(i,j) ≤ {0}, tedy hodnoty pod prahem nesouhlasu.
+            Poznámka: Buňky zvýrazněné světle červenou barvou splňují podmínku D(i,j) ≤ {index_nesouhlasu}, tedy hodnoty pod prahem nesouhlasu.
         </p>
     </div>
-    """.format(index_nesouhlasu)
-    
-    return html
+    """
 
-def vytvor_html_tabulku_outranking_matrix(outranking_matrix, varianty):
+def vytvor_html_tabulku_outranking_matrix(outranking_matrix, varianty, max_radku=None):
     """
     Vytvoří HTML tabulku zobrazující matici převahy metody ELECTRE.
-    
+
     Args:
         outranking_matrix: 2D binární matice převahy mezi variantami (0/1)
         varianty: Seznam názvů variant
-        
+        max_radku: Nejvyšší počet zobrazených variant (None = všechny)
+
     Returns:
         str: HTML kód tabulky s maticí převahy
     """
-    html = """
+    return f"""
     <h3>Matice převahy (Outranking matrix)</h3>
     <div class="mcapp-explanation">
         <p>
@@ -1704,101 +1792,54 @@ def vytvor_html_tabulku_outranking_matrix(outranking_matrix, varianty):
             hodnota 0 (Ne) znamená, že varianta i nepřevyšuje variantu j.
         </p>
     </div>
-    <div class="mcapp-table-container">
-        <table class="mcapp-table mcapp-outranking-table">
-            <thead>
-                <tr>
-                    <th>O(i,j)</th>
-    """
-    
-    for var in varianty:
-        html += f"<th>{var}</th>"
-    
-    html += """
-                </tr>
-            </thead>
-            <tbody>
-    """
-    
-    for i, var_i in enumerate(varianty):
-        html += f"<tr><td><strong>{var_i}</strong></td>"
-        
-        for j, _ in enumerate(varianty):
-            if i == j:
-                # Diagonální prvky jsou vždy "-"
-                html += "<td style='text-align: center;'>-</td>"
-            else:
-                hodnota = outranking_matrix[i][j]
-                buňka_text = "Ano" if hodnota == 1 else "Ne"
-                buňka_styl = "background-color: #E8F5E9; font-weight: bold;" if hodnota == 1 else ""  # Světle zelená pro 1
-                html += f"<td style='text-align: center; {buňka_styl}'>{buňka_text}</td>"
-                
-        html += "</tr>"
-    
-    html += """
-            </tbody>
-        </table>
-    </div>
+    {_html_tabulka_prevahy(outranking_matrix, varianty, max_radku)}
     """
-    
-    return html
 
-def vytvor_html_net_flow_ranking(net_flows, outranking_matrix, varianty):
+def vytvor_html_net_flow_ranking(net_flows, outranking_matrix, varianty, max_radku=None, souhrn_prevahy=None):
     """
     Vytvoří HTML tabulku zobrazující pořadí variant podle Net Flow Score.
-    
+
     Args:
         net_flows: List trojic (varianta, pořadí, net_flow)
-        outranking_matrix: 2D binární matice převahy
+        outranking_matrix: 2D binární matice převahy (None u velkých analýz)
         varianty: Seznam názvů variant
-        
+        max_radku: Nejvyšší počet zobrazených variant (None = všechny)
+        souhrn_prevahy: Souhrn řídké relace převahy, pokud matice převahy chybí
+
     Returns:
         str: HTML kód tabulky s pořadím variant
     """
-    html = """
-    <h3>Pořadí variant podle Net Flow Score</h3>
-    <div class="mcapp-explanation">
-        <p>
-            Net Flow Score je pro každou variantu vypočítáno jako rozdíl mezi počtem variant, které daná varianta převyšuje,
-            a počtem variant, které převyšují ji. Čím vyšší Net Flow Score, tím lepší je varianta.
-        </p>
-    </div>
-    <div class="mcapp-table-container">
-        <table class="mcapp-table mcapp-results-table">
-            <thead>
-                <tr>
-                    <th>Pořadí</th>
-                    <th>Varianta</th>
-                    <th>Počet převyšovaných variant</th>
-                    <th>Počet variant, které převyšují</th>
-                    <th>Net Flow Score</th>
-                </tr>
-            </thead>
-            <tbody>
-    """
-    
     # Seřazení podle pořadí
     sorted_net_flows = sorted(net_flows, key=lambda x: x[1])
-    
-    for varianta, poradi, score in sorted_net_flows:
-        # Najdeme index varianty v seznamu varianty
-        var_idx = varianty.index(varianta)
-        
-        # Počet variant, které tato varianta převyšuje
-        prevysovane = sum(outranking_matrix[var_idx])
-        
-        # Počet variant, které převyšují tuto variantu
-        prevysujici = sum(outranking_matrix[j][var_idx] for j in range(len(varianty)))
-        
+    zobrazeno = _pocet_zobrazenych(len(sorted_net_flows), max_radku)
+
+    # Index varianty v matici převahy podle názvu
+    index_varianty = {varianta: i for i, varianta in enumerate(varianty)}
+
+    radky = []
+    for varianta, poradi, score in sorted_net_flows[:zobrazeno]:
+        var_idx = index_varianty[varianta]
+
+        if outranking_matrix is None:
+            # Velká analýza - počty jsou spočítané na serveru z řídké relace
+            prevysovane = souhrn_prevahy['prevysuje'][var_idx]
+            prevysujici = souhrn_prevahy['prevysovano'][var_idx]
+        else:
+            # Počet variant, které tato varianta převyšuje
+            prevysovane = sum(outranking_matrix[var_idx])
+
+            # Počet variant, které převyšují tuto variantu
+            prevysujici = sum(radek[var_idx] for radek in outranking_matrix)
+
         radek_styl = ""
-        
+
         # Zvýraznění nejlepší a nejhorší varianty
         if poradi == 1:
             radek_styl = " style='background-color: #E0F7FA;'"  # Světle modrá pro nejlepší
         elif poradi == len(varianty):
             radek_styl = " style='background-color: #FFEBEE;'"  # Světle červená pro nejhorší
-            
-        html += f"""
+
+        radky.append(f"""
             <tr{radek_styl}>
                 <td>{poradi}.</td>
                 <td>{varianta}</td>
@@ -1806,20 +1847,92 @@ def vytvor_html_net_flow_ranking(net_flows, outranking_matrix, varianty):
                 <td style="text-align: center;">{prevysujici}</td>
                 <td style="text-align: right;">{score}</td>
             </tr>
-        """
-    
-    html += """
+        """)
+    if zobrazeno < len(sorted_net_flows):
+        radky.append(_html_radek_vynechanych(zobrazeno, len(sorted_net_flows), 5))
+
+    return f"""
+    <h3>Pořadí variant podle Net Flow Score</h3>
+    <div class="mcapp-explanation">
+        <p>
+            Net Flow Score je pro každou variantu vypočítáno jako rozdíl mezi počtem variant, které daná varianta převyšuje,
+            a počtem variant, které převyšují ji. Čím vyšší Net Flow Score, tím lepší je varianta.
+        </p>
+    </div>
+    <div class="mcapp-table-container">
+        <table class="mcapp-table mcapp-results-table">
+            <thead>
+                <tr>
+                    <th>Pořadí</th>
+                    <th>Varianta</th>
+                    <th>Počet převyšovaných variant</th>
+                    <th>Počet variant, které převyšují</th>
+                    <th>Net Flow Score</th>
+                </tr>
+            </thead>
+            <tbody>
+                {"".join(radky)}
             </tbody>
         </table>
     </div>
     """
-    
-    return html
 
-def vytvor_sekci_postupu_electre(norm_matice, matice, concordance_matrix, discordance_matrix, outranking_matrix, varianty, kriteria, typy_kriterii, index_souhlasu, index_nesouhlasu):
+def _html_souhrn_relace_prevahy(souhrn_prevahy, varianty, index_souhlasu, index_nesouhlasu, max_radku=None):
+    """
+    Vytvoří HTML kroku převahy pro velké analýzy, u kterých server nevrací
+    matice souhlasu, nesouhlasu a převahy, ale jen souhrn řídké relace.
+
+    Args:
+        souhrn_prevahy: Stupně variant, počet relací a podmatice převahy
+                        mezi variantami s nejvyšším Net Flow
+        varianty: Seznam názvů variant
+        index_souhlasu: Prahová hodnota indexu souhlasu
+        index_nesouhlasu: Prahová hodnota indexu nesouhlasu
+        max_radku: Nejvyšší počet zobrazených variant (None = všechny)
+
+    Returns:
+        str: HTML kód kroku
+    """
+    pocet = len(varianty)
+    pocet_dvojic = pocet * (pocet - 1)
+    podil = souhrn_prevahy['pocet_relaci'] / pocet_dvojic if pocet_dvojic else 0.0
+    nejlepsi = [varianty[i] for i in souhrn_prevahy['uzly']]
+
+    return f"""
+    <h3>Relace převahy (Outranking relation)</h3>
+    <div class="mcapp-explanation">
+        <p>
+            Pro {pocet} variant se matice souhlasu, nesouhlasu a převahy (každá {pocet} × {pocet} hodnot)
+            nevypisují. Relace převahy se počítá po blocích variant přímo z normalizované matice:
+        </p>
+        <div class="mcapp-formula-box">
+            <div class="mcapp-formula-row">
+                <span class="mcapp-formula-content">
+                    O(i,j) = 1, pokud C(i,j) ≥ {index_souhlasu:.3f} a D(i,j) ≤ {index_nesouhlasu:.3f}
+                </span>
+            </div>
+            <div class="mcapp-formula-row">
+                <span class="mcapp-formula-content">
+                    O(i,j) = 0, jinak
+                </span>
+            </div>
+        </div>
+        <p>
+            Převaha (Ano) platí u {souhrn_prevahy['pocet_relaci']} z {pocet_dvojic} dvojic variant ({podil:.2%}).
+            Počty převyšovaných a převyšujících variant jsou v tabulce výsledků.
+        </p>
+    </div>
+    <h4>Relace převahy mezi {len(nejlepsi)} variantami s nejvyšším Net Flow</h4>
+    {_html_tabulka_prevahy(souhrn_prevahy['matice'], nejlepsi, max_radku)}
+    """
+
+def vytvor_sekci_postupu_electre(norm_matice, matice, concordance_matrix, discordance_matrix, outranking_matrix, varianty, kriteria, typy_kriterii, index_souhlasu, index_nesouhlasu, max_radku=None, souhrn_prevahy=None):
     """
     Vytvoří HTML sekci s postupem výpočtu ELECTRE.
-    
+
+    U velkých analýz jsou matice souhlasu, nesouhlasu a převahy None
+    a kroky 2 až 4 nahradí souhrn řídké relace převahy.
+
     Args:
         norm_matice: Normalizovaná matice hodnot
         matice: Původní matice hodnot
@@ -1831,19 +1944,39 @@ def vytvor_sekci_postupu_electre(norm_matice, matice, concordance_matrix, discor
         typy_kriterii: Seznam typů kritérií
         index_souhlasu: Prahová hodnota indexu souhlasu
         index_nesouhlasu: Prahová hodnota indexu nesouhlasu
-            
+        max_radku: Nejvyšší počet zobrazených variant (None = všechny)
+        souhrn_prevahy: Souhrn řídké relace převahy (jen u velkých analýz)
+
     Returns:
         str: HTML kód pro sekci postupu výpočtu
     """
     # Krok 1: Normalizace matice
-    normalizace_html = vytvor_html_normalizacni_tabulku_minmax(matice, norm_matice, varianty, kriteria, typy_kriterii)
-    
+    normalizace_html = vytvor_html_normalizacni_tabulku_minmax(matice, norm_matice, varianty, kriteria, typy_kriterii, max_radku)
+
+    if concordance_matrix is None:
+        prevaha_html = _html_souhrn_relace_prevahy(
+            souhrn_prevahy, varianty, index_souhlasu, index_nesouhlasu, max_radku
+        )
+        return f"""
+    <div class="mcapp-section mcapp-process">
+        <h2>Postup zpracování dat</h2>
+        <div class="mcapp-card">
+            <h3>Krok 1: Normalizace rozhodovací matice</h3>
+            {normalizace_html}
+        </div>
+        <div class="mcapp-card">
+            <h3>Krok 2: Výpočet relace převahy</h3>
+            {prevaha_html}
+        </div>
+    </div>
+    """
+
     # Krok 2: Výpočet matice souhlasu
-    concordance_html = """
+    concordance_html = f"""
     <h3>Matice souhlasu (Concordance matrix)</h3>
     <div class="mcapp-explanation">
         <p>
-            Matice souhlasu vyjadřuje, do jaké míry kritéria podporují tvrzení, že varianta v řádku i je alespoň tak dobrá jako varianta 
+            Matice souhlasu vyjadřuje, do jaké míry kritéria podporují tvrzení, že varianta v řádku i je alespoň tak dobrá jako varianta
             ve sloupci j.
         </p>
         <div class="mcapp-formula-box">
@@ -1854,51 +1987,16 @@ def vytvor_sekci_postupu_electre(norm_matice, matice, concordance_matrix, discor
         </div>
         <p>kde K(i,j) je množina kritérií, pro která je varianta i alespoň tak dobrá jako varianta j, a w<sub>k</sub> je váha k-tého kritéria.</p>
     </div>
-    <div class="mcapp-table-container">
-        <table class="mcapp-table mcapp-concordance-table">
-            <thead>
-                <tr>
-                    <th>C(i,j)</th>
-    """
-    
-    for var in varianty:
-        concordance_html += f"<th>{var}</th>"
-    
-    concordance_html += """
-                </tr>
-            </thead>
-            <tbody>
-    """
-    
-    for i, var_i in enumerate(varianty):
-        concordance_html += f"<tr><td><strong>{var_i}</strong></td>"
-        
-        for j, _ in enumerate(varianty):
-            if i == j:
-                # Diagonální prvky jsou vždy "-"
-                concordance_html += "<td style='text-align: center;'>-</td>"
-            else:
-                hodnota = concordance_matrix[i][j]
-                buňka_styl = ""
-                if hodnota >= index_souhlasu:
-                    buňka_styl = "background-color: #E0F7FA; font-weight: bold;"  # Světle modrá pro hodnoty nad prahem
-                concordance_html += f"<td style='text-align: center; {buňka_styl}'>{hodnota:.3f}</td>"
-                
-        concordance_html += "</tr>"
-    
-    concordance_html += f"""
-            </tbody>
-        </table>
-    </div>
+    {_html_tabulka_souhlasu(concordance_matrix, varianty, index_souhlasu, max_radku)}
     <div class="mcapp-note">
         <p>
             Poznámka: Buňky zvýrazněné světle modrou barvou splňují podmínku C(i,j) ≥ {index_souhlasu:.3f}, tedy hodnoty nad prahem souhlasu.
         </p>
     </div>
     """
-    
+
     # Krok 3: Výpočet matice nesouhlasu
-    discordance_html = """
+    discordance_html = f"""
     <h3>Matice nesouhlasu (Discordance matrix)</h3>
     <div class="mcapp-explanation">
         <p>
@@ -1913,51 +2011,16 @@ def vytvor_sekci_postupu_electre(norm_matice, matice, concordance_matrix, discor
         </div>
         <p>kde K'(i,j) je množina kritérií, pro která je varianta j lepší než varianta i, r<sub>ik</sub> je normalizovaná hodnota varianty i pro kritérium k a R je rozsah normalizované škály (typicky 1).</p>
     </div>
-    <div class="mcapp-table-container">
-        <table class="mcapp-table mcapp-discordance-table">
-            <thead>
-                <tr>
-                    <th>D(i,j)</th>
-    """
-    
-    for var in varianty:
-        discordance_html += f"<th>{var}</th>"
-    
-    discordance_html += """
-                </tr>
-            </thead>
-            <tbody>
-    """
-    
-    for i, var_i in enumerate(varianty):
-        discordance_html += f"<tr><td><strong>{var_i}</strong></td>"
-        
-        for j, _ in enumerate(varianty):
-            if i == j:
-                # Diagonální prvky jsou vždy "-"
-                discordance_html += "<td style='text-align: center;'>-</td>"
-            else:
-                hodnota = discordance_matrix[i][j]
-                buňka_styl = ""
-                if hodnota <= index_nesouhlasu:
-                    buňka_styl = "background-color: #FFEBEE; font-weight: bold;"  # Světle červená pro hodnoty pod prahem
-                discordance_html += f"<td style='text-align: center; {buňka_styl}'>{hodnota:.3f}</td>"
-                
-        discordance_html += "</tr>"
-    
-    discordance_html += f"""
-            </tbody>
-        </table>
-    </div>
+    {_html_tabulka_nesouhlasu(discordance_matrix, varianty, index_nesouhlasu, max_radku)}
     <div class="mcapp-note">
         <p>
             Poznámka: Buňky zvýrazněné světle červenou barvou splňují podmínku D(i,j) ≤ {index_nesouhlasu:.3f}, tedy hodnoty pod prahem nesouhlasu.
         </p>
     </div>
     """
-    
+
     # Krok 4: Výpočet matice převahy
-    outranking_html = """
+    outranking_html = f"""
     <h3>Matice převahy (Outranking matrix)</h3>
     <div class="mcapp-explanation">
         <p>
@@ -1968,7 +2031,7 @@ def vytvor_sekci_postupu_electre(norm_matice, matice, concordance_matrix, discor
         <div class="mcapp-formula-box">
             <div class="mcapp-formula-row">
                 <span class="mcapp-formula-content">
-                    O(i,j) = 1, pokud C(i,j) ≥ {0:.3f} a D(i,j) ≤ {1:.3f}
+                    O(i,j) = 1, pokud C(i,j) ≥ {index_souhlasu:.3f} a D(i,j) ≤ {index_nesouhlasu:.3f}
                 </span>
             </div>
             <div class="mcapp-formula-row">
@@ -1978,43 +2041,9 @@ def vytvor_sekci_postupu_electre(norm_matice, matice, concordance_matrix, discor
             </div>
         </div>
     </div>
-    <div class="mcapp-table-container">
-        <table class="mcapp-table mcapp-outranking-table">
-            <thead>
-                <tr>
-                    <th>O(i,j)</th>
-    """.format(index_souhlasu, index_nesouhlasu)
-    
-    for var in varianty:
-        outranking_html += f"<th>{var}</th>"
-    
-    outranking_html += """
-                </tr>
-            </thead>
-            <tbody>
+    {_html_tabulka_prevahy(outranking_matrix, varianty, max_radku)}
     """
-    
-    for i, var_i in enumerate(varianty):
-        outranking_html += f"<tr><td><strong>{var_i}</strong></td>"
-        
-        for j, _ in enumerate(varianty):
-            if i == j:
-                # Diagonální prvky jsou vždy "-"
-                outranking_html += "<td style='text-align: center;'>-</td>"
-            else:
-                hodnota = outranking_matrix[i][j]
-                buňka_text = "Ano" if hodnota == 1 else "Ne"
-                buňka_styl = "background-color: #E8F5E9; font-weight: bold;" if hodnota == 1 else ""  # Světle zelená pro 1
-                outranking_html += f"<td style='text-align: center; {buňka_styl}'>{buňka_text}</td>"
-                
-        outranking_html += "</tr>"
-    
-    outranking_html += """
-            </tbody>
-        </table>
-    </div>
-    """
-    
+
     # Sloučení do sekce
     return f"""
     <div class="mcapp-section mcapp-process">
@@ -2038,26 +2067,29 @@ def vytvor_sekci_postupu_electre(norm_matice, matice, concordance_matrix, discor
     </div>
     """
 
-def vytvor_sekci_vysledku_electre(electre_vysledky, varianty, index_souhlasu, index_nesouhlasu):
+def vytvor_sekci_vysledku_electre(electre_vysledky, varianty, index_souhlasu, index_nesouhlasu, max_radku=None):
     """
     Vytvoří HTML sekci s výsledky ELECTRE analýzy.
-    
+
     Args:
         electre_vysledky: Slovník s výsledky ELECTRE analýzy
         varianty: Seznam názvů variant
         index_souhlasu: Prahová hodnota indexu souhlasu
         index_nesouhlasu: Prahová hodnota indexu nesouhlasu
-        
+        max_radku: Nejvyšší počet zobrazených variant (None = všechny)
+
     Returns:
         str: HTML kód pro sekci výsledků
     """
     # Tabulka pořadí variant podle Net Flow
     net_flow_html = vytvor_html_net_flow_ranking(
-        electre_vysledky["results"], 
-        electre_vysledky["outranking_matrix"], 
-        varianty
+        electre_vysledky["results"],
+        electre_vysledky["outranking_matrix"],
+        varianty,
+        max_radku,
+        electre_vysledky.get("souhrn_prevahy")
     )
-    
+
     # Sloučení do sekce
     return f"""
     <div class="mcapp-section mcapp-results">
@@ -2068,21 +2100,28 @@ def vytvor_sekci_vysledku_electre(electre_vysledky, varianty, index_souhlasu, in
     </div>
     """
 
-def vytvor_html_normalizacni_tabulku_minmax(matice, norm_matice, varianty, kriteria, typy_kriterii):
+def vytvor_html_normalizacni_tabulku_minmax(matice, norm_matice, varianty, kriteria, typy_kriterii, max_radku=None):
     """
     Vytvoří HTML tabulku s normalizovanými hodnotami pomocí min-max normalizace.
-    
+
     Args:
         matice: Původní 2D matice hodnot
         norm_matice: Normalizovaná 2D matice hodnot
         varianty: Seznam názvů variant
         kriteria: Seznam názvů kritérií
         typy_kriterii: Seznam typů kritérií (max/min)
-        
+        max_radku: Nejvyšší počet zobrazených variant (None = všechny)
+
     Returns:
         str: HTML kód s vysvětlením normalizace a tabulkou hodnot
     """
-    html = """
+    zahlavi = "".join(f"<th>{krit} ({typy_kriterii[j].upper()})</th>" for j, krit in enumerate(kriteria))
+    radky = _html_radky_variant(
+        varianty, norm_matice, ".3f", max_radku,
+        styl_bunky=lambda hodnota: "text-align: right;", tucne_nazvy=True
+    )
+
+    return f"""
     <div class="mcapp-explanation">
         <h4>Normalizace hodnot metodou Min-Max</h4>
         <p>
@@ -2104,36 +2143,21 @@ def vytvor_html_normalizacni_tabulku_minmax(matice, norm_matice, varianty, krite
             kritéria napříč všemi variantami a max<sub>i</sub>(x<sub>ij</sub>) je největší hodnota j-tého kritéria napříč všemi variantami.
         </p>
     </div>
-    
+
     <div class="mcapp-table-container">
         <table class="mcapp-table mcapp-normalized-table">
             <thead>
                 <tr>
                     <th>Varianta / Kritérium</th>
-    """
-    
-    for j, krit in enumerate(kriteria):
-        html += f"<th>{krit} ({typy_kriterii[j].upper()})</th>"
-    
-    html += """
+                    {zahlavi}
                 </tr>
             </thead>
             <tbody>
-    """
-    
-    for i, var in enumerate(varianty):
-        html += f"<tr><td><strong>{var}</strong></td>"
-        for j in range(len(kriteria)):
-            html += f"<td style='text-align: right;'>{norm_matice[i][j]:.3f}</td>"
-        html += "</tr>"
-    
-    html += """
+                {radky}
             </tbody>
         </table>
     </div>
     """
-    
-    return html
 
 def vytvor_html_sekci_metodologie_mabac(default_open=True):
     """
@@ -2203,10 +2227,10 @@ def vytvor_html_sekci_metodologie_mabac(default_open=True):
     </div>
     """
 
-def vytvor_sekci_postupu_mabac(norm_matice, vazena_matice, g_values, q_matrix, vahy, varianty, kriteria, typy_kriterii):
+def vytvor_sekci_postupu_mabac(norm_matice, vazena_matice, g_values, q_matrix, vahy, varianty, kriteria, typy_kriterii, max_radku=None):
     """
     Vytvoří HTML sekci s postupem výpočtu MABAC.
-    
+
     Args:
         norm_matice: 2D list s normalizovanými hodnotami
         vazena_matice: 2D list s váženými hodnotami
@@ -2216,25 +2240,26 @@ def vytvor_sekci_postupu_mabac(norm_matice, vazena_matice, g_values, q_matrix, v
         varianty: Seznam názvů variant
         kriteria: Seznam názvů kritérií
         typy_kriterii: Seznam typů kritérií (max/min)
-            
+        max_radku: Nejvyšší počet zobrazených variant (None = všechny)
+
     Returns:
         str: HTML kód pro sekci postupu výpočtu
     """
     # Normalizační tabulka
     normalizace_html = vytvor_html_normalizacni_tabulku_minmax(
-        norm_matice, vazena_matice, varianty, kriteria, typy_kriterii)
-    
+        norm_matice, vazena_matice, varianty, kriteria, typy_kriterii, max_radku)
+
     # Tabulka vah kritérií
     vahy_html = vytvor_html_tabulku_vah(vahy, kriteria)
-    
+
     # Tabulka vážených hodnot
-    vazene_html = vytvor_html_tabulku_vazenych_hodnot_mabac(vazena_matice, varianty, kriteria)
-    
+    vazene_html = vytvor_html_tabulku_vazenych_hodnot_mabac(vazena_matice, varianty, kriteria, max_radku)
+
     # Tabulka hraničních hodnot
     g_html = vytvor_html_tabulku_g_hodnot(g_values, kriteria)
-    
+
     # Tabulka vzdáleností od hranic (Q)
-    q_html = vytvor_html_tabulku_q_hodnot(q_matrix, varianty, kriteria)
+    q_html = vytvor_html_tabulku_q_hodnot(q_matrix, varianty, kriteria, max_radku)
 
     # Sloučení do sekce
     return f"""
@@ -2260,19 +2285,23 @@ def vytvor_sekci_postupu_mabac(norm_matice, vazena_matice, g_values, q_matrix, v
     </div>
     """
 
-def vytvor_html_tabulku_vazenych_hodnot_mabac(vazena_matice, varianty, kriteria):
+def vytvor_html_tabulku_vazenych_hodnot_mabac(vazena_matice, varianty, kriteria, max_radku=None):
     """
     Vytvoří HTML tabulku s váženými hodnotami pro MABAC.
-    
+
     Args:
         vazena_matice: 2D list s váženými hodnotami [varianty][kriteria]
         varianty: Seznam názvů variant
         kriteria: Seznam názvů kritérií
-        
+        max_radku: Nejvyšší počet zobrazených variant (None = všechny)
+
     Returns:
         str: HTML kód tabulky s váženými hodnotami
     """
-    html = """
+    zahlavi = "".join(f"<th>{krit}</th>" for krit in kriteria)
+    radky = _html_radky_variant(varianty, vazena_matice, ".3f", max_radku)
+
+    return f"""
     <h3>Vážená normalizovaná matice (V)</h3>
     <div class="mcapp-explanation">
         <p>
@@ -2290,43 +2319,31 @@ def vytvor_html_tabulku_vazenych_hodnot_mabac(vazena_matice, varianty, kriteria)
             <thead>
                 <tr>
                     <th>Varianta / Kritérium</th>
-    """
-    
-    for krit in kriteria:
-        html += f"<th>{krit}</th>"
-    
-    html += """
+                    {zahlavi}
                 </tr>
             </thead>
             <tbody>
-    """
-    
-    for i, var in enumerate(varianty):
-        html += f"<tr><td>{var}</td>"
-        for j in range(len(kriteria)):
-            html += f"<td>{vazena_matice[i][j]:.3f}</td>"
-        html += "</tr>"
-    
-    html += """
+                {radky}
             </tbody>
         </table>
     </div>
     """
-    
-    return html
 
 def vytvor_html_tabulku_g_hodnot(g_values, kriteria):
     """
     Vytvoří HTML tabulku s hraničními hodnotami pro každé kritérium.
-    
+
     Args:
         g_values: Seznam hraničních hodnot pro každé kritérium
         kriteria: Seznam názvů kritérií
-        
+
     Returns:
         str: HTML kód tabulky s hraničními hodnotami
     """
-    html = """
+    zahlavi = "".join(f"<th>{krit}</th>" for krit in kriteria)
+    bunky = _html_bunky(g_values[:len(kriteria)], ".4f")
+
+    return f"""
     <h3>Hraniční aproximační prostor (G)</h3>
     <div class="mcapp-explanation">
         <p>
@@ -2344,44 +2361,46 @@ def vytvor_html_tabulku_g_hodnot(g_values, kriteria):
             <thead>
                 <tr>
                     <th>Parametr</th>
-    """
-    
-    for krit in kriteria:
-        html += f"<th>{krit}</th>"
-    
-    html += """
+                    {zahlavi}
                 </tr>
             </thead>
             <tbody>
                 <tr>
                     <td><strong>Hraniční hodnota (G)</strong></td>
-    """
-    
-    for j in range(len(kriteria)):
-        html += f"<td>{g_values[j]:.4f}</td>"
-    
-    html += """
+                    {bunky}
                 </tr>
             </tbody>
         </table>
     </div>
     """
-    
-    return html
 
-def vytvor_html_tabulku_q_hodnot(q_matrix, varianty, kriteria):
+def _styl_q_hodnoty(hodnota):
+    """Vrátí barvu buňky podle interpretace vzdálenosti q od hraničního prostoru."""
+    if hodnota > 0:
+        return "background-color:#E0F7FA;"  # Světle modrá pro hodnoty v horní oblasti (G+)
+    if hodnota < 0:
+        return "background-color:#FFEBEE;"  # Světle červená pro hodnoty v dolní oblasti (G-)
+    return "background-color:#E8F5E9;"  # Světle zelená pro hodnoty v hraničním prostoru (G)
+
+def vytvor_html_tabulku_q_hodnot(q_matrix, varianty, kriteria, max_radku=None):
     """
     Vytvoří HTML tabulku se vzdálenostmi od hraničního prostoru a celkovým skóre.
-    
+
     Args:
         q_matrix: 2D list vzdáleností od hraničního prostoru [varianty][kriteria]
         varianty: Seznam názvů variant
         kriteria: Seznam názvů kritérií
-        
+        max_radku: Nejvyšší počet zobrazených variant (None = všechny)
+
     Returns:
         str: HTML kód tabulky se vzdálenostmi a celkovým skóre
     """
-    html = """
+    zahlavi = "".join(f"<th>{krit}</th>" for krit in kriteria)
+    # Celkové skóre je součtem vzdáleností v řádku
+    sumy = [sum(radek) for radek in q_matrix]
+    radky = _html_radky_variant(varianty, q_matrix, ".4f", max_radku, celkem=sumy, styl_bunky=_styl_q_hodnoty)
+
+    return f"""
     <h3>Matice vzdáleností (Q) a celkové skóre</h3>
     <div class="mcapp-explanation">
         <p>
@@ -2415,45 +2434,12 @@ def vytvor_html_tabulku_q_hodnot(q_matrix, varianty, kriteria):
             <thead>
                 <tr>
                     <th>Varianta / Kritérium</th>
-    """
-    
-    for krit in kriteria:
-        html += f"<th>{krit}</th>"
-    
-    html += "<th style='background-color:#f0f0f0; font-weight:bold;'>Celkové skóre</th>"
-    
-    html += """
+                    {zahlavi}
+                    <th style='background-color:#f0f0f0; font-weight:bold;'>Celkové skóre</th>
                 </tr>
             </thead>
             <tbody>
-    """
-    
-    for i, var in enumerate(varianty):
-        html += f"<tr><td>{var}</td>"
-        
-        # Výpočet celkového skóre pro řádek
-        suma = sum(q_matrix[i])
-        
-        for j in range(len(kriteria)):
-            hodnota = q_matrix[i][j]
-            
-            # Přidání barvy buňky podle interpretace hodnoty q
-            if hodnota > 0:
-                barva = "#E0F7FA"  # Světle modrá pro hodnoty v horní oblasti (G+)
-                html += f"<td style='background-color:{barva};'>{hodnota:.4f}</td>"
-            elif hodnota < 0:
-                barva = "#FFEBEE"  # Světle červená pro hodnoty v dolní oblasti (G-)
-                html += f"<td style='background-color:{barva};'>{hodnota:.4f}</td>"
-            else:
-                barva = "#E8F5E9"  # Světle zelená pro hodnoty v hraničním prostoru (G)
-                html += f"<td style='background-color:{barva};'>{hodnota:.4f}</td>"
-        
-        # Přidání celkového skóre
-        html += f"<td style='background-color:#f0f0f0; font-weight:bold; text-align:right;'>{suma:.4f}</td>"
-        
-        html += "</tr>"
-    
-    html += """
+                {radky}
             </tbody>
         </table>
     </div>
@@ -2466,20 +2452,50 @@ def vytvor_html_tabulku_q_hodnot(q_matrix, varianty, kriteria):
         </ul>
     </div>
     """
-    
-    return html
 
-def vytvor_html_tabulku_vysledku_mabac(mabac_vysledky):
+def vytvor_html_tabulku_vysledku_mabac(mabac_vysledky, max_radku=None):
     """
     Vytvoří HTML tabulku s výsledky MABAC analýzy včetně procenta z maxima a počtu kritérií v G+ a G-.
-    
+
     Args:
         mabac_vysledky: Slovník s výsledky MABAC analýzy
-        
+        max_radku: Nejvyšší počet zobrazených variant (None = všechny)
+
     Returns:
         str: HTML kód tabulky s výsledky
     """
-    html = """
+    max_skore = mabac_vysledky['nejlepsi_skore']
+    q_matrix = mabac_vysledky['q_matrix']
+
+    # Vytvoření mapování z názvu varianty na index v q_matrix
+    varianta_na_index = {varianta: i for i, (varianta, _, _) in enumerate(mabac_vysledky['results'])}
+
+    serazene = sorted(mabac_vysledky['results'], key=lambda x: x[1])
+    zobrazeno = _pocet_zobrazenych(len(serazene), max_radku)
+
+    radky = []
+    for varianta, poradi, skore in serazene[:zobrazeno]:
+        procento = (skore / max_skore) * 100 if max_skore > 0 else 0
+
+        # Spočítání kritérií v G+ (q > 0) a G- (q < 0)
+        q_radek = q_matrix[varianta_na_index.get(varianta, 0)]
+        gplus_count = sum(1 for q in q_radek if q > 0)
+        gminus_count = sum(1 for q in q_radek if q < 0)
+
+        radky.append(f"""
+            <tr{_styl_radku_poradi(varianta, mabac_vysledky)}>
+                <td>{poradi}.</td>
+                <td>{varianta}</td>
+                <td style="text-align: right;">{skore:.3f}</td>
+                <td style="text-align: right;">{procento:.1f}%</td>
+                <td style="text-align: center;">{gplus_count}</td>
+                <td style="text-align: center;">{gminus_count}</td>
+            </tr>
+        """)
+    if zobrazeno < len(serazene):
+        radky.append(_html_radek_vynechanych(zobrazeno, len(serazene), 6))
+
+    return f"""
     <h3>Pořadí variant</h3>
     <div class="mcapp-table-container">
         <table class="mcapp-table mcapp-results-table">
@@ -2494,68 +2510,29 @@ def vytvor_html_tabulku_vysledku_mabac(mabac_vysledky):
                 </tr>
             </thead>
             <tbody>
-    """
-    
-    max_skore = mabac_vysledky['nejlepsi_skore']
-    q_matrix = mabac_vysledky['q_matrix']
-    
-    # Vytvoření mapování z názvu varianty na index v q_matrix
-    varianta_na_index = {}
-    for i, (varianta, poradi, skore) in enumerate(mabac_vysledky['results']):
-        varianta_na_index[varianta] = i
-    
-    for varianta, poradi, skore in sorted(mabac_vysledky['results'], key=lambda x: x[1]):
-        procento = (skore / max_skore) * 100 if max_skore > 0 else 0
-        radek_styl = ""
-        
-        # Získání indexu varianty v q_matrix
-        idx = varianta_na_index.get(varianta, 0)
-        
-        # Spočítání kritérií v G+ (q > 0) a G- (q < 0)
-        gplus_count = sum(1 for q in q_matrix[idx] if q > 0)
-        gminus_count = sum(1 for q in q_matrix[idx] if q < 0)
-        
-        # Zvýraznění nejlepší a nejhorší varianty
-        if varianta == mabac_vysledky['nejlepsi_varianta']:
-            radek_styl = " style='background-color: #E0F7FA;'"  # Light Cyan for best
-        elif varianta == mabac_vysledky['nejhorsi_varianta']:
-            radek_styl = " style='background-color: #FFEBEE;'"  # Light Red for worst
-            
-        html += f"""
-            <tr{radek_styl}>
-                <td>{poradi}.</td>
-                <td>{varianta}</td>
-                <td style="text-align: right;">{skore:.3f}</td>
-                <td style="text-align: right;">{procento:.1f}%</td>
-                <td style="text-align: center;">{gplus_count}</td>
-                <td style="text-align: center;">{gminus_count}</td>
-            </tr>
-        """
-    
-    html += """
+                {"".join(radky)}
             </tbody>
         </table>
     </div>
     """
-    
-    return html
 
-def vytvor_sekci_vysledku_mabac(mabac_vysledky):
+def vytvor_sekci_vysledku_mabac(mabac_vysledky, max_radku=None):
     """
     Vytvoří HTML sekci s výsledky MABAC analýzy.
-    
+
     Args:
         mabac_vysledky: Slovník s výsledky MABAC analýzy
-        
+        max_radku: Nejvyšší počet zobrazených variant (None = všechny)
+
     Returns:
         str: HTML kód pro sekci výsledků
     """
     # Tabulka výsledků
-    vysledky_html = vytvor_html_tabulku_vysledku_mabac(mabac_vysledky)
-    
+    vysledky_html = vytvor_html_tabulku_vysledku_mabac(mabac_vysledky, max_radku)
+
     # Shrnutí výsledků
     shrnuti_html = vytvor_html_shrnuti_vysledku_rozsirene(mabac_vysledky)
-    
+
     # Sloučení do sekce
     return f"""
     <div class="mcapp-section mcapp-results">
@@ -0,0 +1,418 @@
+# -------------------------------------------------------
+# Modul: Inkrementalni_vypocty
+# Přírůstkový přepočet výsledků při úpravách analýzy.
+#
+# Stav drží rozhodovací matici, statistiky sloupců (min, max, součet
+# čtverců), skóre WSM a příspěvky sloupců ke vzdálenostem TOPSIS.
+# Změna jedné hodnoty, váhy nebo typu kritéria přepočítá nejvýše jeden
+# sloupec (O(varianty)), přidání a odebrání varianty jen dotčené
+# sloupce. Úplný přepočet se provede jen tehdy, když změna zneplatní
+# extrém sloupce (původní min/max se posune dovnitř nebo se odebere
+# varianta, která jej držela), a preventivně po MAX_POCET_PRIRUSTKU
+# přírůstcích, aby se neakumulovala zaokrouhlovací chyba součtů.
+#
+# Modul nepoužívá klientské importy, takže jej lze použít na klientovi
+# (Spravce_stavu) i na serveru.
+# -------------------------------------------------------
+
+from . import Normalizace, Rozhodovaci_matice
+
+# Počet přírůstkových změn, po kterém se součty přepočítají znovu
+MAX_POCET_PRIRUSTKU = 1000
+
+# Součty čtverců vzdáleností TOPSIS menší než tento podíl největšího
+# možného součtu se při výpisu výsledků sečtou znovu z příspěvků sloupců
+PRAH_PRESNEHO_SOUCTU = 1e-6
+
+def _na_cislo(hodnota):
+    """Převede hodnotu na float stejně jako Rozhodovaci_matice (nečíselná hodnota = 0)."""
+    try:
+        return float(hodnota)
+    except (ValueError, TypeError):
+        return 0.0
+
+def _serad_vysledky(varianty, skore):
+    """
+    Seřadí varianty podle skóre sestupně do stejné struktury,
+    jakou vrací wsm_vypocet a topsis_vypocet ve Vypocty.
+    """
+    serazene = sorted(zip(varianty, skore), key=lambda x: x[1], reverse=True)
+    results = [(varianta, poradi, hodnota) for poradi, (varianta, hodnota) in enumerate(serazene, 1)]
+    if not results:
+        return {'results': []}
+
+    nejlepsi_var, _, nejlepsi_skore = results[0]
+    nejhorsi_var, _, nejhorsi_skore = results[-1]
+    return {
+        'results': results,
+        'nejlepsi_varianta': nejlepsi_var,
+        'nejlepsi_skore': nejlepsi_skore,
+        'nejhorsi_varianta': nejhorsi_var,
+        'nejhorsi_skore': nejhorsi_skore,
+        'rozdil_skore': nejlepsi_skore - nejhorsi_skore
+    }
+
+class Inkrementalni_stav:
+    """
+    Poslední spočítaný stav analýzy, na který se aplikují změny.
+
+    Skóre WSM odpovídá vypocitej_wsm_analyzu a relativní blízkost
+    TOPSIS odpovídá vypocitej_topsis_analyzu (až na zaokrouhlení
+    při jiném pořadí sčítání).
+    """
+
+    def __init__(self, rozhodovaci_matice):
+        """
+        Args:
+            rozhodovaci_matice: Rozhodovaci_matice s výchozími daty analýzy
+        """
+        self.varianty = list(rozhodovaci_matice.varianty)
+        self.kriteria = list(rozhodovaci_matice.kriteria)
+        self.typy_kriterii = list(rozhodovaci_matice.typy_kriterii)
+        self.vahy = list(rozhodovaci_matice.vahy)
+        # Vlastní kopie řádků - stav je mění na místě
+        self.radky = [list(radek) for radek in rozhodovaci_matice.jako_seznam()]
+        self.index_variant = {nazev: i for i, nazev in enumerate(self.varianty)}
+        self.index_kriterii = {nazev: j for j, nazev in enumerate(self.kriteria)}
+        self.pocet_prirustku = 0
+        self.pocet_uplnych_prepoctu = 0
+        self._prepocitej_vse()
+
+    @classmethod
+    def z_json(cls, analyza_data):
+        """
+        Sestaví stav z JSON struktury analýzy.
+
+        Raises:
+            ValueError: Pokud data nelze převést na matici
+        """
+        return cls(Rozhodovaci_matice.Rozhodovaci_matice.z_json(analyza_data))
+
+    # === Úplný přepočet ===
+
+    def _prepocitej_vse(self):
+        """Spočítá statistiky sloupců, skóre WSM i součty TOPSIS znovu od začátku."""
+        pocet_variant = len(self.varianty)
+        pocet_kriterii = len(self.kriteria)
+        statistiky = Normalizace.vypocitej_statistiky_sloupcu(self.radky)
+        self.minima = statistiky['min'] or [0.0] * pocet_kriterii
+        self.maxima = statistiky['max'] or [0.0] * pocet_kriterii
+        self.soucty_ctvercu = statistiky['soucet_ctvercu'] or [0.0] * pocet_kriterii
+
+        self.wsm_skore = [0.0] * pocet_variant
+        self.topsis_ideal = [0.0] * pocet_variant
+        self.topsis_anti_ideal = [0.0] * pocet_variant
+        self._topsis_sloupce = [None] * pocet_kriterii
+        for j in range(pocet_kriterii):
+            vazene = self._wsm_sloupec(j)
+            for i in range(pocet_variant):
+                self.wsm_skore[i] += vazene[i]
+            self._prepocitej_topsis_sloupec(j)
+
+        self.pocet_prirustku = 0
+        self.pocet_uplnych_prepoctu += 1
+
+    def _zapocitej_prirustek(self):
+        """Po MAX_POCET_PRIRUSTKU změnách přepočítá součty znovu."""
+        self.pocet_prirustku += 1
+        if self.pocet_prirustku >= MAX_POCET_PRIRUSTKU:
+            self._prepocitej_vse()
+
+    # === Příspěvky sloupců ===
+
+    def _normalizuj(self, j, hodnota):
+        """Min-max normalizace jedné hodnoty sloupce j (jako Normalizace.normalizuj_minmax)."""
+        min_val = self.minima[j]
+        max_val = self.maxima[j]
+        if max_val == min_val:
+            return 1.0
+        if Normalizace.je_minimalizacni(self.typy_kriterii[j]):
+            return (max_val - hodnota) / (max_val - min_val)
+        return (hodnota - min_val) / (max_val - min_val)
+
+    def _wsm_sloupec(self, j):
+        """Vrátí vážené normalizované hodnoty sloupce j pro všechny varianty."""
+        vaha = self.vahy[j]
+        return [self._normalizuj(j, radek[j]) * vaha for radek in self.radky]
+
+    def _prepocitej_wsm_sloupec(self, j, stare_vazene):
+        """Nahradí příspěvky sloupce j ve skóre WSM novými hodnotami."""
+        nove_vazene = self._wsm_sloupec(j)
+        for i in range(len(self.varianty)):
+            self.wsm_skore[i] += nove_vazene[i] - stare_vazene[i]
+
+    def _topsis_parametry(self, j):
+        """
+        Vrátí měřítko sloupce j (váha / norma) a surové hodnoty ideálu
+        a anti-ideálu. Vážená normalizovaná hodnota je hodnota * měřítko,
+        takže ideál leží v min/max sloupce a čtverec vzdálenosti od něj
+        je ((hodnota - ideal) * meritko) ** 2.
+        """
+        norma = self.soucty_ctvercu[j] ** 0.5
+        meritko = self.vahy[j] / norma if norma != 0 else 0.0
+        maximalizacni = not Normalizace.je_minimalizacni(self.typy_kriterii[j])
+        if maximalizacni == (meritko >= 0):
+            return meritko, self.maxima[j], self.minima[j]
+        return meritko, self.minima[j], self.maxima[j]
+
+    def _prepocitej_topsis_sloupec(self, j):
+        """
+        Přepočítá čtverce vzdáleností sloupce j od ideálního a anti-ideálního
+        řešení a promítne rozdíl do součtů.
+        """
+        meritko, ideal, anti_ideal = self._topsis_parametry(j)
+        nove_ideal = [((radek[j] - ideal) * meritko) ** 2 for radek in self.radky]
+        nove_anti_ideal = [((radek[j] - anti_ideal) * meritko) ** 2 for radek in self.radky]
+
+        if self._topsis_sloupce[j] is None:
+            soucty_ideal = self.topsis_ideal
+            soucty_anti_ideal = self.topsis_anti_ideal
+            for i in range(len(self.radky)):
+                soucty_ideal[i] += nove_ideal[i]
+                soucty_anti_ideal[i] += nove_anti_ideal[i]
+        else:
+            stare_ideal, stare_anti_ideal = self._topsis_sloupce[j]
+            self.topsis_ideal = [
+                soucet + nova - stara
+                for soucet, nova, stara in zip(self.topsis_ideal, nove_ideal, stare_ideal)
+            ]
+            self.topsis_anti_ideal = [
+                soucet + nova - stara
+                for soucet, nova, stara in zip(self.topsis_anti_ideal, nove_anti_ideal, stare_anti_ideal)
+            ]
+        self._topsis_sloupce[j] = (nove_ideal, nove_anti_ideal)
+
+    def _nejvetsi_soucet_topsis(self):
+        """Vrátí největší možný čtverec vzdálenosti TOPSIS (součet čtverců rozpětí sloupců)."""
+        soucet = 0.0
+        for j in range(len(self.kriteria)):
+            meritko, _, _ = self._topsis_parametry(j)
+            soucet += ((self.maxima[j] - self.minima[j]) * meritko) ** 2
+        return soucet
+
+    def _presny_soucet_topsis(self, i, k):
+        """Sečte příspěvky sloupců varianty i (k = 0 ideál, k = 1 anti-ideál)."""
+        return sum(sloupec[k][i] for sloupec in self._topsis_sloupce)
+
+    # === Změny ===
+
+    def zmen_hodnotu(self, varianta, kriterium, hodnota):
+        """
+        Změní jednu hodnotu matice.
+
+        Args:
+            varianta: Název varianty
+            kriterium: Název kritéria
+            hodnota: Nová hodnota (nečíselná se uloží jako 0)
+
+        Raises:
+            KeyError: Pokud varianta nebo kritérium neexistuje
+        """
+        i = self.index_variant[varianta]
+        j = self.index_kriterii[kriterium]
+        hodnota = _na_cislo(hodnota)
+        stara = self.radky[i][j]
+        if hodnota == stara:
+            return
+
+        # Extrém sloupce se posouvá dovnitř - nový extrém nelze určit bez průchodu
+        if (stara == self.minima[j] and hodnota > stara) or (stara == self.maxima[j] and hodnota < stara):
+            self.radky[i][j] = hodnota
+            self._prepocitej_vse()
+            return
+
+        self.soucty_ctvercu[j] += hodnota ** 2 - stara ** 2
+
+        if hodnota < self.minima[j] or hodnota > self.maxima[j]:
+            # Rozšíření rozsahu sloupce mění normalizaci celého sloupce
+            stare_vazene = self._wsm_sloupec(j)
+            self.radky[i][j] = hodnota
+            self.minima[j] = min(self.minima[j], hodnota)
+            self.maxima[j] = max(self.maxima[j], hodnota)
+            self._prepocitej_wsm_sloupec(j, stare_vazene)
+        else:
+            self.radky[i][j] = hodnota
+            self.wsm_skore[i] += (self._normalizuj(j, hodnota) - self._normalizuj(j, stara)) * self.vahy[j]
+
+        self._prepocitej_topsis_sloupec(j)
+        self._zapocitej_prirustek()
+
+    def zmen_kriterium(self, kriterium, typ=None, vaha=None):
+        """
+        Změní typ a/nebo váhu kritéria.
+
+        Args:
+            kriterium: Název kritéria
+            typ: Nový typ ("max" nebo "min"), None = beze změny
+            vaha: Nová váha, None = beze změny
+
+        Raises:
+            KeyError: Pokud kritérium neexistuje
+        """
+        j = self.index_kriterii[kriterium]
+        stare_vazene = self._wsm_sloupec(j)
+        if typ is not None:
+            self.typy_kriterii[j] = typ
+        if vaha is not None:
+            self.vahy[j] = _na_cislo(vaha)
+
+        self._prepocitej_wsm_sloupec(j, stare_vazene)
+        self._prepocitej_topsis_sloupec(j)
+        self._zapocitej_prirustek()
+
+    def pridej_variantu(self, varianta, hodnoty=None):
+        """
+        Přidá variantu na konec matice.
+
+        Args:
+            varianta: Název nové varianty
+            hodnoty: Slovník {kritérium: hodnota}; chybějící hodnoty jsou 0
+
+        Raises:
+            ValueError: Pokud varianta již existuje
+        """
+        if varianta in self.index_variant:
+            raise ValueError(f"Varianta {varianta} již existuje")
+
+        hodnoty = hodnoty or {}
+        radek = [_na_cislo(hodnoty[k]) if k in hodnoty else 0.0 for k in self.kriteria]
+        self.index_variant[varianta] = len(self.varianty)
+        self.varianty.append(varianta)
+
+        if len(self.radky) == 0:
+            self.radky.append(radek)
+            self._prepocitej_vse()
+            return
+
+        self.radky.append(radek)
+        self.wsm_skore.append(0.0)
+        self.topsis_ideal.append(0.0)
+        self.topsis_anti_ideal.append(0.0)
+
+        for j, hodnota in enumerate(radek):
+            self.soucty_ctvercu[j] += hodnota ** 2
+            rozsireni = hodnota < self.minima[j] or hodnota > self.maxima[j]
+            if rozsireni:
+                # Nový řádek zatím nemá ve skóre žádný příspěvek
+                stare_vazene = self._wsm_sloupec(j)
+                stare_vazene[-1] = 0.0
+                self.minima[j] = min(self.minima[j], hodnota)
+                self.maxima[j] = max(self.maxima[j], hodnota)
+                self._prepocitej_wsm_sloupec(j, stare_vazene)
+            else:
+                self.wsm_skore[-1] += self._normalizuj(j, hodnota) * self.vahy[j]
+
+            stare_ideal, stare_anti_ideal = self._topsis_sloupce[j]
+            if rozsireni or hodnota != 0:
+                # Změna extrému nebo normy mění TOPSIS celého sloupce
+                stare_ideal.append(0.0)
+                stare_anti_ideal.append(0.0)
+                self._prepocitej_topsis_sloupec(j)
+            else:
+                meritko, ideal, anti_ideal = self._topsis_parametry(j)
+                stare_ideal.append(((hodnota - ideal) * meritko) ** 2)
+                stare_anti_ideal.append(((hodnota - anti_ideal) * meritko) ** 2)
+                self.topsis_ideal[-1] += stare_ideal[-1]
+                self.topsis_anti_ideal[-1] += stare_anti_ideal[-1]
+
+        self._zapocitej_prirustek()
+
+    def odeber_variantu(self, varianta):
+        """
+        Odebere variantu z matice.
+
+        Raises:
+            KeyError: Pokud varianta neexistuje
+        """
+        i = self.index_variant[varianta]
+        radek = self.radky[i]
+        drzi_extrem = any(
+            hodnota == self.minima[j] or hodnota == self.maxima[j]
+            for j, hodnota in enumerate(radek)
+        )
+
+        del self.varianty[i]
+        del self.radky[i]
+        self.index_variant = {nazev: k for k, nazev in enumerate(self.varianty)}
+
+        if drzi_extrem:
+            self._prepocitej_vse()
+            return
+
+        del self.wsm_skore[i]
+        del self.topsis_ideal[i]
+        del self.topsis_anti_ideal[i]
+        for j, hodnota in enumerate(radek):
+            del self._topsis_sloupce[j][0][i]
+            del self._topsis_sloupce[j][1][i]
+            if hodnota != 0:
+                # Změna normy sloupce mění vektorovou normalizaci celého sloupce
+                self.soucty_ctvercu[j] -= hodnota ** 2
+                self._prepocitej_topsis_sloupec(j)
+
+        self._zapocitej_prirustek()
+
+    def prejmenuj_variantu(self, stary_nazev, novy_nazev):
+        """
+        Přejmenuje variantu bez přepočtu.
+
+        Raises:
+            KeyError: Pokud varianta neexistuje
+        """
+        if stary_nazev == novy_nazev:
+            return
+        i = self.index_variant.pop(stary_nazev)
+        self.varianty[i] = novy_nazev
+        self.index_variant[novy_nazev] = i
+
+    # === Výsledky ===
+
+    def vysledky_wsm(self):
+        """
+        Vrátí výsledky WSM ve struktuře 'wsm_vysledky' z vypocitej_wsm_analyzu.
+        """
+        return _serad_vysledky(self.varianty, self.wsm_skore)
+
+    def vysledky_topsis(self):
+        """
+        Vrátí pořadí TOPSIS podle relativní blízkosti k ideálnímu řešení.
+
+        Returns:
+            dict: 'results' a nejlepší/nejhorší varianta jako v topsis_vypocet
+                  a seznam 'relativni_blizkost' v pořadí variant
+        """
+        # Součty nesou zaokrouhlovací chybu přírůstků úměrnou největšímu
+        # možnému součtu. U malých součtů by ji odmocnina zvětšila
+        # (1e-16 na 1e-8), proto se sečtou znovu z příspěvků sloupců.
+        prah = PRAH_PRESNEHO_SOUCTU * self._nejvetsi_soucet_topsis()
+        relativni_blizkost = []
+        for i, (soucet_ideal, soucet_anti_ideal) in enumerate(zip(self.topsis_ideal, self.topsis_anti_ideal)):
+            if soucet_ideal <= prah:
+                soucet_ideal = self._presny_soucet_topsis(i, 0)
+            if soucet_anti_ideal <= prah:
+                soucet_anti_ideal = self._presny_soucet_topsis(i, 1)
+            # Zaokrouhlením přírůstků může součet klesnout těsně pod nulu
+            dist_ideal = max(soucet_ideal, 0.0) ** 0.5
+            dist_anti_ideal = max(soucet_anti_ideal, 0.0) ** 0.5
+            jmenovatel = dist_ideal + dist_anti_ideal
+            relativni_blizkost.append(dist_anti_ideal / jmenovatel if jmenovatel != 0 else 0)
+
+        vysledek = _serad_vysledky(self.varianty, relativni_blizkost)
+        vysledek['relativni_blizkost'] = relativni_blizkost
+        return vysledek
+
+    def vysledky(self):
+        """
+        Vrátí aktuální výsledky všech přírůstkově udržovaných metod.
+
+        Returns:
+            dict: {'wsm': ..., 'topsis': ..., 'pocet_variant', 'pocet_prirustku',
+                   'pocet_uplnych_prepoctu'}
+        """
+        return {
+            'wsm': self.vysledky_wsm(),
+            'topsis': self.vysledky_topsis(),
+            'pocet_variant': len(self.varianty),
+            'pocet_prirustku': self.pocet_prirustku,
+            'pocet_uplnych_prepoctu': self.pocet_uplnych_prepoctu
+        }
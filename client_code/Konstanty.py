@@ -27,6 +27,10 @@ METODA_ANALYZY = {
     'MABAC': 'MABAC',
 }
 
+# Výsledky metod se ve výstupních formulářích počítají na serveru
+# (False = záložní výpočet v prohlížeči přes modul Vypocty)
+VYPOCET_NA_SERVERU = True
+
 # Typy kritérií
 TYP_KRITERIA = {
     'MAXIMALIZACNI': 'max',
@@ -57,6 +61,9 @@ ZPRAVY_CHYB = {
     'NEPLATNA_VAHA': 'Váha musí být číslo mezi 0 a 1.',
     'NEPLATNA_HODNOTA': 'Neplatná hodnota pro variantu {} a kritérium {}.',
     
+    # Souběžné úpravy (text shodný s CRUD_analyzy._over_verzi)
+    'KONFLIKT_VERZE': 'Analýzu mezitím uložil jiný uživatel nebo okno.',
+    
     # Potvrzovací zprávy
     'POTVRZENI_SMAZANI': 'Opravdu chcete odstranit tuto analýzu?',
     'POTVRZENI_ZRUSENI_NOVE': 'Opustíte rozpracovanou analýzu a data budou smazána. Pokračovat?',
@@ -0,0 +1,196 @@
+# -------------------------------------------------------
+# Modul: Normalizace
+# Sdílená normalizační vrstva pro všechny metody analýzy.
+#
+# Statistiky sloupců (min, max, součet, součet čtverců) se spočítají
+# jedním průchodem maticí a z nich se odvodí všechny normalizace
+# v lineárním čase. Modul nepoužívá klientské importy, takže jej
+# sdílí klient (Vypocty) i server (Export).
+# -------------------------------------------------------
+
+# Počet matic, jejichž statistiky se drží v cache
+MAX_POCET_V_CACHE = 8
+
+# Cache statistik jako seznam dvojic (matice, statistiky).
+# Porovnává se identitou objektu matice, proto se matice po výpočtu
+# statistik nesmí měnit na místě.
+_cache_statistik = []
+
+def vypocitej_statistiky_sloupcu(matice):
+    """
+    Spočítá statistiky všech sloupců matice jedním průchodem.
+
+    Args:
+        matice: 2D list s hodnotami [varianty][kriteria]
+
+    Returns:
+        dict: Slovník se seznamy 'min', 'max', 'soucet', 'soucet_ctvercu'
+              a počtem řádků 'pocet'
+    """
+    if not matice:
+        return {'min': [], 'max': [], 'soucet': [], 'soucet_ctvercu': [], 'pocet': 0}
+
+    prvni = matice[0]
+    minima = list(prvni)
+    maxima = list(prvni)
+    soucty = [0] * len(prvni)
+    soucty_ctvercu = [0] * len(prvni)
+
+    for radek in matice:
+        for j, hodnota in enumerate(radek):
+            if hodnota < minima[j]:
+                minima[j] = hodnota
+            elif hodnota > maxima[j]:
+                maxima[j] = hodnota
+            soucty[j] += hodnota
+            soucty_ctvercu[j] += hodnota ** 2
+
+    return {
+        'min': minima,
+        'max': maxima,
+        'soucet': soucty,
+        'soucet_ctvercu': soucty_ctvercu,
+        'pocet': len(matice)
+    }
+
+def ziskej_statistiky_sloupcu(matice):
+    """
+    Vrátí statistiky sloupců z cache, případně je spočítá a uloží.
+
+    Args:
+        matice: 2D list s hodnotami [varianty][kriteria]
+
+    Returns:
+        dict: Statistiky sloupců (viz vypocitej_statistiky_sloupcu)
+    """
+    for ulozena_matice, statistiky in _cache_statistik:
+        if ulozena_matice is matice:
+            return statistiky
+
+    statistiky = vypocitej_statistiky_sloupcu(matice)
+    _cache_statistik.insert(0, (matice, statistiky))
+    del _cache_statistik[MAX_POCET_V_CACHE:]
+    return statistiky
+
+def vycisti_cache():
+    """Vyprázdní cache statistik sloupců."""
+    del _cache_statistik[:]
+
+def je_minimalizacni(typ_kriteria):
+    """Zjistí, zda je kritérium minimalizační (nákladové)."""
+    return typ_kriteria.lower() in ("min", "cost")
+
+def normalizuj_minmax(matice, typy_kriterii, statistiky=None):
+    """
+    Provede min-max normalizaci. U MIN kritérií je normalizace obrácená,
+    sloupec se shodnými hodnotami dostane hodnotu 1.0.
+
+    Args:
+        matice: 2D list s hodnotami [varianty][kriteria]
+        typy_kriterii: List typů kritérií ("max" nebo "min")
+        statistiky: Předpočítané statistiky sloupců (volitelné)
+
+    Returns:
+        2D list normalizovaných hodnot
+    """
+    statistiky = statistiky or ziskej_statistiky_sloupcu(matice)
+    minima = statistiky['min']
+    maxima = statistiky['max']
+    pocet_kriterii = len(minima)
+    minimalizacni = [je_minimalizacni(typy_kriterii[j]) for j in range(pocet_kriterii)]
+
+    norm_matice = []
+    for radek in matice:
+        norm_radek = []
+        for j in range(pocet_kriterii):
+            min_val = minima[j]
+            max_val = maxima[j]
+            if max_val == min_val:
+                norm_radek.append(1.0)
+            elif minimalizacni[j]:
+                norm_radek.append((max_val - radek[j]) / (max_val - min_val))
+            else:
+                norm_radek.append((radek[j] - min_val) / (max_val - min_val))
+        norm_matice.append(norm_radek)
+    return norm_matice
+
+def vypocitej_vektorove_normy(matice, statistiky=None):
+    """
+    Vrátí Euklidovské normy sloupců (odmocniny součtů čtverců).
+
+    Args:
+        matice: 2D list s hodnotami [varianty][kriteria]
+        statistiky: Předpočítané statistiky sloupců (volitelné)
+
+    Returns:
+        list: Norma pro každé kritérium
+    """
+    statistiky = statistiky or ziskej_statistiky_sloupcu(matice)
+    return [soucet ** 0.5 for soucet in statistiky['soucet_ctvercu']]
+
+def normalizuj_vektorove(matice, statistiky=None):
+    """
+    Provede vektorovou (Euklidovskou) normalizaci používanou v metodě TOPSIS.
+    Sloupec s nulovou normou dostane hodnoty 0.
+
+    Args:
+        matice: 2D list s hodnotami [varianty][kriteria]
+        statistiky: Předpočítané statistiky sloupců (volitelné)
+
+    Returns:
+        2D list normalizovaných hodnot
+    """
+    normy = vypocitej_vektorove_normy(matice, statistiky)
+    return [
+        [hodnota / normy[j] if normy[j] != 0 else 0 for j, hodnota in enumerate(radek)]
+        for radek in matice
+    ]
+
+def normalizuj_souctem(matice, statistiky=None):
+    """
+    Provede normalizaci součtem sloupce (podíl hodnoty na součtu sloupce).
+    Sloupec s nulovým součtem dostane hodnoty 0.
+
+    Args:
+        matice: 2D list s hodnotami [varianty][kriteria]
+        statistiky: Předpočítané statistiky sloupců (volitelné)
+
+    Returns:
+        2D list normalizovaných hodnot
+    """
+    statistiky = statistiky or ziskej_statistiky_sloupcu(matice)
+    soucty = statistiky['soucet']
+    return [
+        [hodnota / soucty[j] if soucty[j] != 0 else 0 for j, hodnota in enumerate(radek)]
+        for radek in matice
+    ]
+
+def normalizuj_maximem(matice, typy_kriterii, statistiky=None):
+    """
+    Provede lineární normalizaci maximem: x / max pro MAX kritéria
+    a min / x pro MIN kritéria. Při nulovém jmenovateli vrací 0.
+
+    Args:
+        matice: 2D list s hodnotami [varianty][kriteria]
+        typy_kriterii: List typů kritérií ("max" nebo "min")
+        statistiky: Předpočítané statistiky sloupců (volitelné)
+
+    Returns:
+        2D list normalizovaných hodnot
+    """
+    statistiky = statistiky or ziskej_statistiky_sloupcu(matice)
+    minima = statistiky['min']
+    maxima = statistiky['max']
+    pocet_kriterii = len(minima)
+    minimalizacni = [je_minimalizacni(typy_kriterii[j]) for j in range(pocet_kriterii)]
+
+    norm_matice = []
+    for radek in matice:
+        norm_radek = []
+        for j in range(pocet_kriterii):
+            if minimalizacni[j]:
+                norm_radek.append(minima[j] / radek[j] if radek[j] != 0 else 0)
+            else:
+                norm_radek.append(radek[j] / maxima[j] if maxima[j] != 0 else 0)
+        norm_matice.append(norm_radek)
+    return norm_matice
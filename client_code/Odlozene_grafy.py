@@ -0,0 +1,148 @@
+# -------------------------------------------------------
+# Modul: Odlozene_grafy
+# Odložené vytváření grafů ve výstupních formulářích.
+#
+# Formulář při zobrazení výsledků grafy nesestavuje, jen pro každý
+# zaregistruje funkci, která vrací jeho figure. Funkce se zavolá, až se
+# komponenta grafu poprvé přiblíží viditelné části stránky (sleduje to
+# IntersectionObserver prohlížeče), nebo až uživatel rozbalí sekci,
+# do které graf patří. Vytvořené figures i mezivýsledky sdílené více
+# grafy si formulář pamatuje, dokud nenačte nová data.
+# -------------------------------------------------------
+from . import Utils
+
+try:
+    from anvil.js import window as _okno, get_dom_node as _dom_uzel, new as _novy
+except ImportError:
+    # Mimo prohlížeč - grafy se vytvářejí hned při registraci
+    _okno = None
+
+# O kolik pixelů dřív, než se graf objeví na obrazovce, se začne vytvářet
+PREDSTIH_PX = 300
+
+def _trida_pozorovatele():
+    """Vrátí třídu IntersectionObserver, pokud ji prohlížeč podporuje, jinak None."""
+    if _okno is None:
+        return None
+    return getattr(_okno, 'IntersectionObserver', None)
+
+class Odlozene_grafy:
+    """
+    Registr odložených grafů jednoho výstupního formuláře.
+
+    Každý graf se registruje pod názvem spolu s komponentou Plot, funkcí
+    vracející figure a volitelně sekcí, která je zpočátku sbalená.
+    Každý graf se sestaví nejvýše jednou, dokud formulář nezavolá vycisti().
+    """
+
+    def __init__(self):
+        self._grafy = {}         # název -> (plot, tvůrce, sekce)
+        self._figures = {}       # název -> vytvořená figure
+        self._mezivysledky = {}  # název -> výsledek sdíleného výpočtu
+        self._pozorovatele = {}  # název -> IntersectionObserver
+        self._rozbalene = set()
+
+    def vycisti(self):
+        """Zapomene zaregistrované grafy i zapamatované výsledky (před načtením nových dat)."""
+        for pozorovatel in self._pozorovatele.values():
+            pozorovatel.disconnect()
+        self._pozorovatele = {}
+        self._grafy = {}
+        self._figures = {}
+        self._mezivysledky = {}
+
+    def pridej(self, nazev, plot, tvurce, sekce=None):
+        """
+        Zaregistruje odložený graf.
+
+        Args:
+            nazev: Název grafu, jedinečný v rámci formuláře
+            plot: Komponenta Plot, do které se figure vykreslí
+            tvurce: Funkce bez argumentů vracející Plotly figure
+            sekce: Název sbalitelné sekce (None = graf se zobrazí hned)
+        """
+        self._grafy[nazev] = (plot, tvurce, sekce)
+        viditelny = sekce is None or sekce in self._rozbalene
+        plot.visible = viditelny
+        if viditelny:
+            self._sleduj(nazev)
+
+    def je_rozbalena(self, sekce):
+        """Vrátí True, pokud je sekce rozbalená."""
+        return sekce in self._rozbalene
+
+    def rozbal(self, sekce):
+        """Zobrazí grafy sekce. Vytvoří se, jakmile se dostanou k viditelné části stránky."""
+        self._rozbalene.add(sekce)
+        for nazev, (plot, _, sekce_grafu) in list(self._grafy.items()):
+            if sekce_grafu == sekce:
+                plot.visible = True
+                self._sleduj(nazev)
+
+    def sbal(self, sekce):
+        """Skryje grafy sekce. Už vytvořené figures zůstanou zapamatované."""
+        self._rozbalene.discard(sekce)
+        for nazev, (plot, _, sekce_grafu) in self._grafy.items():
+            if sekce_grafu == sekce:
+                plot.visible = False
+                self._prestan_sledovat(nazev)
+
+    def mezivysledek(self, nazev, vypocet):
+        """
+        Vrátí výsledek výpočtu sdíleného více grafy, při prvním volání ho spočítá.
+
+        Args:
+            nazev: Název mezivýsledku, jedinečný v rámci formuláře
+            vypocet: Funkce bez argumentů vracející mezivýsledek
+
+        Returns:
+            Zapamatovaný výsledek funkce vypocet
+        """
+        if nazev not in self._mezivysledky:
+            self._mezivysledky[nazev] = vypocet()
+        return self._mezivysledky[nazev]
+
+    def vytvor(self, nazev):
+        """Vykreslí graf, při prvním volání ho vytvoří. Při chybě graf skryje."""
+        if nazev not in self._grafy:
+            return
+        self._prestan_sledovat(nazev)
+        plot, tvurce, _ = self._grafy[nazev]
+        if nazev not in self._figures:
+            try:
+                self._figures[nazev] = tvurce()
+            except Exception as e:
+                Utils.zapsat_chybu(f"Chyba při vytváření grafu '{nazev}': {str(e)}")
+                plot.visible = False
+                return
+        plot.figure = self._figures[nazev]
+
+    def obnov(self, nazev):
+        """Zahodí zapamatovanou figure grafu a vytvoří ji znovu, pokud už byla vytvořena."""
+        if self._figures.pop(nazev, None) is not None:
+            self.vytvor(nazev)
+
+    def _sleduj(self, nazev):
+        """Začne sledovat viditelnost grafu, bez podpory v prohlížeči graf vytvoří hned."""
+        if nazev in self._figures or nazev in self._pozorovatele:
+            return
+        trida = _trida_pozorovatele()
+        if trida is None:
+            self.vytvor(nazev)
+            return
+
+        def pri_zmene(zaznamy, *args):
+            for zaznam in zaznamy:
+                if zaznam.isIntersecting:
+                    self.vytvor(nazev)
+                    return
+
+        pozorovatel = _novy(trida, pri_zmene, {'rootMargin': f"{PREDSTIH_PX}px"})
+        pozorovatel.observe(_dom_uzel(self._grafy[nazev][0]))
+        self._pozorovatele[nazev] = pozorovatel
+
+    def _prestan_sledovat(self, nazev):
+        """Ukončí sledování viditelnosti grafu."""
+        pozorovatel = self._pozorovatele.pop(nazev, None)
+        if pozorovatel is not None:
+            pozorovatel.disconnect()
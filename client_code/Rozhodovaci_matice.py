@@ -0,0 +1,171 @@
+# -------------------------------------------------------
+# Modul: Rozhodovaci_matice
+# Sdílená reprezentace rozhodovací matice analýzy.
+#
+# Matice se z JSON dat analýzy sestaví jen jednou (jeden průchod
+# slovníky a jedno volání float() na buňku) a dál ji konzumují
+# všechny metody, analýza citlivosti i exporty. Hodnoty se drží
+# v souvislém poli array('d') po řádcích, na serveru je k dispozici
+# i NumPy pohled bez kopírování dat. Modul nepoužívá klientské
+# importy, takže jej sdílí klient (Vypocty) i server (Export).
+# -------------------------------------------------------
+
+try:
+    from array import array
+except ImportError:
+    # Prostředí bez modulu array (klient v prohlížeči) - hodnoty drží seznam
+    array = None
+
+from . import Normalizace
+
+class Rozhodovaci_matice:
+    """
+    Rozhodovací matice [varianty x kriteria] s vahami a typy kritérií.
+
+    Hodnoty jsou uložené po řádcích v jednom souvislém poli. Seznamová
+    podoba matice pro Pythonové výpočty, statistiky sloupců a NumPy pohled
+    se vytvářejí líně a ukládají se, takže je sdílí všechny metody.
+    Matice se po vytvoření nemá měnit.
+    """
+
+    __slots__ = (
+        'varianty', 'kriteria', 'typy_kriterii', 'vahy', 'hodnoty',
+        'index_variant', 'index_kriterii',
+        '_radky', '_statistiky', '_numpy'
+    )
+
+    def __init__(self, varianty, kriteria, typy_kriterii, vahy, hodnoty):
+        """
+        Args:
+            varianty: List názvů variant
+            kriteria: List názvů kritérií
+            typy_kriterii: List typů kritérií ("max" nebo "min")
+            vahy: List vah kritérií
+            hodnoty: Hodnoty matice po řádcích (délka varianty x kriteria)
+
+        Raises:
+            ValueError: Pokud počet hodnot neodpovídá rozměrům matice
+        """
+        if len(hodnoty) != len(varianty) * len(kriteria):
+            raise ValueError(
+                f"Počet hodnot ({len(hodnoty)}) neodpovídá rozměrům matice "
+                f"{len(varianty)} x {len(kriteria)}"
+            )
+
+        self.varianty = list(varianty)
+        self.kriteria = list(kriteria)
+        self.typy_kriterii = list(typy_kriterii)
+        self.vahy = [float(v) for v in vahy]
+        self.hodnoty = array('d', hodnoty) if array is not None else [float(h) for h in hodnoty]
+        self.index_variant = {nazev: i for i, nazev in enumerate(self.varianty)}
+        self.index_kriterii = {nazev: j for j, nazev in enumerate(self.kriteria)}
+        self._radky = None
+        self._statistiky = None
+        self._numpy = None
+
+    @classmethod
+    def z_json(cls, analyza_data):
+        """
+        Sestaví rozhodovací matici z JSON struktury analýzy.
+        Chybějící nebo nečíselná hodnota se uloží jako 0.
+
+        Args:
+            analyza_data: Slovník s daty analýzy
+
+        Returns:
+            Rozhodovaci_matice: Nová rozhodovací matice
+
+        Raises:
+            ValueError: Pokud data nelze převést na matici
+        """
+        try:
+            kriteria_dict = analyza_data.get('kriteria', {})
+            kriteria = list(kriteria_dict.keys())
+            typy_kriterii = [kriteria_dict[k]['typ'] for k in kriteria]
+            vahy = [float(kriteria_dict[k]['vaha']) for k in kriteria]
+
+            varianty_dict = analyza_data.get('varianty', {})
+            varianty = list(varianty_dict.keys())
+
+            hodnoty = []
+            for var_nazev in varianty:
+                var_data = varianty_dict[var_nazev]
+                for krit_nazev in kriteria:
+                    hodnota = 0
+                    if krit_nazev in var_data and krit_nazev != "popis_varianty":
+                        try:
+                            hodnota = float(var_data[krit_nazev])
+                        except (ValueError, TypeError):
+                            hodnota = 0
+                    hodnoty.append(hodnota)
+
+            return cls(varianty, kriteria, typy_kriterii, vahy, hodnoty)
+
+        except Exception as e:
+            raise ValueError(f"Chyba při přípravě dat pro výpočet: {str(e)}")
+
+    @property
+    def pocet_variant(self):
+        return len(self.varianty)
+
+    @property
+    def pocet_kriterii(self):
+        return len(self.kriteria)
+
+    def hodnota(self, varianta, kriterium):
+        """
+        Vrátí hodnotu buňky podle názvu varianty a kritéria.
+
+        Raises:
+            KeyError: Pokud varianta nebo kritérium neexistuje
+        """
+        i = self.index_variant[varianta]
+        j = self.index_kriterii[kriterium]
+        return self.hodnoty[i * len(self.kriteria) + j]
+
+    def radek(self, i):
+        """Vrátí hodnoty i-té varianty jako list."""
+        n = len(self.kriteria)
+        return list(self.hodnoty[i * n:(i + 1) * n])
+
+    def jako_seznam(self):
+        """
+        Vrátí matici jako 2D list [varianty][kriteria].
+        Seznam se vytvoří jen jednou a sdílí jej všechny metody,
+        proto jej volající nesmí měnit.
+        """
+        if self._radky is None:
+            self._radky = [self.radek(i) for i in range(len(self.varianty))]
+        return self._radky
+
+    def jako_data(self):
+        """
+        Vrátí matici ve tvaru, který používají výpočetní funkce.
+
+        Returns:
+            tuple: (matice, typy_kriterii, varianty, kriteria, vahy)
+        """
+        return self.jako_seznam(), self.typy_kriterii, self.varianty, self.kriteria, self.vahy
+
+    def statistiky_sloupcu(self):
+        """Vrátí statistiky sloupců (min, max, součty) spočítané jedním průchodem."""
+        if self._statistiky is None:
+            self._statistiky = Normalizace.ziskej_statistiky_sloupcu(self.jako_seznam())
+        return self._statistiky
+
+    def jako_numpy(self):
+        """
+        Vrátí matici jako NumPy pole float64 [varianty x kriteria].
+        Pole sdílí paměť s uloženými hodnotami a je pouze pro čtení.
+        Dostupné jen tam, kde je nainstalovaný NumPy (serverový kód).
+        """
+        if self._numpy is None:
+            import numpy as np
+            if array is not None:
+                pole = np.frombuffer(self.hodnoty, dtype=np.float64)
+            else:
+                pole = np.array(self.hodnoty, dtype=np.float64)
+            pole = pole.reshape(len(self.varianty), len(self.kriteria))
+            pole.flags.writeable = False
+            self._numpy = pole
+        return self._numpy
@@ -0,0 +1,56 @@
+# -------------------------------------------------------
+# Modul: Sledovani_uloh
+# Zadání úlohy na pozadí (serverový modul Ulohy) a čekání na její
+# dokončení s průběžným hlášením postupu.
+#
+# Stav se zjišťuje dotazováním serveru v intervalu INTERVAL_DOTAZU_S.
+# Volání jsou tichá (call_s), aby se během čekání nezobrazoval
+# globální indikátor načítání, a time.sleep v prohlížeči neblokuje
+# vykreslování formuláře.
+# -------------------------------------------------------
+import time
+import anvil.server
+from . import Utils
+
+# Interval dotazování na stav úlohy v sekundách
+INTERVAL_DOTAZU_S = 1
+
+# Nejdelší doba čekání na dokončení úlohy v sekundách
+MAX_CEKANI_S = 30 * 60
+
+def spust_a_cekej(typ, parametry, pri_postupu=None):
+    """
+    Zadá úlohu na pozadí a počká na její výsledek.
+
+    Args:
+        typ: Typ úlohy ('excel', 'pdf', 'monte_carlo', 'zip', 'smazani_uzivatelu')
+        parametry: Slovník parametrů úlohy včetně 'analyza_id'
+                   (u typu 'zip' 'analyza_ids', u 'smazani_uzivatelu' 'emaily')
+        pri_postupu: Funkce (postup, zprava) volaná při každé změně stavu,
+                     postup je číslo 0-1 (volitelné)
+
+    Returns:
+        Media se souborem, nebo slovník u výpočetních úloh
+
+    Raises:
+        ValueError: Pokud úloha skončí chybou nebo nestihne doběhnout
+    """
+    uloha_id = anvil.server.call('zadej_ulohu', typ, parametry)
+    Utils.zapsat_info(f"Zadána úloha {uloha_id} ({typ})")
+
+    zacatek = time.time()
+    posledni = None
+    while True:
+        stav = anvil.server.call_s('nacti_stav_ulohy', uloha_id)
+        if pri_postupu and (stav['postup'], stav['zprava']) != posledni:
+            posledni = (stav['postup'], stav['zprava'])
+            pri_postupu(stav['postup'], stav['zprava'])
+
+        if stav['stav'] == 'hotovo':
+            return anvil.server.call_s('stahni_vysledek_ulohy', uloha_id)
+        if stav['stav'] == 'chyba':
+            raise ValueError(stav['chyba'] or "Úloha skončila chybou")
+        if time.time() - zacatek > MAX_CEKANI_S:
+            raise ValueError("Úloha nestihla doběhnout, výsledek bude později k dispozici v seznamu úloh")
+
+        time.sleep(INTERVAL_DOTAZU_S)
@@ -4,7 +4,14 @@
 
 import anvil.server
 import anvil.users
-from . import Utils, Konstanty
+from . import Utils, Konstanty, Inkrementalni_vypocty
+
+def je_konflikt_verze(chyba):
+    """
+    Vrátí True, pokud chyba ze serveru hlásí konflikt verzí analýzy
+    (CRUD_analyzy._over_verzi, text Konstanty.ZPRAVY_CHYB['KONFLIKT_VERZE']).
+    """
+    return Konstanty.ZPRAVY_CHYB['KONFLIKT_VERZE'] in str(chyba)
 
 class Spravce_stavu:
     """
@@ -49,6 +56,14 @@ class Spravce_stavu:
 
         # Metoda stanovení vah
         self._metoda_stanoveni_vah = 'manual'
+
+        # Přírůstkově udržované výsledky (sestaví se až při prvním dotazu)
+        self._inkrementalni_stav = None
+        
+        # Verze analýzy načtené ze serveru a změny provedené od jejího načtení
+        # (uloží se jako částečná úprava místo celých dat)
+        self._verze_analyzy = None
+        self._zmeny = []
         
         Utils.zapsat_info("Spravce_stavu inicializován s novou strukturou dat")
     
@@ -123,6 +138,10 @@ class Spravce_stavu:
             analyza_id (str): ID analýzy
             rezim_upravy (bool): Zda je analýza v režimu úprav
         """
+        if analyza_id != self._aktivni_analyza_id:
+            self._inkrementalni_stav = None
+            self._verze_analyzy = None
+            self._zmeny = []
         self._aktivni_analyza_id = analyza_id
         self._rezim_upravy = rezim_upravy
         Utils.zapsat_info(f"Aktivní analýza nastavena: {analyza_id}, režim úprav: {rezim_upravy}")
@@ -136,6 +155,24 @@ class Spravce_stavu:
         """
         return self._aktivni_analyza_id
     
+    def nastav_verzi_analyzy(self, verze):
+        """
+        Nastaví verzi analýzy načtené ze serveru. Od této chvíle se úpravy
+        zaznamenávají jako změny a uloží se částečnou úpravou.
+        
+        Args:
+            verze (int): Verze analýzy vrácená serverem
+        """
+        self._verze_analyzy = verze
+        self._zmeny = []
+    
+    def _zaznamenej_zmenu(self, **zmena):
+        """
+        Zaznamená změnu dat pro částečné uložení (jen u analýzy načtené ze serveru).
+        """
+        if self._verze_analyzy is not None:
+            self._zmeny.append(zmena)
+    
     def je_rezim_upravy(self):
         """
         Zjistí, zda je analýza v režimu úprav.
@@ -177,6 +214,9 @@ class Spravce_stavu:
             "kriteria": {},
             "varianty": {}
         }
+        self._inkrementalni_stav = None
+        self._verze_analyzy = None
+        self._zmeny = []
         Utils.zapsat_info("Data analýzy vyčištěna")
     
     # === Metody pro práci s daty analýzy ===
@@ -189,6 +229,8 @@ class Spravce_stavu:
             nazev (str): Název analýzy
             popis (str): Popis analýzy
         """
+        if popis != self._data_analyzy.get("popis_analyzy"):
+            self._zaznamenej_zmenu(operace="nastav_popis_analyzy", popis_analyzy=popis)
         self._data_analyzy["nazev"] = nazev
         self._data_analyzy["popis_analyzy"] = popis
         Utils.zapsat_info(f"Uložena základní data analýzy: {nazev}")
@@ -202,10 +244,14 @@ class Spravce_stavu:
             typ (str): Typ kritéria (max nebo min)
             vaha (float): Váha kritéria
         """
+        if self._data_analyzy["kriteria"].get(nazev_kriteria) != {"typ": typ, "vaha": vaha}:
+            self._zaznamenej_zmenu(operace="nastav_kriterium", kriterium=nazev_kriteria, typ=typ, vaha=vaha)
         self._data_analyzy["kriteria"][nazev_kriteria] = {
             "typ": typ,
             "vaha": vaha
         }
+        # Změna struktury matice - stav se při dalším dotazu sestaví znovu
+        self._inkrementalni_stav = None
         Utils.zapsat_info(f"Přidáno kritérium: {nazev_kriteria}")
     
     def uprav_kriterium(self, stary_nazev, novy_nazev, typ, vaha):
@@ -218,12 +264,19 @@ class Spravce_stavu:
             typ (str): Typ kritéria (max nebo min)
             vaha (float): Váha kritéria
         """
+        if stary_nazev != novy_nazev:
+            self._zaznamenej_zmenu(operace="prejmenuj_kriterium", puvodni=stary_nazev, novy=novy_nazev)
+        if self._data_analyzy["kriteria"].get(stary_nazev) != {"typ": typ, "vaha": vaha}:
+            self._zaznamenej_zmenu(operace="nastav_kriterium", kriterium=novy_nazev, typ=typ, vaha=vaha)
+        
         # Pokud se název nezměnil, jen aktualizujeme
         if stary_nazev == novy_nazev:
             self._data_analyzy["kriteria"][novy_nazev] = {
                 "typ": typ,
                 "vaha": vaha
             }
+            if self._inkrementalni_stav is not None:
+                self._inkrementalni_stav.zmen_kriterium(novy_nazev, typ, vaha)
         else:
             # Jinak vytvoříme nové a smažeme staré
             self._data_analyzy["kriteria"][novy_nazev] = {
@@ -238,6 +291,7 @@ class Spravce_stavu:
                     hodnota = var_data[stary_nazev]
                     var_data[novy_nazev] = hodnota
                     del var_data[stary_nazev]
+            self._inkrementalni_stav = None
         
         Utils.zapsat_info(f"Upraveno kritérium: {novy_nazev}")
     
@@ -249,12 +303,14 @@ class Spravce_stavu:
             nazev_kriteria (str): Název kritéria k odstranění
         """
         if nazev_kriteria in self._data_analyzy["kriteria"]:
+            self._zaznamenej_zmenu(operace="odeber_kriterium", kriterium=nazev_kriteria)
             del self._data_analyzy["kriteria"][nazev_kriteria]
             
             # Odstraníme kritérium i ze všech variant
             for nazev_var, var_data in self._data_analyzy["varianty"].items():
                 if nazev_kriteria in var_data:
                     del var_data[nazev_kriteria]
+            self._inkrementalni_stav = None
                     
             Utils.zapsat_info(f"Smazáno kritérium: {nazev_kriteria}")
     
@@ -267,6 +323,13 @@ class Spravce_stavu:
             popis_varianty (str): Popis varianty
         """
         varianta = {"popis_varianty": popis_varianty}
+        self._zaznamenej_zmenu(operace="pridej_variantu", varianta=nazev_varianty, popis_varianty=popis_varianty)
+        if self._inkrementalni_stav is not None:
+            if nazev_varianty in self._data_analyzy["varianty"]:
+                # Přepsání existující varianty - stav se sestaví znovu
+                self._inkrementalni_stav = None
+            else:
+                self._inkrementalni_stav.pridej_variantu(nazev_varianty)
         self._data_analyzy["varianty"][nazev_varianty] = varianta
         Utils.zapsat_info(f"Přidána varianta: {nazev_varianty}")
     
@@ -282,14 +345,31 @@ class Spravce_stavu:
         # Získáme původní data varianty
         if stary_nazev in self._data_analyzy["varianty"]:
             var_data = self._data_analyzy["varianty"][stary_nazev].copy()
+            if stary_nazev != novy_nazev:
+                self._zaznamenej_zmenu(operace="prejmenuj_variantu", puvodni=stary_nazev, novy=novy_nazev)
+            if var_data.get("popis_varianty") != popis_varianty:
+                self._zaznamenej_zmenu(operace="nastav_popis_varianty", varianta=novy_nazev, popis_varianty=popis_varianty)
             
             # Aktualizujeme popis
             var_data["popis_varianty"] = popis_varianty
             
             # Pokud se název změnil, vytvoříme novou a smažeme starou
             if stary_nazev != novy_nazev:
-                self._data_analyzy["varianty"][novy_nazev] = var_data
-                del self._data_analyzy["varianty"][stary_nazev]
+                if self._inkrementalni_stav is not None:
+                    if novy_nazev in self._data_analyzy["varianty"]:
+                        self._inkrementalni_stav = None
+                    else:
+                        self._inkrementalni_stav.prejmenuj_variantu(stary_nazev, novy_nazev)
+                # Slovník se sestaví znovu, aby varianta zůstala na svém místě
+                # (stejně jako operace prejmenuj_variantu na serveru)
+                varianty = self._data_analyzy["varianty"]
+                polozky = [(nazev, data) for nazev, data in varianty.items() if nazev != novy_nazev]
+                varianty.clear()
+                for nazev, data in polozky:
+                    if nazev == stary_nazev:
+                        varianty[novy_nazev] = var_data
+                    else:
+                        varianty[nazev] = data
             else:
                 # Jinak jen aktualizujeme
                 self._data_analyzy["varianty"][novy_nazev] = var_data
@@ -304,7 +384,10 @@ class Spravce_stavu:
             nazev_varianty (str): Název varianty k odstranění
         """
         if nazev_varianty in self._data_analyzy["varianty"]:
+            self._zaznamenej_zmenu(operace="odeber_variantu", varianta=nazev_varianty)
             del self._data_analyzy["varianty"][nazev_varianty]
+            if self._inkrementalni_stav is not None:
+                self._inkrementalni_stav.odeber_variantu(nazev_varianty)
             Utils.zapsat_info(f"Smazána varianta: {nazev_varianty}")
     
     def uloz_hodnotu_varianty(self, nazev_varianty, nazev_kriteria, hodnota):
@@ -317,9 +400,32 @@ class Spravce_stavu:
             hodnota (float): Hodnota kritéria pro danou variantu
         """
         if nazev_varianty in self._data_analyzy["varianty"]:
-            self._data_analyzy["varianty"][nazev_varianty][nazev_kriteria] = hodnota
+            var_data = self._data_analyzy["varianty"][nazev_varianty]
+            if nazev_kriteria in self._data_analyzy["kriteria"] and var_data.get(nazev_kriteria) != hodnota:
+                self._zaznamenej_zmenu(operace="nastav_hodnotu", varianta=nazev_varianty,
+                                       kriterium=nazev_kriteria, hodnota=hodnota)
+            var_data[nazev_kriteria] = hodnota
+            if self._inkrementalni_stav is not None and nazev_kriteria in self._data_analyzy["kriteria"]:
+                self._inkrementalni_stav.zmen_hodnotu(nazev_varianty, nazev_kriteria, hodnota)
             Utils.zapsat_info(f"Uložena hodnota pro variantu {nazev_varianty}, kritérium {nazev_kriteria}: {hodnota}")
     
+    def ziskej_prubezne_vysledky(self):
+        """
+        Vrátí aktuální výsledky WSM a TOPSIS pro rozpracovaná data analýzy.
+        Stav se sestaví jen při prvním dotazu (nebo po změně kritérií),
+        další úpravy hodnot, vah a variant se do něj promítají přírůstkově.
+        
+        Returns:
+            dict: Viz Inkrementalni_vypocty.Inkrementalni_stav.vysledky()
+        
+        Raises:
+            ValueError: Pokud data nelze převést na matici
+        """
+        if self._inkrementalni_stav is None:
+            self._inkrementalni_stav = Inkrementalni_vypocty.Inkrementalni_stav.z_json(self._data_analyzy)
+            Utils.zapsat_info("Sestaven stav pro přírůstkový přepočet výsledků")
+        return self._inkrementalni_stav.vysledky()
+    
     def ziskej_nazev(self):
         """
         Vrátí název analýzy.
@@ -358,10 +464,15 @@ class Spravce_stavu:
     
     def uloz_analyzu_na_server(self):
         """
-        Uloží kompletní analýzu na server.
+        Uloží analýzu na server. U analýzy načtené ze serveru se posílají
+        jen změny od jejího načtení (uprav_analyzu_zmenami).
         
         Returns:
             bool: True pokud uložení proběhlo úspěšně, jinak False
+            
+        Raises:
+            Exception: Při konfliktu verzí (viz je_konflikt_verze) - analýzu
+                       mezitím uložil jiný uživatel nebo okno a nic se neuložilo
         """
         try:
             # Kontrola, zda jde o novou analýzu nebo aktualizaci
@@ -387,18 +498,37 @@ class Spravce_stavu:
                 "kriteria": self._data_analyzy.get("kriteria", {}),
                 "varianty": self._data_analyzy.get("varianty", {})
             }
+            nazev = self._data_analyzy.get("nazev", "")
             
-            # Uložení/aktualizace dat analýzy
-            anvil.server.call('uprav_analyzu', 
-                              self._aktivni_analyza_id,
-                              self._data_analyzy.get("nazev", ""),
-                              data)
+            if not je_nova and self._verze_analyzy is not None:
+                # Analýza načtená ze serveru - posílají se jen provedené změny
+                try:
+                    self._verze_analyzy = anvil.server.call(
+                        'uprav_analyzu_zmenami', self._aktivni_analyza_id, self._zmeny, self._verze_analyzy, nazev
+                    )
+                    Utils.zapsat_info(f"Uloženo {len(self._zmeny)} změn analýzy")
+                except Exception as e:
+                    # Při konfliktu verzí by celá data přepsala cizí změny
+                    if je_konflikt_verze(e):
+                        raise
+                    # Změny nešly použít - uloží se celá data, ale jen pokud
+                    # analýzu mezitím neuložil nikdo jiný
+                    Utils.zapsat_chybu(f"Částečné uložení selhalo, ukládám celou analýzu: {str(e)}")
+                    self._verze_analyzy = anvil.server.call(
+                        'uprav_analyzu', self._aktivni_analyza_id, nazev, data, self._verze_analyzy
+                    )
+            else:
+                # Uložení/aktualizace dat analýzy
+                self._verze_analyzy = anvil.server.call('uprav_analyzu', self._aktivni_analyza_id, nazev, data)
+            self._zmeny = []
             
             Utils.zapsat_info(f"Analýza úspěšně uložena: {self._aktivni_analyza_id}")
             return True
             
         except Exception as e:
             Utils.zapsat_chybu(f"Chyba při ukládání analýzy: {str(e)}")
+            if je_konflikt_verze(e):
+                raise
             return False
 
     def nacti_nastaveni_uzivatele(self):
@@ -0,0 +1,14 @@
+# client_code/Tisk_html_komp/__init__.py
+from ._anvil_designer import Tisk_html_kompTemplate
+from anvil import *
+
+
+class Tisk_html_komp(Tisk_html_kompTemplate):
+  """
+  Odlehčený formulář pro serverový PDF export (anvil.pdf.render_form).
+  Jen zobrazí hotové HTML reportu sestavené na serveru (Pdf_report),
+  nic nepočítá a nekreslí žádné Plotly grafy.
+  """
+  def __init__(self, html_dokument="", **properties):
+    self.init_components(**properties)
+    self.html = html_dokument
@@ -8,6 +8,256 @@ import plotly.graph_objects as go
 import math
 from . import Utils
 
+# Nad tímto počtem variant přecházejí grafy výsledků do úsporného režimu:
+# sloupcový graf se kreslí jako jediná WebGL stopa bez popisků, skládaný
+# graf jako teplotní mapa a grafy s jednou sérií na variantu (radar,
+# citlivost) zobrazí jen TOP_K_VARIANT nejlepších variant a souhrn ostatních.
+MAX_VARIANT_GRAFU = 40
+TOP_K_VARIANT = 10
+
+# Barva souhrnných sérií "Ostatní"
+BARVA_OSTATNICH = '#95a5a6'
+_VYPLN_OSTATNICH = 'rgba(149,165,166,0.3)'
+
+
+def _je_velky_graf(pocet_variant):
+    """Vrátí True, pokud se graf pro daný počet variant kreslí v úsporném režimu."""
+    return pocet_variant > MAX_VARIANT_GRAFU
+
+def _rozdel_top_k(poradi_indexu):
+    """
+    Rozdělí indexy variant na samostatně zobrazené a souhrnně zobrazené.
+
+    Args:
+        poradi_indexu: Indexy variant seřazené od nejlepší
+
+    Returns:
+        tuple: (indexy zobrazených variant, indexy ostatních variant);
+            pokud se graf vejde celý, jsou zobrazeny všechny v původním pořadí
+    """
+    if not _je_velky_graf(len(poradi_indexu)):
+        return list(range(len(poradi_indexu))), []
+    return list(poradi_indexu[:TOP_K_VARIANT]), list(poradi_indexu[TOP_K_VARIANT:])
+
+def _popis_ostatnich(pocet, souhrn):
+    """Vrátí název souhrnné série ostatních variant."""
+    return f"Ostatní ({pocet} variant, {souhrn})"
+
+def _poradi_podle_vysledku(results, varianty):
+    """
+    Vrátí indexy variant seřazené podle výsledků metody.
+
+    Args:
+        results: Seznam (varianta, pořadí, skóre) seřazený od nejlepší
+        varianty: Seznam názvů variant
+
+    Returns:
+        list: Indexy variant od nejlepší; pokud výsledky neodpovídají
+            variantám, indexy v původním pořadí
+    """
+    index_varianty = {varianta: i for i, varianta in enumerate(varianty)}
+    poradi = [index_varianty[vysledek[0]] for vysledek in results or [] if vysledek[0] in index_varianty]
+    if len(poradi) != len(varianty):
+        return list(range(len(varianty)))
+    return poradi
+
+def _poradi_variant_citlivosti(analyza, pocet_variant):
+    """Vrátí indexy variant seřazené podle průměrného pořadí v analýze citlivosti."""
+    soucty = [sum(sloupec) for sloupec in zip(*analyza['citlivost_poradi'])]
+    return sorted(range(pocet_variant), key=lambda i: soucty[i])
+
+def _data_serii_citlivosti(analyza, klic, varianty):
+    """
+    Vrátí hodnoty samostatně zobrazených variant a pás ostatních variant.
+
+    Analýza ze serveru obsahuje jen souhrn ('zobrazene_varianty' a 'ostatni',
+    viz Citlivost_numpy._souhrn_skore), výpočet v prohlížeči úplná pole,
+    ze kterých se stejný souhrn sestaví zde.
+
+    Returns:
+        tuple: (seznam (název varianty, hodnoty po krocích),
+                (počet, minima, maxima) ostatních variant nebo None)
+    """
+    hodnoty = analyza[klic]
+    if 'zobrazene_varianty' in analyza:
+        zobrazene = [
+            (nazev, [krok[k] for krok in hodnoty])
+            for k, nazev in enumerate(analyza['zobrazene_varianty'])
+        ]
+        ostatni = analyza.get('ostatni')
+        if not ostatni:
+            return zobrazene, None
+        return zobrazene, (ostatni['pocet'], ostatni[klic + '_min'], ostatni[klic + '_max'])
+
+    indexy, ostatni = _rozdel_top_k(_poradi_variant_citlivosti(analyza, len(varianty)))
+    zobrazene = [(varianty[i], [krok[i] for krok in hodnoty]) for i in indexy]
+    if not ostatni:
+        return zobrazene, None
+    return zobrazene, (
+        len(ostatni),
+        [min(krok[i] for i in ostatni) for krok in hodnoty],
+        [max(krok[i] for i in ostatni) for krok in hodnoty]
+    )
+
+def _serie_citlivosti(analyza, klic, varianty, viditelne, skupina=None):
+    """
+    Vytvoří série grafu citlivosti pro jedno kritérium.
+
+    Pro velký počet variant se samostatně zobrazí jen TOP_K_VARIANT variant
+    s nejlepším průměrným pořadím a zbylé varianty nahradí pás mezi jejich
+    minimem a maximem, takže počet sérií nezávisí na velikosti analýzy.
+
+    Args:
+        analyza: Výsledky analýzy citlivosti pro jedno kritérium
+        klic: 'citlivost_skore' nebo 'citlivost_poradi'
+        varianty: Seznam názvů variant
+        viditelne: Zda jsou série viditelné po vykreslení grafu
+        skupina: Skupina legendy (volitelná)
+
+    Returns:
+        list: Série grafu (vždy stejný počet pro stejný počet variant)
+    """
+    vahy_rozsah = analyza['vahy_rozsah']
+    zobrazene, ostatni = _data_serii_citlivosti(analyza, klic, varianty)
+    typ = 'scattergl' if ostatni else 'scatter'
+
+    serie = []
+    for nazev, y in zobrazene:
+        serie.append({
+            'type': typ,
+            'mode': 'lines+markers',
+            'name': nazev,
+            'x': vahy_rozsah,
+            'y': y,
+            'marker': {'size': 8},
+            'visible': viditelne
+        })
+
+    if ostatni:
+        # Pás ostatních variant: dolní hranice bez legendy, horní vyplněná k dolní
+        pocet, minima, maxima = ostatni
+        popis = _popis_ostatnich(pocet, "rozsah")
+        for nazev_hranice, y, vypln in (("minimum", minima, 'none'), ("maximum", maxima, 'tonexty')):
+            serie.append({
+                'type': 'scatter',
+                'mode': 'lines',
+                'name': popis,
+                'x': vahy_rozsah,
+                'y': y,
+                'line': {'color': BARVA_OSTATNICH, 'width': 1},
+                'fill': vypln,
+                'fillcolor': _VYPLN_OSTATNICH,
+                'showlegend': nazev_hranice == "maximum",
+                'hovertemplate': f'{popis}<br>{nazev_hranice}: ' + '%{y}<extra></extra>',
+                'visible': viditelne
+            })
+
+    if skupina:
+        for s in serie:
+            s['legendgroup'] = skupina
+    return serie
+
+# Popisek rozbalovacího menu pro výběr kritéria v grafech citlivosti
+_POPISEK_VYBERU_KRITERIA = {
+    'text': 'Vyberte kritérium:',
+    'x': 0.03,
+    'y': 1.09,
+    'xref': 'paper',
+    'yref': 'paper',
+    'showarrow': False,
+    'font': {
+        'size': 13
+    }
+}
+
+def _znacky_zmen_nejlepsi(analyza):
+    """
+    Vytvoří svislé čáry a popisky vah, při kterých se mění nejlepší varianta.
+
+    Analýzy ze serveru (Citlivost_numpy) mají tyto váhy v 'zmeny_nejlepsi',
+    u WSM, WPM a MABAC přesně spočítané, u TOPSIS odečtené z mřížky vah.
+
+    Args:
+        analyza: Výsledky analýzy citlivosti pro jedno kritérium
+
+    Returns:
+        tuple: (shapes, annotations) pro layout grafu
+    """
+    shapes = []
+    annotations = []
+    for zmena in analyza.get('zmeny_nejlepsi', []):
+        shapes.append({
+            'type': 'line',
+            'xref': 'x',
+            'yref': 'paper',
+            'x0': zmena['vaha'],
+            'x1': zmena['vaha'],
+            'y0': 0,
+            'y1': 1,
+            'line': {'color': BARVA_OSTATNICH, 'width': 1, 'dash': 'dot'}
+        })
+        annotations.append({
+            'text': f"{zmena['puvodni']} → {zmena['nova']} ({zmena['vaha']:.4f})",
+            'x': zmena['vaha'],
+            'y': 1,
+            'xref': 'x',
+            'yref': 'paper',
+            'xanchor': 'right',
+            'yanchor': 'top',
+            'textangle': -90,
+            'showarrow': False,
+            'font': {'size': 10, 'color': '#555'}
+        })
+    return shapes, annotations
+
+def _serie_a_menu_citlivosti(analyza_citlivosti, varianty, vsechna_kriteria, vsechny_analyzy, klic):
+    """
+    Sestaví série grafu citlivosti pro všechna kritéria a tlačítka pro jejich přepínání.
+    Každé kritérium má vlastní značky vah, při kterých se mění nejlepší varianta.
+
+    Args:
+        analyza_citlivosti: Výsledky analýzy citlivosti pro výchozí kritérium
+        varianty: Seznam názvů variant
+        vsechna_kriteria: Seznam všech kritérií pro dropdown (volitelný)
+        vsechny_analyzy: Slovník s výsledky analýzy pro všechna kritéria (volitelný)
+        klic: 'citlivost_skore' nebo 'citlivost_poradi'
+
+    Returns:
+        tuple: (série grafu, tlačítka dropdown menu, shapes a annotations
+                layoutu pro výchozí kritérium)
+    """
+    zvolene_kriterium = analyza_citlivosti['zvolene_kriterium']
+    data = _serie_citlivosti(analyza_citlivosti, klic, varianty, True)
+    popisky = [zvolene_kriterium]
+    znacky = [_znacky_zmen_nejlepsi(analyza_citlivosti)]
+
+    # Ostatní kritéria jako skryté bloky sérií stejné velikosti
+    if vsechna_kriteria and vsechny_analyzy:
+        for krit in vsechna_kriteria:
+            if krit == zvolene_kriterium or krit not in vsechny_analyzy:
+                continue
+            data.extend(_serie_citlivosti(vsechny_analyzy[krit], klic, varianty, False, krit))
+            popisky.append(krit)
+            znacky.append(_znacky_zmen_nejlepsi(vsechny_analyzy[krit]))
+
+    popisek_menu = [_POPISEK_VYBERU_KRITERIA] if len(popisky) > 1 else []
+    menu_buttons = []
+    if len(popisky) > 1:
+        velikost_bloku = len(data) // len(popisky)
+        for b, krit in enumerate(popisky):
+            visible_array = [False] * len(data)
+            visible_array[b * velikost_bloku:(b + 1) * velikost_bloku] = [True] * velikost_bloku
+            shapes, annotations = znacky[b]
+            menu_buttons.append(
+                dict(
+                    args=[{'visible': visible_array}, {'shapes': shapes, 'annotations': popisek_menu + annotations}],
+                    label=krit,
+                    method="update"
+                )
+            )
+    shapes, annotations = znacky[0]
+    return data, menu_buttons, shapes, popisek_menu + annotations
+
 
 def vytvor_graf_mabac_vzdalenosti_kriterii(varianty, kriteria, q_matrix, typy_kriterii=None):
     """
@@ -220,17 +470,19 @@ def vytvor_radar_graf_mabac(mabac_vysledky, varianty, kriteria, vazena_matice=No
             )
         })
         
-        # 5) Každá varianta
-        for i, varianta in enumerate(varianty):
-            if i >= len(vazena_matice):
-                continue  # ochrana, kdyby nebylo dost řádků ve vazena_matice
-            
+        # 5) Varianty - při velkém počtu jen nejlepší podle výsledků a průměr ostatních
+        pocet_variant = min(len(varianty), len(vazena_matice))
+        zobrazene, ostatni = _rozdel_top_k(
+            _poradi_podle_vysledku(mabac_vysledky.get('results'), varianty[:pocet_variant])
+        )
+        for poradi, i in enumerate(zobrazene):
+            varianta = varianty[i]
             hodnoty = vazena_matice[i]
             
             # Uzavřeme první hodnotu, abychom vytvořili "kruh"
             uzavrene_hodnoty = hodnoty + [hodnoty[0]]
             
-            barva_idx = i % len(barvy)
+            barva_idx = poradi % len(barvy)
             barva = barvy[barva_idx]
             
             r = int(barva[1:3], 16)
@@ -254,6 +506,23 @@ def vytvor_radar_graf_mabac(mabac_vysledky, varianty, kriteria, vazena_matice=No
                 )
             })
         
+        if ostatni:
+            # Ostatní varianty souhrnně jako průměrný profil
+            prumer = [sum(vazena_matice[i][j] for i in ostatni) / len(ostatni) for j in range(len(kriteria))]
+            data.append({
+                'type': 'scatterpolar',
+                'r': prumer + [prumer[0]],
+                'theta': short_theta,
+                'customdata': full_crit,
+                'fill': 'none',
+                'name': _popis_ostatnich(len(ostatni), "průměr"),
+                'line': {'color': BARVA_OSTATNICH, 'width': 2, 'dash': 'dash'},
+                'hovertemplate': (
+                    "Kritérium: %{customdata}<br>"
+                    "Průměr ostatních: %{r:.4f}<extra></extra>"
+                )
+            })
+        
         # 6) Sestavení layoutu
         fig = {
             'data': data,
@@ -338,10 +607,20 @@ def vytvor_sloupovy_graf_vysledku(results, nejlepsi_varianta, nejhorsi_varianta,
         y_padding = (max_skore - min_skore) * 0.1 if max_skore != min_skore else 0.1
         y_min = min(0, min_skore - y_padding)  # Vždy zahrnout nulu
         y_max = max_skore + y_padding
-                
-        # Vytvoření grafu
-        fig = {
-            'data': [{
+
+        if _je_velky_graf(len(varianty)):
+            # Mnoho variant: jediná WebGL stopa bodů, hodnoty a názvy jen v hoveru
+            stopa = {
+                'type': 'scattergl',
+                'mode': 'markers',
+                'x': varianty,
+                'y': skore,
+                'marker': {'color': colors, 'size': 6},
+                'hovertemplate': '%{x}<br>S: %{y:.4f}<extra></extra>'
+            }
+            osa_x = {'title': f'Varianty ({len(varianty)}, názvy v hoveru)', 'showticklabels': False}
+        else:
+            stopa = {
                 'type': 'bar',
                 'x': varianty,
                 'y': skore,
@@ -350,13 +629,18 @@ def vytvor_sloupovy_graf_vysledku(results, nejlepsi_varianta, nejhorsi_varianta,
                 },
                 'text': [f'{s:.4f}' for s in skore],  # Zobrazení hodnot nad/pod sloupci
                 'textposition': 'auto',
-            }],
+            }
+            osa_x = {
+                'title': 'Varianty',
+                'tickangle': -45 if len(varianty) > 4 else 0  # Natočení popisků pro lepší čitelnost
+            }
+
+        # Vytvoření grafu
+        fig = {
+            'data': [stopa],
             'layout': {
                 'title': f'Celkové hodnoty kriteriální funkce (S){f" ({nazev_metody})" if nazev_metody else ""}',
-                'xaxis': {
-                    'title': 'Varianty',
-                    'tickangle': -45 if len(varianty) > 4 else 0  # Natočení popisků pro lepší čitelnost
-                },
+                'xaxis': osa_x,
                 'yaxis': {
                     'title': 'Hodnota S',
                     'range': [y_min, y_max],  # Dynamický rozsah na základě dat
@@ -407,7 +691,34 @@ def vytvor_skladany_sloupovy_graf(varianty, kriteria, vazene_hodnoty, serazene_v
         
         # Určení pořadí variant pro graf
         zobrazene_varianty = serazene_varianty if serazene_varianty else varianty
-        
+
+        if _je_velky_graf(len(zobrazene_varianty)):
+            # Mnoho variant: jedna teplotní mapa příspěvků [kritéria][varianty]
+            radky = [vazene_hodnoty[var_to_idx[var]] for var in zobrazene_varianty]
+            return {
+                'data': [{
+                    'type': 'heatmap',
+                    'x': zobrazene_varianty,
+                    'y': kriteria,
+                    'z': [list(sloupec) for sloupec in zip(*radky)],
+                    'colorscale': 'Blues',
+                    'colorbar': {'title': 'Příspěvek'},
+                    'hovertemplate': '%{x}<br>%{y}: %{z:.3f}<extra></extra>'
+                }],
+                'layout': {
+                    'title': 'Příspěvek jednotlivých kritérií k celkovému skóre',
+                    'xaxis': {
+                        'title': f'Varianty ({len(zobrazene_varianty)}, názvy v hoveru)',
+                        'showticklabels': False
+                    },
+                    'yaxis': {
+                        'title': 'Kritéria',
+                        'autorange': 'reversed'
+                    },
+                    'margin': {'t': 50, 'b': 80}
+                }
+            }
+
         # Vytvoření datových sérií pro každé kritérium
         data = []
         
@@ -466,35 +777,58 @@ def vytvor_skladany_sloupovy_graf(varianty, kriteria, vazene_hodnoty, serazene_v
             }
         }
 
-def vytvor_radar_graf(varianty, kriteria, norm_hodnoty):
+def vytvor_radar_graf(varianty, kriteria, norm_hodnoty, serazene_varianty=None):
     """
     Vytvoří radarový (paprskový) graf zobrazující normalizované hodnoty variant ve všech kritériích.
-    
+    Při velkém počtu variant zobrazí jen TOP_K_VARIANT nejlepších a průměr ostatních.
+
     Args:
         varianty: Seznam názvů variant
         kriteria: Seznam názvů kritérií
         norm_hodnoty: 2D list normalizovaných hodnot [varianty][kriteria]
-        
+        serazene_varianty: Seznam variant seřazených podle celkového skóre (volitelný)
+            Pokud chybí, varianty se pro výběr nejlepších řadí podle součtu hodnot
+
     Returns:
         dict: Plotly figure configuration
     """
     try:
         data = []
-        
-        # Pro každou variantu vytvoříme jednu sérii dat
-        for i, varianta in enumerate(varianty):
+        labels = kriteria + [kriteria[0]]
+
+        if serazene_varianty and set(serazene_varianty) == set(varianty):
+            var_to_idx = {var: idx for idx, var in enumerate(varianty)}
+            poradi = [var_to_idx[var] for var in serazene_varianty]
+        else:
+            soucty = [sum(radek) for radek in norm_hodnoty]
+            poradi = sorted(range(len(varianty)), key=lambda i: -soucty[i])
+        zobrazene, ostatni = _rozdel_top_k(poradi)
+
+        # Pro každou zobrazenou variantu vytvoříme jednu sérii dat
+        for i in zobrazene:
             # Pro radarový graf musíme uzavřít křivku tak, že opakujeme první hodnotu na konci
             hodnoty = norm_hodnoty[i] + [norm_hodnoty[i][0]]
-            labels = kriteria + [kriteria[0]]
-            
+
             data.append({
                 'type': 'scatterpolar',
                 'r': hodnoty,
                 'theta': labels,
                 'fill': 'toself',
-                'name': varianta
+                'name': varianty[i]
             })
-        
+
+        if ostatni:
+            # Ostatní varianty souhrnně jako průměrný profil
+            prumer = [sum(norm_hodnoty[i][j] for i in ostatni) / len(ostatni) for j in range(len(kriteria))]
+            data.append({
+                'type': 'scatterpolar',
+                'r': prumer + [prumer[0]],
+                'theta': labels,
+                'fill': 'none',
+                'name': _popis_ostatnich(len(ostatni), "průměr"),
+                'line': {'color': BARVA_OSTATNICH, 'width': 2, 'dash': 'dash'}
+            })
+
         # Vytvoření grafu
         fig = {
             'data': data,
@@ -543,70 +877,11 @@ def vytvor_graf_citlivosti_skore(analyza_citlivosti, varianty, vsechna_kriteria=
         dict: Plotly figure configuration
     """
     try:
-        # Základní graf pro aktuální kritérium
-        vahy_rozsah = analyza_citlivosti['vahy_rozsah']
-        citlivost_skore = analyza_citlivosti['citlivost_skore']
-        zvolene_kriterium = analyza_citlivosti['zvolene_kriterium']
-        
-        # Vytvoření datových sérií pro každou variantu
-        data = []
-        
-        for i, varianta in enumerate(varianty):
-            # Pro každou variantu vytvoříme jednu datovou sérii
-            data.append({
-                'type': 'scatter',
-                'mode': 'lines+markers',
-                'name': varianta,
-                'x': vahy_rozsah,
-                'y': [citlivost_skore[j][i] for j in range(len(vahy_rozsah))],
-                'marker': {
-                    'size': 8
-                },
-                'visible': True
-            })
-        
-        # Přidání dat pro ostatní kritéria (pokud jsou k dispozici)
-        if vsechna_kriteria and vsechny_analyzy:
-            # Data pro dropdown menu
-            menu_buttons = []
-            
-            # Pro každé kritérium
-            for k_idx, krit in enumerate(vsechna_kriteria):
-                if krit == zvolene_kriterium:
-                    # Přeskočíme aktuální kritérium, to je už zahrnuto výše
-                    continue
-                
-                # Získáme analýzu pro toto kritérium
-                if krit in vsechny_analyzy:
-                    ak = vsechny_analyzy[krit]
-                    
-                    # Přidáme data do grafu jako skryté série
-                    for i, varianta in enumerate(varianty):
-                        data.append({
-                            'type': 'scatter',
-                            'mode': 'lines+markers',
-                            'name': varianta,
-                            'x': ak['vahy_rozsah'],
-                            'y': [ak['citlivost_skore'][j][i] for j in range(len(ak['vahy_rozsah']))],
-                            'marker': {'size': 8},
-                            'visible': False,
-                            'legendgroup': krit
-                        })
-                    
-                    # Vytvoříme tlačítko pro toto kritérium
-                    visible_array = [False] * (len(varianty) * len(vsechna_kriteria))
-                    # Nastavíme viditelnost pouze pro série tohoto kritéria
-                    for idx in range(len(varianty)):
-                        visible_array[(k_idx * len(varianty)) + idx] = True
-                    
-                    menu_buttons.append(
-                        dict(
-                            args=[{'visible': visible_array}],
-                            label=krit,
-                            method="update"
-                        )
-                    )
-        
+        # Série pro výchozí kritérium a skryté série ostatních kritérií
+        data, menu_buttons, shapes, annotations = _serie_a_menu_citlivosti(
+            analyza_citlivosti, varianty, vsechna_kriteria, vsechny_analyzy, 'citlivost_skore'
+        )
+
         # Vytvoření grafu
         fig = {
             'data': data,
@@ -628,12 +903,14 @@ def vytvor_graf_citlivosti_skore(analyza_citlivosti, varianty, vsechna_kriteria=
                     'rows': 1, 
                     'columns': 1
                 },
+                'shapes': shapes,
+                'annotations': annotations,
                 'margin': {'t': 120, 'b': 100}
             }
         }
         
         # Přidáme dropdown menu, pokud máme data pro více kritérií
-        if vsechna_kriteria and vsechny_analyzy and len(menu_buttons) > 0:
+        if menu_buttons:
             fig['layout']['updatemenus'] = [
                 {
                     'buttons': menu_buttons,
@@ -645,20 +922,6 @@ def vytvor_graf_citlivosti_skore(analyza_citlivosti, varianty, vsechna_kriteria=
                     'yanchor': 'top'
                 }
             ]
-            # Přidáme anotaci jako popisek pro dropdown
-            fig['layout']['annotations'] = [
-                {
-                    'text': 'Vyberte kritérium:',
-                    'x': 0.03,
-                    'y': 1.09,
-                    'xref': 'paper',
-                    'yref': 'paper',
-                    'showarrow': False,
-                    'font': {
-                        'size': 13
-                    }
-                }
-            ]
         
         return fig
     
@@ -686,67 +949,11 @@ def vytvor_graf_citlivosti_poradi(analyza_citlivosti, varianty, vsechna_kriteria
         dict: Plotly figure configuration
     """
     try:
-        vahy_rozsah = analyza_citlivosti['vahy_rozsah']
-        citlivost_poradi = analyza_citlivosti['citlivost_poradi']
-        zvolene_kriterium = analyza_citlivosti['zvolene_kriterium']
-        
-        # Vytvoření datových sérií pro každou variantu
-        data = []
-        
-        for i, varianta in enumerate(varianty):
-            # Pro každou variantu vytvoříme jednu datovou sérii
-            data.append({
-                'type': 'scatter',
-                'mode': 'lines+markers',
-                'name': varianta,
-                'x': vahy_rozsah,
-                'y': [citlivost_poradi[j][i] for j in range(len(vahy_rozsah))],
-                'marker': {
-                    'size': 8
-                },
-                'visible': True
-            })
-        
-        # Přidání dat pro ostatní kritéria (pokud jsou k dispozici)
-        menu_buttons = []
-        if vsechna_kriteria and vsechny_analyzy:
-            # Pro každé kritérium (kromě aktuálního)
-            for k_idx, krit in enumerate(vsechna_kriteria):
-                if krit == zvolene_kriterium:
-                    # Přeskočíme aktuální kritérium, to je už zahrnuto výše
-                    continue
-                
-                # Získáme analýzu pro toto kritérium
-                if krit in vsechny_analyzy:
-                    ak = vsechny_analyzy[krit]
-                    
-                    # Přidáme data do grafu jako skryté série
-                    for i, varianta in enumerate(varianty):
-                        data.append({
-                            'type': 'scatter',
-                            'mode': 'lines+markers',
-                            'name': varianta,
-                            'x': ak['vahy_rozsah'],
-                            'y': [ak['citlivost_poradi'][j][i] for j in range(len(ak['vahy_rozsah']))],
-                            'marker': {'size': 8},
-                            'visible': False,
-                            'legendgroup': krit
-                        })
-                    
-                    # Vytvoříme tlačítko pro toto kritérium
-                    visible_array = [False] * (len(varianty) * len(vsechna_kriteria))
-                    # Nastavíme viditelnost pouze pro série tohoto kritéria
-                    for idx in range(len(varianty)):
-                        visible_array[(k_idx * len(varianty)) + idx] = True
-                    
-                    menu_buttons.append(
-                        dict(
-                            args=[{'visible': visible_array}],
-                            label=krit,
-                            method="update"
-                        )
-                    )
-            
+        # Série pro výchozí kritérium a skryté série ostatních kritérií
+        data, menu_buttons, shapes, annotations = _serie_a_menu_citlivosti(
+            analyza_citlivosti, varianty, vsechna_kriteria, vsechny_analyzy, 'citlivost_poradi'
+        )
+
         # Vytvoření grafu
         fig = {
             'data': data,
@@ -772,12 +979,19 @@ def vytvor_graf_citlivosti_poradi(analyza_citlivosti, varianty, vsechna_kriteria
                     'rows': 1, 
                     'columns': 1
                 },
+                'shapes': shapes,
+                'annotations': annotations,
                 'margin': {'t': 120, 'b': 80}
             }
         }
         
+        if _je_velky_graf(len(varianty)):
+            # Značka pro každé pořadí by při mnoha variantách zaplnila osu
+            for klic in ('tickmode', 'tick0', 'dtick'):
+                del fig['layout']['yaxis'][klic]
+
         # Přidáme dropdown menu, pokud máme data pro více kritérií
-        if vsechna_kriteria and vsechny_analyzy and len(menu_buttons) > 0:
+        if menu_buttons:
             fig['layout']['updatemenus'] = [
                 {
                     'buttons': menu_buttons,
@@ -789,20 +1003,6 @@ def vytvor_graf_citlivosti_poradi(analyza_citlivosti, varianty, vsechna_kriteria
                     'yanchor': 'top'
                 }
             ]
-            # Přidáme anotaci jako popisek pro dropdown
-            fig['layout']['annotations'] = [
-                {
-                    'text': 'Vyberte kritérium:',
-                    'x': 0.03,
-                    'y': 1.09,
-                    'xref': 'paper',
-                    'yref': 'paper',
-                    'showarrow': False,
-                    'font': {
-                        'size': 13
-                    }
-                }
-            ]
         
         return fig
     except Exception as e:
@@ -1118,115 +1318,307 @@ def vytvor_graf_discordance_electre(matice_nesouhlasu, varianty):
             }
         }
 
-def vytvor_graf_outranking_relace(outranking_matrix, varianty):
+# Nejvyšší počet uzlů grafu převahy ELECTRE. Při více variantách graf
+# zobrazí jen varianty s nejvyšším net flow.
+MAX_UZLU_GRAFU_PREVAHY = 30
+# Nad tímto počtem hran se šipky (anotace) vynechají, hrany zůstanou jen
+# jako jediná čárová stopa.
+MAX_SIPEK_GRAFU_PREVAHY = 100
+
+
+def _pocet_bitu(maska):
+    """Vrátí počet nastavených bitů masky."""
+    return bin(maska).count('1')
+
+def _dosazitelnost(outranking_matrix):
+    """
+    Spočítá tranzitivní uzávěr relace převahy (Warshallův algoritmus).
+
+    Args:
+        outranking_matrix: 2D binární matice převahy mezi variantami (0/1)
+
+    Returns:
+        list: Bitová maska pro každou variantu, bit j = variantu j lze dosáhnout
+    """
+    dosah = []
+    for i, radek in enumerate(outranking_matrix):
+        maska = 0
+        for j, hodnota in enumerate(radek):
+            if hodnota == 1 and i != j:
+                maska |= 1 << j
+        dosah.append(maska)
+
+    for k in range(len(dosah)):
+        bit = 1 << k
+        maska_k = dosah[k]
+        for i in range(len(dosah)):
+            if dosah[i] & bit:
+                dosah[i] |= maska_k
+    return dosah
+
+def _hasseuv_diagram(dosah, uzly):
+    """
+    Vrátí Hasseův diagram relace převahy zúžené na vybrané uzly.
+
+    Vzájemně se převyšující varianty (silně souvislé komponenty) se nejdřív
+    sloučí do jedné skupiny. Hrany zůstanou jen mezi skupinami, a to jen
+    pokud cílovou skupinu nelze dosáhnout přes jinou zobrazenou skupinu
+    (tranzitivní redukce kondenzace). Každou hranu reprezentuje jediná
+    dvojice uzlů - první uzel každé skupiny. Členy skupiny spojuje řetízek
+    obousměrných hran. Cesty mohou vést i přes skryté varianty.
+
+    Args:
+        dosah: Bitové masky dosažitelnosti všech variant (viz _dosazitelnost)
+        uzly: Indexy zobrazených variant
+
+    Returns:
+        tuple: (hrany mezi skupinami jako dvojice pozic v uzly,
+                obousměrné hrany uvnitř skupin jako dvojice pozic v uzly,
+                úroveň každého uzlu pro rozvržení,
+                skupina každého uzlu jako pozice jejího prvního uzlu)
+    """
+    n = len(uzly)
+    mezi = []
+    for i in uzly:
+        maska = 0
+        for b, j in enumerate(uzly):
+            if dosah[i] >> j & 1:
+                maska |= 1 << b
+        mezi.append(maska)
+    predchudci = [sum(1 << a for a in range(n) if mezi[a] >> b & 1) for b in range(n)]
+
+    # Silně souvislé komponenty: uzel a jeho vzájemně dosažitelné uzly
+    clenove = [(mezi[a] & predchudci[a]) | (1 << a) for a in range(n)]
+    skupina = [(clenove[a] & -clenove[a]).bit_length() - 1 for a in range(n)]
+    zastupci = [a for a in range(n) if skupina[a] == a]
+
+    # Obousměrný řetízek mezi členy každé skupiny v pořadí pozic
+    vzajemne = []
+    posledni = {}
+    for a in range(n):
+        if skupina[a] != a:
+            vzajemne.append((posledni[skupina[a]], a))
+        posledni[skupina[a]] = a
+
+    # Tranzitivní redukce kondenzace - mezi[a] je tranzitivní, takže hrana
+    # x -> y je zbytečná, pokud existuje jiná skupina z, pro kterou x -> z -> y
+    hrany = []
+    for x in zastupci:
+        for y in zastupci:
+            if x == y or not mezi[x] >> y & 1:
+                continue
+            mezilehle = mezi[x] & predchudci[y] & ~(clenove[x] | clenove[y])
+            if mezilehle == 0:
+                hrany.append((x, y))
+
+    # Úroveň skupiny = délka nejdelšího řetězce striktních předchůdců
+    striktni = {x: predchudci[x] & ~clenove[x] for x in zastupci}
+    uroven_skupiny = {}
+    for x in sorted(zastupci, key=lambda x: _pocet_bitu(striktni[x])):
+        uroven_skupiny[x] = max(
+            [uroven_skupiny[z] + 1 for z in zastupci if striktni[x] >> z & 1] or [0]
+        )
+    uroven = [uroven_skupiny[skupina[a]] for a in range(n)]
+    return hrany, vzajemne, uroven, skupina
+
+def vytvor_graf_outranking_relace(outranking_matrix, varianty, hasseuv_diagram=None, max_uzlu=None,
+                                  souhrn_prevahy=None):
     """
     Vytvoří síťový graf znázorňující outrankingové relace (vztahy převahy) mezi variantami
     z ELECTRE analýzy.
-    
+
+    Při velkém počtu variant graf zobrazí jen max_uzlu variant s nejvyšším
+    net flow. Hrany tvoří jedinou čárovou stopu a šipky (anotace) se přidají,
+    jen pokud hran není víc než MAX_SIPEK_GRAFU_PREVAHY.
+
+    U velkých analýz server místo matice převahy vrací souhrn řídké relace
+    s podmaticí převahy jen mezi variantami s nejvyšším net flow. Graf pak
+    zobrazí tyto varianty a Hasseův diagram hledá cesty jen mezi nimi.
+
     Args:
-        outranking_matrix: 2D binární matice převahy mezi variantami (0/1)
+        outranking_matrix: 2D binární matice převahy mezi variantami (0/1),
+            None pokud se předává souhrn_prevahy
         varianty: Seznam názvů variant
-        
+        hasseuv_diagram: Zobrazit jen Hasseův diagram (bez tranzitivních hran)
+            s variantami rozloženými do úrovní, lepší nahoře. Vzájemně se
+            převyšující varianty leží vedle sebe spojené čárkovanou
+            obousměrnou hranou.
+            None = zapnout automaticky, pokud se nezobrazí všechny varianty.
+        max_uzlu: Nejvyšší počet zobrazených variant (None = MAX_UZLU_GRAFU_PREVAHY)
+        souhrn_prevahy: Souhrn řídké relace převahy ('prevysuje', 'prevysovano',
+            'uzly', 'matice'), pokud outranking_matrix je None
+
     Returns:
         dict: Plotly figure configuration
     """
     try:
-        # Vytvoření uzlů (nodes) pro graf
+        n_variants = len(varianty)
+        if max_uzlu is None:
+            max_uzlu = MAX_UZLU_GRAFU_PREVAHY
+
+        # Spočítáme počet převyšujících a převyšovaných variant pro každý uzel
+        if outranking_matrix is None:
+            prevysuje_count = souhrn_prevahy['prevysuje']
+            prevysovano_count = souhrn_prevahy['prevysovano']
+            kandidati = souhrn_prevahy['uzly']
+        else:
+            prevysuje_count = [sum(radek) for radek in outranking_matrix]
+            prevysovano_count = [sum(sloupec) for sloupec in zip(*outranking_matrix)]
+            kandidati = list(range(n_variants))
+        net_flow = [prevysuje_count[i] - prevysovano_count[i] for i in range(n_variants)]
+
+        # Výběr zobrazených variant podle net flow
+        if len(kandidati) > max_uzlu:
+            uzly = sorted(sorted(kandidati, key=lambda i: -net_flow[i])[:max_uzlu])
+        else:
+            uzly = list(kandidati)
+        if hasseuv_diagram is None:
+            hasseuv_diagram = len(uzly) < n_variants
+
+        # Podmatice převahy mezi zobrazenými variantami (pozice v seznamu uzly)
+        if outranking_matrix is None:
+            pozice = {i: a for a, i in enumerate(kandidati)}
+            podmatice = [[souhrn_prevahy['matice'][pozice[i]][pozice[j]] for j in uzly] for i in uzly]
+        else:
+            podmatice = [[outranking_matrix[i][j] for j in uzly] for i in uzly]
+
+        # Hrany mezi zobrazenými variantami (pozice v seznamu uzly)
+        vzajemne = []
+        skupina = list(range(len(uzly)))
+        if hasseuv_diagram and outranking_matrix is None:
+            hrany, vzajemne, uroven, skupina = _hasseuv_diagram(
+                _dosazitelnost(podmatice), list(range(len(uzly)))
+            )
+        elif hasseuv_diagram:
+            hrany, vzajemne, uroven, skupina = _hasseuv_diagram(_dosazitelnost(outranking_matrix), uzly)
+        else:
+            hrany = [(a, b) for a in range(len(uzly)) for b in range(len(uzly))
+                     if a != b and podmatice[a][b] == 1]
+
         node_x = []
         node_y = []
-        node_hover_texts = []
-        
-        # Spočítáme počet převyšujících a převyšovaných variant pro každý uzel
-        prevysuje_count = []
-        prevysovano_count = []
-        
-        for i in range(len(varianty)):
-            # Počet variant, které tato varianta převyšuje
-            prevysuje = sum(outranking_matrix[i])
-            prevysuje_count.append(prevysuje)
-            
-            # Počet variant, které převyšují tuto variantu
-            prevysovano = sum(outranking_matrix[j][i] for j in range(len(varianty)))
-            prevysovano_count.append(prevysovano)
-        
-        # Pomocí kruhového layoutu rozmístíme uzly
-        n_variants = len(varianty)
         radius = 1.0
-        for i, varianta in enumerate(varianty):
-            angle = 2 * math.pi * i / n_variants  # Úhel pro rozmístění do kruhu
-            x = radius * math.cos(angle)
-            y = radius * math.sin(angle)
-            
-            node_x.append(x)
-            node_y.append(y)
-            
-            # Vytvoření bohatšího hover textu s informacemi o převyšování
-            hover_text = f"<b>{varianta}</b><br>" + \
-                         f"Převyšuje: {prevysuje_count[i]} variant<br>" + \
-                         f"Je převyšována: {prevysovano_count[i]} variantami<br>" + \
-                         f"Net Flow: {prevysuje_count[i] - prevysovano_count[i]}"
-            node_hover_texts.append(hover_text)
-        
-        # Vytvoření hran (edges) pro graf
+        if hasseuv_diagram:
+            # Rozvržení do úrovní: dominující varianty nahoře, v úrovni podle net flow
+            pocet_urovni = max(uroven) + 1 if uroven else 1
+            urovne = [[] for _ in range(pocet_urovni)]
+            # Členové skupiny vzájemné převahy leží v úrovni vedle sebe
+            nejlepsi_ve_skupine = {}
+            for a in range(len(uzly)):
+                nejlepsi_ve_skupine[skupina[a]] = max(nejlepsi_ve_skupine.get(skupina[a], net_flow[uzly[a]]),
+                                                      net_flow[uzly[a]])
+            for a in sorted(range(len(uzly)),
+                            key=lambda a: (-nejlepsi_ve_skupine[skupina[a]], skupina[a], -net_flow[uzly[a]])):
+                urovne[uroven[a]].append(a)
+            pozice = {}
+            for u, cleny in enumerate(urovne):
+                y = 1.0 - 2.0 * u / (pocet_urovni - 1) if pocet_urovni > 1 else 0.0
+                for poradi_v_urovni, a in enumerate(cleny):
+                    pozice[a] = (2.0 * (poradi_v_urovni + 1) / (len(cleny) + 1) - 1.0, y)
+            for a in range(len(uzly)):
+                node_x.append(pozice[a][0])
+                node_y.append(pozice[a][1])
+        else:
+            # Pomocí kruhového layoutu rozmístíme uzly
+            for a in range(len(uzly)):
+                angle = 2 * math.pi * a / len(uzly)  # Úhel pro rozmístění do kruhu
+                node_x.append(radius * math.cos(angle))
+                node_y.append(radius * math.sin(angle))
+
+        # Vytvoření bohatšího hover textu s informacemi o převyšování
+        node_hover_texts = [
+            f"<b>{varianty[i]}</b><br>" +
+            f"Převyšuje: {prevysuje_count[i]} variant<br>" +
+            f"Je převyšována: {prevysovano_count[i]} variantami<br>" +
+            f"Net Flow: {net_flow[i]}"
+            for i in uzly
+        ]
+        for a in range(len(uzly)):
+            ostatni_clenove = [varianty[uzly[b]] for b in range(len(uzly)) if skupina[b] == skupina[a] and b != a]
+            if ostatni_clenove:
+                node_hover_texts[a] += "<br>Vzájemně se převyšuje s: " + ", ".join(ostatni_clenove)
+
+        # Vytvoření hran (edges) jako jediné čárové stopy oddělené hodnotami None
         edge_x = []
         edge_y = []
         edge_annotations = []
-        
-        for i in range(n_variants):
-            for j in range(n_variants):
-                if i != j and outranking_matrix[i][j] == 1:
-                    # Pro každý vztah převahy vytvoříme šipku
-                    x0, y0 = node_x[i], node_y[i]
-                    x1, y1 = node_x[j], node_y[j]
-                    
-                    # Mírně upravíme koncové body šipky aby nezasahovaly do uzlů
-                    edge_length = ((x1 - x0) ** 2 + (y1 - y0) ** 2) ** 0.5
-                    
-                    dx = (x1 - x0) / edge_length
-                    dy = (y1 - y0) / edge_length
-                    
-                    x0_adj = x0 + dx * (radius * 0.3)
-                    y0_adj = y0 + dy * (radius * 0.3)
-                    x1_adj = x1 - dx * (radius * 0.3)
-                    y1_adj = y1 - dy * (radius * 0.3)
-                    
-                    # Přidání hrany do seznamu
-                    edge_x.extend([x0_adj, x1_adj, None])
-                    edge_y.extend([y0_adj, y1_adj, None])
-                    
-                    # Přidání šipky jako anotace
-                    edge_annotations.append({
-                        'ax': x0_adj,
-                        'ay': y0_adj,
-                        'axref': 'x',
-                        'ayref': 'y',
-                        'x': x1_adj,
-                        'y': y1_adj,
-                        'xref': 'x',
-                        'yref': 'y',
-                        'showarrow': True,
-                        'arrowhead': 2,
-                        'arrowsize': 1.5,
-                        'arrowwidth': 2,
-                        'arrowcolor': '#636363'
-                    })
-        
+        se_sipkami = len(hrany) + len(vzajemne) <= MAX_SIPEK_GRAFU_PREVAHY
+
+        # Obousměrné hrany uvnitř skupin vzájemné převahy jako čárkovaná stopa
+        vzajemne_x = []
+        vzajemne_y = []
+        for a, b in hrany + vzajemne:
+            obousmerna = (a, b) in vzajemne
+            x0, y0 = node_x[a], node_y[a]
+            x1, y1 = node_x[b], node_y[b]
+
+            # Mírně upravíme koncové body šipky aby nezasahovaly do uzlů
+            edge_length = ((x1 - x0) ** 2 + (y1 - y0) ** 2) ** 0.5
+            posun = radius * 0.3 if not hasseuv_diagram else min(0.08, edge_length * 0.25)
+
+            dx = (x1 - x0) / edge_length
+            dy = (y1 - y0) / edge_length
+
+            x0_adj = x0 + dx * posun
+            y0_adj = y0 + dy * posun
+            x1_adj = x1 - dx * posun
+            y1_adj = y1 - dy * posun
+
+            # Přidání hrany do seznamu
+            if obousmerna:
+                vzajemne_x.extend([x0_adj, x1_adj, None])
+                vzajemne_y.extend([y0_adj, y1_adj, None])
+            else:
+                edge_x.extend([x0_adj, x1_adj, None])
+                edge_y.extend([y0_adj, y1_adj, None])
+
+            if se_sipkami:
+                # Přidání šipky jako anotace
+                edge_annotations.append({
+                    'ax': x0_adj,
+                    'ay': y0_adj,
+                    'axref': 'x',
+                    'ayref': 'y',
+                    'x': x1_adj,
+                    'y': y1_adj,
+                    'xref': 'x',
+                    'yref': 'y',
+                    'showarrow': True,
+                    'arrowhead': 2,
+                    'arrowsize': 1.5,
+                    'arrowwidth': 2,
+                    'arrowcolor': '#636363'
+                })
+                if obousmerna:
+                    edge_annotations[-1].update({'arrowside': 'end+start', 'startarrowhead': 2})
+
         # Nastavení velikosti uzlů podle jejich "důležitosti" (Net Flow)
-        node_sizes = [15 + 10 * abs(prevysuje_count[i] - prevysovano_count[i]) for i in range(n_variants)]
-        
+        if len(uzly) < n_variants or hasseuv_diagram:
+            # Omezená velikost, net flow může být až v řádu počtu variant
+            max_flow = max([abs(net_flow[i]) for i in uzly] + [1])
+            node_sizes = [12 + 18 * abs(net_flow[i]) / max_flow for i in uzly]
+        else:
+            node_sizes = [15 + 10 * abs(net_flow[i]) for i in uzly]
+
         # Nastavení barev uzlů podle jejich Net Flow (zelená pro pozitivní, červená pro negativní)
         node_colors = []
-        for i in range(n_variants):
-            net_flow = prevysuje_count[i] - prevysovano_count[i]
-            if net_flow > 0:
-                intensity = min(255, 100 + 20 * net_flow)
+        for i in uzly:
+            if net_flow[i] > 0:
+                intensity = min(255, 100 + 20 * net_flow[i])
                 node_colors.append(f'rgba(0, {intensity}, 0, 0.8)')
-            elif net_flow < 0:
-                intensity = min(255, 100 + 20 * abs(net_flow))
+            elif net_flow[i] < 0:
+                intensity = min(255, 100 + 20 * abs(net_flow[i]))
                 node_colors.append(f'rgba({intensity}, 0, 0, 0.8)')
             else:
                 node_colors.append('rgba(100, 100, 100, 0.8)')  # Šedá pro neutrální
-        
+
+        if hasseuv_diagram:
+            titulek = 'Outranking relace - Hasseův diagram (lepší varianty výš)'
+        else:
+            titulek = 'Outranking relace (šipka znázorňuje převyšování)'
+        if len(uzly) < n_variants:
+            titulek += f'<br><sub>Zobrazeno {len(uzly)} z {n_variants} variant s nejvyšším net flow</sub>'
+
         # Vytvoření grafu
         fig = {
             'data': [
@@ -1241,6 +1633,18 @@ def vytvor_graf_outranking_relace(outranking_matrix, varianty):
                     },
                     'hoverinfo': 'none'
                 },
+                # Vzájemná převaha uvnitř skupin
+                {
+                    'x': vzajemne_x,
+                    'y': vzajemne_y,
+                    'mode': 'lines',
+                    'line': {
+                        'width': 1,
+                        'color': '#888',
+                        'dash': 'dash'
+                    },
+                    'hoverinfo': 'none'
+                },
                 # Uzly
                 {
                     'x': node_x,
@@ -1254,14 +1658,14 @@ def vytvor_graf_outranking_relace(outranking_matrix, varianty):
                             'color': 'darkblue'
                         }
                     },
-                    'text': varianty,
+                    'text': [varianty[i] for i in uzly],
                     'textposition': 'middle center',
                     'hoverinfo': 'text',
                     'hovertext': node_hover_texts
                 }
             ],
             'layout': {
-                'title': 'Outranking relace (šipka znázorňuje převyšování)',
+                'title': titulek,
                 'showlegend': False,
                 'xaxis': {
                     'showgrid': False,
@@ -1542,17 +1946,19 @@ def vytvor_radar_graf_topsis(topsis_vysledky, varianty, kriteria):
             )
         })
         
-        # 6) Každá varianta
-        for i, varianta in enumerate(varianty):
-            if i >= len(vazena_matice):
-                continue  # ochrana, kdyby nebylo dost řádků ve vazena_matice
-            
+        # 6) Varianty - při velkém počtu jen nejlepší podle výsledků a průměr ostatních
+        pocet_variant = min(len(varianty), len(vazena_matice))
+        zobrazene, ostatni = _rozdel_top_k(
+            _poradi_podle_vysledku(topsis_vysledky.get('results'), varianty[:pocet_variant])
+        )
+        for poradi, i in enumerate(zobrazene):
+            varianta = varianty[i]
             hodnoty = vazena_matice[i]
             
             # Uzavřeme první hodnotu, abychom vytvořili "kruh"
             uzavrene_hodnoty = hodnoty + [hodnoty[0]]
             
-            barva_idx = i % len(barvy)
+            barva_idx = poradi % len(barvy)
             barva = barvy[barva_idx]
             
             r = int(barva[1:3], 16)
@@ -1576,6 +1982,23 @@ def vytvor_radar_graf_topsis(topsis_vysledky, varianty, kriteria):
                 )
             })
         
+        if ostatni:
+            # Ostatní varianty souhrnně jako průměrný profil
+            prumer = [sum(vazena_matice[i][j] for i in ostatni) / len(ostatni) for j in range(len(kriteria))]
+            data.append({
+                'type': 'scatterpolar',
+                'r': prumer + [prumer[0]],
+                'theta': short_theta,
+                'customdata': full_crit,
+                'fill': 'none',
+                'name': _popis_ostatnich(len(ostatni), "průměr"),
+                'line': {'color': BARVA_OSTATNICH, 'width': 2, 'dash': 'dash'},
+                'hovertemplate': (
+                    "Kritérium: %{customdata}<br>"
+                    "Průměr ostatních: %{r:.4f}<extra></extra>"
+                )
+            })
+        
         # 7) Sestavení layoutu
         fig = {
             'data': data,
@@ -1,6 +1,12 @@
 # -------------------------------------------------------
 # Modul: Vypocty
 # Obsahuje sdílené funkce pro různé metody vícekriteriální analýzy
+#
+# Jediný výpočetní engine aplikace. Modul nepoužívá klientské importy,
+# takže jej volají formuláře na klientovi i serverové moduly (Export).
+# Na serveru je jeho zrychlenou cestou Vypocty_numpy, která vrací
+# bitově shodné výsledky. Parametry ELECTRE se předávají volajícím
+# (klient je bere ze Spravce_stavu, server z nastavení uživatele).
 # -------------------------------------------------------
 
 import anvil.server
@@ -8,7 +14,15 @@ import anvil.users
 import anvil.tables as tables
 import anvil.tables.query as q
 from anvil.tables import app_tables
-from . import Spravce_stavu, Utils
+import math
+from . import Normalizace, Rozhodovaci_matice
+
+# Kódy podporovaných metod
+METODY = ("wsm", "wpm", "topsis", "electre", "mabac")
+
+# Výchozí prahové hodnoty ELECTRE
+VYCHOZI_INDEX_SOUHLASU = 0.7
+VYCHOZI_INDEX_NESOUHLASU = 0.3
 
 # ========================
 # SPOLEČNÉ FUNKCE
@@ -27,25 +41,8 @@ def normalizuj_matici_minmax(matice, typy_kriterii, varianty, kriteria):
     Returns:
         dict: Slovník obsahující normalizovanou matici a metadata
     """
-    norm_matice = []
-    for i in range(len(matice)):
-        norm_radek = []
-        for j in range(len(matice[0])):
-            sloupec = [row[j] for row in matice]
-            min_val = min(sloupec)
-            max_val = max(sloupec)
-            
-            if max_val == min_val:
-                norm_hodnota = 1.0  # Všechny hodnoty jsou stejné
-            else:
-                # Pro MIN kritéria obrátíme normalizaci
-                if typy_kriterii[j].lower() in ("min", "cost"):
-                    norm_hodnota = (max_val - matice[i][j]) / (max_val - min_val)
-                else:
-                    norm_hodnota = (matice[i][j] - min_val) / (max_val - min_val)
-                
-            norm_radek.append(norm_hodnota)
-        norm_matice.append(norm_radek)
+    # Min a max sloupců se spočítají jedním průchodem (sdílená normalizační vrstva)
+    norm_matice = Normalizace.normalizuj_minmax(matice, typy_kriterii)
     
     return {
         'nazvy_variant': varianty,
@@ -80,37 +77,7 @@ def priprav_data_z_json(analyza_data):
     Returns:
         tuple: (matice, typy_kriterii, varianty, kriteria, vahy)
     """
-    try:
-        # Získání seznamu kritérií a jejich typů
-        kriteria_dict = analyza_data.get('kriteria', {})
-        kriteria = list(kriteria_dict.keys())
-        typy_kriterii = [kriteria_dict[k]['typ'] for k in kriteria]
-        vahy = [float(kriteria_dict[k]['vaha']) for k in kriteria]
-        
-        # Získání seznamu variant
-        varianty_dict = analyza_data.get('varianty', {})
-        varianty = list(varianty_dict.keys())
-        
-        # Vytvoření matice hodnot
-        matice = []
-        for var_nazev in varianty:
-            var_data = varianty_dict[var_nazev]
-            radek = []
-            for krit_nazev in kriteria:
-                # Získáme hodnotu pro kritérium, výchozí je 0 pokud chybí
-                hodnota = 0
-                if krit_nazev in var_data and krit_nazev != "popis_varianty":
-                    try:
-                        hodnota = float(var_data[krit_nazev])
-                    except (ValueError, TypeError):
-                        hodnota = 0
-                radek.append(hodnota)
-            matice.append(radek)
-            
-        return matice, typy_kriterii, varianty, kriteria, vahy
-        
-    except Exception as e:
-        raise ValueError(f"Chyba při přípravě dat pro výpočet: {str(e)}")
+    return Rozhodovaci_matice.Rozhodovaci_matice.z_json(analyza_data).jako_data()
 
 def validuj_vstupni_data_analyzy(analyza_data):
     """
@@ -157,13 +124,36 @@ def validuj_vstupni_data_analyzy(analyza_data):
     
     return True, ""
 
-def vypocitej_analyzu(analyza_data, metoda="wsm"):
+def priprav_rozhodovaci_matici(analyza_data):
+    """
+    Zvaliduje data analýzy a sestaví z nich rozhodovací matici.
+    Matici lze předat do libovolného počtu metod, takže se JSON
+    prochází a převádí jen jednou za analýzu.
+    
+    Args:
+        analyza_data: Slovník s daty analýzy
+        
+    Returns:
+        Rozhodovaci_matice: Sestavená rozhodovací matice
+        
+    Raises:
+        ValueError: Pokud data nejsou validní
+    """
+    je_validni, chyba = validuj_vstupni_data_analyzy(analyza_data)
+    if not je_validni:
+        raise ValueError(f"Neplatná vstupní data: {chyba}")
+    return Rozhodovaci_matice.Rozhodovaci_matice.z_json(analyza_data)
+
+def vypocitej_analyzu(analyza_data, metoda="wsm", rozhodovaci_matice=None,
+                      index_souhlasu=VYCHOZI_INDEX_SOUHLASU, index_nesouhlasu=VYCHOZI_INDEX_NESOUHLASU):
     """
     Obecná funkce pro výpočet libovolné metody vícekriteriální analýzy.
     
     Args:
         analyza_data: Slovník s daty analýzy v JSON formátu
         metoda: Kód metody analýzy ('wsm', 'wpm', 'topsis', 'electre', 'mabac')
+        rozhodovaci_matice: Předem sestavená Rozhodovaci_matice (volitelné)
+        index_souhlasu, index_nesouhlasu: Prahové hodnoty ELECTRE (jen pro ELECTRE)
         
     Returns:
         dict: Výsledky analýzy ve standardizovaném formátu
@@ -174,29 +164,52 @@ def vypocitej_analyzu(analyza_data, metoda="wsm"):
     metoda = metoda.lower()
     
     if metoda == "wsm":
-        return vypocitej_wsm_analyzu(analyza_data)
+        return vypocitej_wsm_analyzu(analyza_data, rozhodovaci_matice)
     elif metoda == "wpm":
-        return vypocitej_wpm_analyzu(analyza_data)
+        return vypocitej_wpm_analyzu(analyza_data, rozhodovaci_matice)
     elif metoda == "topsis":
-        return vypocitej_topsis_analyzu(analyza_data)
+        return vypocitej_topsis_analyzu(analyza_data, rozhodovaci_matice)
     elif metoda == "electre":
-        return vypocitej_electre_analyzu(analyza_data)
+        return vypocitej_electre_analyzu(analyza_data, rozhodovaci_matice, index_souhlasu, index_nesouhlasu)
     elif metoda == "mabac":
-        return vypocitej_mabac_analyzu(analyza_data)
+        return vypocitej_mabac_analyzu(analyza_data, rozhodovaci_matice)
     else:
         raise ValueError(f"Nepodporovaná metoda analýzy: {metoda}")
 
+def sdilene_mezivysledky(vysledek_metody):
+    """
+    Vybere z výsledku libovolné metody data společná všem metodám.
+
+    Args:
+        vysledek_metody: Strukturovaný výsledek jedné metody
+
+    Returns:
+        dict: Názvy variant a kritérií, typy kritérií, váhy,
+              původní a min-max normalizovaná matice
+    """
+    norm_vysledky = vysledek_metody['norm_vysledky']
+    return {
+        'nazvy_variant': norm_vysledky['nazvy_variant'],
+        'nazvy_kriterii': norm_vysledky['nazvy_kriterii'],
+        'typy_kriterii': vysledek_metody['typy_kriterii'],
+        'vahy': vysledek_metody['vahy'],
+        'matice': vysledek_metody['matice'],
+        'normalizovana_matice': norm_vysledky['normalizovana_matice'],
+    }
+
 # ========================
 # METODA WSM
 # ========================
 
-def vypocitej_wsm_analyzu(analyza_data):
+def vypocitej_wsm_analyzu(analyza_data, rozhodovaci_matice=None):
     """
     Centralizovaná funkce pro výpočet WSM analýzy z dat.
     Provádí všechny kroky WSM analýzy a vrací strukturovaný výsledek.
     
     Args:
         analyza_data: Slovník s daty analýzy
+        rozhodovaci_matice: Předem sestavená a zvalidovaná Rozhodovaci_matice
+            (volitelné, jinak se sestaví z analyza_data)
         
     Returns:
         dict: Strukturovaný výsledek s normalizovanou maticí, váženými hodnotami a výsledky
@@ -205,13 +218,10 @@ def vypocitej_wsm_analyzu(analyza_data):
         ValueError: Pokud data nejsou validní nebo nelze provést výpočet
     """
     try:
-        # Kontrola validity dat
-        je_validni, chyba = validuj_vstupni_data_analyzy(analyza_data)
-        if not je_validni:
-            raise ValueError(f"Neplatná vstupní data: {chyba}")
-            
-        # 1. Příprava dat z JSON formátu
-        matice, typy_kriterii, varianty, kriteria, vahy = priprav_data_z_json(analyza_data)
+        # 1. Rozhodovací matice - z JSON se sestaví a zvaliduje jen pokud nebyla předána
+        if rozhodovaci_matice is None:
+            rozhodovaci_matice = priprav_rozhodovaci_matici(analyza_data)
+        matice, typy_kriterii, varianty, kriteria, vahy = rozhodovaci_matice.jako_data()
         
         # 2. Normalizace matice pomocí min-max metody
         norm_vysledky = normalizuj_matici_minmax(matice, typy_kriterii, varianty, kriteria)
@@ -291,13 +301,15 @@ def wsm_vypocet(norm_matice, vahy, varianty):
 # METODA WPM
 # ========================
 
-def vypocitej_wpm_analyzu(analyza_data):
+def vypocitej_wpm_analyzu(analyza_data, rozhodovaci_matice=None):
     """
     Centralizovaná funkce pro výpočet WPM analýzy z dat.
     Provádí všechny kroky WPM analýzy a vrací strukturovaný výsledek.
     
     Args:
         analyza_data: Slovník s daty analýzy
+        rozhodovaci_matice: Předem sestavená a zvalidovaná Rozhodovaci_matice
+            (volitelné, jinak se sestaví z analyza_data)
         
     Returns:
         dict: Strukturovaný výsledek s normalizovanou maticí, produktovými příspěvky a výsledky
@@ -306,13 +318,10 @@ def vypocitej_wpm_analyzu(analyza_data):
         ValueError: Pokud data nejsou validní nebo nelze provést výpočet
     """
     try:
-        # Kontrola validity dat
-        je_validni, chyba = validuj_vstupni_data_analyzy(analyza_data)
-        if not je_validni:
-            raise ValueError(f"Neplatná vstupní data: {chyba}")
-            
-        # 1. Příprava dat z JSON formátu
-        matice, typy_kriterii, varianty, kriteria, vahy = priprav_data_z_json(analyza_data)
+        # 1. Rozhodovací matice - z JSON se sestaví a zvaliduje jen pokud nebyla předána
+        if rozhodovaci_matice is None:
+            rozhodovaci_matice = priprav_rozhodovaci_matici(analyza_data)
+        matice, typy_kriterii, varianty, kriteria, vahy = rozhodovaci_matice.jako_data()
         
         # 2. Normalizace matice pomocí min-max metody pro vizualizaci
         # (pro samotný výpočet WPM není normalizace nutná,
@@ -509,13 +518,15 @@ def vypocitej_matici_pomeru_variant(matice, vahy, typy_kriterii):
 # METODA TOPSIS
 # ========================
 
-def vypocitej_topsis_analyzu(analyza_data):
+def vypocitej_topsis_analyzu(analyza_data, rozhodovaci_matice=None):
     """
     Centralizovaná funkce pro výpočet TOPSIS analýzy z dat.
     Provádí všechny kroky TOPSIS analýzy a vrací strukturovaný výsledek.
     
     Args:
         analyza_data: Slovník s daty analýzy
+        rozhodovaci_matice: Předem sestavená a zvalidovaná Rozhodovaci_matice
+            (volitelné, jinak se sestaví z analyza_data)
         
     Returns:
         dict: Strukturovaný výsledek s normalizovanou maticí, vzdálenostmi a výsledky
@@ -524,13 +535,10 @@ def vypocitej_topsis_analyzu(analyza_data):
         ValueError: Pokud data nejsou validní nebo nelze provést výpočet
     """
     try:
-        # Kontrola validity dat
-        je_validni, chyba = validuj_vstupni_data_analyzy(analyza_data)
-        if not je_validni:
-            raise ValueError(f"Neplatná vstupní data: {chyba}")
-            
-        # 1. Příprava dat z JSON formátu
-        matice, typy_kriterii, varianty, kriteria, vahy = priprav_data_z_json(analyza_data)
+        # 1. Rozhodovací matice - z JSON se sestaví a zvaliduje jen pokud nebyla předána
+        if rozhodovaci_matice is None:
+            rozhodovaci_matice = priprav_rozhodovaci_matici(analyza_data)
+        matice, typy_kriterii, varianty, kriteria, vahy = rozhodovaci_matice.jako_data()
         
         # 2. Pro TOPSIS používáme původní matici a normalizujeme ji v samotné metodě TOPSIS
         # Pro kompatibilitu s ostatními funkcemi vytvoříme také min-max normalizovanou matici
@@ -578,18 +586,8 @@ def topsis_vypocet(matice, vahy, varianty, kriteria, typy_kriterii):
     """
     try:
         # 1. Vektorizace rozhodovací matice (normalizace pomocí Euklidovské normy)
-        norm_matice = []
-        for i in range(len(varianty)):
-            radek = []
-            for j in range(len(kriteria)):
-                # Vypočítáme Euklidovskou normu pro každé kritérium
-                sloupec = [matice[k][j] for k in range(len(varianty))]
-                norma = (sum(x**2 for x in sloupec)) ** 0.5
-                
-                # Normalizace hodnoty
-                hodnota = matice[i][j] / norma if norma != 0 else 0
-                radek.append(hodnota)
-            norm_matice.append(radek)
+        # Normy sloupců se berou ze sdílených statistik sloupců
+        norm_matice = Normalizace.normalizuj_vektorove(matice)
         
         # 2. Výpočet vážené normalizované matice
         vazena_matice = []
@@ -666,13 +664,18 @@ def topsis_vypocet(matice, vahy, varianty, kriteria, typy_kriterii):
 # METODA ELECTRE
 # ========================
 
-def vypocitej_electre_analyzu(analyza_data):
+def vypocitej_electre_analyzu(analyza_data, rozhodovaci_matice=None,
+                              index_souhlasu=VYCHOZI_INDEX_SOUHLASU, index_nesouhlasu=VYCHOZI_INDEX_NESOUHLASU):
     """
     Centralizovaná funkce pro výpočet ELECTRE analýzy z dat.
     Provádí všechny kroky ELECTRE analýzy a vrací strukturovaný výsledek.
     
     Args:
         analyza_data: Slovník s daty analýzy
+        rozhodovaci_matice: Předem sestavená a zvalidovaná Rozhodovaci_matice
+            (volitelné, jinak se sestaví z analyza_data)
+        index_souhlasu: Prahová hodnota indexu souhlasu
+        index_nesouhlasu: Prahová hodnota indexu nesouhlasu
         
     Returns:
         dict: Strukturovaný výsledek s maticemi souhlasu, nesouhlasu a výsledky
@@ -681,20 +684,14 @@ def vypocitej_electre_analyzu(analyza_data):
         ValueError: Pokud data nejsou validní nebo nelze provést výpočet
     """
     try:
-        # Kontrola validity dat
-        je_validni, chyba = validuj_vstupni_data_analyzy(analyza_data)
-        if not je_validni:
-            raise ValueError(f"Neplatná vstupní data: {chyba}")
-            
-        # 1. Příprava dat z JSON formátu
-        matice, typy_kriterii, varianty, kriteria, vahy = priprav_data_z_json(analyza_data)
+        # 1. Rozhodovací matice - z JSON se sestaví a zvaliduje jen pokud nebyla předána
+        if rozhodovaci_matice is None:
+            rozhodovaci_matice = priprav_rozhodovaci_matici(analyza_data)
+        matice, typy_kriterii, varianty, kriteria, vahy = rozhodovaci_matice.jako_data()
         
-        # 2. Získání parametrů ELECTRE z nastavení uživatele
-        from . import Spravce_stavu
-        spravce = Spravce_stavu.Spravce_stavu()
-        electre_params = spravce.ziskej_nastaveni_electre()
-        index_souhlasu = electre_params['index_souhlasu'] 
-        index_nesouhlasu = electre_params['index_nesouhlasu']
+        # 2. Parametry ELECTRE předává volající (nastavení uživatele)
+        index_souhlasu = float(index_souhlasu)
+        index_nesouhlasu = float(index_nesouhlasu)
         
         # 3. Normalizace matice pomocí min-max metody pro další výpočty
         norm_vysledky = normalizuj_matici_minmax(matice, typy_kriterii, varianty, kriteria)
@@ -883,17 +880,50 @@ def vypocitej_net_flows(outranking_matrix, varianty):
     # Seřazení podle net_flow sestupně
     return sorted(net_flows, key=lambda x: x[1], reverse=True)
 
+# Počet variant s nejvyšším net flow, mezi kterými souhrn relace převahy
+# obsahuje hustou podmatici převahy (pro graf outrankingových relací)
+POCET_UZLU_SOUHRNU_PREVAHY = 30
+
+def souhrn_prevahy(outranking_matrix, results, varianty):
+    """
+    Shrne matici převahy pro výstupy, kterým se celá matice neposílá.
+    Velké analýzy počítané po dlaždicích (Vypocty_numpy) vracejí stejný
+    souhrn přímo z řídké relace.
+    
+    Args:
+        outranking_matrix: Binární matice převahy
+        results: Seřazené výsledky ELECTRE (varianta, pořadí, net_flow)
+        varianty: Seznam názvů variant
+        
+    Returns:
+        dict: 'prevysuje' a 'prevysovano' (počty pro každou variantu),
+              'pocet_relaci', 'uzly' (indexy variant s nejvyšším net flow
+              vzestupně) a 'matice' (podmatice převahy mezi nimi)
+    """
+    index_varianty = {varianta: i for i, varianta in enumerate(varianty)}
+    uzly = sorted(index_varianty[varianta] for varianta, _, _ in results[:POCET_UZLU_SOUHRNU_PREVAHY])
+    prevysuje = [sum(radek) for radek in outranking_matrix]
+    return {
+        'prevysuje': prevysuje,
+        'prevysovano': [sum(sloupec) for sloupec in zip(*outranking_matrix)],
+        'pocet_relaci': sum(prevysuje),
+        'uzly': uzly,
+        'matice': [[outranking_matrix[i][j] for j in uzly] for i in uzly]
+    }
+
 # ========================
 # METODA MABAC
 # ========================
 
-def vypocitej_mabac_analyzu(analyza_data):
+def vypocitej_mabac_analyzu(analyza_data, rozhodovaci_matice=None):
     """
     Centralizovaná funkce pro výpočet MABAC analýzy z dat.
     Provádí všechny kroky MABAC analýzy a vrací strukturovaný výsledek.
     
     Args:
         analyza_data: Slovník s daty analýzy
+        rozhodovaci_matice: Předem sestavená a zvalidovaná Rozhodovaci_matice
+            (volitelné, jinak se sestaví z analyza_data)
         
     Returns:
         dict: Strukturovaný výsledek s normalizovanou maticí, mezními hodnotami a výsledky
@@ -902,13 +932,10 @@ def vypocitej_mabac_analyzu(analyza_data):
         ValueError: Pokud data nejsou validní nebo nelze provést výpočet
     """
     try:
-        # Kontrola validity dat
-        je_validni, chyba = validuj_vstupni_data_analyzy(analyza_data)
-        if not je_validni:
-            raise ValueError(f"Neplatná vstupní data: {chyba}")
-            
-        # 1. Příprava dat z JSON formátu
-        matice, typy_kriterii, varianty, kriteria, vahy = priprav_data_z_json(analyza_data)
+        # 1. Rozhodovací matice - z JSON se sestaví a zvaliduje jen pokud nebyla předána
+        if rozhodovaci_matice is None:
+            rozhodovaci_matice = priprav_rozhodovaci_matici(analyza_data)
+        matice, typy_kriterii, varianty, kriteria, vahy = rozhodovaci_matice.jako_data()
         
         # 2. Normalizace matice pomocí min-max metody
         norm_vysledky = normalizuj_matici_minmax(matice, typy_kriterii, varianty, kriteria)
@@ -1028,6 +1055,7 @@ def vypocitej_analyzu_citlivosti(norm_matice, vahy, varianty, kriteria, metoda="
     
     Args:
         norm_matice: 2D list - pro WSM/TOPSIS normalizované hodnoty, pro WPM/MABAC původní hodnoty
+                     (pro WPM/MABAC lze předat přímo Rozhodovaci_matice)
         vahy: List vah kritérií
         varianty: List názvů variant
         kriteria: List názvů kritérií
@@ -1040,6 +1068,11 @@ def vypocitej_analyzu_citlivosti(norm_matice, vahy, varianty, kriteria, metoda="
         dict: Výsledky analýzy citlivosti
     """
     try:
+        # Rozhodovací matice se použije přímo, bez nového převodu z JSON
+        if isinstance(norm_matice, Rozhodovaci_matice.Rozhodovaci_matice):
+            typy_kriterii = typy_kriterii or norm_matice.typy_kriterii
+            norm_matice = norm_matice.jako_seznam()
+            
         # Kontrola vstupních dat
         if not kriteria or len(kriteria) == 0:
             raise ValueError("Seznam kritérií je prázdný")
@@ -1073,57 +1106,31 @@ def vypocitej_analyzu_citlivosti(norm_matice, vahy, varianty, kriteria, metoda="
             # Váha od 0.1 do 0.9
             vahy_rozsah.append(0.1 + (0.8 * i / (pocet_kroku - 1)))
         
+        metoda = metoda.lower()
+        if metoda not in ("wsm", "wpm", "topsis", "mabac"):
+            raise ValueError(f"Nepodporovaná metoda analýzy: {metoda}")
+        
+        # WSM, WPM (v logaritmu) a MABAC mají skóre lineární ve váze vybraného
+        # kritéria - přímky skore_i = a_i + b_i * vaha se spočítají jen jednou
+        if metoda != "topsis":
+            prispevky = _prispevky_kriterii_citlivosti(norm_matice, typy_kriterii, metoda)
+            primky = _linearni_koeficienty_citlivosti(prispevky, vahy, vyber_kriteria)
+        
         citlivost_skore = []    # Bude obsahovat skóre pro každou kombinaci váhy a varianty
         citlivost_poradi = []   # Bude obsahovat pořadí pro každou kombinaci váhy a varianty
         
         # Pro každou váhu v rozsahu
         for vaha in vahy_rozsah:
-            # Vytvoření nových vah
-            nove_vahy = vahy.copy()
-            nove_vahy[vyber_kriteria] = vaha
-            
-            # Přepočítání vah zbývajících kritérií proporcionálně
-            zbyvajici_vaha = 1 - vaha
-            
-            suma_zbylych_vah = sum([nove_vahy[i] for i in range(len(nove_vahy)) if i != vyber_kriteria])
-            if suma_zbylych_vah > 0:
-                for i in range(len(nove_vahy)):
-                    if i != vyber_kriteria:
-                        nove_vahy[i] = (nove_vahy[i] / suma_zbylych_vah) * zbyvajici_vaha
-            
-            # Výpočet nových skóre podle metody
-            if metoda.lower() == "wsm":
-                # WSM metoda - sčítání vážených hodnot
-                skore_variant = []
-                for i in range(len(varianty)):
-                    skore = 0
-                    for j in range(len(kriteria)):
-                        skore += norm_matice[i][j] * nove_vahy[j]
-                    skore_variant.append(skore)
+            if metoda == "wsm" or metoda == "mabac":
+                skore_variant = [a + b * vaha for a, b in primky]
             
-            elif metoda.lower() == "wpm":
-                # WPM metoda - násobení hodnot umocněných na váhy
-                skore_variant = []
-                for i in range(len(varianty)):
-                    skore = 1.0  # Inicializace na 1 pro násobení
-                    for j in range(len(kriteria)):
-                        hodnota = norm_matice[i][j]
-                        
-                        # Kontrola, že hodnoty nejsou nulové nebo záporné
-                        if hodnota <= 0:
-                            hodnota = 0.001  # Malá kladná hodnota
-                        
-                        # Pro minimalizační kritéria používáme 1/hodnota
-                        if typy_kriterii[j].lower() in ("min", "cost"):
-                            hodnota = 1 / hodnota
-                        
-                        # Umocníme hodnotu na váhu a vynásobíme dosavadní skóre
-                        skore *= hodnota ** nove_vahy[j]
-                        
-                    skore_variant.append(skore)
+            elif metoda == "wpm":
+                # Logaritmus skóre je lineární, skóre je jeho exponenciála
+                skore_variant = [math.exp(a + b * vaha) for a, b in primky]
                     
-            elif metoda.lower() == "topsis":
+            else:
                 # TOPSIS metoda - výpočet relativní blízkosti k ideálnímu řešení
+                nove_vahy = _prepocitej_vahy(vahy, vyber_kriteria, vaha)
                 skore_variant = []
                 
                 # Výpočet vážené normalizované matice
@@ -1160,61 +1167,6 @@ def vypocitej_analyzu_citlivosti(norm_matice, vahy, varianty, kriteria, metoda="
                         relativni_blizkost = dist_anti_ideal / (dist_ideal + dist_anti_ideal)
                     
                     skore_variant.append(relativni_blizkost)
-                    
-            elif metoda.lower() == "mabac":
-                # MABAC metoda
-                skore_variant = []
-                
-                # 1. Normalizace matice
-                norm_matice_minmax = []
-                for i in range(len(varianty)):
-                    radek = []
-                    for j in range(len(kriteria)):
-                        sloupec = [row[j] for row in norm_matice]
-                        min_val = min(sloupec)
-                        max_val = max(sloupec)
-                        
-                        if max_val == min_val:
-                            norm_hodnota = 1.0
-                        else:
-                            # Pro MIN kritéria obrátíme normalizaci
-                            if typy_kriterii[j].lower() in ("min", "cost"):
-                                norm_hodnota = (max_val - norm_matice[i][j]) / (max_val - min_val)
-                            else:
-                                norm_hodnota = (norm_matice[i][j] - min_val) / (max_val - min_val)
-                            
-                        radek.append(norm_hodnota)
-                    norm_matice_minmax.append(radek)
-                
-                # 2. Výpočet vážené normalizované matice - specifický pro MABAC
-                vazena_matice = []
-                for i in range(len(varianty)):
-                    radek = []
-                    for j in range(len(kriteria)):
-                        # v_ij = w_j * (r_ij + 1)
-                        v_ij = nove_vahy[j] * (norm_matice_minmax[i][j] + 1)
-                        radek.append(v_ij)
-                    vazena_matice.append(radek)
-                
-                # 3. Výpočet hraničních hodnot
-                g_values = []
-                for j in range(len(kriteria)):
-                    g = 1
-                    for i in range(len(varianty)):
-                        g *= vazena_matice[i][j]
-                    g = g ** (1/len(varianty))
-                    g_values.append(g)
-                
-                # 4. Výpočet vzdáleností od hranic a skóre
-                for i in range(len(varianty)):
-                    celkove_skore = 0
-                    for j in range(len(kriteria)):
-                        q = vazena_matice[i][j] - g_values[j]
-                        celkove_skore += q
-                    skore_variant.append(celkove_skore)
-                
-            else:
-                raise ValueError(f"Nepodporovaná metoda analýzy: {metoda}")
             
             # Určení pořadí variant pro tyto váhy
             serazene_indexy = sorted(range(len(skore_variant)), 
@@ -1235,4 +1187,82 @@ def vypocitej_analyzu_citlivosti(norm_matice, vahy, varianty, kriteria, metoda="
             'zvolene_kriterium_index': vyber_kriteria
         }
     except Exception as e:
-        raise ValueError(f"Chyba při výpočtu analýzy citlivosti: {str(e)}")
\ No newline at end of file
+        raise ValueError(f"Chyba při výpočtu analýzy citlivosti: {str(e)}")
+
+def _prepocitej_vahy(vahy, vyber_kriteria, vaha):
+    """
+    Nastaví váhu vybraného kritéria a ostatní váhy proporcionálně
+    přepočítá tak, aby jejich součet byl 1 - vaha.
+    """
+    nove_vahy = vahy.copy()
+    nove_vahy[vyber_kriteria] = vaha
+    
+    suma_zbylych_vah = sum([nove_vahy[i] for i in range(len(nove_vahy)) if i != vyber_kriteria])
+    if suma_zbylych_vah > 0:
+        for i in range(len(nove_vahy)):
+            if i != vyber_kriteria:
+                nove_vahy[i] = (nove_vahy[i] / suma_zbylych_vah) * (1 - vaha)
+    return nove_vahy
+
+def _prispevky_kriterii_citlivosti(matice, typy_kriterii, metoda):
+    """
+    Vrátí matici příspěvků C, pro kterou je skóre metody rovno součtu
+    C[i][j] * vahy[j] (u WPM jde o logaritmus skóre).
+    
+    Args:
+        matice: 2D list - pro WSM normalizované hodnoty, pro WPM/MABAC původní hodnoty
+        typy_kriterii: List typů kritérií
+        metoda: "wsm", "wpm" nebo "mabac"
+    
+    Returns:
+        2D list příspěvků [varianty][kriteria]
+    """
+    if metoda == "wsm":
+        return matice
+    
+    if metoda == "wpm":
+        prispevky = []
+        for radek in matice:
+            prispevky_radku = []
+            for j, hodnota in enumerate(radek):
+                # Nekladné hodnoty se nahrazují malou kladnou hodnotou
+                if hodnota <= 0:
+                    hodnota = 0.001
+                # Pro minimalizační kritéria se používá 1/hodnota
+                if Normalizace.je_minimalizacni(typy_kriterii[j]):
+                    hodnota = 1 / hodnota
+                prispevky_radku.append(math.log(hodnota))
+            prispevky.append(prispevky_radku)
+        return prispevky
+    
+    # MABAC: v_ij = w_j * (r_ij + 1), hraniční hodnota g_j = w_j * G_j,
+    # kde G_j je geometrický průměr (r_ij + 1), takže q_ij = w_j * (r_ij + 1 - G_j)
+    norm_matice = Normalizace.normalizuj_minmax(matice, typy_kriterii)
+    pocet_variant = len(norm_matice)
+    hranice = []
+    for j in range(len(typy_kriterii)):
+        soucin = 1
+        for i in range(pocet_variant):
+            soucin *= norm_matice[i][j] + 1
+        hranice.append(soucin ** (1 / pocet_variant))
+    return [[r + 1 - hranice[j] for j, r in enumerate(radek)] for radek in norm_matice]
+
+def _linearni_koeficienty_citlivosti(prispevky, vahy, vyber_kriteria):
+    """
+    Spočítá přímky skore_i(vaha) = a_i + b_i * vaha pro změnu váhy vybraného
+    kritéria s proporcionálním přepočtem ostatních vah.
+    
+    Returns:
+        list: Dvojice (a_i, b_i) pro každou variantu
+    """
+    suma_zbylych_vah = sum(v for j, v in enumerate(vahy) if j != vyber_kriteria)
+    primky = []
+    for radek in prispevky:
+        zbytek = sum(radek[j] * vahy[j] for j in range(len(vahy)) if j != vyber_kriteria)
+        if suma_zbylych_vah > 0:
+            # Ostatní váhy se škálují faktorem (1 - vaha) / suma_zbylych_vah
+            a = zbytek / suma_zbylych_vah
+            primky.append((a, radek[vyber_kriteria] - a))
+        else:
+            primky.append((zbytek, radek[vyber_kriteria]))
+    return primky
@@ -6,7 +6,7 @@ import anvil.users
 import anvil.tables as tables
 import anvil.tables.query as q
 from anvil.tables import app_tables
-from .. import Spravce_stavu, Utils,Generator_html, Vypocty, Vizualizace, mcapp_styly
+from .. import Spravce_stavu, Utils, Generator_html, Vypocty, Vizualizace, mcapp_styly, Zdroj_vysledku, Sledovani_uloh, Odlozene_grafy
 
 class Vystup_electre_komp(Vystup_electre_kompTemplate):
   def __init__(self, analyza_id=None, **properties):
@@ -26,6 +26,11 @@ class Vystup_electre_komp(Vystup_electre_kompTemplate):
     # Data, která budeme používat v celém formuláři
     self.analyza_data = None
     self.vysledky_vypoctu = None
+    self.html_obsah = None
+    # Počet variant zobrazených v tabulkách, zvětšuje se odkazem pod výsledky
+    self.max_radku = Generator_html.MAX_RADKU_TABULKY
+    # Grafy se vytvářejí až při přiblížení k viditelné části stránky
+    self.grafy = Odlozene_grafy.Odlozene_grafy()
 
   def form_show(self, **event_args):
     """Načte a zobrazí data analýzy při zobrazení formuláře."""
@@ -41,11 +46,11 @@ class Vystup_electre_komp(Vystup_electre_kompTemplate):
         electre_params = self.spravce.ziskej_nastaveni_electre()
         Utils.zapsat_info(f"Aktuální parametry ELECTRE: souhlas={electre_params['index_souhlasu']}, nesouhlas={electre_params['index_nesouhlasu']}")
 
-        # Načtení dat analýzy z JSON struktury
-        self.analyza_data = anvil.server.call("nacti_analyzu", self.analyza_id)
-
-        # Výpočet ELECTRE analýzy
-        self.vysledky_vypoctu = Vypocty.vypocitej_analyzu(self.analyza_data, metoda="electre")
+        # Načtení dat analýzy a výpočet ELECTRE (standardně na serveru,
+        # prahy se tam berou ze stejného nastavení uživatele)
+        self.analyza_data, self.vysledky_vypoctu, self.html_obsah = Zdroj_vysledku.nacti_vysledky(
+            self.analyza_id, "electre", self.max_radku
+        )
 
         # Zobrazení výsledků
         self._zobraz_kompletni_analyzu()
@@ -67,6 +72,7 @@ class Vystup_electre_komp(Vystup_electre_kompTemplate):
         </div>
         """
     self.html_1.html = mcapp_styly.vloz_styly_do_html(chyba_html)
+    self.dalsi_radky_link.visible = False
     self._skryj_grafy()
 
   def _zobraz_chybovou_zpravu(self, zprava):
@@ -78,18 +84,14 @@ class Vystup_electre_komp(Vystup_electre_kompTemplate):
         </div>
         """
     self.html_1.html = mcapp_styly.vloz_styly_do_html(chyba_html)
+    self.dalsi_radky_link.visible = False
     self._skryj_grafy()
 
   def _zobraz_kompletni_analyzu(self):
     """Zobrazí kompletní analýzu včetně všech výpočtů a vizualizací."""
     try:
-      # Vytvoření HTML obsahu pomocí funkcí z modulu Vizualizace
-      html_obsah = Generator_html.vytvor_kompletni_html_analyzy(
-        self.analyza_data, self.vysledky_vypoctu, "ELECTRE"
-      )
-
-      # Vložení stylů do HTML
-      self.html_1.html = mcapp_styly.vloz_styly_do_html(html_obsah)
+      # Vytvoření HTML obsahu s tabulkami zkrácenými na self.max_radku variant
+      self._zobraz_html()
 
       # Vytvoření a nastavení grafů
       self._vytvor_a_nastav_grafy()
@@ -99,60 +101,84 @@ class Vystup_electre_komp(Vystup_electre_kompTemplate):
       self._zobraz_chybovou_zpravu(str(e))
       self._skryj_grafy()
 
+  def _zobraz_html(self):
+    """Zobrazí HTML výsledků, velké tabulky ukazují prvních self.max_radku variant."""
+    self.html_1.html = mcapp_styly.vloz_styly_do_html(self.html_obsah)
+
+    pocet_variant = len(self.vysledky_vypoctu["norm_vysledky"]["nazvy_variant"])
+    self.dalsi_radky_link.text = f"Zobrazit další varianty v tabulkách ({self.max_radku} z {pocet_variant})"
+    self.dalsi_radky_link.visible = pocet_variant > self.max_radku
+
+  def dalsi_radky_link_click(self, **event_args):
+    """Rozšíří tabulky o další várku variant (grafy zůstávají)."""
+    self.max_radku += Generator_html.MAX_RADKU_TABULKY
+    self.html_obsah = Zdroj_vysledku.nacti_html_vysledku(
+        self.analyza_id, "electre", self.analyza_data, self.vysledky_vypoctu, self.max_radku
+    )
+    self._zobraz_html()
+
   def _vytvor_a_nastav_grafy(self):
-    """Vytvoří a nastaví grafy pro vizualizaci výsledků."""
+    """Zaregistruje grafy výsledků, vytvoří se až při zobrazení."""
     try:
+        self.grafy.vycisti()
+
         # Získání seřazených variant podle výsledků
         serazene_varianty = [var for var, _, _ in sorted(
             self.vysledky_vypoctu["electre_vysledky"]["results"], 
             key=lambda x: x[1]  # Seřazení podle pořadí
         )]
 
-        # Přeuspořádání matic podle seřazených variant
-        concordance_matrix_serazena = self._preusporadat_matici_pomerova(
-            self.vysledky_vypoctu["electre_vysledky"]["concordance_matrix"],
-            self.vysledky_vypoctu["norm_vysledky"]["nazvy_variant"],
-            serazene_varianty
-        )
-        
-        discordance_matrix_serazena = self._preusporadat_matici_pomerova(
-            self.vysledky_vypoctu["electre_vysledky"]["discordance_matrix"],
-            self.vysledky_vypoctu["norm_vysledky"]["nazvy_variant"],
-            serazene_varianty
-        )
-
         # Graf výsledků - pořadí variant
-        self.plot_electre_vysledky.figure = Vizualizace.vytvor_graf_electre_vysledky(
+        self.grafy.pridej("vysledky", self.plot_electre_vysledky, lambda: Vizualizace.vytvor_graf_electre_vysledky(
             self.vysledky_vypoctu["electre_vysledky"]["results"],
             self.vysledky_vypoctu["norm_vysledky"]["nazvy_variant"]
-        )
-        self.plot_electre_vysledky.visible = True
+        ))
 
-        # Graf matice souhlasu (concordance)
-        self.plot_sablona_skladba.figure = Vizualizace.vytvor_graf_concordance_electre(
-            concordance_matrix_serazena, 
-            serazene_varianty
-        )
-        self.plot_sablona_skladba.visible = True
+        # U velkých analýz server matice souhlasu a nesouhlasu nevrací
+        electre_vysledky = self.vysledky_vypoctu["electre_vysledky"]
+        if electre_vysledky["concordance_matrix"] is None:
+            self.plot_sablona_skladba.visible = False
+            self.plot_discordance.visible = False
+        else:
+            # Graf matice souhlasu (concordance) přeuspořádané podle seřazených variant
+            self.grafy.pridej("souhlas", self.plot_sablona_skladba, lambda: Vizualizace.vytvor_graf_concordance_electre(
+                self._preusporadat_matici_pomerova(
+                    electre_vysledky["concordance_matrix"],
+                    self.vysledky_vypoctu["norm_vysledky"]["nazvy_variant"],
+                    serazene_varianty
+                ),
+                serazene_varianty
+            ))
 
-        # Graf matice nesouhlasu (discordance)
-        self.plot_discordance.figure = Vizualizace.vytvor_graf_discordance_electre(
-            discordance_matrix_serazena, 
-            serazene_varianty
-        )
-        self.plot_discordance.visible = True
+            # Graf matice nesouhlasu (discordance) přeuspořádané podle seřazených variant
+            self.grafy.pridej("nesouhlas", self.plot_discordance, lambda: Vizualizace.vytvor_graf_discordance_electre(
+                self._preusporadat_matici_pomerova(
+                    electre_vysledky["discordance_matrix"],
+                    self.vysledky_vypoctu["norm_vysledky"]["nazvy_variant"],
+                    serazene_varianty
+                ),
+                serazene_varianty
+            ))
 
-        # Graf outrankingových relací
-        self.plot_electre_outranking.figure = Vizualizace.vytvor_graf_outranking_relace(
-            self.vysledky_vypoctu["electre_vysledky"]["outranking_matrix"],
-            self.vysledky_vypoctu["norm_vysledky"]["nazvy_variant"]
-        )
-        self.plot_electre_outranking.visible = True
+        # Graf outrankingových relací, pro mnoho variant výchozí jako Hasseův diagram
+        pocet_variant = len(self.vysledky_vypoctu["norm_vysledky"]["nazvy_variant"])
+        self.hasse_checkbox.checked = pocet_variant > Vizualizace.MAX_UZLU_GRAFU_PREVAHY
+        self.hasse_checkbox.visible = True
+        self.grafy.pridej("prevaha", self.plot_electre_outranking, lambda: Vizualizace.vytvor_graf_outranking_relace(
+            electre_vysledky["outranking_matrix"],
+            self.vysledky_vypoctu["norm_vysledky"]["nazvy_variant"],
+            hasseuv_diagram=self.hasse_checkbox.checked,
+            souhrn_prevahy=electre_vysledky.get("souhrn_prevahy")
+        ))
 
     except Exception as e:
         Utils.zapsat_chybu(f"Chyba při vytváření grafů: {str(e)}")
         self._skryj_grafy()
 
+  def hasse_checkbox_change(self, **event_args):
+    """Přepne graf outrankingových relací mezi všemi hranami a Hasseovým diagramem."""
+    self.grafy.obnov("prevaha")
+
   def _preusporadat_matici_pomerova(self, matice, puvodni_poradi, nove_poradi):
       """
       Přeuspořádá čtvercovou matici poměrů podle nového pořadí řádků a sloupců.
@@ -197,10 +223,12 @@ class Vystup_electre_komp(Vystup_electre_kompTemplate):
 
   def _skryj_grafy(self):
     """Skryje všechny grafy ve formuláři."""
+    self.grafy.vycisti()
     self.plot_electre_vysledky.visible = False
     self.plot_sablona_skladba.visible = False
     self.plot_discordance.visible = False
     self.plot_electre_outranking.visible = False
+    self.hasse_checkbox.visible = False
 
   def export_link_click(self, **event_args):
         """Obsluha kliknutí na tlačítko pro export PDF."""
@@ -214,8 +242,13 @@ class Vystup_electre_komp(Vystup_electre_kompTemplate):
             self.export_link.text = "Generuji PDF..."
             self.export_link.enabled = False
             
-            # Volání serverové funkce pro vytvoření PDF
-            pdf = anvil.server.call('vytvor_analyzu_pdf', self.analyza_id, "ELECTRE")
+            # PDF se generuje jako úloha na pozadí, průběh se zobrazuje v tlačítku
+            def pri_postupu(postup, zprava):
+                self.export_link.text = f"Generuji PDF... {int(postup * 100)} %"
+            
+            pdf = Sledovani_uloh.spust_a_cekej(
+                'pdf', {'analyza_id': self.analyza_id, 'metoda': "ELECTRE"}, pri_postupu
+            )
             
             # Stažení PDF
             download(pdf)
@@ -6,7 +6,7 @@ import anvil.users
 import anvil.tables as tables
 import anvil.tables.query as q
 from anvil.tables import app_tables
-from .. import Spravce_stavu, Utils,Generator_html, Vypocty, Vizualizace, mcapp_styly
+from .. import Spravce_stavu, Utils, Generator_html, Vypocty, Vizualizace, mcapp_styly, Zdroj_vysledku, Sledovani_uloh, Odlozene_grafy
 
 
 class Vystup_topsis_komp(Vystup_topsis_kompTemplate):
@@ -32,6 +32,11 @@ class Vystup_topsis_komp(Vystup_topsis_kompTemplate):
     # Data, která budeme používat v celém formuláři
     self.analyza_data = None
     self.vysledky_vypoctu = None
+    self.html_obsah = None
+    # Počet variant zobrazených v tabulkách, zvětšuje se odkazem pod výsledky
+    self.max_radku = Generator_html.MAX_RADKU_TABULKY
+    # Grafy se vytvářejí až při přiblížení k viditelné části stránky
+    self.grafy = Odlozene_grafy.Odlozene_grafy()
 
   def form_show(self, **event_args):
     """Načte a zobrazí data analýzy při zobrazení formuláře."""
@@ -42,11 +47,10 @@ class Vystup_topsis_komp(Vystup_topsis_kompTemplate):
     try:
       Utils.zapsat_info(f"Načítám data analýzy ID: {self.analyza_id}")
 
-      # Načtení dat analýzy z JSON struktury
-      self.analyza_data = anvil.server.call("nacti_analyzu", self.analyza_id)
-
-      # Výpočet TOPSIS analýzy pomocí centralizované funkce z modulu Vypocty
-      self.vysledky_vypoctu = Vypocty.vypocitej_topsis_analyzu(self.analyza_data)
+      # Načtení dat analýzy a výpočet TOPSIS (standardně na serveru)
+      self.analyza_data, self.vysledky_vypoctu, self.html_obsah = Zdroj_vysledku.nacti_vysledky(
+          self.analyza_id, "topsis", self.max_radku
+      )
 
       # Zobrazení výsledků
       self._zobraz_kompletni_analyzu()
@@ -68,6 +72,7 @@ class Vystup_topsis_komp(Vystup_topsis_kompTemplate):
         </div>
         """
     self.html_1.html = mcapp_styly.vloz_styly_do_html(chyba_html)
+    self.dalsi_radky_link.visible = False
     self._skryj_grafy()
 
   def _zobraz_chybovou_zpravu(self, zprava):
@@ -79,18 +84,14 @@ class Vystup_topsis_komp(Vystup_topsis_kompTemplate):
         </div>
         """
     self.html_1.html = mcapp_styly.vloz_styly_do_html(chyba_html)
+    self.dalsi_radky_link.visible = False
     self._skryj_grafy()
 
   def _zobraz_kompletni_analyzu(self):
     """Zobrazí kompletní analýzu včetně všech výpočtů a vizualizací."""
     try:
-      # Vytvoření HTML obsahu pomocí funkcí z modulu Vizualizace
-      html_obsah = Generator_html.vytvor_kompletni_html_analyzy(
-        self.analyza_data, self.vysledky_vypoctu, "TOPSIS"
-      )
-
-      # Vložení stylů do HTML
-      self.html_1.html = mcapp_styly.vloz_styly_do_html(html_obsah)
+      # Vytvoření HTML obsahu s tabulkami zkrácenými na self.max_radku variant
+      self._zobraz_html()
 
       # Vytvoření a nastavení grafů
       self._vytvor_a_nastav_grafy()
@@ -100,102 +101,126 @@ class Vystup_topsis_komp(Vystup_topsis_kompTemplate):
       self._zobraz_chybovou_zpravu(str(e))
       self._skryj_grafy()
 
+  def _zobraz_html(self):
+    """Zobrazí HTML výsledků, velké tabulky ukazují prvních self.max_radku variant."""
+    self.html_1.html = mcapp_styly.vloz_styly_do_html(self.html_obsah)
+
+    pocet_variant = len(self.vysledky_vypoctu["norm_vysledky"]["nazvy_variant"])
+    self.dalsi_radky_link.text = f"Zobrazit další varianty v tabulkách ({self.max_radku} z {pocet_variant})"
+    self.dalsi_radky_link.visible = pocet_variant > self.max_radku
+
+  def dalsi_radky_link_click(self, **event_args):
+    """Rozšíří tabulky o další várku variant (grafy zůstávají)."""
+    self.max_radku += Generator_html.MAX_RADKU_TABULKY
+    self.html_obsah = Zdroj_vysledku.nacti_html_vysledku(
+        self.analyza_id, "topsis", self.analyza_data, self.vysledky_vypoctu, self.max_radku
+    )
+    self._zobraz_html()
+
   def _vytvor_a_nastav_grafy(self):
-    """Vytvoří a nastaví grafy pro vizualizaci výsledků."""
+    """Zaregistruje grafy výsledků, vytvoří se až při zobrazení (citlivost po rozbalení sekce)."""
     try:
+        self.grafy.vycisti()
+
         # Získání seřazených variant podle výsledků
         serazene_varianty = [var for var, _, _ in sorted(
             self.vysledky_vypoctu["topsis_vysledky"]["results"], 
             key=lambda x: x[1]  # Seřazení podle pořadí
         )]
-        
+
+        # Úpravy dat pro grafy v seřazeném pořadí (sdílené třemi grafy)
+        def upravene_vysledky():
+            return self.grafy.mezivysledek("topsis_serazene", lambda: self._preusporadat_data_topsis(
+                self.vysledky_vypoctu["topsis_vysledky"],
+                self.vysledky_vypoctu["norm_vysledky"]["nazvy_variant"],
+                serazene_varianty
+            ))
+
         # Graf výsledků - relativní blízkost k ideálnímu řešení
-        self.plot_topsis_vysledek.figure = Vizualizace.vytvor_sloupovy_graf_vysledku(
+        self.grafy.pridej("vysledky", self.plot_topsis_vysledek, lambda: Vizualizace.vytvor_sloupovy_graf_vysledku(
             self.vysledky_vypoctu["topsis_vysledky"]["results"],
             self.vysledky_vypoctu["topsis_vysledky"]["nejlepsi_varianta"],
             self.vysledky_vypoctu["topsis_vysledky"]["nejhorsi_varianta"],
             "TOPSIS - relativní blízkost k ideálnímu řešení",
-        )
-        self.plot_topsis_vysledek.visible = True
+        ))
 
-        # Úpravy dat pro grafy v seřazeném pořadí
-        topsis_vysledky_upravene = self._preusporadat_data_topsis(
-            self.vysledky_vypoctu["topsis_vysledky"],
-            self.vysledky_vypoctu["norm_vysledky"]["nazvy_variant"],
-            serazene_varianty
-        )
-        
         # Graf vzdáleností od ideálního a anti-ideálního řešení
-        self.plot_topsis_vzdalenosti.figure = Vizualizace.vytvor_graf_vzdalenosti_topsis(
-            topsis_vysledky_upravene,
+        self.grafy.pridej("vzdalenosti", self.plot_topsis_vzdalenosti, lambda: Vizualizace.vytvor_graf_vzdalenosti_topsis(
+            upravene_vysledky(),
             serazene_varianty
-        )
-        self.plot_topsis_vzdalenosti.visible = True
+        ))
 
         # Radarový graf porovnání s ideálním řešením
-        self.plot_topsis_radar.figure = Vizualizace.vytvor_radar_graf_topsis(
-            topsis_vysledky_upravene,
+        self.grafy.pridej("radar", self.plot_topsis_radar, lambda: Vizualizace.vytvor_radar_graf_topsis(
+            upravene_vysledky(),
             serazene_varianty,
             self.vysledky_vypoctu["norm_vysledky"]["nazvy_kriterii"]
-        )
-        self.plot_topsis_radar.visible = True
+        ))
 
         # 2D rozptylový graf vzdáleností
-        self.plot_topsis_2d.figure = Vizualizace.vytvor_2d_graf_vzdalenosti_topsis(
-            topsis_vysledky_upravene,
+        self.grafy.pridej("2d", self.plot_topsis_2d, lambda: Vizualizace.vytvor_2d_graf_vzdalenosti_topsis(
+            upravene_vysledky(),
             serazene_varianty
-        )
-        self.plot_topsis_2d.visible = True
+        ))
 
         # Analýza citlivosti - povolená pouze pokud máme více než jedno kritérium
-        kriteria = self.vysledky_vypoctu["norm_vysledky"]["nazvy_kriterii"]
-        if len(kriteria) > 1:
-            # Připravíme analýzy citlivosti pro všechna kritéria
-            vsechny_analyzy = {}
-            
-            # Pro každé kritérium
-            for i, kriterium in enumerate(kriteria):
-                # Výpočet analýzy citlivosti pro toto kritérium
-                analyza = Vypocty.vypocitej_analyzu_citlivosti(
-                    self.vysledky_vypoctu["norm_vysledky"]["normalizovana_matice"],
-                    self.vysledky_vypoctu["vahy"],
-                    self.vysledky_vypoctu["norm_vysledky"]["nazvy_variant"],
-                    kriteria,
-                    metoda="topsis",
-                    typy_kriterii=self.vysledky_vypoctu["typy_kriterii"],
-                    vyber_kriteria=i  # Index aktuálního kritéria
-                )
-                
-                vsechny_analyzy[kriterium] = analyza
-            
-            # Výchozí analýza pro první kritérium pro zpětnou kompatibilitu
-            analyza_citlivosti = vsechny_analyzy[kriteria[0]]
-            
-            # Grafy citlivosti s dropdown menu
-            self.plot_citlivost_skore.figure = Vizualizace.vytvor_graf_citlivosti_skore(
-                analyza_citlivosti, 
-                self.vysledky_vypoctu["norm_vysledky"]["nazvy_variant"],
-                kriteria,  # Seznam všech kritérií
-                vsechny_analyzy  # Výsledky analýzy pro všechna kritéria
-            )
-            self.plot_citlivost_skore.visible = True
-            
-            self.plot_citlivost_poradi.figure = Vizualizace.vytvor_graf_citlivosti_poradi(
-                analyza_citlivosti, 
-                self.vysledky_vypoctu["norm_vysledky"]["nazvy_variant"],
-                kriteria,
-                vsechny_analyzy
-            )
-            self.plot_citlivost_poradi.visible = True
-        else:
-            # Skryjeme grafy citlivosti, pokud máme jen jedno kritérium
-            self.plot_citlivost_skore.visible = False
-            self.plot_citlivost_poradi.visible = False
+        self._zaregistruj_grafy_citlivosti()
 
     except Exception as e:
         Utils.zapsat_chybu(f"Chyba při vytváření grafů: {str(e)}")
         self._skryj_grafy()
 
+  def _zaregistruj_grafy_citlivosti(self):
+    """Zaregistruje grafy citlivosti do sbalitelné sekce (počítají se až po rozbalení)."""
+    kriteria = self.vysledky_vypoctu["norm_vysledky"]["nazvy_kriterii"]
+    if len(kriteria) < 2:
+        # Skryjeme grafy citlivosti, pokud máme jen jedno kritérium
+        self.plot_citlivost_skore.visible = False
+        self.plot_citlivost_poradi.visible = False
+        self.citlivost_link.visible = False
+        return
+
+    self.grafy.pridej("citlivost_skore", self.plot_citlivost_skore,
+                      lambda: self._graf_citlivosti(Vizualizace.vytvor_graf_citlivosti_skore), sekce="citlivost")
+    self.grafy.pridej("citlivost_poradi", self.plot_citlivost_poradi,
+                      lambda: self._graf_citlivosti(Vizualizace.vytvor_graf_citlivosti_poradi), sekce="citlivost")
+    self._nastav_citlivost_link()
+
+  def _spocitej_analyzy_citlivosti(self):
+    """Načte analýzy citlivosti pro všechna kritéria (na serveru jedním voláním)."""
+    return Zdroj_vysledku.nacti_citlivost(
+      self.analyza_id, "topsis", self.analyza_data, self.vysledky_vypoctu
+    )
+
+  def _graf_citlivosti(self, vytvor_graf):
+    """Sestaví graf citlivosti s dropdown menu, analýzy se spočítají jednou pro oba grafy."""
+    kriteria = self.vysledky_vypoctu["norm_vysledky"]["nazvy_kriterii"]
+    vsechny_analyzy = self.grafy.mezivysledek("analyzy_citlivosti", self._spocitej_analyzy_citlivosti)
+    return vytvor_graf(
+        vsechny_analyzy[kriteria[0]],  # Výchozí analýza pro první kritérium
+        self.vysledky_vypoctu["norm_vysledky"]["nazvy_variant"],
+        kriteria,  # Seznam všech kritérií
+        vsechny_analyzy  # Výsledky analýzy pro všechna kritéria
+    )
+
+  def _nastav_citlivost_link(self):
+    """Nastaví text odkazu pro rozbalení sekce citlivosti podle jejího stavu."""
+    if self.grafy.je_rozbalena("citlivost"):
+        self.citlivost_link.text = "Skrýt grafy citlivosti"
+        self.citlivost_link.icon = "fa:angle-double-up"
+    else:
+        self.citlivost_link.text = "Zobrazit grafy citlivosti"
+        self.citlivost_link.icon = "fa:angle-double-down"
+    self.citlivost_link.visible = True
+
+  def citlivost_link_click(self, **event_args):
+    """Rozbalí nebo sbalí sekci analýzy citlivosti."""
+    if self.grafy.je_rozbalena("citlivost"):
+        self.grafy.sbal("citlivost")
+    else:
+        self.grafy.rozbal("citlivost")
+    self._nastav_citlivost_link()
+
   def _preusporadat_data_topsis(self, topsis_vysledky, puvodni_poradi, nove_poradi):
       """
       Přeuspořádá data TOPSIS výsledků podle nového pořadí variant.
@@ -262,12 +287,14 @@ class Vystup_topsis_komp(Vystup_topsis_kompTemplate):
 
   def _skryj_grafy(self):
     """Skryje všechny grafy ve formuláři."""
+    self.grafy.vycisti()
     self.plot_topsis_vysledek.visible = False
     self.plot_topsis_vzdalenosti.visible = False
     self.plot_topsis_radar.visible = False
     self.plot_topsis_2d.visible = False
     self.plot_citlivost_skore.visible = False
     self.plot_citlivost_poradi.visible = False
+    self.citlivost_link.visible = False
 
   def export_link_click(self, **event_args):
         """Obsluha kliknutí na tlačítko pro export PDF."""
@@ -281,8 +308,13 @@ class Vystup_topsis_komp(Vystup_topsis_kompTemplate):
             self.export_link.text = "Generuji PDF..."
             self.export_link.enabled = False
             
-            # Volání serverové funkce pro vytvoření PDF
-            pdf = anvil.server.call('vytvor_analyzu_pdf', self.analyza_id, "TOPSIS")
+            # PDF se generuje jako úloha na pozadí, průběh se zobrazuje v tlačítku
+            def pri_postupu(postup, zprava):
+                self.export_link.text = f"Generuji PDF... {int(postup * 100)} %"
+            
+            pdf = Sledovani_uloh.spust_a_cekej(
+                'pdf', {'analyza_id': self.analyza_id, 'metoda': "TOPSIS"}, pri_postupu
+            )
             
             # Stažení PDF
             download(pdf)
@@ -64,6 +64,9 @@ def load_existing_analyza(self):
                     if nazev_krit != "popis_varianty" and nazev_krit in kriteria:
                         self.spravce.uloz_hodnotu_varianty(nazev_var, nazev_krit, hodnota)
 
+            # Další úpravy se uloží jako změny oproti načtené verzi
+            self.spravce.nastav_verzi_analyzy(data.get("verze", 0))
+
             # Nastavení polí formuláře z dat ve správci stavu
             self.text_box_nazev.text = self.spravce.ziskej_nazev()
             self.text_area_popis.text = self.spravce.ziskej_popis()
@@ -306,6 +309,59 @@ def zobraz_krok_4(self, **event_args):
         })
 
     self.Matice_var.items = matice_data
+    zobraz_prubezne_poradi(self)
+
+# Počet nejlepších variant v průběžném pořadí pod maticí
+POCET_PRUBEZNEHO_PORADI = 5
+
+def zobraz_prubezne_poradi(self, **event_args):
+    """
+    Zobrazí pod maticí průběžné pořadí variant podle WSM a TOPSIS.
+    Správce stavu po každé změně hodnoty přepočítá výsledky přírůstkově,
+    nevyplněné hodnoty se do zadání všech hodnot počítají jako 0.
+    Dokud mají všechna kritéria nulovou váhu (průvodce entropií váhy
+    dopočítá až při uložení), průběžné pořadí se nezobrazuje.
+    
+    Args:
+        self: Instance formuláře průvodce
+        event_args: Argumenty události
+    """
+    soucet_vah = sum(float(k.get("vaha") or 0) for k in self.spravce.ziskej_kriteria().values())
+    if soucet_vah <= 0:
+        self.label_prubezne_poradi.visible = False
+        return
+
+    try:
+        vysledky = self.spravce.ziskej_prubezne_vysledky()
+    except ValueError as e:
+        Utils.zapsat_chybu(f"Průběžné pořadí nelze spočítat: {str(e)}")
+        self.label_prubezne_poradi.visible = False
+        return
+
+    radky = []
+    for metoda in ("wsm", "topsis"):
+        nejlepsi = vysledky[metoda]["results"][:POCET_PRUBEZNEHO_PORADI]
+        poradi = ", ".join(f"{poradi}. {varianta} ({skore:.3f})" for varianta, poradi, skore in nejlepsi)
+        radky.append(f"{metoda.upper()}: {poradi}")
+    if vysledky["pocet_variant"] > POCET_PRUBEZNEHO_PORADI:
+        radky.append(f"(nejlepších {POCET_PRUBEZNEHO_PORADI} z {vysledky['pocet_variant']} variant)")
+
+    self.label_prubezne_poradi.text = "Průběžné pořadí\n" + "\n".join(radky)
+    self.label_prubezne_poradi.visible = bool(vysledky["pocet_variant"])
+
+def zprava_chyby_ulozeni(chyba):
+    """
+    Vrátí text chyby při uložení analýzy pro label_chyba_4.
+    Konflikt verzí se hlásí zvlášť - nic se neuložilo a analýzu je
+    potřeba načíst znovu.
+    
+    Args:
+        chyba: Výjimka z Spravce_stavu.uloz_analyzu_na_server
+    """
+    if Spravce_stavu.je_konflikt_verze(chyba):
+        return (f"{Konstanty.ZPRAVY_CHYB['KONFLIKT_VERZE']} Změny nebyly uloženy, "
+                "načtěte analýzu znovu s aktuálními daty.")
+    return f"Chyba při ukládání: {str(chyba)}"
 
 def validuj_matici(self):
     """
@@ -33,6 +33,7 @@ class Wizard_komp(Wizard_kompTemplate):
     # Event handlery pro repeating panely
     self.repeating_panel_kriteria.set_event_handler('x-refresh', self.nacti_kriteria)
     self.repeating_panel_varianty.set_event_handler('x-refresh', self.nacti_varianty)
+    self.Matice_var.set_event_handler('x-zmena-hodnoty', self.zobraz_prubezne_poradi)
 
     if self.mode == Konstanty.STAV_ANALYZY['UPRAVA']: 
         self.load_existing_analyza()
@@ -162,6 +163,10 @@ class Wizard_komp(Wizard_kompTemplate):
     """Naplní RepeatingPanel (Matice_var) daty pro zadání matice hodnot."""
     Wizard.zobraz_krok_4(self, **event_args)
 
+  def zobraz_prubezne_poradi(self, **event_args):
+    """Zobrazí průběžné pořadí variant pod maticí hodnot."""
+    Wizard.zobraz_prubezne_poradi(self, **event_args)
+
   def button_ulozit_4_click(self, **event_args):
     """Uloží kompletní analýzu na server, pokud je matice validní."""
     if not self.validuj_matici():
@@ -180,7 +185,7 @@ class Wizard_komp(Wizard_kompTemplate):
         else:
             raise ValueError("Nepodařilo se uložit analýzu.")
     except Exception as e:
-        error_msg = f"Chyba při ukládání: {str(e)}"
+        error_msg = Wizard.zprava_chyby_ulozeni(e)
         Utils.zapsat_chybu(error_msg)
         self.label_chyba_4.text = error_msg
         self.label_chyba_4.visible = True
@@ -0,0 +1,132 @@
+# -------------------------------------------------------
+# Modul: Zdroj_vysledku
+# Načtení dat analýzy, výsledků metody a analýzy citlivosti pro
+# výstupní formuláře.
+#
+# Výpočet standardně běží na serveru (callable spocitej_vysledky),
+# který vrátí data analýzy, výsledek metody i HTML výsledků v jednom
+# volání. HTML s tabulkami zkrácenými na zobrazené varianty vykreslí
+# server z úplného výsledku, klient dostane jen mezivýsledky pro grafy.
+# V prohlížeči (Skulpt) je výpočet o řády pomalejší, klientský
+# výpočet přes Vypocty zůstává jen jako záložní cesta - zapíná se
+# konstantou Konstanty.VYPOCET_NA_SERVERU nebo parametrem volání.
+# -------------------------------------------------------
+import anvil.server
+from . import Generator_html, Konstanty, Spravce_stavu, Utils, Vypocty
+
+def _obnov_aliasy(vysledky_vypoctu):
+    """
+    Doplní klíče, které server kvůli velikosti odpovědi neposílá dvakrát.
+    """
+    mabac_vysledky = vysledky_vypoctu.get('mabac_vysledky')
+    if mabac_vysledky and 'q_distance_matrix' not in mabac_vysledky:
+        mabac_vysledky['q_distance_matrix'] = mabac_vysledky.get('q_matrix')
+    return vysledky_vypoctu
+
+def nacti_vysledky(analyza_id, metoda, max_radku=Generator_html.MAX_RADKU_TABULKY, vypocet_na_serveru=None):
+    """
+    Načte data analýzy, spočítá výsledky zvolené metody a vykreslí jejich HTML.
+
+    Args:
+        analyza_id: ID analýzy
+        metoda: Kód metody ('wsm', 'wpm', 'topsis', 'electre', 'mabac')
+        max_radku: Počet variant zobrazených v tabulkách HTML
+        vypocet_na_serveru: True = výpočet na serveru, False = v prohlížeči,
+                            None = podle Konstanty.VYPOCET_NA_SERVERU
+
+    Returns:
+        tuple: (analyza_data, vysledky_vypoctu, html) - výsledek má strukturu
+               jako Vypocty.vypocitej_analyzu, ze serveru ale bez matic
+               potřebných jen pro tabulky HTML
+
+    Raises:
+        ValueError: Pokud data nejsou validní nebo výpočet selže
+    """
+    if vypocet_na_serveru is None:
+        vypocet_na_serveru = Konstanty.VYPOCET_NA_SERVERU
+
+    if vypocet_na_serveru:
+        odpoved = anvil.server.call('spocitej_vysledky', analyza_id, metoda,
+                                    mezivysledky=True, max_radku=max_radku)
+        return odpoved['analyza_data'], _obnov_aliasy(odpoved['vysledky_vypoctu']), odpoved['html']
+
+    Utils.zapsat_info(f"Výpočet metody {metoda.upper()} probíhá v prohlížeči")
+    analyza_data = anvil.server.call('nacti_analyzu', analyza_id)
+    parametry = {}
+    if metoda.lower() == 'electre':
+        parametry = Spravce_stavu.Spravce_stavu().ziskej_nastaveni_electre()
+    vysledky_vypoctu = Vypocty.vypocitej_analyzu(analyza_data, metoda, **parametry)
+    html = Generator_html.vytvor_kompletni_html_analyzy(analyza_data, vysledky_vypoctu, metoda.upper(), max_radku)
+    return analyza_data, vysledky_vypoctu, html
+
+def nacti_html_vysledku(analyza_id, metoda, analyza_data, vysledky_vypoctu, max_radku, vypocet_na_serveru=None):
+    """
+    Vykreslí HTML výsledků s tabulkami zkrácenými na max_radku variant.
+
+    Args:
+        analyza_id: ID analýzy
+        metoda: Kód metody ('wsm', 'wpm', 'topsis', 'electre', 'mabac')
+        analyza_data: Data analýzy (pro vykreslení v prohlížeči)
+        vysledky_vypoctu: Výsledky metody (pro vykreslení v prohlížeči)
+        max_radku: Počet variant zobrazených v tabulkách
+        vypocet_na_serveru: True = HTML vykreslí server, False = prohlížeč,
+                            None = podle Konstanty.VYPOCET_NA_SERVERU
+
+    Returns:
+        str: HTML výsledků
+    """
+    if vypocet_na_serveru is None:
+        vypocet_na_serveru = Konstanty.VYPOCET_NA_SERVERU
+
+    if vypocet_na_serveru:
+        # Klient nemá matice pro tabulky, server je vezme z cache výsledků
+        return anvil.server.call('vytvor_html_vysledku', analyza_id, metoda, max_radku)
+    return Generator_html.vytvor_kompletni_html_analyzy(analyza_data, vysledky_vypoctu, metoda.upper(), max_radku)
+
+def nacti_citlivost(analyza_id, metoda, analyza_data, vysledky_vypoctu, vypocet_na_serveru=None):
+    """
+    Načte analýzu citlivosti na váhy pro všechna kritéria analýzy.
+
+    Na serveru se všechna kritéria spočítají jedním voláním (Citlivost_numpy)
+    a výsledek obsahuje i přesné váhy, při kterých se mění nejlepší varianta
+    ('zmeny_nejlepsi'). Skóre a pořadí vrací server jen jako souhrn pro
+    grafy (zobrazené varianty a rozsah ostatních). Záložní výpočet
+    v prohlížeči prochází kritéria postupně přes Vypocty.
+
+    Args:
+        analyza_id: ID analýzy
+        metoda: Kód metody ('wsm', 'wpm', 'topsis', 'mabac')
+        analyza_data: Data analýzy (pro záložní výpočet)
+        vysledky_vypoctu: Výsledky metody (pro záložní výpočet)
+        vypocet_na_serveru: True = výpočet na serveru, False = v prohlížeči,
+                            None = podle Konstanty.VYPOCET_NA_SERVERU
+
+    Returns:
+        dict: Název kritéria -> výsledek ve formátu vypocitej_analyzu_citlivosti
+              (ze serveru se souhrnem skóre a pořadí, viz Vizualizace._data_serii_citlivosti)
+    """
+    if vypocet_na_serveru is None:
+        vypocet_na_serveru = Konstanty.VYPOCET_NA_SERVERU
+
+    if vypocet_na_serveru:
+        return anvil.server.call('vypocitej_citlivost_analyzy', analyza_id, metoda)['kriteria']
+
+    metoda = metoda.lower()
+    kriteria = vysledky_vypoctu['norm_vysledky']['nazvy_kriterii']
+    if metoda in ("wpm", "mabac"):
+        # WPM a MABAC pracují s původními hodnotami
+        matice = Vypocty.priprav_rozhodovaci_matici(analyza_data)
+    else:
+        matice = vysledky_vypoctu['norm_vysledky']['normalizovana_matice']
+    return {
+        kriterium: Vypocty.vypocitej_analyzu_citlivosti(
+            matice,
+            vysledky_vypoctu['vahy'],
+            vysledky_vypoctu['norm_vysledky']['nazvy_variant'],
+            kriteria,
+            metoda=metoda,
+            typy_kriterii=vysledky_vypoctu['typy_kriterii'],
+            vyber_kriteria=i
+        )
+        for i, kriterium in enumerate(kriteria)
+    }
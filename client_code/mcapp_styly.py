@@ -1,16 +1,24 @@
 # -------------------------------------------------------
 # Modul: mcapp_styly
 # Obsahuje styly pro formátování výstupů analýz
+#
+# Stylopis se sestaví jednou při importu modulu. V prohlížeči se
+# vloží do hlavičky stránky jako jediný element <style> (s kontrolou
+# podle ID), takže HTML výstupů nese jen obsah a při každém
+# vykreslení výsledků se styly znovu neposílají. Mimo prohlížeč
+# (serverový PDF report) se styly vkládají přímo do dokumentu.
 # -------------------------------------------------------
 
-def ziskej_css_styly():
-    """
-    Vrátí řetězec s CSS styly pro výstupy analýz.
-    
-    Returns:
-        str: CSS styly jako řetězec
-    """
-    return """
+try:
+    from anvil.js import window as _okno
+except ImportError:
+    # Server - dokument prohlížeče není k dispozici
+    _okno = None
+
+# ID elementu <style> se styly výstupů v hlavičce stránky
+ID_STYLU = "mcapp-styly"
+
+_CSS_ZDROJ = """
     /* Hlavní kontejner pro výsledky */
     .mcapp-wsm-results {
       font-family: 'Roboto', Arial, sans-serif;
@@ -393,21 +401,52 @@ def ziskej_css_styly():
     }
     """
 
+# Stylopis bez odsazení a prázdných řádků, sestavený jednou
+CSS_STYLY = "\n".join(radek.strip() for radek in _CSS_ZDROJ.splitlines() if radek.strip())
+
+def ziskej_css_styly():
+    """
+    Vrátí řetězec s CSS styly pro výstupy analýz.
+    
+    Returns:
+        str: CSS styly jako řetězec
+    """
+    return CSS_STYLY
+
+def zaregistruj_styly():
+    """
+    Vloží styly výstupů do hlavičky stránky, pokud tam ještě nejsou.
+    Opakované volání stránku nemění, element se hledá podle ID_STYLU.
+    
+    Returns:
+        bool: True, pokud jsou styly na stránce (běh v prohlížeči)
+    """
+    if _okno is None:
+        return False
+    
+    dokument = _okno.document
+    if not dokument.getElementById(ID_STYLU):
+        styl = dokument.createElement("style")
+        styl.id = ID_STYLU
+        styl.textContent = CSS_STYLY
+        dokument.head.appendChild(styl)
+    return True
+
 def vloz_styly_do_html(html_obsah):
     """
-    Vloží CSS styly do HTML obsahu bez JavaScriptu.
+    Připraví HTML obsah výstupu k zobrazení se styly.
+    
+    V prohlížeči se styly zaregistrují jednou pro celou stránku
+    (zaregistruj_styly) a obsah se vrátí beze změny. Mimo prohlížeč
+    se styly vloží před obsah.
     
     Args:
-        html_obsah: HTML obsah ke kterému budou přidány styly
+        html_obsah: HTML obsah výstupu
         
     Returns:
-        str: HTML obsah se styly
+        str: HTML obsah připravený k zobrazení
     """
-    css_styly = ziskej_css_styly()
+    if zaregistruj_styly():
+        return html_obsah
     
-    return f"""
-    <style>
-    {css_styly}
-    </style>
-    {html_obsah}
-    """
\ No newline at end of file
+    return f"<style>\n{CSS_STYLY}\n</style>\n{html_obsah}"
\ No newline at end of file
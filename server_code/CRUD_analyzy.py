@@ -5,15 +5,29 @@ import anvil.email
 # Modul obsahuje základní operace pro práci s analýzami v novém JSON formátu:
 # - Create: vytvoření nové analýzy (vytvor_analyzu)
 # - Read: načtení analýzy podle ID (nacti_analyzu)
-# - Update: aktualizace existující analýzy (uprav_analyzu)
+# - Update: aktualizace existující analýzy (uprav_analyzu) nebo jen
+#   jejích změněných částí (uprav_analyzu_zmenami)
 # - Delete: smazání analýzy (smaz_analyzu)
 #
 # Pomocné funkce:
 # - validuj_nazev_analyzy: Kontrola platnosti názvu analýzy
 # - validuj_data_analyzy: Kontrola struktury JSON dat analýzy
+# - souhrn_dat_analyzy: Denormalizované sloupce (popis, počty kritérií
+#   a variant, velikost dat), které se ukládají spolu s data_json, aby výpis analýz
+#   nemusel načítat celá data
+#
+# Data analýzy se ukládají v kompaktním formátu modulu Format_analyzy.
+# Funkce tohoto modulu přijímají i vracejí data ve formátu verze 1
+# (slovníky kritérií a variant); starší řádky se převedou při čtení.
+#
+# Každý zápis dat zvýší verzi analýzy (sloupec verze). Klient posílá
+# verzi, ze které úpravy vycházejí, a pokud analýzu mezitím uložil
+# někdo jiný, změny se odmítnou místo přepsání cizí práce.
 # - handle_errors: Dekorátor pro jednotné zachytávání a logování chyb
 # -------------------------------------------------------
+import copy
 import datetime
+import json
 import logging
 import functools
 from typing import Dict, List, Optional, Any
@@ -22,6 +36,7 @@ import anvil.users
 import anvil.tables as tables
 import anvil.tables.query as q
 from anvil.tables import app_tables
+from . import Cache_vysledku, Format_analyzy
 
 # ============= Pomocné funkce pro error handling =============
 
@@ -120,6 +135,62 @@ def validuj_data_analyzy(data: Dict) -> None:
             if nazev_krit not in var_data and nazev_krit != "popis_varianty":
                 zapsat_info(f"Upozornění: Varianta '{nazev_var}' neobsahuje hodnotu pro kritérium '{nazev_krit}'")
 
+# =============== Denormalizované sloupce ===============
+
+# Sloupce tabulky analyzy, které stačí pro výpis analýz (bez data_json)
+SLOUPCE_VYPISU = ("nazev", "datum_vytvoreni", "datum_upravy", "popis", "pocet_kriterii", "pocet_variant", "velikost_dat")
+
+def souhrn_dat_analyzy(data: Dict) -> Dict:
+    """
+    Vrátí hodnoty denormalizovaných sloupců odvozené z dat analýzy.
+    
+    Args:
+        data: Uložená data analýzy (obsah sloupce data_json, libovolná verze)
+        
+    Returns:
+        Dict: popis, pocet_kriterii, pocet_variant a velikost_dat (bajty
+              JSON dat) pro uložení do řádku
+    """
+    return {
+        "popis": data.get("popis_analyzy", "") or "",
+        "pocet_kriterii": len(data.get("kriteria", {})),
+        "pocet_variant": len(data.get("varianty", {})),
+        "velikost_dat": len(json.dumps(data, ensure_ascii=False, default=str).encode("utf-8")),
+    }
+
+def dopln_souhrn_analyzy(analyza) -> None:
+    """
+    Doplní denormalizované sloupce řádku uloženého před jejich zavedením.
+    Data analýzy se načtou jen jednou, při dalším přístupu už sloupce existují.
+    
+    Args:
+        analyza: Řádek tabulky analyzy
+    """
+    if analyza["velikost_dat"] is None:
+        analyza.update(**souhrn_dat_analyzy(analyza["data_json"] or {}))
+
+def metadata_analyzy(analyza) -> Dict:
+    """
+    Sestaví metadata analýzy pro výpis. Řádkům uloženým před zavedením
+    denormalizovaných sloupců se sloupce jednorázově doplní z data_json.
+    
+    Args:
+        analyza: Řádek tabulky analyzy
+        
+    Returns:
+        Dict: id, nazev, datumy, popis, pocet_kriterii a pocet_variant
+    """
+    dopln_souhrn_analyzy(analyza)
+    return {
+        "id": analyza.get_id(),
+        "nazev": analyza["nazev"],
+        "datum_vytvoreni": analyza["datum_vytvoreni"],
+        "datum_upravy": analyza["datum_upravy"],
+        "popis": analyza["popis"] or "",
+        "pocet_kriterii": analyza["pocet_kriterii"],
+        "pocet_variant": analyza["pocet_variant"],
+    }
+
 # =============== CRUD Operace ===============
 
 @anvil.server.callable
@@ -146,11 +217,11 @@ def vytvor_analyzu(nazev: str, popis: str = "") -> str:
     
     try:
         # Vytvoření základní JSON struktury pro analýzu v novém formátu
-        data_json = {
+        data_json = Format_analyzy.zabal_data({
             "popis_analyzy": popis,
             "kriteria": {},
             "varianty": {}
-        }
+        })
         
         # Vytvoření záznamu v databázi
         analyza = app_tables.analyzy.add_row(
@@ -158,13 +229,87 @@ def vytvor_analyzu(nazev: str, popis: str = "") -> str:
             uzivatel=uzivatel,
             data_json=data_json,
             datum_vytvoreni=datetime.datetime.now(),
-            datum_upravy=None
+            datum_upravy=None,
+            verze=1,
+            **souhrn_dat_analyzy(data_json)
         )
         return analyza.get_id()
     except Exception as e:
         zapsat_chybu(f"Chyba při vytváření analýzy: {str(e)}")
         raise
 
+def _preved_do_kompaktniho_formatu(analyza_id: str, verze: int):
+    """
+    Převede data analýzy uložená ve starším formátu do kompaktního formátu.
+    Zápis proběhne v transakci a zvýší verzi analýzy. Pokud analýzu od
+    načtení verze 'verze' mezitím uložil někdo jiný, převod se přeskočí.
+    
+    Args:
+        analyza_id: ID analýzy
+        verze: Verze analýzy, ze které převod vychází
+        
+    Returns:
+        tuple: (řádek analýzy, uložená data) po převodu, nebo None pokud
+               se převod neprovedl
+    """
+    try:
+        with tables.Transaction():
+            analyza = app_tables.analyzy.get_by_id(analyza_id)
+            if not analyza or (analyza["verze"] or 0) != verze:
+                return None
+            zabalena = Format_analyzy.zabal_data(analyza["data_json"] or {})
+            if not Format_analyzy.je_kompaktni(zabalena):
+                return None
+            analyza.update(data_json=zabalena, verze=verze + 1, **souhrn_dat_analyzy(zabalena))
+    except Exception as e:
+        # Převod se zkusí znovu při příštím načtení
+        zapsat_chybu(f"Převod dat analýzy {analyza_id} do kompaktního formátu selhal: {str(e)}")
+        return None
+    
+    zapsat_info(f"Data analýzy {analyza_id} převedena do formátu verze {Format_analyzy.VERZE_FORMATU}")
+    return analyza, zabalena
+
+def _nacti_ulozena_data(analyza_id: str, prevest: bool = True):
+    """
+    Načte řádek analýzy a její uložená data. Data uložená ve starším
+    formátu se při tom jednorázově převedou do kompaktního formátu.
+    
+    Args:
+        analyza_id: ID požadované analýzy
+        prevest: Zda převést data ve starším formátu (uvnitř jiné
+                 transakce se nepřevádí - převod má vlastní transakci)
+        
+    Returns:
+        tuple: (řádek analýzy, uložená data)
+        
+    Raises:
+        ValueError: Pokud analýza neexistuje
+    """
+    analyza = app_tables.analyzy.get_by_id(analyza_id)
+    if not analyza:
+        raise ValueError(f"Analýza s ID {analyza_id} neexistuje.")
+    
+    ulozena = analyza["data_json"] or {}
+    if prevest and not Format_analyzy.je_kompaktni(ulozena):
+        prevedena = _preved_do_kompaktniho_formatu(analyza_id, analyza["verze"] or 0)
+        if prevedena is not None:
+            analyza, ulozena = prevedena
+    return analyza, ulozena
+
+def _data_analyzy(analyza, ulozena) -> Dict:
+    """
+    Sestaví kompletní slovník dat analýzy (metadata a data ve formátu verze 1).
+    """
+    result = {
+        "id": analyza.get_id(),
+        "nazev": analyza["nazev"],
+        "datum_vytvoreni": analyza["datum_vytvoreni"],
+        "datum_upravy": analyza["datum_upravy"],
+        "verze": analyza["verze"] or 0,
+    }
+    result.update(Format_analyzy.rozbal_data(ulozena))
+    return result
+
 @anvil.server.callable
 @handle_errors
 def nacti_analyzu(analyza_id: str) -> Dict:
@@ -178,29 +323,58 @@ def nacti_analyzu(analyza_id: str) -> Dict:
         Dict: Slovník s daty analýzy
     """
     try:
-        analyza = app_tables.analyzy.get_by_id(analyza_id)
-        if not analyza:
-            raise ValueError(f"Analýza s ID {analyza_id} neexistuje.")
-            
-        # Sestavení kompletního slovníku dat
-        result = {
-            "id": analyza.get_id(),
-            "nazev": analyza["nazev"],
-            "datum_vytvoreni": analyza["datum_vytvoreni"],
-            "datum_upravy": analyza["datum_upravy"],
-        }
-        
-        # Přidání dat z JSON
-        result.update(analyza["data_json"])
-        
-        return result
+        analyza, ulozena = _nacti_ulozena_data(analyza_id)
+        return _data_analyzy(analyza, ulozena)
     except Exception as e:
         zapsat_chybu(f"Chyba při načítání analýzy {analyza_id}: {str(e)}")
         raise
 
+def nacti_analyzu_pro_vypocet(analyza_id: str):
+    """
+    Načte analýzu spolu s rozhodovací maticí pro serverové výpočty.
+    Matice se sestaví přímo z kompaktně uložených hodnot.
+    
+    Args:
+        analyza_id: ID požadované analýzy
+        
+    Returns:
+        tuple: (data analýzy jako u nacti_analyzu, Rozhodovaci_matice)
+        
+    Raises:
+        ValueError: Pokud analýza neexistuje nebo data nejsou validní
+    """
+    analyza, ulozena = _nacti_ulozena_data(analyza_id)
+    return _data_analyzy(analyza, ulozena), Format_analyzy.priprav_rozhodovaci_matici(ulozena)
+
+def _over_pravo_upravy(analyza) -> None:
+    """
+    Ověří, že aktuální uživatel smí analýzu upravovat (vlastník nebo admin).
+    
+    Raises:
+        ValueError: Pokud uživatel nemá oprávnění
+    """
+    aktualni_uzivatel = anvil.users.get_user()
+    if (aktualni_uzivatel != analyza["uzivatel"] and 
+        not (aktualni_uzivatel and aktualni_uzivatel.get("role") == "admin")):
+        raise ValueError("Nemáte oprávnění upravit tuto analýzu.")
+
+def _over_verzi(analyza, verze) -> None:
+    """
+    Ověří, že analýza nebyla od načtení verze 'verze' uložena jinde.
+    
+    Raises:
+        ValueError: Pokud se verze liší
+    """
+    if verze is not None and (analyza["verze"] or 0) != verze:
+        # Začátek zprávy = Konstanty.ZPRAVY_CHYB['KONFLIKT_VERZE'], podle něj ji pozná klient
+        raise ValueError(
+            "Analýzu mezitím uložil jiný uživatel nebo okno. "
+            "Načtěte ji znovu, aby se vaše úpravy nepřepsaly navzájem."
+        )
+
 @anvil.server.callable
 @handle_errors
-def uprav_analyzu(analyza_id: str, nazev: str = None, data: Dict = None) -> None:
+def uprav_analyzu(analyza_id: str, nazev: str = None, data: Dict = None, verze: int = None) -> int:
     """
     Upraví existující analýzu.
     
@@ -208,35 +382,241 @@ def uprav_analyzu(analyza_id: str, nazev: str = None, data: Dict = None) -> None
         analyza_id: ID analýzy k úpravě
         nazev: Nový název analýzy (volitelný)
         data: Nová data JSON (volitelné)
+        verze: Verze analýzy, ze které úprava vychází (volitelné, bez ní
+               se analýza přepíše bez kontroly souběžných úprav)
+        
+    Returns:
+        int: Nová verze analýzy
     """
     try:
-        analyza = app_tables.analyzy.get_by_id(analyza_id)
-        if not analyza:
-            raise ValueError(f"Analýza s ID {analyza_id} neexistuje.")
+        with tables.Transaction():
+            analyza = app_tables.analyzy.get_by_id(analyza_id)
+            if not analyza:
+                raise ValueError(f"Analýza s ID {analyza_id} neexistuje.")
+            
+            # Kontrola, zda má uživatel právo upravovat analýzu
+            _over_pravo_upravy(analyza)
+            _over_verzi(analyza, verze)
+            
+            # Aktualizace názvu, pokud byl poskytnut
+            if nazev is not None:
+                validuj_nazev_analyzy(nazev)
+                analyza["nazev"] = nazev
+            
+            # Aktualizace dat, pokud byla poskytnuta
+            if data is not None:
+                # Validace struktury dat
+                validuj_data_analyzy(data)
+                ulozena = Format_analyzy.zabal_data(data)
+                analyza.update(data_json=ulozena, **souhrn_dat_analyzy(ulozena))
+            
+            # Aktualizace časového razítka a verze
+            nova_verze = (analyza["verze"] or 0) + 1
+            analyza.update(datum_upravy=datetime.datetime.now(), verze=nova_verze)
         
-        # Kontrola, zda má uživatel právo upravovat analýzu
-        aktualni_uzivatel = anvil.users.get_user()
-        if (aktualni_uzivatel != analyza["uzivatel"] and 
-            not (aktualni_uzivatel and aktualni_uzivatel.get("role") == "admin")):
-            raise ValueError("Nemáte oprávnění upravit tuto analýzu.")
+        # Uložené výsledky výpočtů už neodpovídají datům analýzy
+        Cache_vysledku.zneplatni_analyzu(analyza_id)
+        return nova_verze
+        
+    except Exception as e:
+        zapsat_chybu(f"Chyba při úpravě analýzy {analyza_id}: {str(e)}")
+        raise
+
+# =============== Částečné úpravy ===============
+#
+# Změna je slovník s klíčem 'operace' a parametry operace. Operace
+# pracují s daty ve formátu verze 1 a každá ověřuje jen části dat,
+# kterých se týká.
+
+# Operace, po kterých se znovu kontroluje součet vah
+_OPERACE_S_VAHAMI = ("nastav_kriterium", "zmen_vahu", "odeber_kriterium")
+
+def _kriterium(data, nazev):
+    """Vrátí kritérium podle názvu, nebo vyhodí ValueError."""
+    if nazev not in data["kriteria"]:
+        raise ValueError(f"Kritérium '{nazev}' neexistuje.")
+    return data["kriteria"][nazev]
+
+def _varianta(data, nazev):
+    """Vrátí variantu podle názvu, nebo vyhodí ValueError."""
+    if nazev not in data["varianty"]:
+        raise ValueError(f"Varianta '{nazev}' neexistuje.")
+    return data["varianty"][nazev]
+
+def _cislo(hodnota, popis):
+    """Převede hodnotu na float, nebo vyhodí ValueError s popisem hodnoty."""
+    try:
+        return float(hodnota)
+    except (ValueError, TypeError):
+        raise ValueError(f"{popis} musí být číslo.")
+
+def _novy_nazev(nazev, existujici, co):
+    """Ověří nový název kritéria nebo varianty."""
+    if not nazev or not str(nazev).strip():
+        raise ValueError(f"Název {co} nesmí být prázdný.")
+    if nazev in existujici:
+        raise ValueError(f"Název {co} '{nazev}' už existuje.")
+    if nazev == "popis_varianty":
+        raise ValueError(f"Název {co} '{nazev}' je vyhrazený.")
+
+def _zmena_nastav_hodnotu(data, zmena):
+    """Nastaví hodnotu jedné buňky matice ('varianta', 'kriterium', 'hodnota')."""
+    _kriterium(data, zmena["kriterium"])
+    _varianta(data, zmena["varianta"])[zmena["kriterium"]] = _cislo(
+        zmena["hodnota"], f"Hodnota varianty '{zmena['varianta']}' pro kritérium '{zmena['kriterium']}'"
+    )
+
+def _zmena_nastav_kriterium(data, zmena):
+    """Přidá kritérium nebo změní jeho typ a váhu ('kriterium', 'typ', 'vaha')."""
+    nazev = zmena["kriterium"]
+    if nazev not in data["kriteria"]:
+        _novy_nazev(nazev, data["kriteria"], "kritéria")
+    if zmena["typ"] not in ("max", "min"):
+        raise ValueError(f"Typ kritéria '{nazev}' musí být 'max' nebo 'min'.")
+    data["kriteria"][nazev] = {"typ": zmena["typ"], "vaha": _cislo(zmena["vaha"], f"Váha kritéria '{nazev}'")}
+
+def _zmena_zmen_vahu(data, zmena):
+    """Změní váhu kritéria ('kriterium', 'vaha')."""
+    _kriterium(data, zmena["kriterium"])["vaha"] = _cislo(zmena["vaha"], f"Váha kritéria '{zmena['kriterium']}'")
+
+def _zmena_prejmenuj_kriterium(data, zmena):
+    """Přejmenuje kritérium včetně hodnot variant ('puvodni', 'novy')."""
+    puvodni, novy = zmena["puvodni"], zmena["novy"]
+    _kriterium(data, puvodni)
+    _novy_nazev(novy, data["kriteria"], "kritéria")
+    data["kriteria"] = {(novy if k == puvodni else k): v for k, v in data["kriteria"].items()}
+    for var_data in data["varianty"].values():
+        if puvodni in var_data:
+            var_data[novy] = var_data.pop(puvodni)
+
+def _zmena_odeber_kriterium(data, zmena):
+    """Odebere kritérium včetně hodnot variant ('kriterium')."""
+    _kriterium(data, zmena["kriterium"])
+    del data["kriteria"][zmena["kriterium"]]
+    for var_data in data["varianty"].values():
+        var_data.pop(zmena["kriterium"], None)
+
+def _zmena_pridej_variantu(data, zmena):
+    """Přidá nebo nahradí variantu ('varianta', 'popis_varianty', volitelně 'hodnoty')."""
+    nazev = zmena["varianta"]
+    if nazev not in data["varianty"]:
+        _novy_nazev(nazev, data["varianty"], "varianty")
+    var_data = {"popis_varianty": zmena.get("popis_varianty", "")}
+    for krit_nazev, hodnota in (zmena.get("hodnoty") or {}).items():
+        _kriterium(data, krit_nazev)
+        var_data[krit_nazev] = _cislo(hodnota, f"Hodnota varianty '{nazev}' pro kritérium '{krit_nazev}'")
+    data["varianty"][nazev] = var_data
+
+def _zmena_prejmenuj_variantu(data, zmena):
+    """Přejmenuje variantu se zachováním pořadí ('puvodni', 'novy')."""
+    puvodni, novy = zmena["puvodni"], zmena["novy"]
+    _varianta(data, puvodni)
+    _novy_nazev(novy, data["varianty"], "varianty")
+    data["varianty"] = {(novy if k == puvodni else k): v for k, v in data["varianty"].items()}
+
+def _zmena_nastav_popis_varianty(data, zmena):
+    """Změní popis varianty ('varianta', 'popis_varianty')."""
+    _varianta(data, zmena["varianta"])["popis_varianty"] = zmena.get("popis_varianty", "")
+
+def _zmena_odeber_variantu(data, zmena):
+    """Odebere variantu ('varianta')."""
+    _varianta(data, zmena["varianta"])
+    del data["varianty"][zmena["varianta"]]
+
+def _zmena_nastav_popis_analyzy(data, zmena):
+    """Změní popis analýzy ('popis_analyzy')."""
+    data["popis_analyzy"] = zmena.get("popis_analyzy", "")
+
+# Operace -> funkce(data, zmena), která změnu provede na datech verze 1
+OPERACE_ZMEN = {
+    'nastav_hodnotu': _zmena_nastav_hodnotu,
+    'nastav_kriterium': _zmena_nastav_kriterium,
+    'zmen_vahu': _zmena_zmen_vahu,
+    'prejmenuj_kriterium': _zmena_prejmenuj_kriterium,
+    'odeber_kriterium': _zmena_odeber_kriterium,
+    'pridej_variantu': _zmena_pridej_variantu,
+    'prejmenuj_variantu': _zmena_prejmenuj_variantu,
+    'nastav_popis_varianty': _zmena_nastav_popis_varianty,
+    'odeber_variantu': _zmena_odeber_variantu,
+    'nastav_popis_analyzy': _zmena_nastav_popis_analyzy,
+}
+
+def proved_zmeny(data: Dict, zmeny: List[Dict]) -> None:
+    """
+    Provede seznam změn na datech analýzy (na místě).
+    
+    Args:
+        data: Data analýzy ve formátu verze 1
+        zmeny: List změn (viz OPERACE_ZMEN)
+        
+    Raises:
+        ValueError: Pokud je některá změna neplatná; data pak mohou
+                    být změněná jen zčásti a nemají se ukládat
+    """
+    kontrola_vah = False
+    for poradi, zmena in enumerate(zmeny):
+        operace = zmena.get("operace") if isinstance(zmena, dict) else None
+        if operace not in OPERACE_ZMEN:
+            raise ValueError(f"Neznámá operace změny č. {poradi + 1}: {operace}")
+        try:
+            OPERACE_ZMEN[operace](data, zmena)
+        except KeyError as e:
+            raise ValueError(f"Změně č. {poradi + 1} ({operace}) chybí parametr {e}")
+        kontrola_vah = kontrola_vah or operace in _OPERACE_S_VAHAMI
+    
+    if kontrola_vah and data["kriteria"]:
+        vahy_suma = sum(float(k_data["vaha"]) for k_data in data["kriteria"].values())
+        if abs(vahy_suma - 1.0) > 0.001:  # Konstanty.VALIDACE['TOLERANCE_SOUCTU_VAH']
+            raise ValueError(f"Součet vah musí být 1.0 (aktuálně: {vahy_suma:.3f}).")
+
+@anvil.server.callable
+@handle_errors
+def uprav_analyzu_zmenami(analyza_id: str, zmeny: List[Dict], verze: int, nazev: str = None) -> int:
+    """
+    Uloží jen změněné části analýzy. Všechny změny se provedou najednou
+    v jedné transakci, nebo se při chybě neprovede žádná.
+    
+    Args:
+        analyza_id: ID analýzy k úpravě
+        zmeny: List změn, např. {'operace': 'nastav_hodnotu', 'varianta': ...,
+               'kriterium': ..., 'hodnota': ...} (viz OPERACE_ZMEN)
+        verze: Verze analýzy, ze které změny vycházejí
+        nazev: Nový název analýzy (volitelný)
+        
+    Returns:
+        int: Nová verze analýzy
+        
+    Raises:
+        ValueError: Pokud analýzu mezitím uložil někdo jiný nebo je
+                    některá změna neplatná
+    """
+    with tables.Transaction():
+        # Data ve starším formátu převede do kompaktního samo uložení změn
+        analyza, ulozena = _nacti_ulozena_data(analyza_id, prevest=False)
+        _over_pravo_upravy(analyza)
+        _over_verzi(analyza, verze)
         
-        # Aktualizace názvu, pokud byl poskytnut
         if nazev is not None:
             validuj_nazev_analyzy(nazev)
-            analyza["nazev"] = nazev
         
-        # Aktualizace dat, pokud byla poskytnuta
-        if data is not None:
-            # Validace struktury dat
-            validuj_data_analyzy(data)
-            analyza["data_json"] = data
+        if zmeny:
+            data = Format_analyzy.rozbal_data(ulozena)
+            if data is ulozena:
+                # Data ve formátu verze 1 se mění na kopii
+                data = copy.deepcopy(ulozena)
+            proved_zmeny(data, zmeny)
+            ulozena = Format_analyzy.zabal_data(data)
+            analyza.update(data_json=ulozena, **souhrn_dat_analyzy(ulozena))
         
-        # Aktualizace časového razítka
-        analyza["datum_upravy"] = datetime.datetime.now()
+        if nazev is not None:
+            analyza["nazev"] = nazev
         
-    except Exception as e:
-        zapsat_chybu(f"Chyba při úpravě analýzy {analyza_id}: {str(e)}")
-        raise
+        nova_verze = (analyza["verze"] or 0) + 1
+        analyza.update(datum_upravy=datetime.datetime.now(), verze=nova_verze)
+    
+    Cache_vysledku.zneplatni_analyzu(analyza_id)
+    zapsat_info(f"Analýza {analyza_id}: uloženo {len(zmeny or [])} změn, verze {nova_verze}")
+    return nova_verze
 
 @anvil.server.callable
 @handle_errors
@@ -262,12 +642,37 @@ def smaz_analyzu(analyza_id: str) -> bool:
             raise ValueError("Nemáte oprávnění smazat tuto analýzu.")
             
         analyza.delete()
+        Cache_vysledku.zneplatni_analyzu(analyza_id)
         return True
         
     except Exception as e:
         zapsat_chybu(f"Chyba při mazání analýzy {analyza_id}: {str(e)}")
         raise
 
+def over_pristup_k_analyzam(analyza_ids) -> None:
+    """
+    Ověří, že aktuální uživatel smí pracovat se všemi zadanými analýzami.
+    Administrátor smí pracovat se všemi analýzami.
+    
+    Args:
+        analyza_ids: List ID analýz
+        
+    Raises:
+        ValueError: Pokud uživatel není přihlášen nebo některá analýza
+                    neexistuje či mu nepatří
+    """
+    uzivatel = anvil.users.get_user()
+    if not uzivatel:
+        raise ValueError("Pro práci s analýzami musíte být přihlášeni.")
+    if uzivatel.get("role") == "admin":
+        return
+    
+    # Jedno vyhledání místo načítání každé analýzy zvlášť
+    vlastni = {analyza.get_id() for analyza in app_tables.analyzy.search(uzivatel=uzivatel)}
+    cizi = [analyza_id for analyza_id in analyza_ids if analyza_id not in vlastni]
+    if cizi:
+        raise ValueError(f"Analýza s ID {cizi[0]} neexistuje nebo k ní nemáte oprávnění.")
+
 @anvil.server.callable
 @handle_errors
 def klonuj_analyzu(analyza_id: str) -> str:
@@ -305,7 +710,9 @@ def klonuj_analyzu(analyza_id: str) -> str:
             uzivatel=aktualni_uzivatel,
             data_json=puvodni["data_json"],
             datum_vytvoreni=datetime.datetime.now(),
-            datum_upravy=None
+            datum_upravy=None,
+            verze=1,
+            **souhrn_dat_analyzy(puvodni["data_json"])
         )
         
         zapsat_info(f"Analýza {analyza_id} úspěšně naklonována jako {nova_analyza.get_id()}")
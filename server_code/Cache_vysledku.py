@@ -0,0 +1,303 @@
+# -------------------------------------------------------
+# Modul: Cache_vysledku
+#
+# Serverová cache výsledků metod vícekriteriální analýzy.
+# Klíčem je (ID analýzy, hash obsahu dat, metoda, prahy ELECTRE),
+# takže změna dat analýzy vede na nový klíč i bez explicitní
+# invalidace. Položky vyprší po uplynutí TTL.
+# CRUD_analyzy při úpravě a smazání analýzy volá zneplatni_analyzu,
+# mazání uživatelů zneplatní celou dávku analýz funkcí zneplatni_analyzy.
+#
+# Cache má dvě úrovně. Trvalou úrovní je tabulka cache_vysledku
+# (výsledek jako komprimovaný JSON v Media), takže výsledky přežijí
+# mezi voláními serveru i bez trvalého serverového procesu. Nad ní je
+# paměť procesu omezená přibližnou velikostí výsledků v bajtech, kde se
+# položky vytlačují podle LRU. Výsledky větší než MAX_VELIKOST_POLOZKY_B
+# se neukládají vůbec - jejich uložení by trvalo déle než nový výpočet.
+# -------------------------------------------------------
+import gzip
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+import anvil
+import anvil.server
+import anvil.tables.query as q
+from anvil.tables import app_tables
+
+# Maximální celková velikost výsledků v paměti procesu (bajty JSON)
+MAX_VELIKOST_PAMETI_B = 64 * 1024 * 1024
+
+# Výsledky větší než tento limit (bajty JSON) se do cache neukládají
+MAX_VELIKOST_POLOZKY_B = 16 * 1024 * 1024
+
+# Doba platnosti výsledku v sekundách
+PLATNOST_S = 6 * 60 * 60
+
+# Klíč -> (čas uložení, výsledek, velikost); pořadí odpovídá poslednímu použití
+_polozky = OrderedDict()
+_velikost_b = 0
+_zamek = threading.Lock()
+_pocitadla = {
+    'zasahy': 0, 'zasahy_tabulky': 0, 'minuti': 0, 'vyprsene': 0,
+    'vytlacene': 0, 'zneplatnene': 0, 'prilis_velke': 0
+}
+
+def zapsat_info(zprava):
+    """Pomocná funkce pro serverové logování info zpráv"""
+    logging.info(f"[INFO] {zprava}")
+
+def zapsat_chybu(zprava):
+    """Pomocná funkce pro serverové logování chyb"""
+    logging.error(f"[CHYBA] {zprava}")
+
+def hash_dat(analyza_data):
+    """
+    Vrátí hash obsahu dat analýzy, který ovlivňuje výsledky výpočtu.
+    Název, popis a data vytvoření/úpravy se do hashe nezapočítávají.
+
+    Args:
+        analyza_data: Slovník s daty analýzy
+
+    Returns:
+        str: Hexadecimální SHA-256 otisk kritérií a variant
+    """
+    obsah = {
+        'kriteria': analyza_data.get('kriteria', {}),
+        'varianty': analyza_data.get('varianty', {})
+    }
+    serializovano = json.dumps(obsah, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(serializovano.encode('utf-8')).hexdigest()
+
+def _json_hodnota(hodnota):
+    """
+    Převede pro JSON hodnoty, které modul json nezná - pole a skaláry NumPy
+    (např. řídká relace převahy ELECTRE z Vypocty_numpy).
+
+    Raises:
+        TypeError: Pokud hodnotu nelze převést
+    """
+    if hasattr(hodnota, 'tolist'):
+        return hodnota.tolist()
+    raise TypeError(f"Hodnotu typu {type(hodnota).__name__} nelze uložit do cache")
+
+def vytvor_klic(analyza_id, otisk_dat, metoda, index_souhlasu=None, index_nesouhlasu=None):
+    """
+    Sestaví klíč cache. Prahy ELECTRE jsou součástí klíče jen u metody
+    ELECTRE, ostatní metody na nich nezávisí.
+
+    Returns:
+        tuple: Klíč do cache
+    """
+    metoda = metoda.lower()
+    if metoda != 'electre':
+        index_souhlasu = index_nesouhlasu = None
+    return (analyza_id, otisk_dat, metoda, index_souhlasu, index_nesouhlasu)
+
+def _klic_tabulky(klic):
+    """Vrátí část klíče, která v tabulce doplňuje ID analýzy a otisk dat (metoda a prahy)."""
+    return json.dumps(list(klic[2:]))
+
+def _radky_tabulky(klic):
+    """Vrátí řádky tabulky cache_vysledku uložené pod daným klíčem."""
+    return app_tables.cache_vysledku.search(
+        analyza_id=klic[0], otisk_dat=klic[1], klic=_klic_tabulky(klic)
+    )
+
+def _vloz_do_pameti(klic, cas_ulozeni, vysledek, velikost):
+    """Vloží výsledek do paměti a vytlačí nejdéle nepoužité položky nad limit (volá se pod zámkem)."""
+    global _velikost_b
+    puvodni = _polozky.pop(klic, None)
+    if puvodni is not None:
+        _velikost_b -= puvodni[2]
+    _polozky[klic] = (cas_ulozeni, vysledek, velikost)
+    _velikost_b += velikost
+    while _velikost_b > MAX_VELIKOST_PAMETI_B and len(_polozky) > 1:
+        _, (_, _, vytlacena) = _polozky.popitem(last=False)
+        _velikost_b -= vytlacena
+        _pocitadla['vytlacene'] += 1
+
+def _odeber_z_pameti(klic):
+    """Odebere položku z paměti (volá se pod zámkem)."""
+    global _velikost_b
+    polozka = _polozky.pop(klic, None)
+    if polozka is not None:
+        _velikost_b -= polozka[2]
+
+def _nacti_z_tabulky(klic):
+    """
+    Načte výsledek z tabulky cache_vysledku.
+
+    Returns:
+        tuple: (čas uložení, výsledek, velikost), nebo None pokud chybí nebo vypršel
+    """
+    try:
+        for radek in _radky_tabulky(klic):
+            if time.time() - radek['cas_ulozeni'] > PLATNOST_S:
+                radek.delete()
+                with _zamek:
+                    _pocitadla['vyprsene'] += 1
+                continue
+            obsah = gzip.decompress(radek['vysledek'].get_bytes())
+            return radek['cas_ulozeni'], json.loads(obsah.decode('utf-8')), len(obsah)
+    except Exception as e:
+        zapsat_chybu(f"Cache výsledků: načtení z tabulky selhalo: {str(e)}")
+    return None
+
+def nacti(klic):
+    """
+    Vrátí výsledek z cache, nebo None pokud chybí nebo mu vypršela platnost.
+    Výsledek nalezený jen v tabulce se uloží i do paměti procesu.
+
+    Args:
+        klic: Klíč vytvořený funkcí vytvor_klic
+
+    Returns:
+        Uložený výsledek nebo None
+    """
+    with _zamek:
+        polozka = _polozky.get(klic)
+        if polozka is not None:
+            cas_ulozeni, vysledek, _ = polozka
+            if time.time() - cas_ulozeni <= PLATNOST_S:
+                _polozky.move_to_end(klic)
+                _pocitadla['zasahy'] += 1
+                return vysledek
+            _odeber_z_pameti(klic)
+
+    polozka = _nacti_z_tabulky(klic)
+    with _zamek:
+        if polozka is None:
+            _pocitadla['minuti'] += 1
+            return None
+        _vloz_do_pameti(klic, *polozka)
+        _pocitadla['zasahy'] += 1
+        _pocitadla['zasahy_tabulky'] += 1
+        return polozka[1]
+
+def uloz(klic, vysledek):
+    """
+    Uloží výsledek do cache a odstraní z tabulky vypršené položky.
+    Výsledky větší než MAX_VELIKOST_POLOZKY_B se přeskočí.
+
+    Args:
+        klic: Klíč vytvořený funkcí vytvor_klic
+        vysledek: Výsledek výpočtu (po uložení se nesmí měnit); pole NumPy
+                  se v tabulce uloží jako seznamy
+    """
+    obsah = json.dumps(vysledek, ensure_ascii=False, default=_json_hodnota).encode('utf-8')
+    if len(obsah) > MAX_VELIKOST_POLOZKY_B:
+        with _zamek:
+            _pocitadla['prilis_velke'] += 1
+        zapsat_info(f"Cache výsledků: výsledek {klic[2].upper()} má {len(obsah)} B, neukládá se")
+        return
+
+    cas_ulozeni = time.time()
+    with _zamek:
+        _vloz_do_pameti(klic, cas_ulozeni, vysledek, len(obsah))
+
+    try:
+        # Spolu s původní položkou klíče se odstraní i všechny vypršené
+        for radek in _radky_tabulky(klic):
+            radek.delete()
+        for radek in app_tables.cache_vysledku.search(cas_ulozeni=q.less_than(cas_ulozeni - PLATNOST_S)):
+            radek.delete()
+        app_tables.cache_vysledku.add_row(
+            analyza_id=klic[0],
+            otisk_dat=klic[1],
+            klic=_klic_tabulky(klic),
+            vysledek=anvil.BlobMedia('application/gzip', gzip.compress(obsah), name=f"{klic[2]}.json.gz"),
+            velikost=len(obsah),
+            cas_ulozeni=cas_ulozeni
+        )
+    except Exception as e:
+        zapsat_chybu(f"Cache výsledků: uložení do tabulky selhalo: {str(e)}")
+
+def zneplatni_analyzu(analyza_id):
+    """
+    Odstraní z cache všechny výsledky dané analýzy.
+
+    Args:
+        analyza_id: ID analýzy
+
+    Returns:
+        int: Počet odstraněných položek
+    """
+    return zneplatni_analyzy([analyza_id])
+
+def zneplatni_analyzy(analyza_ids):
+    """
+    Odstraní z cache všechny výsledky zadaných analýz jedním dotazem
+    do tabulky (např. pro dávku analýz smazaných spolu s uživatelem).
+
+    Args:
+        analyza_ids: List ID analýz
+
+    Returns:
+        int: Počet odstraněných položek
+    """
+    analyza_ids = set(analyza_ids)
+    if not analyza_ids:
+        return 0
+    with _zamek:
+        klice = [klic for klic in _polozky if klic[0] in analyza_ids]
+        for klic in klice:
+            _odeber_z_pameti(klic)
+
+    pocet = len(klice)
+    try:
+        radky = list(app_tables.cache_vysledku.search(analyza_id=q.any_of(*analyza_ids)))
+        for radek in radky:
+            radek.delete()
+        pocet = max(pocet, len(radky))
+    except Exception as e:
+        zapsat_chybu(f"Cache výsledků: zneplatnění v tabulce selhalo: {str(e)}")
+
+    with _zamek:
+        _pocitadla['zneplatnene'] += pocet
+    if pocet:
+        popis = f"analýzy {next(iter(analyza_ids))}" if len(analyza_ids) == 1 else f"{len(analyza_ids)} analýz"
+        zapsat_info(f"Cache výsledků: zneplatněno {pocet} položek {popis}")
+    return pocet
+
+def vycisti():
+    """Vyprázdní cache v paměti i v tabulce a vynuluje počítadla."""
+    global _velikost_b
+    with _zamek:
+        _polozky.clear()
+        _velikost_b = 0
+        for nazev in _pocitadla:
+            _pocitadla[nazev] = 0
+    app_tables.cache_vysledku.delete_all_rows()
+
+def statistiky():
+    """
+    Vrátí počítadla cache.
+
+    Returns:
+        dict: Počty zásahů (z toho z tabulky), minutí, vypršených,
+              vytlačených, zneplatněných a příliš velkých položek,
+              aktuální počet a velikost položek v paměti a úspěšnost (0-1)
+    """
+    with _zamek:
+        vysledek = dict(_pocitadla)
+        vysledek['velikost'] = len(_polozky)
+        vysledek['velikost_b'] = _velikost_b
+    celkem = vysledek['zasahy'] + vysledek['minuti']
+    vysledek['uspesnost'] = vysledek['zasahy'] / celkem if celkem else 0.0
+    return vysledek
+
+@anvil.server.callable
+def nacti_statistiky_cache():
+    """
+    Vrátí statistiky cache výsledků pro administraci.
+
+    Returns:
+        dict: Viz statistiky()
+    """
+    from . import Sprava_uzivatelu
+    Sprava_uzivatelu.over_admin_prava()
+    return statistiky()
@@ -0,0 +1,332 @@
+# -------------------------------------------------------
+# Modul: Citlivost_numpy
+#
+# Serverový engine analýzy citlivosti na váhy kritérií.
+#
+# Váha vybraného kritéria c se mění na hodnotu t a ostatní váhy se
+# proporcionálně přepočítají na součet 1 - t (stejně jako ve Vypocty).
+# U WSM, WPM (v logaritmu skóre) a MABAC je pak skóre každé varianty
+# lineární funkcí t:  skore_i(t) = a_ic + b_ic * t.  Koeficienty pro
+# všechna kritéria najednou dává jeden maticový součin, libovolně jemná
+# mřížka vah je jen vnější součin a body změny pořadí (průsečíky přímek)
+# se dají spočítat přesně.
+#
+# TOPSIS lineární není. Ideální a anti-ideální řešení vážené matice
+# jsou ale pro nezáporné váhy w_j * max a w_j * min sloupce, takže
+# druhé mocniny vzdáleností jsou součinem matice čtverců vah
+# [kroky x kriteria] a matice čtverců rozdílů [kriteria x varianty].
+# Všechny kroky se tak vyhodnotí dávkově bez cyklu přes varianty.
+#
+# Vstupní matice odpovídají tomu, co dostává vypocitej_analyzu_citlivosti:
+# WSM a TOPSIS pracují s min-max normalizovanou maticí, WPM a MABAC
+# s původními hodnotami.
+# -------------------------------------------------------
+import numpy as np
+
+from . import Vypocty_numpy
+
+# Počet variant, do kterého se hledají průsečíky všech dvojic variant
+# (počet dvojic roste kvadraticky)
+MAX_VARIANT_PRO_PRUSECIKY = 2000
+
+# Nejvyšší počet vrácených průsečíků na kritérium (nejbližší aktuální váze)
+MAX_POCET_PRUSECIKU = 1000
+
+# Metody, jejichž skóre je lineární ve váze vybraného kritéria
+LINEARNI_METODY = ("wsm", "wpm", "mabac")
+
+# Souhrn skóre a pořadí (souhrn=True): nad MAX_VARIANT_SOUHRNU variant se po
+# krocích vrací jen TOP_K_SOUHRNU variant s nejlepším průměrným pořadím
+# a minimum/maximum ostatních (odpovídá Vizualizace.MAX_VARIANT_GRAFU
+# a Vizualizace.TOP_K_VARIANT)
+MAX_VARIANT_SOUHRNU = 40
+TOP_K_SOUHRNU = 10
+
+def vytvor_rozsah_vah(pocet_kroku=9, vaha_od=0.1, vaha_do=0.9):
+    """
+    Vytvoří rovnoměrnou mřížku vah vybraného kritéria.
+
+    Returns:
+        Pole float64 s pocet_kroku hodnotami od vaha_od do vaha_do
+
+    Raises:
+        ValueError: Pokud je kroků méně než 2 nebo neplatí 0 <= vaha_od < vaha_do <= 1
+    """
+    if pocet_kroku < 2:
+        raise ValueError("Počet kroků musí být alespoň 2")
+    if not 0 <= vaha_od < vaha_do <= 1:
+        raise ValueError("Rozsah vah musí splňovat 0 <= vaha_od < vaha_do <= 1")
+    kroky = np.arange(pocet_kroku, dtype=np.float64)
+    return vaha_od + ((vaha_do - vaha_od) * kroky / (pocet_kroku - 1))
+
+def _prispevky_kriterii(matice, typy_kriterii, metoda):
+    """
+    Vrátí matici C [varianty x kriteria], pro kterou je skóre lineárních
+    metod rovno C @ vahy (u WPM jde o logaritmus skóre).
+    """
+    if metoda == "wsm":
+        return Vypocty_numpy.normalizuj_matici_minmax(matice, typy_kriterii)
+    if metoda == "wpm":
+        return np.log(Vypocty_numpy._wpm_zaklad(matice, typy_kriterii))
+    if metoda == "mabac":
+        posunuta = Vypocty_numpy.normalizuj_matici_minmax(matice, typy_kriterii) + 1
+        # Hraniční hodnota g_j = w_j * geometrický průměr (r_ij + 1)
+        hranice = np.exp(np.log(posunuta).mean(axis=0))
+        return posunuta - hranice
+    raise ValueError(f"Metoda {metoda.upper()} nemá lineární skóre")
+
+def _linearni_koeficienty(prispevky, vahy):
+    """
+    Spočítá koeficienty a, b přímek skore_i(t) = a_ic + b_ic * t pro všechna
+    kritéria c najednou.
+
+    Args:
+        prispevky: Matice C [varianty x kriteria]
+        vahy: Pole vah kritérií
+
+    Returns:
+        tuple: (a, b) - pole [varianty x kriteria]
+    """
+    # Skóre bez příspěvku kritéria c - jeden maticový součin pro všechna kritéria
+    zbytek = (prispevky @ vahy)[:, None] - prispevky * vahy[None, :]
+    suma_zbylych = vahy.sum() - vahy
+
+    # Při nulovém součtu zbylých vah se ostatní váhy nepřepočítávají
+    kladna = suma_zbylych > 0
+    delitel = np.where(kladna, suma_zbylych, 1.0)
+    a = np.where(kladna, zbytek / delitel, zbytek)
+    b = np.where(kladna, prispevky - zbytek / delitel, prispevky)
+    return a, b
+
+def _poradi(skore):
+    """
+    Převede skóre [kroky x varianty] na pořadí (1 = nejlepší).
+    Shodná skóre řadí stabilně podle indexu varianty.
+    """
+    serazene = np.argsort(-skore, axis=1, kind="stable")
+    poradi = np.empty_like(serazene)
+    radky = np.arange(skore.shape[0])[:, None]
+    poradi[radky, serazene] = np.arange(1, skore.shape[1] + 1)[None, :]
+    return poradi
+
+def vypocitej_prusecky(a, b, vaha_od, vaha_do, aktualni_vaha=None, max_pocet=None):
+    """
+    Najde přesné váhy, při kterých se dvě varianty vymění v pořadí.
+
+    Args:
+        a, b: Koeficienty přímek jednoho kritéria (pole délky varianty)
+        vaha_od, vaha_do: Zkoumaný interval vah
+        aktualni_vaha: Současná váha kritéria (pro výběr nejbližších průsečíků)
+        max_pocet: Nejvyšší počet vrácených průsečíků - ponechají se ty
+                   nejblíže aktuální váze
+
+    Returns:
+        list: Trojice (vaha, index_i, index_j) seřazené podle váhy
+    """
+    i, j = np.triu_indices(len(a), k=1)
+    rozdil_sklonu = b[i] - b[j]
+    ruzne = rozdil_sklonu != 0
+    i, j = i[ruzne], j[ruzne]
+    vahy = (a[j] - a[i]) / rozdil_sklonu[ruzne]
+    uvnitr = (vahy >= vaha_od) & (vahy <= vaha_do)
+    i, j, vahy = i[uvnitr], j[uvnitr], vahy[uvnitr]
+
+    if max_pocet is not None and len(vahy) > max_pocet:
+        stred = aktualni_vaha if aktualni_vaha is not None else (vaha_od + vaha_do) / 2
+        nejblizsi = np.argpartition(np.abs(vahy - stred), max_pocet - 1)[:max_pocet]
+        i, j, vahy = i[nejblizsi], j[nejblizsi], vahy[nejblizsi]
+
+    poradi = np.argsort(vahy, kind="stable")
+    return list(zip(vahy[poradi].tolist(), i[poradi].tolist(), j[poradi].tolist()))
+
+def vypocitej_zmeny_nejlepsi(a, b, vaha_od, vaha_do):
+    """
+    Projde horní obálku přímek a vrátí přesné váhy, při kterých se mění
+    nejlepší varianta.
+
+    Returns:
+        list: Trojice (vaha, puvodni_index, novy_index)
+    """
+    def nejlepsi_v(t):
+        skore = a + b * t
+        kandidati = np.flatnonzero(skore == skore.max())
+        # Při shodě vede varianta s nižším indexem (stejně jako stabilní řazení)
+        return int(kandidati[0])
+
+    zmeny = []
+    t = vaha_od
+    nejlepsi = nejlepsi_v(t)
+    prvni = True
+    while True:
+        # Kandidáti rostou rychleji než aktuální nejlepší a předstihnou jej až za t;
+        # v prvním intervalu se počítá i průsečík přímo ve vaha_od
+        rychlejsi = b > b[nejlepsi]
+        if not rychlejsi.any():
+            break
+        prusecik = (a[nejlepsi] - a[rychlejsi]) / (b[rychlejsi] - b[nejlepsi])
+        za_t = prusecik >= t if prvni else prusecik > t
+        prvni = False
+        pred_koncem = prusecik[za_t & (prusecik <= vaha_do)]
+        if len(pred_koncem) == 0:
+            break
+        t = float(pred_koncem.min())
+        # Těsně za průsečíkem je nejlepší ta z vyrovnaných přímek s největším sklonem
+        skore = a + b * t
+        vyrovnane = np.flatnonzero(np.isclose(skore, skore.max(), rtol=1e-12, atol=1e-15))
+        novy = int(vyrovnane[np.argmax(b[vyrovnane])])
+        if novy == nejlepsi:
+            break
+        zmeny.append((t, nejlepsi, novy))
+        nejlepsi = novy
+    return zmeny
+
+def _zmeny_nejlepsi_z_mrizky(skore, vahy_rozsah):
+    """Odvodí změny nejlepší varianty z hodnot na mřížce vah."""
+    nejlepsi = np.argmax(skore, axis=1)
+    kroky = np.flatnonzero(nejlepsi[1:] != nejlepsi[:-1]) + 1
+    return [(float(vahy_rozsah[k]), int(nejlepsi[k - 1]), int(nejlepsi[k])) for k in kroky]
+
+def _souhrn_skore(skore, poradi, varianty):
+    """
+    Zmenší skóre a pořadí [kroky x varianty] na zobrazené varianty.
+
+    Do MAX_VARIANT_SOUHRNU variant jsou zobrazené všechny v původním pořadí,
+    nad limitem TOP_K_SOUHRNU variant s nejlepším průměrným pořadím
+    a ostatní jen jako minimum a maximum v každém kroku.
+
+    Returns:
+        dict: 'zobrazene_varianty', 'citlivost_skore', 'citlivost_poradi'
+              (sloupce odpovídají zobrazeným variantám) a případně 'ostatni'
+    """
+    if len(varianty) <= MAX_VARIANT_SOUHRNU:
+        zobrazene = np.arange(len(varianty))
+        ostatni = zobrazene[:0]
+    else:
+        # Shodné průměrné pořadí řadí stabilně podle indexu varianty
+        podle_poradi = np.argsort(poradi.sum(axis=0), kind="stable")
+        zobrazene, ostatni = podle_poradi[:TOP_K_SOUHRNU], podle_poradi[TOP_K_SOUHRNU:]
+
+    vysledek = {
+        'zobrazene_varianty': [varianty[i] for i in zobrazene.tolist()],
+        'citlivost_skore': skore[:, zobrazene].tolist(),
+        'citlivost_poradi': poradi[:, zobrazene].tolist()
+    }
+    if len(ostatni):
+        vysledek['ostatni'] = {
+            'pocet': len(ostatni),
+            'citlivost_skore_min': skore[:, ostatni].min(axis=1).tolist(),
+            'citlivost_skore_max': skore[:, ostatni].max(axis=1).tolist(),
+            'citlivost_poradi_min': poradi[:, ostatni].min(axis=1).tolist(),
+            'citlivost_poradi_max': poradi[:, ostatni].max(axis=1).tolist()
+        }
+    return vysledek
+
+def _topsis_skore(norm_matice, vahy, vyber_kriteria, vahy_rozsah):
+    """
+    Dávkově spočítá relativní blízkost TOPSIS pro všechny kroky mřížky.
+
+    Returns:
+        Pole float64 [kroky x varianty]
+    """
+    # Matice vah [kroky x kriteria] po proporcionálním přepočtu
+    suma_zbylych = vahy.sum() - vahy[vyber_kriteria]
+    nasobek = (1 - vahy_rozsah) / suma_zbylych if suma_zbylych > 0 else np.ones_like(vahy_rozsah)
+    matice_vah = nasobek[:, None] * vahy[None, :]
+    matice_vah[:, vyber_kriteria] = vahy_rozsah
+
+    ctverce_vah = matice_vah ** 2
+    k_idealu = (norm_matice - norm_matice.max(axis=0)) ** 2
+    k_anti_idealu = (norm_matice - norm_matice.min(axis=0)) ** 2
+    dist_ideal = np.sqrt(ctverce_vah @ k_idealu.T)
+    dist_anti_ideal = np.sqrt(ctverce_vah @ k_anti_idealu.T)
+
+    jmenovatel = dist_ideal + dist_anti_ideal
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(jmenovatel == 0, 0.0, dist_anti_ideal / jmenovatel)
+
+def vypocitej_citlivost(matice, typy_kriterii, varianty, kriteria, vahy, metoda="wsm",
+                        pocet_kroku=9, vaha_od=0.1, vaha_do=0.9, kriteria_indexy=None,
+                        vratit_skore=True, souhrn=False):
+    """
+    Provede analýzu citlivosti pro všechna (nebo vybraná) kritéria najednou.
+
+    Args:
+        matice, typy_kriterii, varianty, kriteria, vahy: Výstup Vypocty_numpy.priprav_pole
+        metoda: "wsm", "wpm", "topsis" nebo "mabac"
+        pocet_kroku: Počet kroků mřížky vah (libovolný, např. 1000)
+        vaha_od, vaha_do: Rozsah vah vybraného kritéria
+        kriteria_indexy: Indexy zkoumaných kritérií (výchozí jsou všechna)
+        vratit_skore: Zda vracet skóre a pořadí pro každý krok mřížky
+        souhrn: Vracet skóre a pořadí jen pro zobrazené varianty (viz _souhrn_skore)
+                místo úplných polí [kroky x varianty]
+
+    Returns:
+        dict: 'metoda', 'vahy_rozsah' a 'kriteria' (název kritéria -> výsledek
+              ve formátu vypocitej_analyzu_citlivosti doplněný o 'zmeny_nejlepsi',
+              u lineárních metod také o přesné 'prusecky' nejbližší aktuální váze)
+
+    Raises:
+        ValueError: Pokud metoda není podporována, jsou váhy záporné
+                    nebo je neplatný rozsah vah
+    """
+    metoda = metoda.lower()
+    if metoda not in LINEARNI_METODY and metoda != "topsis":
+        raise ValueError(f"Nepodporovaná metoda analýzy: {metoda}")
+    if (vahy < 0).any():
+        raise ValueError("Váhy kritérií musí být nezáporné")
+
+    vahy_rozsah = vytvor_rozsah_vah(pocet_kroku, vaha_od, vaha_do)
+    if kriteria_indexy is None:
+        kriteria_indexy = range(len(kriteria))
+
+    if metoda in LINEARNI_METODY:
+        a, b = _linearni_koeficienty(_prispevky_kriterii(matice, typy_kriterii, metoda), vahy)
+    else:
+        norm_matice = Vypocty_numpy.normalizuj_matici_minmax(matice, typy_kriterii)
+
+    vysledky = {}
+    for c in kriteria_indexy:
+        if metoda in LINEARNI_METODY:
+            # Všechny kroky najednou jako vnější součin [kroky x varianty]
+            skore = a[:, c][None, :] + vahy_rozsah[:, None] * b[:, c][None, :]
+            zmeny = vypocitej_zmeny_nejlepsi(a[:, c], b[:, c], vaha_od, vaha_do)
+        else:
+            skore = _topsis_skore(norm_matice, vahy, c, vahy_rozsah)
+            zmeny = _zmeny_nejlepsi_z_mrizky(skore, vahy_rozsah)
+
+        vysledek = {
+            'vahy_rozsah': vahy_rozsah.tolist(),
+            'zvolene_kriterium': kriteria[c],
+            'zvolene_kriterium_index': c,
+            'presne': metoda in LINEARNI_METODY,
+            'zmeny_nejlepsi': [
+                {'vaha': t, 'puvodni': varianty[i], 'nova': varianty[j]} for t, i, j in zmeny
+            ]
+        }
+
+        if metoda in LINEARNI_METODY and len(varianty) <= MAX_VARIANT_PRO_PRUSECIKY:
+            vysledek['prusecky'] = [
+                {'vaha': t, 'varianta_a': varianty[i], 'varianta_b': varianty[j]}
+                for t, i, j in vypocitej_prusecky(
+                    a[:, c], b[:, c], vaha_od, vaha_do,
+                    aktualni_vaha=float(vahy[c]), max_pocet=MAX_POCET_PRUSECIKU
+                )
+            ]
+
+        if vratit_skore:
+            # WPM se počítá v logaritmu, ven jde skutečné produktové skóre
+            skore_ven = np.exp(skore) if metoda == "wpm" else skore
+            poradi = _poradi(skore)
+            if souhrn:
+                vysledek.update(_souhrn_skore(skore_ven, poradi, varianty))
+            else:
+                vysledek['citlivost_skore'] = skore_ven.tolist()
+                vysledek['citlivost_poradi'] = poradi.tolist()
+
+        vysledky[kriteria[c]] = vysledek
+
+    return {
+        'metoda': metoda.upper(),
+        'vahy_rozsah': vahy_rozsah.tolist(),
+        'kriteria': vysledky
+    }
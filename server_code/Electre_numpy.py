@@ -0,0 +1,144 @@
+# -------------------------------------------------------
+# Modul: Electre_numpy
+#
+# Dlaždicový (blokový) výpočet relace převahy metody ELECTRE pro velký
+# počet variant.
+#
+# Matice souhlasu a nesouhlasu se nikdy nesestavují celé - počítají se
+# po dlaždicích [blok variant x blok variant] a z každé dlaždice se
+# ihned odvodí binární relace převahy. Uchovává se jen tato relace
+# v řídkém formátu CSR (indptr, indices) a stupně vrcholů, ze kterých
+# se počítá Net Flow. Najednou se drží jen dlaždice matic souhlasu
+# a nesouhlasu a bool pás relace jednoho bloku řádků, paměť je tak
+# O(velikost_dlazdice * m + počet hran) místo tří hustých matic m x m.
+#
+# Výpočet v dlaždici sčítá váhy a hledá maxima ve stejném pořadí
+# kritérií jako hustá verze ve Vypocty_numpy, takže relace i Net Flow
+# jsou s ní shodné.
+# -------------------------------------------------------
+import numpy as np
+
+# Výchozí velikost hrany dlaždice (počet variant)
+VELIKOST_DLAZDICE = 512
+
+def _dlazdice_prevahy(norm_matice, vahy, radky, sloupce, index_souhlasu, index_nesouhlasu):
+    """
+    Spočítá binární relaci převahy pro jednu dlaždici variant.
+
+    Args:
+        norm_matice: Pole float64 normalizovaných hodnot [varianty x kriteria]
+        vahy: Pole vah kritérií
+        radky, sloupce: Rozsahy (slice) variant dlaždice
+        index_souhlasu, index_nesouhlasu: Prahové hodnoty ELECTRE
+
+    Returns:
+        Pole bool [radky x sloupce], True pokud varianta řádku převyšuje variantu sloupce
+    """
+    blok_radku = norm_matice[radky]
+    blok_sloupcu = norm_matice[sloupce]
+    souhlas = np.zeros((blok_radku.shape[0], blok_sloupcu.shape[0]), dtype=np.float64)
+    nesouhlas = np.zeros_like(souhlas)
+    for k in range(norm_matice.shape[1]):
+        hodnoty_radku = blok_radku[:, k][:, None]
+        hodnoty_sloupcu = blok_sloupcu[:, k][None, :]
+        souhlas += np.where(hodnoty_radku >= hodnoty_sloupcu, vahy[k], 0.0)
+        np.maximum(nesouhlas, hodnoty_sloupcu - hodnoty_radku, out=nesouhlas)
+
+    prevaha = (souhlas >= index_souhlasu) & (nesouhlas <= index_nesouhlasu)
+
+    # Varianta nepřevyšuje sama sebe (diagonála leží v dlaždicích na hlavní diagonále)
+    if radky.start == sloupce.start:
+        np.fill_diagonal(prevaha, False)
+    return prevaha
+
+def vypocitej_prevahu_ridce(norm_matice, vahy, index_souhlasu, index_nesouhlasu,
+                            velikost_dlazdice=VELIKOST_DLAZDICE):
+    """
+    Vypočítá relaci převahy po dlaždicích a uloží ji jako řídkou matici CSR.
+
+    Args:
+        norm_matice: Pole float64 normalizovaných hodnot [varianty x kriteria]
+        vahy: Pole vah kritérií
+        index_souhlasu, index_nesouhlasu: Prahové hodnoty ELECTRE
+        velikost_dlazdice: Počet variant na hraně dlaždice
+
+    Returns:
+        dict: 'indptr' a 'indices' relace převahy (řádek i převyšuje sloupce
+              indices[indptr[i]:indptr[i+1]]), 'odchozi' a 'prichozi' stupně
+              jako pole int64
+    """
+    pocet_variant = norm_matice.shape[0]
+    prichozi = np.zeros(pocet_variant, dtype=np.int64)
+    indptr = np.zeros(pocet_variant + 1, dtype=np.int64)
+    indexy_bloku = []
+
+    for zacatek_radku in range(0, pocet_variant, velikost_dlazdice):
+        radky = slice(zacatek_radku, min(zacatek_radku + velikost_dlazdice, pocet_variant))
+
+        # Pás relace pro blok řádků [blok x varianty] - jen bool, bez matic souhlasu
+        pas = np.empty((radky.stop - radky.start, pocet_variant), dtype=bool)
+        for zacatek_sloupcu in range(0, pocet_variant, velikost_dlazdice):
+            sloupce = slice(zacatek_sloupcu, min(zacatek_sloupcu + velikost_dlazdice, pocet_variant))
+            pas[:, sloupce] = _dlazdice_prevahy(
+                norm_matice, vahy, radky, sloupce, index_souhlasu, index_nesouhlasu
+            )
+
+        prichozi += pas.sum(axis=0)
+        indptr[radky.start + 1:radky.stop + 1] = pas.sum(axis=1)
+        # np.nonzero vrací hrany po řádcích, tedy přímo v pořadí CSR
+        indexy_bloku.append(np.nonzero(pas)[1].astype(np.int32))
+
+    np.cumsum(indptr, out=indptr)
+    odchozi = np.diff(indptr)
+    indices = np.concatenate(indexy_bloku) if indexy_bloku else np.zeros(0, dtype=np.int32)
+
+    return {'indptr': indptr, 'indices': indices, 'odchozi': odchozi, 'prichozi': prichozi}
+
+def vypocitej_net_flows_ridce(prevaha, varianty):
+    """
+    Vypočítá Net Flow (odchozí - příchozí převahy) ze stupňů řídké relace.
+
+    Args:
+        prevaha: Výstup vypocitej_prevahu_ridce
+        varianty: List názvů variant
+
+    Returns:
+        list: Seznam dvojic (varianta, net_flow) seřazený sestupně podle net_flow
+    """
+    net_flows = prevaha['odchozi'] - prevaha['prichozi']
+    poradi_indexu = np.argsort(-net_flows, kind="stable")
+    hodnoty = net_flows.tolist()
+    return [(varianty[i], hodnoty[i]) for i in poradi_indexu.tolist()]
+
+def vyber_podgraf(prevaha, uzly):
+    """
+    Vrátí hustou podmatici relace převahy zúženou na vybrané varianty.
+
+    Args:
+        prevaha: Výstup vypocitej_prevahu_ridce
+        uzly: Seřazené indexy vybraných variant
+
+    Returns:
+        Pole int [uzly x uzly] s hodnotami 0/1
+    """
+    pocet_variant = len(prevaha['indptr']) - 1
+    pozice = np.full(pocet_variant, -1, dtype=np.int64)
+    pozice[uzly] = np.arange(len(uzly))
+    podgraf = np.zeros((len(uzly), len(uzly)), dtype=int)
+    for a, i in enumerate(uzly):
+        sousede = pozice[prevaha['indices'][prevaha['indptr'][i]:prevaha['indptr'][i + 1]]]
+        podgraf[a, sousede[sousede >= 0]] = 1
+    return podgraf
+
+def na_hustou_matici(prevaha):
+    """
+    Převede řídkou relaci převahy na hustou matici 0/1 (jen pro malé analýzy).
+
+    Returns:
+        Pole int [varianty x varianty]
+    """
+    pocet_variant = len(prevaha['indptr']) - 1
+    husta = np.zeros((pocet_variant, pocet_variant), dtype=int)
+    radky = np.repeat(np.arange(pocet_variant), np.diff(prevaha['indptr']))
+    husta[radky, prevaha['indices']] = 1
+    return husta
@@ -12,7 +12,22 @@ import anvil.tables as tables
 import anvil.tables.query as q
 from anvil.tables import app_tables
 from anvil import Media
-from . import CRUD_analyzy
+from . import Cache_vysledku, CRUD_analyzy, Generator_html, Pdf_report, Vypocty
+
+# Výpočetní engine je jeden - čistě Pythonový modul Vypocty sdílený
+# s klientem. Je-li na serveru k dispozici NumPy, metody se počítají
+# rychlou maticovou cestou (Vypocty_numpy), jinak přímo přes Vypocty.
+try:
+    from . import Citlivost_numpy, Monte_carlo_numpy, Vypocty_numpy
+except ImportError:
+    Citlivost_numpy = Monte_carlo_numpy = Vypocty_numpy = None
+
+# Od kolika variant se Excel report zapisuje v režimu constant_memory
+# (xlsxwriter drží v paměti jen rozepsaný řádek každého listu)
+VELKY_REPORT_OD_VARIANT = 2000
+
+# Nejvyšší počet kroků mřížky vah v analýze citlivosti volané z klienta
+MAX_KROKU_CITLIVOSTI = 101
 
 def zapsat_info(zprava):
     """Pomocná funkce pro serverové logování info zpráv"""
@@ -37,11 +52,22 @@ def handle_errors(func):
             raise ValueError(zprava) from e
     return wrapper
 
+def _over_numpy(nazev_analyzy):
+    """
+    Ověří, že je na serveru k dispozici NumPy.
+
+    Raises:
+        ValueError: Pokud NumPy chybí
+    """
+    if Vypocty_numpy is None:
+        raise ValueError(f"{nazev_analyzy} vyžaduje na serveru knihovnu NumPy")
+
 @anvil.server.callable
 @handle_errors
 def vytvor_analyzu_pdf(analyza_id, metoda="WSM"):
     """
-    Vytvoří PDF s výsledky analýzy s optimalizací pro velké tabulky a grafy.
+    Vytvoří PDF s výsledky analýzy jednou metodou.
+    Pro velké analýzy je vhodnější úloha na pozadí (Ulohy, typ 'pdf').
     
     Args:
         analyza_id: ID analýzy
@@ -50,33 +76,58 @@ def vytvor_analyzu_pdf(analyza_id, metoda="WSM"):
     Returns:
         PDF dokument
     """
+    CRUD_analyzy.over_pristup_k_analyzam([analyza_id])
+    return sestav_pdf(analyza_id, [metoda])
+
+@anvil.server.callable
+@handle_errors
+def vytvor_pdf_report(analyza_id, metody=None):
+    """
+    Vytvoří jedno PDF s výsledky více metod analýzy.
+    
+    Args:
+        analyza_id: ID analýzy
+        metody: List kódů metod, výchozí jsou všechny
+        
+    Returns:
+        PDF dokument
+    """
+    CRUD_analyzy.over_pristup_k_analyzam([analyza_id])
+    return sestav_pdf(analyza_id, metody)
+
+def sestav_pdf(analyza_id, metody=None, nahlas_postup=None):
+    """
+    Sestaví PDF s výsledky zvolených metod přímo na serveru.
+    Metody se spočítají jednou společně, HTML se složí ze šablon
+    Generator_html se statickými SVG grafy (viz Pdf_report).
+    
+    Args:
+        analyza_id: ID analýzy
+        metody: List kódů metod (WSM, WPM, ...), výchozí jsou všechny
+        nahlas_postup: Funkce (podil, zprava) pro hlášení postupu (volitelné)
+        
+    Returns:
+        PDF dokument
+    """
+    nahlas_postup = nahlas_postup or _bez_hlaseni
     try:
-        analyza_data = CRUD_analyzy.nacti_analyzu(analyza_id)
+        metody = [m.lower() for m in (metody or Vypocty.METODY)]
+        nahlas_postup(0.0, "Načítám analýzu")
+        analyza_data, rozhodovaci_matice = CRUD_analyzy.nacti_analyzu_pro_vypocet(analyza_id)
+        
+        nahlas_postup(0.1, "Počítám metody")
+        vsechny_vysledky = vypocitej_vsechny_metody(analyza_data, metody, rozhodovaci_matice)['vysledky']
+        
+        nahlas_postup(0.5, "Sestavuji report")
+        html_dokument = Pdf_report.vytvor_html_reportu(analyza_data, vsechny_vysledky, metody)
         
         nazev = analyza_data.get("nazev", "Analyza")
         bezpecny_nazev = nazev.replace(" ", "_").replace("/", "_").replace("\\", "_")
-        nazev_souboru = f"{bezpecny_nazev}_{metoda}.pdf"
-        
-        if metoda == "WSM":
-            formular = "Vystup_wsm_komp"
-        elif metoda == "WPM":
-            formular = "Vystup_wpm_komp"
-        elif metoda == "TOPSIS":
-            formular = "Vystup_topsis_komp"
-        elif metoda == "ELECTRE":
-            formular = "Vystup_electre_komp"
-        elif metoda == "MABAC":
-            formular = "Vystup_mabac_komp"
-        else:
-            raise ValueError(f"Nepodporovaná metoda: {metoda}")
+        nazev_metod = "_".join(m.upper() for m in metody) if len(metody) < len(Vypocty.METODY) else "vsechny_metody"
         
-        pdf_renderer = anvil.pdf.PDFRenderer(
-            filename=nazev_souboru,
-            page_size="A4",
-            landscape=False,
-        )    
-      
-        pdf = pdf_renderer.render_form(formular, analyza_id=analyza_id)
+        nahlas_postup(0.7, "Vytvářím PDF")
+        pdf = Pdf_report.html_na_pdf(html_dokument, f"{bezpecny_nazev}_{nazev_metod}.pdf")
+        nahlas_postup(1.0, "PDF je připraveno")
         
         return pdf
     except Exception as e:
@@ -85,256 +136,51 @@ def vytvor_analyzu_pdf(analyza_id, metoda="WSM"):
 
 @anvil.server.callable
 @handle_errors
-def vytvor_komplexni_excel_report(analyza_id):
+def vytvor_komplexni_excel_report(analyza_id, max_radku_metody=None):
     """
     Vytvoří komplexní Excel soubor obsahující výsledky všech metod 
     vícekriteriální analýzy pro porovnání.
+    Pro velké analýzy je vhodnější úloha na pozadí (Ulohy, typ 'excel').
     
     Args:
         analyza_id: ID analýzy
+        max_radku_metody: Nejvyšší počet variant na listech metod (volitelné)
         
     Returns:
         Media: Excel dokument
     """
+    CRUD_analyzy.over_pristup_k_analyzam([analyza_id])
+    return sestav_excel_report(analyza_id, max_radku_metody=max_radku_metody)
+
+def _bez_hlaseni(podil, zprava=""):
+    """Výchozí hlášení postupu, které nic nedělá."""
+
+def sestav_excel_report(analyza_id, nahlas_postup=None, max_radku_metody=None):
+    """
+    Sestaví komplexní Excel report se srovnáním a listy všech metod.
+    
+    Args:
+        analyza_id: ID analýzy
+        nahlas_postup: Funkce (podil, zprava) pro hlášení postupu (volitelné)
+        max_radku_metody: Nejvyšší počet variant na listech metod (volitelné)
+        
+    Returns:
+        Media: Excel dokument
+    """
+    nahlas_postup = nahlas_postup or _bez_hlaseni
     try:
         # Načtení dat analýzy
-        analyza_data = CRUD_analyzy.nacti_analyzu(analyza_id)
-        
-        # Vypočet výsledků všech metod
-        vysledky_wsm = vypocitej_wsm_analyzu(analyza_data)
-        vysledky_wpm = vypocitej_wpm_analyzu(analyza_data)
-        vysledky_topsis = vypocitej_topsis_analyzu(analyza_data)
-        vysledky_electre = vypocitej_electre_analyzu(analyza_data)
-        vysledky_mabac = vypocitej_mabac_analyzu(analyza_data)
+        nahlas_postup(0.0, "Načítám analýzu")
+        analyza_data, rozhodovaci_matice = CRUD_analyzy.nacti_analyzu_pro_vypocet(analyza_id)
+
+        # Výpočet všech metod najednou - sdílené mezivýsledky se počítají jen jednou
+        nahlas_postup(0.1, "Počítám metody")
+        vsechny_vysledky = vypocitej_vsechny_metody(analyza_data, rozhodovaci_matice=rozhodovaci_matice)['vysledky']
         
         # Vytvoření Excel souboru v paměti
         output = io.BytesIO()
-        workbook = xlsxwriter.Workbook(output)
-        
-        # Formáty pro Excel
-        header_format = workbook.add_format({
-            'bold': True, 
-            'bg_color': '#D6E4F0', 
-            'border': 1,
-            'align': 'center'
-        })
-        
-        subheader_format = workbook.add_format({
-            'bold': True,
-            'bg_color': '#F0F0F0',
-            'border': 1
-        })
-        
-        number_format = workbook.add_format({
-            'num_format': '0.000',
-            'border': 1
-        })
-        
-        # Vytvoření formátu, ale není používán - pro budoucí použití
-        # percent_format = workbook.add_format({
-        #     'num_format': '0.0%',
-        #     'border': 1
-        # })
-        
-        best_format = workbook.add_format({
-            'bold': True,
-            'bg_color': '#E0F7FA',
-            'border': 1,
-            'num_format': '0.000'
-        })
-        
-        worst_format = workbook.add_format({
-            'bold': True,
-            'bg_color': '#FFEBEE',
-            'border': 1,
-            'num_format': '0.000'
-        })
-        
-        # 1. List: Základní informace o analýze
-        zakladni_sheet = workbook.add_worksheet("Základní informace")
-        zakladni_sheet.set_column('A:A', 25)
-        zakladni_sheet.set_column('B:B', 50)
-        
-        zakladni_sheet.write(0, 0, "Název analýzy", header_format)
-        zakladni_sheet.write(0, 1, analyza_data["nazev"])
-        zakladni_sheet.write(1, 0, "Popis", header_format)
-        zakladni_sheet.write(1, 1, analyza_data.get("popis_analyzy", ""))
-        zakladni_sheet.write(2, 0, "Datum vytvoření", header_format)
-        zakladni_sheet.write(2, 1, str(analyza_data.get("datum_vytvoreni", "")))
-        zakladni_sheet.write(3, 0, "Datum poslední úpravy", header_format)
-        zakladni_sheet.write(3, 1, str(analyza_data.get("datum_upravy", "")))
-        
-        # 2. List: Kritéria
-        kriteria_sheet = workbook.add_worksheet("Kritéria")
-        kriteria_sheet.set_column('A:A', 30)
-        kriteria_sheet.set_column('B:B', 15)
-        kriteria_sheet.set_column('C:C', 15)
-        
-        kriteria_sheet.write(0, 0, "Název kritéria", header_format)
-        kriteria_sheet.write(0, 1, "Typ", header_format)
-        kriteria_sheet.write(0, 2, "Váha", header_format)
-        
-        kriteria = analyza_data.get("kriteria", {})
-        row = 1
-        for nazev_krit, krit_data in kriteria.items():
-            kriteria_sheet.write(row, 0, nazev_krit)
-            kriteria_sheet.write(row, 1, krit_data.get("typ", "").upper())
-            try:
-                kriteria_sheet.write(row, 2, float(krit_data.get("vaha", 0)), number_format)
-            except (ValueError, TypeError):
-                kriteria_sheet.write(row, 2, 0, number_format)
-            row += 1
-
-        hodnoty_sheet = workbook.add_worksheet("Hodnoty")
-        hodnoty_sheet.write(0, 0, "Varianta/Kritérium", header_format)
-        
-        # Záhlaví - názvy kritérií
-        col = 1
-        for nazev_krit in kriteria.keys():
-            hodnoty_sheet.write(0, col, nazev_krit, header_format)
-            col += 1
-        
-        # Hodnoty variant
-        varianty = analyza_data.get("varianty", {})
-        row = 1
-        for nazev_var, var_data in varianty.items():
-            hodnoty_sheet.write(row, 0, nazev_var)
-            col = 1
-            for nazev_krit in kriteria.keys():
-                if nazev_krit in var_data and nazev_krit != "popis_varianty":
-                    try:
-                        hodnoty_sheet.write(row, col, float(var_data[nazev_krit]), number_format)
-                    except (ValueError, TypeError):
-                        hodnoty_sheet.write(row, col, 0, number_format)
-                col += 1
-            row += 1
-        
-        # 4. List: Srovnání výsledků všech metod
-        srovnani_sheet = workbook.add_worksheet("Srovnání metod")
-        srovnani_sheet.set_column('A:A', 30)  # Širší sloupec pro názvy variant
-        
-        srovnani_sheet.write(0, 0, "Varianta", header_format)
-        srovnani_sheet.write(0, 1, "WSM pořadí", header_format)
-        srovnani_sheet.write(0, 2, "WSM skóre", header_format)
-        srovnani_sheet.write(0, 3, "WPM pořadí", header_format)
-        srovnani_sheet.write(0, 4, "WPM skóre", header_format)
-        srovnani_sheet.write(0, 5, "TOPSIS pořadí", header_format)
-        srovnani_sheet.write(0, 6, "TOPSIS skóre", header_format)
-        srovnani_sheet.write(0, 7, "ELECTRE pořadí", header_format)
-        srovnani_sheet.write(0, 8, "ELECTRE skóre", header_format)
-        srovnani_sheet.write(0, 9, "MABAC pořadí", header_format)
-        srovnani_sheet.write(0, 10, "MABAC skóre", header_format)
-        srovnani_sheet.write(0, 11, "Průměrné pořadí", header_format)
-        
-        # Kontrola existence klíčů a vytvoření slovníků výsledků
-        wsm_dict = {}
-        if 'wsm_vysledky' in vysledky_wsm and 'results' in vysledky_wsm['wsm_vysledky']:
-            wsm_dict = {var: (poradi, skore) for var, poradi, skore in vysledky_wsm['wsm_vysledky']['results']}
-        
-        wpm_dict = {}
-        if 'wpm_vysledky' in vysledky_wpm and 'results' in vysledky_wpm['wpm_vysledky']:
-            wpm_dict = {var: (poradi, skore) for var, poradi, skore in vysledky_wpm['wpm_vysledky']['results']}
-        
-        topsis_dict = {}
-        if 'topsis_vysledky' in vysledky_topsis and 'results' in vysledky_topsis['topsis_vysledky']:
-            topsis_dict = {var: (poradi, skore) for var, poradi, skore in vysledky_topsis['topsis_vysledky']['results']}
-        
-        electre_dict = {}
-        if 'electre_vysledky' in vysledky_electre and 'results' in vysledky_electre['electre_vysledky']:
-            electre_dict = {var: (poradi, skore) for var, poradi, skore in vysledky_electre['electre_vysledky']['results']}
-        
-        mabac_dict = {}
-        if 'mabac_vysledky' in vysledky_mabac and 'results' in vysledky_mabac['mabac_vysledky']:
-            mabac_dict = {var: (poradi, skore) for var, poradi, skore in vysledky_mabac['mabac_vysledky']['results']}
-        
-        # Seznam všech variant
-        vsechny_varianty = list(varianty.keys())
-        
-        # Vyplnění dat do srovnávací tabulky
-        row = 1
-        for varianta in vsechny_varianty:
-            prumerne_poradi = 0
-            pocet_metod = 0
-            
-            srovnani_sheet.write(row, 0, varianta)
-            
-            # WSM
-            if varianta in wsm_dict:
-                poradi, skore = wsm_dict[varianta]
-                srovnani_sheet.write(row, 1, poradi)
-                srovnani_sheet.write(row, 2, skore, number_format)
-                prumerne_poradi += poradi
-                pocet_metod += 1
-            
-            # WPM
-            if varianta in wpm_dict:
-                poradi, skore = wpm_dict[varianta]
-                srovnani_sheet.write(row, 3, poradi)
-                srovnani_sheet.write(row, 4, skore, number_format)
-                prumerne_poradi += poradi
-                pocet_metod += 1
-            
-            # TOPSIS
-            if varianta in topsis_dict:
-                poradi, skore = topsis_dict[varianta]
-                srovnani_sheet.write(row, 5, poradi)
-                srovnani_sheet.write(row, 6, skore, number_format)
-                prumerne_poradi += poradi
-                pocet_metod += 1
-            
-            # ELECTRE
-            if varianta in electre_dict:
-                poradi, skore = electre_dict[varianta]
-                srovnani_sheet.write(row, 7, poradi)
-                srovnani_sheet.write(row, 8, skore, number_format)
-                prumerne_poradi += poradi
-                pocet_metod += 1
-            
-            # MABAC
-            if varianta in mabac_dict:
-                poradi, skore = mabac_dict[varianta]
-                srovnani_sheet.write(row, 9, poradi)
-                srovnani_sheet.write(row, 10, skore, number_format)
-                prumerne_poradi += poradi
-                pocet_metod += 1
-            
-            # Průměrné pořadí
-            if pocet_metod > 0:
-                avg_poradi = prumerne_poradi / pocet_metod
-                srovnani_sheet.write(row, 11, avg_poradi, number_format)
-            
-            row += 1
-
-        # WSM
-        wsm_sheet = workbook.add_worksheet("WSM")
-        _vytvor_list_metody(workbook, wsm_sheet, "WSM", vysledky_wsm, header_format, 
-                            subheader_format, number_format, best_format, worst_format)
-        
-        # WPM
-        wpm_sheet = workbook.add_worksheet("WPM")
-        _vytvor_list_metody(workbook, wpm_sheet, "WPM", vysledky_wpm, header_format, 
-                            subheader_format, number_format, best_format, worst_format)
-        
-        # TOPSIS
-        topsis_sheet = workbook.add_worksheet("TOPSIS")
-        _vytvor_list_metody(workbook, topsis_sheet, "TOPSIS", vysledky_topsis, header_format, 
-                             subheader_format, number_format, best_format, worst_format)
-        
-        # ELECTRE
-        electre_sheet = workbook.add_worksheet("ELECTRE")
-        _vytvor_list_metody(workbook, electre_sheet, "ELECTRE", vysledky_electre, header_format, 
-                             subheader_format, number_format, best_format, worst_format)
-        
-        # MABAC
-        mabac_sheet = workbook.add_worksheet("MABAC")
-        _vytvor_list_metody(workbook, mabac_sheet, "MABAC", vysledky_mabac, header_format, 
-                             subheader_format, number_format, best_format, worst_format)
-        
-        # Nastavení aktivního listu na srovnání
-        srovnani_sheet.activate()
-        
-        # Ukončení a vytvoření souboru
-        workbook.close()
+        zapis_excel_report(output, analyza_data, rozhodovaci_matice, vsechny_vysledky, nahlas_postup,
+                           max_radku_metody=max_radku_metody)
         output.seek(0)
         
         # Vytvoření Media objektu pro stažení
@@ -347,749 +193,532 @@ def vytvor_komplexni_excel_report(analyza_id):
             name=f"{bezpecny_nazev}_komplexni_analyza.xlsx"
         )
         
+        nahlas_postup(1.0, "Excel report je připraven")
         return excel_media
     except Exception as e:
         zapsat_chybu(f"Chyba při vytváření Excel reportu: {str(e)}")
         raise ValueError(f"Chyba při vytváření Excel reportu: {str(e)}")
 
-def _vytvor_list_metody(workbook, sheet, nazev_metody, vysledky, header_format, 
-                        subheader_format, number_format, best_format, worst_format):
+def zapis_excel_report(output, analyza_data, rozhodovaci_matice, vsechny_vysledky, nahlas_postup=None,
+                       velky_report=None, max_radku_metody=None):
     """
-    Pomocná funkce pro vytvoření listu s výsledky konkrétní metody.
+    Zapíše komplexní Excel report do souboru nebo proudu.
+    Listy metod, které ve výsledcích chybí, se vynechají.
+    
+    Všechny listy se zapisují po řádcích shora dolů (write_row), takže
+    report lze zapsat i v režimu constant_memory, ve kterém xlsxwriter
+    drží v paměti jen aktuální řádek každého listu.
     
     Args:
-        workbook: Workbook objekt pro Excel
-        sheet: List, na který se mají data zapisovat
-        nazev_metody: Název metody (WSM, WPM, atd.)
-        vysledky: Slovník s výsledky metody
-        header_format, subheader_format, number_format, best_format, worst_format: 
-            Formáty pro Excel
-    """
-    try:
-        sheet.set_column('A:A', 5)     # Pořadí
-        sheet.set_column('B:B', 30)    # Název varianty
-        sheet.set_column('C:C', 15)    # Skóre
-        
-        # Záhlaví
-        sheet.write(0, 0, f"Výsledky metody {nazev_metody}", header_format)
-        sheet.merge_range('A1:C1', f"Výsledky metody {nazev_metody}", header_format)
-        
-        sheet.write(2, 0, "Pořadí", subheader_format)
-        sheet.write(2, 1, "Varianta", subheader_format)
-        sheet.write(2, 2, "Skóre", subheader_format)
-        
-        # Určení klíče pro přístup k výsledkům podle metody
-        vysledky_klic = f"{nazev_metody.lower()}_vysledky"
-        
-        # Kontrola existence klíče s výsledky
-        if vysledky_klic not in vysledky:
-            zapsat_chybu(f"Chybí klíč {vysledky_klic} ve výsledcích")
-            sheet.write(3, 0, "Chybí data", subheader_format)
-            sheet.merge_range('A3:C3', "Chybí data pro tuto metodu", subheader_format)
-            return
-            
-        # Kontrola existence potřebných klíčů
-        results = vysledky[vysledky_klic].get('results', [])
-        nejlepsi_var = vysledky[vysledky_klic].get('nejlepsi_varianta', '')
-        nejhorsi_var = vysledky[vysledky_klic].get('nejhorsi_varianta', '')
-        nejlepsi_skore = vysledky[vysledky_klic].get('nejlepsi_skore', 0)
-        nejhorsi_skore = vysledky[vysledky_klic].get('nejhorsi_skore', 0)
-        
-        # Vyplnění výsledků
-        row = 3
-        
-        if not results:
-            sheet.write(row, 0, "Žádné výsledky", subheader_format)
-            sheet.merge_range(f'A{row}:C{row}', "Žádné výsledky pro tuto metodu", subheader_format)
-            return
-            
-        for varianta, poradi, skore in sorted(results, key=lambda x: x[1]):
-            if varianta == nejlepsi_var:
-                sheet.write(row, 0, poradi, best_format)
-                sheet.write(row, 1, varianta, best_format)
-                sheet.write(row, 2, skore, best_format)
-            elif varianta == nejhorsi_var:
-                sheet.write(row, 0, poradi, worst_format)
-                sheet.write(row, 1, varianta, worst_format)
-                sheet.write(row, 2, skore, worst_format)
-            else:
-                sheet.write(row, 0, poradi)
-                sheet.write(row, 1, varianta)
-                sheet.write(row, 2, skore, number_format)
-            row += 1
-        
-        # Přidání souhrnu
-        row += 2
-        sheet.write(row, 0, "Souhrn:", subheader_format)
-        sheet.merge_range(f'A{row+1}:B{row+1}', "Nejlepší varianta:", subheader_format)
-        sheet.write(row+1, 2, nejlepsi_var)
-        
-        sheet.merge_range(f'A{row+2}:B{row+2}', "Nejlepší skóre:", subheader_format)
-        sheet.write(row+2, 2, nejlepsi_skore, number_format)
-        
-        sheet.merge_range(f'A{row+3}:B{row+3}', "Nejhorší varianta:", subheader_format)
-        sheet.write(row+3, 2, nejhorsi_var)
-        
-        sheet.merge_range(f'A{row+4}:B{row+4}', "Nejhorší skóre:", subheader_format)
-        sheet.write(row+4, 2, nejhorsi_skore, number_format)
-    except Exception as e:
-        zapsat_chybu(f"Chyba při vytváření listu pro metodu {nazev_metody}: {str(e)}")
-        sheet.write(3, 0, f"Chyba: {str(e)}", subheader_format)
-        sheet.merge_range('A3:C3', f"Chyba při vytváření listu: {str(e)}", subheader_format)
-
+        output: Soubor nebo proud (např. io.BytesIO), do kterého se report zapíše
+        analyza_data: Data analýzy
+        rozhodovaci_matice: Rozhodovací matice analýzy
+        vsechny_vysledky: Výsledky podle kódu metody (vypocitej_vsechny_metody()['vysledky'])
+        nahlas_postup: Funkce (podil, zprava) pro hlášení postupu (volitelné)
+        velky_report: True = režim constant_memory, None = podle počtu variant
+                      (VELKY_REPORT_OD_VARIANT)
+        max_radku_metody: Nejvyšší počet variant na listu metody (volitelné);
+                          při překročení se vypíše začátek a konec pořadí
+    """
+    nahlas_postup = nahlas_postup or _bez_hlaseni
+    if velky_report is None:
+        velky_report = len(rozhodovaci_matice.varianty) >= VELKY_REPORT_OD_VARIANT
+    
+    nahlas_postup(0.4, "Zapisuji srovnání metod")
+    workbook = xlsxwriter.Workbook(output, {'constant_memory': velky_report})
+    
+    # Formáty pro Excel
+    header_format = workbook.add_format({
+        'bold': True, 
+        'bg_color': '#D6E4F0', 
+        'border': 1,
+        'align': 'center'
+    })
+    
+    subheader_format = workbook.add_format({
+        'bold': True,
+        'bg_color': '#F0F0F0',
+        'border': 1
+    })
+    
+    number_format = workbook.add_format({
+        'num_format': '0.000',
+        'border': 1
+    })
+    
+    best_format = workbook.add_format({
+        'bold': True,
+        'bg_color': '#E0F7FA',
+        'border': 1,
+        'num_format': '0.000'
+    })
+    
+    worst_format = workbook.add_format({
+        'bold': True,
+        'bg_color': '#FFEBEE',
+        'border': 1,
+        'num_format': '0.000'
+    })
+    
+    # 1. List: Základní informace o analýze
+    zakladni_sheet = workbook.add_worksheet("Základní informace")
+    zakladni_sheet.set_column('A:A', 25)
+    zakladni_sheet.set_column('B:B', 50)
+    
+    zakladni_sheet.write(0, 0, "Název analýzy", header_format)
+    zakladni_sheet.write(0, 1, analyza_data["nazev"])
+    zakladni_sheet.write(1, 0, "Popis", header_format)
+    zakladni_sheet.write(1, 1, analyza_data.get("popis_analyzy", ""))
+    zakladni_sheet.write(2, 0, "Datum vytvoření", header_format)
+    zakladni_sheet.write(2, 1, str(analyza_data.get("datum_vytvoreni", "")))
+    zakladni_sheet.write(3, 0, "Datum poslední úpravy", header_format)
+    zakladni_sheet.write(3, 1, str(analyza_data.get("datum_upravy", "")))
+    
+    # 2. List: Kritéria
+    kriteria_sheet = workbook.add_worksheet("Kritéria")
+    kriteria_sheet.set_column('A:A', 30)
+    kriteria_sheet.set_column('B:B', 15)
+    kriteria_sheet.set_column('C:C', 15, number_format)
+    
+    kriteria_sheet.write_row(0, 0, ["Název kritéria", "Typ", "Váha"], header_format)
+    for row, (nazev_krit, typ, vaha) in enumerate(
+            zip(rozhodovaci_matice.kriteria, rozhodovaci_matice.typy_kriterii, rozhodovaci_matice.vahy), 1):
+        kriteria_sheet.write_row(row, 0, [nazev_krit, typ.upper(), vaha])
+
+    # 3. List: Hodnoty - přímo z rozhodovací matice bez opakovaného převodu
+    hodnoty_sheet = workbook.add_worksheet("Hodnoty")
+    hodnoty_sheet.write_row(0, 0, ["Varianta/Kritérium"] + list(rozhodovaci_matice.kriteria), header_format)
+    for row, (nazev_var, radek) in enumerate(zip(rozhodovaci_matice.varianty, rozhodovaci_matice.jako_seznam()), 1):
+        hodnoty_sheet.write(row, 0, nazev_var)
+        hodnoty_sheet.write_row(row, 1, radek, number_format)
+    
+    # 4. List: Srovnání výsledků všech metod
+    metody = [metoda for metoda in Vypocty.METODY if metoda in vsechny_vysledky]
+    srovnani_sheet = workbook.add_worksheet("Srovnání metod")
+    srovnani_sheet.set_column('A:A', 30)  # Širší sloupec pro názvy variant
+    # Skóre a průměrné pořadí mají formát sloupce, řádky se pak zapisují najednou bez formátu
+    for col in list(range(2, 2 * len(metody) + 1, 2)) + [2 * len(metody) + 1]:
+        srovnani_sheet.set_column(col, col, None, number_format)
+    
+    zahlavi = ["Varianta"]
+    for metoda in metody:
+        zahlavi += [f"{metoda.upper()} pořadí", f"{metoda.upper()} skóre"]
+    srovnani_sheet.write_row(0, 0, zahlavi + ["Průměrné pořadí"], header_format)
+    
+    # Pořadí a skóre podle metody a varianty
+    vysledky_metod = []
+    for metoda in metody:
+        vysledky_metody = vsechny_vysledky[metoda].get(f"{metoda}_vysledky", {})
+        vysledky_metod.append({var: (poradi, skore) for var, poradi, skore in vysledky_metody.get('results', [])})
+    
+    for row, varianta in enumerate(rozhodovaci_matice.varianty, 1):
+        radek = [varianta]
+        soucet_poradi = 0
+        pocet_metod = 0
+        for vysledky_metody in vysledky_metod:
+            poradi_skore = vysledky_metody.get(varianta)
+            if poradi_skore is None:
+                radek += [None, None]
+                continue
+            radek += poradi_skore
+            soucet_poradi += poradi_skore[0]
+            pocet_metod += 1
+        # Průměrné pořadí
+        radek.append(soucet_poradi / pocet_metod if pocet_metod > 0 else None)
+        srovnani_sheet.write_row(row, 0, radek)
+
+    # Listy metod
+    for podil, metoda in zip((0.5, 0.6, 0.7, 0.8, 0.9), metody):
+        nahlas_postup(podil, f"Zapisuji list {metoda.upper()}")
+        sheet = workbook.add_worksheet(metoda.upper())
+        _vytvor_list_metody(workbook, sheet, metoda.upper(), vsechny_vysledky[metoda], header_format, 
+                            subheader_format, number_format, best_format, worst_format,
+                            max_radku_metody)
+    
+    # Nastavení aktivního listu na srovnání
+    srovnani_sheet.activate()
+    
+    # Ukončení a zápis souboru
+    workbook.close()
 
-# (upravený z původního Vypocty.py, bez klientských importů)
-
-def normalizuj_matici_minmax(matice, typy_kriterii, varianty, kriteria):
+@anvil.server.callable
+@handle_errors
+def vypocitej_vsechny_metody_analyzy(analyza_id, metody=None, mezivysledky=False):
     """
-    Provede min-max normalizaci hodnot matice.
+    Vypočítá výsledky zvolených metod analýzy na serveru v jednom volání.
+    Výsledky metod se klientovi posílají zkrácené (viz _kompaktni_vysledek).
     
     Args:
-        matice: 2D list s hodnotami [varianty][kriteria]
-        typy_kriterii: List typů kritérií ("max" nebo "min")
-        varianty: List názvů variant
-        kriteria: List názvů kritérií
-    
+        analyza_id: ID analýzy
+        metody: List kódů metod (výchozí jsou všechny)
+        mezivysledky: True = výsledky včetně mezivýsledků pro grafy,
+                      False = jen pořadí variant a souhrn
+        
     Returns:
-        dict: Slovník obsahující normalizovanou matici a metadata
-    """
-    norm_matice = []
-    for i in range(len(matice)):
-        norm_radek = []
-        for j in range(len(matice[0])):
-            sloupec = [row[j] for row in matice]
-            min_val = min(sloupec)
-            max_val = max(sloupec)
-            
-            if max_val == min_val:
-                norm_hodnota = 1.0  # Všechny hodnoty jsou stejné
-            else:
-                # Pro MIN kritéria obrátíme normalizaci
-                if typy_kriterii[j].lower() in ("min", "cost"):
-                    norm_hodnota = (max_val - matice[i][j]) / (max_val - min_val)
-                else:
-                    norm_hodnota = (matice[i][j] - min_val) / (max_val - min_val)
-                
-            norm_radek.append(norm_hodnota)
-        norm_matice.append(norm_radek)
-    
-    return {
-        'nazvy_variant': varianty,
-        'nazvy_kriterii': kriteria,
-        'normalizovana_matice': norm_matice
+        dict: Kombinovaný výsledek (viz vypocitej_vsechny_metody)
+    """
+    CRUD_analyzy.over_pristup_k_analyzam([analyza_id])
+    analyza_data, rozhodovaci_matice = CRUD_analyzy.nacti_analyzu_pro_vypocet(analyza_id)
+    vysledek = vypocitej_vsechny_metody(analyza_data, metody, rozhodovaci_matice)
+    vysledek['vysledky'] = {
+        metoda: _kompaktni_vysledek(vysledek_metody, metoda, mezivysledky)
+        for metoda, vysledek_metody in vysledek['vysledky'].items()
     }
+    return vysledek
 
-def vypocitej_vazene_hodnoty(matice, vahy):
-    """
-    Vypočítá vážené hodnoty (váhy × normalizované hodnoty).
-    
-    Args:
-        matice: 2D list normalizovaných hodnot
-        vahy: List vah kritérií
-    
-    Returns:
-        2D list vážených hodnot
-    """
-    vazene_matice = []
-    for radek in matice:
-        vazene_radek = [hodnota * vahy[i] for i, hodnota in enumerate(radek)]
-        vazene_matice.append(vazene_radek)
-    return vazene_matice
+def _vysledek_metody(analyza_id, metoda):
+    """Načte analýzu a vrátí její data a výsledek jedné metody (z cache nebo nově spočítaný)."""
+    analyza_data, rozhodovaci_matice = CRUD_analyzy.nacti_analyzu_pro_vypocet(analyza_id)
+    vysledek = vypocitej_vsechny_metody(analyza_data, [metoda], rozhodovaci_matice)['vysledky'][metoda]
+    return analyza_data, vysledek
 
-def priprav_data_z_json(analyza_data):
-    """
-    Připraví data z JSON struktury pro výpočty.
-    
-    Args:
-        analyza_data: Slovník s daty analýzy v novém formátu
-        
-    Returns:
-        tuple: (matice, typy_kriterii, varianty, kriteria, vahy)
-    """
-    try:
-        # Získání seznamu kritérií a jejich typů
-        kriteria_dict = analyza_data.get('kriteria', {})
-        kriteria = list(kriteria_dict.keys())
-        typy_kriterii = [kriteria_dict[k]['typ'] for k in kriteria]
-        vahy = [float(kriteria_dict[k]['vaha']) for k in kriteria]
-        
-        # Získání seznamu variant
-        varianty_dict = analyza_data.get('varianty', {})
-        varianty = list(varianty_dict.keys())
-        
-        # Vytvoření matice hodnot
-        matice = []
-        for var_nazev in varianty:
-            var_data = varianty_dict[var_nazev]
-            radek = []
-            for krit_nazev in kriteria:
-                # Získáme hodnotu pro kritérium, výchozí je 0 pokud chybí
-                hodnota = 0
-                if krit_nazev in var_data and krit_nazev != "popis_varianty":
-                    try:
-                        hodnota = float(var_data[krit_nazev])
-                    except (ValueError, TypeError):
-                        hodnota = 0
-                radek.append(hodnota)
-            matice.append(radek)
-            
-        return matice, typy_kriterii, varianty, kriteria, vahy
-        
-    except Exception as e:
-        raise ValueError(f"Chyba při přípravě dat pro výpočet: {str(e)}")
+# Od tohoto počtu variant se klientovi neposílají matice [varianty x varianty]
+# (souhlasu, nesouhlasu a převahy ELECTRE, poměry variant WPM). Jejich
+# tabulky vykreslí server v HTML a graf převahy použije souhrn relace.
+MAX_VARIANT_PAROVYCH_MATIC = Generator_html.MAX_RADKU_TABULKY
 
-def validuj_vstupni_data_analyzy(analyza_data):
+@anvil.server.callable
+@handle_errors
+def spocitej_vysledky(analyza_id, metoda="wsm", mezivysledky=False, max_radku=None):
     """
-    Validuje vstupní data analýzy před výpočtem.
+    Spočítá na serveru výsledky jedné metody pro výstupní formulář.
+    Vrací data analýzy i výsledek, formulář tak potřebuje jediné volání.
+    
+    Výchozí odpověď obsahuje jen pořadí variant a souhrn. Formuláře žádají
+    mezivýsledky pro grafy spolu s HTML výsledků, které server vykreslí
+    z úplného výsledku s tabulkami zkrácenými na max_radku variant. Matice,
+    které potřebují jen tabulky, se pak klientovi neposílají.
     
     Args:
-        analyza_data: Slovník s daty analýzy
+        analyza_id: ID analýzy
+        metoda: Kód metody ('wsm', 'wpm', 'topsis', 'electre', 'mabac')
+        mezivysledky: True = výsledek včetně mezivýsledků pro grafy,
+                      False = jen pořadí variant a souhrn
+        max_radku: Počet variant v tabulkách HTML (None = HTML se nevykreslí)
         
     Returns:
-        tuple: (je_validni, chybova_zprava)
+        dict: 'analyza_data', 'vysledky_vypoctu' (struktura jako
+              Vypocty.vypocitej_analyzu, bez duplicitních klíčů) a při
+              zadaném max_radku také 'html'
     """
-    # Kontrola povinných klíčů
-    if not isinstance(analyza_data, dict):
-        return False, "Data analýzy musí být slovník"
-    
-    if not all(key in analyza_data for key in ["kriteria", "varianty"]):
-        return False, "Data analýzy musí obsahovat 'kriteria' a 'varianty'"
-    
-    # Kontrola kritérií
-    if not analyza_data["kriteria"]:
-        return False, "Analýza musí obsahovat alespoň jedno kritérium"
-    
-    # Kontrola variant
-    if not analyza_data["varianty"]:
-        return False, "Analýza musí obsahovat alespoň jednu variantu"
-    
-    # Kontrola vah kritérií
-    vahy = [float(k_data['vaha']) for k_data in analyza_data["kriteria"].values()]
-    soucet_vah = sum(vahy)
-    if abs(soucet_vah - 1.0) > 0.001:
-        return False, f"Součet vah musí být 1.0 (aktuálně: {soucet_vah:.3f})"
-    
-    # Kontrola hodnot variant
-    for var_nazev, var_data in analyza_data["varianty"].items():
-        for krit_nazev in analyza_data["kriteria"].keys():
-            if krit_nazev not in var_data and krit_nazev != "popis_varianty":
-                return False, f"Varianta '{var_nazev}' nemá hodnotu pro kritérium '{krit_nazev}'"
-            elif krit_nazev in var_data and krit_nazev != "popis_varianty":
-                # Kontrola, že hodnota je číslo
-                try:
-                    float(var_data[krit_nazev])
-                except (ValueError, TypeError):
-                    return False, f"Hodnota pro variantu '{var_nazev}', kritérium '{krit_nazev}' musí být číslo"
-    
-    return True, ""
+    CRUD_analyzy.over_pristup_k_analyzam([analyza_id])
+    metoda = metoda.lower()
+    analyza_data, vysledek = _vysledek_metody(analyza_id, metoda)
+    odpoved = {
+        'analyza_data': analyza_data,
+        'vysledky_vypoctu': _kompaktni_vysledek(vysledek, metoda, mezivysledky, max_radku is not None)
+    }
+    if max_radku is not None:
+        odpoved['html'] = Generator_html.vytvor_kompletni_html_analyzy(
+            analyza_data, vysledek, metoda.upper(), max_radku
+        )
+    return odpoved
 
-def vypocitej_analyzu(analyza_data, metoda="wsm"):
+@anvil.server.callable
+@handle_errors
+def vytvor_html_vysledku(analyza_id, metoda="wsm", max_radku=Generator_html.MAX_RADKU_TABULKY):
     """
-    Obecná funkce pro výpočet libovolné metody vícekriteriální analýzy.
+    Vykreslí HTML výsledků metody s tabulkami zkrácenými na max_radku variant.
+    Formuláře jím zvětšují tabulky bez opětovného stažení výsledků.
     
     Args:
-        analyza_data: Slovník s daty analýzy v JSON formátu
-        metoda: Kód metody analýzy ('wsm', 'wpm', 'topsis', 'electre', 'mabac')
+        analyza_id: ID analýzy
+        metoda: Kód metody ('wsm', 'wpm', 'topsis', 'electre', 'mabac')
+        max_radku: Počet variant zobrazených v tabulkách
         
     Returns:
-        dict: Výsledky analýzy ve standardizovaném formátu
-        
-    Raises:
-        ValueError: Pokud metoda není podporována
+        str: HTML výsledků
     """
+    CRUD_analyzy.over_pristup_k_analyzam([analyza_id])
     metoda = metoda.lower()
-    
-    if metoda == "wsm":
-        return vypocitej_wsm_analyzu(analyza_data)
-    elif metoda == "wpm":
-        return vypocitej_wpm_analyzu(analyza_data)
-    elif metoda == "topsis":
-        return vypocitej_topsis_analyzu(analyza_data)
-    elif metoda == "electre":
-        return vypocitej_electre_analyzu(analyza_data)
-    elif metoda == "mabac":
-        return vypocitej_mabac_analyzu(analyza_data)
-    else:
-        raise ValueError(f"Nepodporovaná metoda analýzy: {metoda}")
+    analyza_data, vysledek = _vysledek_metody(analyza_id, metoda)
+    return Generator_html.vytvor_kompletni_html_analyzy(analyza_data, vysledek, metoda.upper(), max_radku)
 
-# ========================
-# METODA WSM
-# ========================
+# Klíče souhrnu metody, které se posílají i bez mezivýsledků
+_KLICE_SOUHRNU = (
+    'results', 'nejlepsi_varianta', 'nejlepsi_skore', 'nejhorsi_varianta',
+    'nejhorsi_skore', 'rozdil_skore', 'index_souhlasu', 'index_nesouhlasu'
+)
+
+# Mezivýsledky, které formuláře potřebují jen pro tabulky postupu výpočtu.
+# Když HTML vykreslí server, klientovi se neposílají.
+_KLICE_JEN_PRO_HTML = ('matice', 'produktovy_prispevek')
+_VNORENE_KLICE_JEN_PRO_HTML = (
+    ('norm_vysledky', 'normalizovana_matice'),
+    ('topsis_vysledky', 'norm_matice'),
+)
 
-def vypocitej_wsm_analyzu(analyza_data):
+def _kompaktni_vysledek(vysledek, metoda, mezivysledky=False, html_na_serveru=False):
     """
-    Centralizovaná funkce pro výpočet WSM analýzy z dat.
-    Provádí všechny kroky WSM analýzy a vrací strukturovaný výsledek.
+    Připraví výsledek metody k odeslání klientovi. Výsledek může pocházet
+    z cache, proto se nemění na místě - vytvářejí se mělké kopie.
+    
+    Řídká relace převahy ELECTRE se klientovi neposílá nikdy. Matice
+    [varianty x varianty] se posílají jen do MAX_VARIANT_PAROVYCH_MATIC
+    variant, nad tímto počtem je ELECTRE nahradí souhrnem relace převahy.
     
     Args:
-        analyza_data: Slovník s daty analýzy
+        vysledek: Strukturovaný výsledek metody
+        metoda: Kód metody
+        mezivysledky: Zda ponechat matice mezivýsledků
+        html_na_serveru: Zda HTML výsledků vykreslil server - pak se
+                         vynechají mezivýsledky potřebné jen pro tabulky
         
     Returns:
-        dict: Strukturovaný výsledek s normalizovanou maticí, váženými hodnotami a výsledky
-        
-    Raises:
-        ValueError: Pokud data nejsou validní nebo nelze provést výpočet
-    """
-    try:
-        # Kontrola validity dat
-        je_validni, chyba = validuj_vstupni_data_analyzy(analyza_data)
-        if not je_validni:
-            raise ValueError(f"Neplatná vstupní data: {chyba}")
-            
-        # 1. Příprava dat z JSON formátu
-        matice, typy_kriterii, varianty, kriteria, vahy = priprav_data_z_json(analyza_data)
-        
-        # 2. Normalizace matice pomocí min-max metody
-        norm_vysledky = normalizuj_matici_minmax(matice, typy_kriterii, varianty, kriteria)
-        
-        # 3. Výpočet vážených hodnot
-        vazene_matice = vypocitej_vazene_hodnoty(
-            norm_vysledky['normalizovana_matice'], 
-            vahy
-        )
-        
-        # 4. Výpočet WSM výsledků
-        wsm_vysledky = wsm_vypocet(
-            norm_vysledky['normalizovana_matice'], 
-            vahy, 
-            varianty
-        )
-        
-        # 5. Sestavení strukturovaného výsledku
-        vysledek = {
-            'norm_vysledky': norm_vysledky,
-            'vazene_matice': vazene_matice,
-            'vahy': vahy,
-            'wsm_vysledky': wsm_vysledky,
-            'matice': matice,
-            'typy_kriterii': typy_kriterii,
-            'metoda': 'WSM',
-            'popis_metody': 'Weighted Sum Model'
-        }
-        
-        return vysledek
-        
-    except Exception as e:
-        raise ValueError(f"Chyba při výpočtu WSM analýzy: {str(e)}")
+        dict: Výsledek bez duplicit (a případně bez mezivýsledků)
+    """
+    klic_metody = f"{metoda}_vysledky"
+    vysledky_metody = dict(vysledek[klic_metody])
+    # Alias q_matrix - klient si jej doplní sám (Zdroj_vysledku)
+    vysledky_metody.pop('q_distance_matrix', None)
+    vysledky_metody.pop('outranking_relace', None)
+    
+    if mezivysledky:
+        kompaktni = dict(vysledek)
+        kompaktni[klic_metody] = vysledky_metody
+        pocet_variant = len(vysledek['norm_vysledky']['nazvy_variant'])
+        if pocet_variant > MAX_VARIANT_PAROVYCH_MATIC:
+            _vynech_parove_matice(kompaktni, vysledky_metody)
+        if html_na_serveru:
+            for klic in _KLICE_JEN_PRO_HTML:
+                kompaktni.pop(klic, None)
+            for klic, vnoreny_klic in _VNORENE_KLICE_JEN_PRO_HTML:
+                if klic in kompaktni:
+                    kompaktni[klic] = {k: v for k, v in kompaktni[klic].items() if k != vnoreny_klic}
+        return kompaktni
+    
+    kompaktni = {
+        klic: vysledek[klic]
+        for klic in ('metoda', 'popis_metody', 'vahy', 'typy_kriterii', 'parametry')
+        if klic in vysledek
+    }
+    kompaktni[klic_metody] = {
+        klic: hodnota for klic, hodnota in vysledky_metody.items() if klic in _KLICE_SOUHRNU
+    }
+    return kompaktni
 
-def wsm_vypocet(norm_matice, vahy, varianty):
+def _vynech_parove_matice(kompaktni, vysledky_metody):
     """
-    Provede výpočet metodou WSM (Weighted Sum Model).
-    
-    Args:
-        norm_matice: 2D list normalizovaných hodnot
-        vahy: List vah kritérií
-        varianty: List názvů variant
-    
-    Returns:
-        dict: Výsledky analýzy metodou WSM
+    Nahradí v kopii výsledku matice [varianty x varianty] hodnotou None.
+    U ELECTRE doplní souhrn relace převahy, pokud jej výsledek ještě nemá.
     """
-    vazene_hodnoty = vypocitej_vazene_hodnoty(norm_matice, vahy)
-    
-    # Sečtení řádků (variant) pro získání skóre
-    skore = []
-    for i, vazene_radek in enumerate(vazene_hodnoty):
-        skore.append((varianty[i], sum(vazene_radek)))
-    
-    # Seřazení podle skóre sestupně
-    serazene = sorted(skore, key=lambda x: x[1], reverse=True)
-    
-    # Vytvoření seznamu výsledků s pořadím
-    results = []
-    for poradi, (varianta, hodnota) in enumerate(serazene, 1):
-        results.append((varianta, poradi, hodnota))
-    
-    # Získání nejlepší a nejhorší varianty
-    nejlepsi_var, _, nejlepsi_skore = results[0]
-    nejhorsi_var, _, nejhorsi_skore = results[-1]
-    rozdil_skore = nejlepsi_skore - nejhorsi_skore
-    
-    return {
-        'results': results,
-        'nejlepsi_varianta': nejlepsi_var,
-        'nejlepsi_skore': nejlepsi_skore,
-        'nejhorsi_varianta': nejhorsi_var,
-        'nejhorsi_skore': nejhorsi_skore,
-        'rozdil_skore': rozdil_skore
-    }
-
-# ========================
-# METODA WPM
-# ========================
+    if kompaktni.get('pomery_variant') is not None:
+        kompaktni['pomery_variant'] = None
+    if vysledky_metody.get('outranking_matrix') is not None:
+        vysledky_metody['souhrn_prevahy'] = Vypocty.souhrn_prevahy(
+            vysledky_metody['outranking_matrix'],
+            vysledky_metody['results'],
+            kompaktni['norm_vysledky']['nazvy_variant']
+        )
+        for klic in ('concordance_matrix', 'discordance_matrix', 'outranking_matrix'):
+            vysledky_metody[klic] = None
 
-def vypocitej_wpm_analyzu(analyza_data):
+def vypocitej_vsechny_metody(analyza_data, metody=None, rozhodovaci_matice=None):
     """
-    Centralizovaná funkce pro výpočet WPM analýzy z dat.
-    Provádí všechny kroky WPM analýzy a vrací strukturovaný výsledek.
+    Vypočítá zvolené metody nad jednou rozhodovací maticí. Normalizace,
+    vážené matice a další společné mezivýsledky se spočítají jen jednou.
+    U uložené analýzy (s 'id') se výsledky jednotlivých metod berou
+    z cache výsledků a počítají se jen chybějící metody.
     
     Args:
         analyza_data: Slovník s daty analýzy
+        metody: List kódů metod ('wsm', 'wpm', 'topsis', 'electre', 'mabac'),
+                výchozí jsou všechny
+        rozhodovaci_matice: Předem sestavená a zvalidovaná Rozhodovaci_matice (volitelné)
         
     Returns:
-        dict: Strukturovaný výsledek s normalizovanou maticí, produktovými příspěvky a výsledky
+        dict: 'vysledky' (kód metody -> strukturovaný výsledek shodný
+              s vypocitej_*_analyzu), 'mezivysledky' a 'parametry'
         
     Raises:
-        ValueError: Pokud data nejsou validní nebo nelze provést výpočet
+        ValueError: Pokud data nejsou validní nebo metoda není podporována
     """
-    try:
-        # Kontrola validity dat
-        je_validni, chyba = validuj_vstupni_data_analyzy(analyza_data)
-        if not je_validni:
-            raise ValueError(f"Neplatná vstupní data: {chyba}")
-            
-        # 1. Příprava dat z JSON formátu
-        matice, typy_kriterii, varianty, kriteria, vahy = priprav_data_z_json(analyza_data)
-        
-        # 2. Normalizace matice pomocí min-max metody pro vizualizaci
-        # (pro samotný výpočet WPM není normalizace nutná,
-        # ale pro konzistenci s WSM ji zahrnujeme do výstupu)
-        norm_vysledky = normalizuj_matici_minmax(matice, typy_kriterii, varianty, kriteria)
-        
-        # 3. Výpočet WPM výsledků
-        wpm_vysledky = wpm_vypocet(
-            matice, 
-            vahy, 
-            typy_kriterii, 
-            varianty,
-            kriteria
-        )
-        
-        # 4. Výpočet produktového příspěvku (pro vizualizaci)
-        produktovy_prispevek = vypocitej_produktovy_prispevek(matice, vahy, typy_kriterii)
-        
-        # 5. Výpočet matice poměrů variant
-        pomery_variant = vypocitej_matici_pomeru_variant(matice, vahy, typy_kriterii)
-        
-        # 6. Sestavení strukturovaného výsledku
-        vysledek = {
-            'norm_vysledky': norm_vysledky,
-            'vahy': vahy,
-            'wpm_vysledky': wpm_vysledky,
-            'matice': matice,
-            'typy_kriterii': typy_kriterii,
-            'produktovy_prispevek': produktovy_prispevek,
-            'pomery_variant': pomery_variant,
-            'metoda': 'WPM',
-            'popis_metody': 'Weighted Product Model'
-        }
-        
-        return vysledek
-        
-    except Exception as e:
-        raise ValueError(f"Chyba při výpočtu WPM analýzy: {str(e)}")
-
-def wpm_vypocet(matice, vahy, typy_kriterii, varianty, kriteria):
-    """
-    Vypočítá výsledky metodou WPM (Weighted Product Model).
+    metody = [m.lower() for m in (metody or Vypocty.METODY)]
+    for metoda in metody:
+        if metoda not in Vypocty.METODY:
+            raise ValueError(f"Nepodporovaná metoda analýzy: {metoda}")
     
-    Args:
-        matice: 2D list původních hodnot
-        vahy: List vah kritérií
-        typy_kriterii: List typů kritérií ("max" nebo "min")
-        varianty: List názvů variant
-        kriteria: List názvů kritérií
+    # Parametry ELECTRE se z nastavení načítají jen pokud je metoda požadována
+    electre_params = {'index_souhlasu': 0.7, 'index_nesouhlasu': 0.3}
+    if 'electre' in metody:
+        electre_params = ziskej_nastaveni_electre()
+    index_souhlasu = electre_params['index_souhlasu']
+    index_nesouhlasu = electre_params['index_nesouhlasu']
+    
+    # Výsledky uložené v cache
+    vysledky = {}
+    klice = {}
+    analyza_id = analyza_data.get('id')
+    if analyza_id:
+        otisk_dat = Cache_vysledku.hash_dat(analyza_data)
+        for metoda in metody:
+            klice[metoda] = Cache_vysledku.vytvor_klic(
+                analyza_id, otisk_dat, metoda, index_souhlasu, index_nesouhlasu
+            )
+            ulozeny = Cache_vysledku.nacti(klice[metoda])
+            if ulozeny is not None:
+                vysledky[metoda] = ulozeny
+    
+    # Výpočet chybějících metod
+    chybejici = [metoda for metoda in metody if metoda not in vysledky]
+    if chybejici:
+        if rozhodovaci_matice is None:
+            rozhodovaci_matice = Vypocty.priprav_rozhodovaci_matici(analyza_data)
+        if Vypocty_numpy is not None:
+            vypocet = Vypocty_numpy.vypocitej_metody(
+                Vypocty_numpy.priprav_pole(rozhodovaci_matice),
+                chybejici,
+                index_souhlasu=index_souhlasu,
+                index_nesouhlasu=index_nesouhlasu
+            )['vysledky']
+        else:
+            vypocet = {
+                metoda: Vypocty.vypocitej_analyzu(
+                    analyza_data, metoda, rozhodovaci_matice,
+                    index_souhlasu=index_souhlasu, index_nesouhlasu=index_nesouhlasu
+                )
+                for metoda in chybejici
+            }
+        for metoda in chybejici:
+            vysledky[metoda] = vypocet[metoda]
+            if metoda in klice:
+                Cache_vysledku.uloz(klice[metoda], vysledky[metoda])
     
-    Returns:
-        dict: Výsledky analýzy metodou WPM
-    """
-    try:
-        # Pro WPM používáme přímo původní hodnoty, nikoliv normalizované
-        # Inicializace výsledných hodnot na 1 pro násobení
-        skore = [1.0] * len(varianty)
-        
-        for i in range(len(varianty)):
-            for j in range(len(kriteria)):
-                hodnota = matice[i][j]
-                
-                # Kontrola, že hodnoty nejsou nulové nebo záporné
-                if hodnota <= 0:
-                    hodnota = 0.001  # Malá kladná hodnota
-                
-                # Pro minimalizační kritéria používáme 1/hodnota
-                if typy_kriterii[j].lower() in ("min", "cost"):
-                    hodnota = 1 / hodnota
-                
-                # Umocníme hodnotu na váhu a vynásobíme dosavadní skóre
-                skore[i] *= hodnota ** vahy[j]
-        
-        # Seřazení variant podle skóre (sestupně)
-        skore_varianty = [(varianty[i], skore[i]) for i in range(len(varianty))]
-        serazene = sorted(skore_varianty, key=lambda x: x[1], reverse=True)
-        
-        # Vytvoření seznamu výsledků s pořadím
-        results = []
-        for poradi, (varianta, hodnota) in enumerate(serazene, 1):
-            results.append((varianta, poradi, hodnota))
-        
-        nejlepsi_var, _, nejlepsi_skore = results[0]
-        nejhorsi_var, _, nejhorsi_skore = results[-1]
-        rozdil_skore = nejlepsi_skore - nejhorsi_skore if len(results) > 1 else 0
-        
-        return {
-            'results': results,
-            'nejlepsi_varianta': nejlepsi_var,
-            'nejlepsi_skore': nejlepsi_skore,
-            'nejhorsi_varianta': nejhorsi_var,
-            'nejhorsi_skore': nejhorsi_skore,
-            'rozdil_skore': rozdil_skore
+    return {
+        'vysledky': {metoda: vysledky[metoda] for metoda in metody},
+        'mezivysledky': Vypocty.sdilene_mezivysledky(vysledky[metody[0]]),
+        'parametry': {
+            'index_souhlasu': index_souhlasu,
+            'index_nesouhlasu': index_nesouhlasu
         }
-    except Exception as e:
-        raise ValueError(f"Chyba při výpočtu WPM: {str(e)}")
+    }
 
-def vypocitej_produktovy_prispevek(matice, vahy, typy_kriterii):
+@anvil.server.callable
+@handle_errors
+def vypocitej_citlivost_analyzy(analyza_id, metoda="wsm", pocet_kroku=9, vaha_od=0.1, vaha_do=0.9,
+                                uplne=False):
     """
-    Vypočítá příspěvek jednotlivých kritérií pro WPM jako matici umocněných hodnot.
-    Pro vizualizaci WPM, kde se používá násobení místo sčítání.
+    Provede na serveru analýzu citlivosti pro všechna kritéria analýzy najednou.
+    U WSM, WPM a MABAC vrací i přesné váhy, při kterých se mění pořadí variant.
     
     Args:
-        matice: 2D list původních hodnot [varianty][kriteria]
-        vahy: List vah kritérií
-        typy_kriterii: List typů kritérií ("max" nebo "min")
-    
-    Returns:
-        2D list transformovaných hodnot umocněných na váhy
-    """
-    try:
-        produktovy_prispevek = []
-        
-        for i in range(len(matice)):
-            radek = []
-            for j in range(len(matice[0])):
-                hodnota = matice[i][j]
-                
-                # Kontrola, že hodnoty nejsou nulové nebo záporné
-                if hodnota <= 0:
-                    hodnota = 0.001  # Malá kladná hodnota
-                
-                # Pro minimalizační kritéria používáme 1/hodnota
-                if typy_kriterii[j].lower() in ("min", "cost"):
-                    hodnota = 1 / hodnota
-                
-                # Umocníme hodnotu na váhu a uložíme
-                prispevek = hodnota ** vahy[j]
-                radek.append(prispevek)
-                
-            produktovy_prispevek.append(radek)
-            
-        return produktovy_prispevek
+        analyza_id: ID analýzy
+        metoda: Metoda analýzy ("wsm", "wpm", "topsis" nebo "mabac")
+        pocet_kroku: Počet kroků mřížky vah (nejvýše MAX_KROKU_CITLIVOSTI)
+        vaha_od, vaha_do: Rozsah vah zkoumaného kritéria (0 <= vaha_od < vaha_do <= 1)
+        uplne: True = skóre a pořadí všech variant v každém kroku,
+               False = jen souhrn pro grafy (viz Citlivost_numpy._souhrn_skore)
         
-    except Exception as e:
-        raise ValueError(f"Chyba při výpočtu produktového příspěvku: {str(e)}")
-
-def vypocitej_matici_pomeru_variant(matice, vahy, typy_kriterii):
-    """
-    Vypočítá matici poměrů variant pro metodu WPM.
-    Pro každý pár variant (A_i, A_j) vypočítá poměr R(A_i/A_j).
-    
-    Args:
-        matice: 2D list původních hodnot [varianty][kriteria]
-        vahy: List vah kritérií
-        typy_kriterii: List typů kritérií ("max" nebo "min")
-    
     Returns:
-        2D matice poměrů mezi variantami
-    """
-    try:
-        n_variant = len(matice)
-        pomer_matice = []
-        
-        # Nejprve vypočítáme produktové skóre pro každou variantu
-        produkty_variant = []
-        for i in range(n_variant):
-            produkt = 1.0
-            for j in range(len(vahy)):
-                hodnota = matice[i][j]
-                
-                # Kontrola, že hodnoty nejsou nulové nebo záporné
-                if hodnota <= 0:
-                    hodnota = 0.001  # Malá kladná hodnota
-                
-                # Pro minimalizační kritéria používáme 1/hodnota
-                if typy_kriterii[j].lower() in ("min", "cost"):
-                    hodnota = 1 / hodnota
-                
-                # Umocníme hodnotu na váhu a vynásobíme dosavadní produkt
-                produkt *= hodnota ** vahy[j]
-            
-            produkty_variant.append(produkt)
-        
-        # Nyní vypočítáme matici poměrů
-        for i in range(n_variant):
-            radek = []
-            for j in range(n_variant):
-                # Poměr variant i a j
-                if produkty_variant[j] == 0:
-                    pomer = float('inf')  # Zabránění dělení nulou
-                else:
-                    pomer = produkty_variant[i] / produkty_variant[j]
-                radek.append(pomer)
-            
-            pomer_matice.append(radek)
-            
-        return pomer_matice
-        
-    except Exception as e:
-        raise ValueError(f"Chyba při výpočtu matice poměrů variant: {str(e)}")
+        dict: Výsledky analýzy citlivosti (viz Citlivost_numpy.vypocitej_citlivost)
+    """
+    _over_numpy("Analýza citlivosti")
+    CRUD_analyzy.over_pristup_k_analyzam([analyza_id])
+    pocet_kroku = min(int(pocet_kroku), MAX_KROKU_CITLIVOSTI)
+    vaha_od, vaha_do = float(vaha_od), float(vaha_do)
+    if not 0 <= vaha_od < vaha_do <= 1:
+        raise ValueError("Rozsah vah musí splňovat 0 <= vaha_od < vaha_do <= 1")
+    analyza_data, rozhodovaci_matice = CRUD_analyzy.nacti_analyzu_pro_vypocet(analyza_id)
+    return Citlivost_numpy.vypocitej_citlivost(
+        *Vypocty_numpy.priprav_pole(rozhodovaci_matice),
+        metoda=metoda,
+        pocet_kroku=pocet_kroku,
+        vaha_od=vaha_od,
+        vaha_do=vaha_do,
+        souhrn=not uplne
+    )
 
-# ========================
-# METODA TOPSIS
-# ========================
-
-def vypocitej_topsis_analyzu(analyza_data):
+def _vytvor_list_metody(workbook, sheet, nazev_metody, vysledky, header_format, 
+                        subheader_format, number_format, best_format, worst_format,
+                        max_radku=None):
     """
-    Centralizovaná funkce pro výpočet TOPSIS analýzy z dat.
-    Provádí všechny kroky TOPSIS analýzy a vrací strukturovaný výsledek.
+    Pomocná funkce pro vytvoření listu s výsledky konkrétní metody.
+    Řádky se zapisují shora dolů (kompatibilní s režimem constant_memory).
     
     Args:
-        analyza_data: Slovník s daty analýzy
-        
-    Returns:
-        dict: Strukturovaný výsledek s normalizovanou maticí, vzdálenostmi a výsledky
-        
-    Raises:
-        ValueError: Pokud data nejsou validní nebo nelze provést výpočet
+        workbook: Workbook objekt pro Excel
+        sheet: List, na který se mají data zapisovat
+        nazev_metody: Název metody (WSM, WPM, atd.)
+        vysledky: Slovník s výsledky metody
+        header_format, subheader_format, number_format, best_format, worst_format: 
+            Formáty pro Excel
+        max_radku: Nejvyšší počet vypsaných variant (volitelné); při překročení
+                   se vypíše první a poslední polovina pořadí
     """
     try:
-        # Kontrola validity dat
-        je_validni, chyba = validuj_vstupni_data_analyzy(analyza_data)
-        if not je_validni:
-            raise ValueError(f"Neplatná vstupní data: {chyba}")
-            
-        # 1. Příprava dat z JSON formátu
-        matice, typy_kriterii, varianty, kriteria, vahy = priprav_data_z_json(analyza_data)
+        sheet.set_column('A:A', 5)     # Pořadí
+        sheet.set_column('B:B', 30)    # Název varianty
+        sheet.set_column('C:C', 15, number_format)    # Skóre
         
-        # 2. Pro TOPSIS používáme původní matici a normalizujeme ji v samotné metodě TOPSIS
-        # Pro kompatibilitu s ostatními funkcemi vytvoříme také min-max normalizovanou matici
-        norm_vysledky = normalizuj_matici_minmax(matice, typy_kriterii, varianty, kriteria)
+        # Záhlaví
+        sheet.merge_range('A1:C1', f"Výsledky metody {nazev_metody}", header_format)
+        sheet.write_row(2, 0, ["Pořadí", "Varianta", "Skóre"], subheader_format)
         
-        # 3. Výpočet TOPSIS výsledků - předáváme původní matici, ne normalizovanou
-        topsis_vysledky = topsis_vypocet(
-            matice, 
-            vahy, 
-            varianty,
-            kriteria,
-            typy_kriterii
-        )
-
-        # 4. Sestavení strukturovaného výsledku
-        vysledek = {
-            'norm_vysledky': norm_vysledky,  # Min-max normalizace pro kompatibilitu
-            'vahy': vahy,
-            'topsis_vysledky': topsis_vysledky,  # Obsahuje výsledky s Euklidovskou normalizací
-            'matice': matice,
-            'typy_kriterii': typy_kriterii,
-            'metoda': 'TOPSIS',
-            'popis_metody': 'Technique for Order of Preference by Similarity to Ideal Solution'
-        }
+        # Určení klíče pro přístup k výsledkům podle metody
+        vysledky_klic = f"{nazev_metody.lower()}_vysledky"
         
-        return vysledek
+        # Kontrola existence klíče s výsledky
+        if vysledky_klic not in vysledky:
+            zapsat_chybu(f"Chybí klíč {vysledky_klic} ve výsledcích")
+            sheet.merge_range('A4:C4', "Chybí data pro tuto metodu", subheader_format)
+            return
+            
+        # Kontrola existence potřebných klíčů
+        results = vysledky[vysledky_klic].get('results', [])
+        nejlepsi_var = vysledky[vysledky_klic].get('nejlepsi_varianta', '')
+        nejhorsi_var = vysledky[vysledky_klic].get('nejhorsi_varianta', '')
+        nejlepsi_skore = vysledky[vysledky_klic].get('nejlepsi_skore', 0)
+        nejhorsi_skore = vysledky[vysledky_klic].get('nejhorsi_skore', 0)
         
-    except Exception as e:
-        raise ValueError(f"Chyba při výpočtu TOPSIS analýzy: {str(e)}")
-
-def topsis_vypocet(matice, vahy, varianty, kriteria, typy_kriterii):
-    """
-    Vypočítá výsledky metodou TOPSIS (Technique for Order of Preference by Similarity to Ideal Solution).
-    Používá normalizaci pomocí Euklidovské normy.
-    
-    Args:
-        matice: 2D list původních (nenormalizovaných) hodnot
-        vahy: List vah kritérií
-        varianty: List názvů variant
-        kriteria: List názvů kritérií
-        typy_kriterii: List typů kritérií ("max" nebo "min")
-    
-    Returns:
-        dict: Výsledky analýzy metodou TOPSIS
-    """
-    try:
-        # 1. Vektorizace rozhodovací matice (normalizace pomocí Euklidovské normy)
-        norm_matice = []
-        for i in range(len(varianty)):
-            radek = []
-            for j in range(len(kriteria)):
-                # Vypočítáme Euklidovskou normu pro každé kritérium
-                sloupec = [matice[k][j] for k in range(len(varianty))]
-                norma = (sum(x**2 for x in sloupec)) ** 0.5
-                
-                # Normalizace hodnoty
-                hodnota = matice[i][j] / norma if norma != 0 else 0
-                radek.append(hodnota)
-            norm_matice.append(radek)
+        # Vyplnění výsledků
+        row = 3
         
-        # 2. Výpočet vážené normalizované matice
-        vazena_matice = []
-        for i in range(len(varianty)):
-            radek = []
-            for j in range(len(kriteria)):
-                radek.append(norm_matice[i][j] * vahy[j])
-            vazena_matice.append(radek)
+        if not results:
+            sheet.merge_range('A4:C4', "Žádné výsledky pro tuto metodu", subheader_format)
+            return
         
-        # 3. Určení ideálního a anti-ideálního řešení
-        ideal = []
-        anti_ideal = []
-        for j in range(len(kriteria)):
-            sloupec = [vazena_matice[i][j] for i in range(len(varianty))]
+        serazene = sorted(results, key=lambda x: x[1])
+        vynechano = 0
+        if max_radku and len(serazene) > max_radku:
+            # Začátek a konec pořadí, prostřední varianty se vynechají
+            vynechano = len(serazene) - max_radku
+            polovina = (max_radku + 1) // 2
+            serazene = serazene[:polovina] + [None] + serazene[len(serazene) - (max_radku - polovina):]
             
-            if typy_kriterii[j].lower() in ("max", "benefit"):
-                ideal.append(max(sloupec))
-                anti_ideal.append(min(sloupec))
-            else:  # min kritéria
-                ideal.append(min(sloupec))
-                anti_ideal.append(max(sloupec))
-        
-        # 4. Výpočet vzdáleností od ideálního a anti-ideálního řešení
-        dist_ideal = []
-        dist_anti_ideal = []
-        for i in range(len(varianty)):
-            sum_ideal = 0
-            sum_anti_ideal = 0
-            for j in range(len(kriteria)):
-                sum_ideal += (vazena_matice[i][j] - ideal[j]) ** 2
-                sum_anti_ideal += (vazena_matice[i][j] - anti_ideal[j]) ** 2
-            dist_ideal.append(sum_ideal ** 0.5)
-            dist_anti_ideal.append(sum_anti_ideal ** 0.5)
-        
-        # 5. Výpočet relativní blízkosti k ideálnímu řešení
-        relativni_blizkost = []
-        for i in range(len(varianty)):
-            if dist_ideal[i] + dist_anti_ideal[i] == 0:
-                relativni_blizkost.append(0)
+        for polozka in serazene:
+            if polozka is None:
+                sheet.merge_range(row, 0, row, 2, f"… vynecháno {vynechano} variant …", subheader_format)
+                row += 1
+                continue
+            varianta, poradi, skore = polozka
+            if varianta == nejlepsi_var:
+                sheet.write_row(row, 0, [poradi, varianta, skore], best_format)
+            elif varianta == nejhorsi_var:
+                sheet.write_row(row, 0, [poradi, varianta, skore], worst_format)
             else:
-                relativni_blizkost.append(dist_anti_ideal[i] / (dist_ideal[i] + dist_anti_ideal[i]))
+                sheet.write_row(row, 0, [poradi, varianta, skore])
+            row += 1
         
-        # Seřazení variant podle blízkosti (sestupně)
-        skore = [(varianty[i], relativni_blizkost[i]) for i in range(len(varianty))]
-        serazene = sorted(skore, key=lambda x: x[1], reverse=True)
+        # Přidání souhrnu
+        row += 2
+        sheet.write(row, 0, "Souhrn:", subheader_format)
+        sheet.merge_range(f'A{row+2}:B{row+2}', "Nejlepší varianta:", subheader_format)
+        sheet.write(row+1, 2, nejlepsi_var)
         
-        # Vytvoření seznamu výsledků s pořadím
-        results = []
-        for poradi, (varianta, hodnota) in enumerate(serazene, 1):
-            results.append((varianta, poradi, hodnota))
+        sheet.merge_range(f'A{row+3}:B{row+3}', "Nejlepší skóre:", subheader_format)
+        sheet.write(row+2, 2, nejlepsi_skore)
         
-        # Zjištění nejlepší a nejhorší varianty
-        nejlepsi_var, _, nejlepsi_skore = results[0]
-        nejhorsi_var, _, nejhorsi_skore = results[-1]
+        sheet.merge_range(f'A{row+4}:B{row+4}', "Nejhorší varianta:", subheader_format)
+        sheet.write(row+3, 2, nejhorsi_var)
         
-        return {
-            'results': results,
-            'nejlepsi_varianta': nejlepsi_var,
-            'nejlepsi_skore': nejlepsi_skore,
-            'nejhorsi_varianta': nejhorsi_var,
-            'nejhorsi_skore': nejhorsi_skore,
-            'norm_matice': norm_matice,
-            'vazena_matice': vazena_matice,
-            'ideal': ideal,
-            'anti_ideal': anti_ideal,
-            'dist_ideal': dist_ideal,
-            'dist_anti_ideal': dist_anti_ideal,
-            'relativni_blizkost': relativni_blizkost
-        }
+        sheet.merge_range(f'A{row+5}:B{row+5}', "Nejhorší skóre:", subheader_format)
+        sheet.write(row+4, 2, nejhorsi_skore)
     except Exception as e:
-        raise ValueError(f"Chyba při výpočtu TOPSIS: {str(e)}")
+        zapsat_chybu(f"Chyba při vytváření listu pro metodu {nazev_metody}: {str(e)}")
+        sheet.write(3, 0, f"Chyba: {str(e)}", subheader_format)
 
 # ========================
-# METODA ELECTRE
+# NASTAVENÍ ELECTRE
 # ========================
 
 def ziskej_nastaveni_electre():
@@ -1125,352 +754,3 @@ def ziskej_nastaveni_electre():
         # Při chybě použijeme výchozí hodnoty
         zapsat_chybu(f"Chyba při načítání ELECTRE parametrů: {str(e)}")
         return {'index_souhlasu': 0.7, 'index_nesouhlasu': 0.3}
-
-def vypocitej_electre_analyzu(analyza_data):
-    """
-    Centralizovaná funkce pro výpočet ELECTRE analýzy z dat.
-    Provádí všechny kroky ELECTRE analýzy a vrací strukturovaný výsledek.
-    
-    Args:
-        analyza_data: Slovník s daty analýzy
-        
-    Returns:
-        dict: Strukturovaný výsledek s maticemi souhlasu, nesouhlasu a výsledky
-        
-    Raises:
-        ValueError: Pokud data nejsou validní nebo nelze provést výpočet
-    """
-    try:
-        # Kontrola validity dat
-        je_validni, chyba = validuj_vstupni_data_analyzy(analyza_data)
-        if not je_validni:
-            raise ValueError(f"Neplatná vstupní data: {chyba}")
-            
-        # 1. Příprava dat z JSON formátu
-        matice, typy_kriterii, varianty, kriteria, vahy = priprav_data_z_json(analyza_data)
-        
-        # 2. Získání parametrů ELECTRE z nastavení uživatele
-        electre_params = ziskej_nastaveni_electre()
-        index_souhlasu = electre_params['index_souhlasu'] 
-        index_nesouhlasu = electre_params['index_nesouhlasu']
-
-        # 3. Normalizace matice pomocí min-max metody pro další výpočty
-        norm_vysledky = normalizuj_matici_minmax(matice, typy_kriterii, varianty, kriteria)
-        norm_matice = norm_vysledky['normalizovana_matice']
-        
-        # 4. Výpočet ELECTRE
-        # 4.1 Výpočet matice souhlasu (concordance matrix)
-        concordance_matrix = vypocitej_concordance_matrix(norm_matice, vahy, len(varianty))
-        
-        # 4.2 Výpočet matice nesouhlasu (discordance matrix)
-        discordance_matrix = vypocitej_discordance_matrix(norm_matice, len(varianty))
-        
-        # 4.3 Výpočet matice převahy (outranking matrix)
-        outranking_matrix = vypocitej_outranking_matrix(
-            concordance_matrix, 
-            discordance_matrix, 
-            index_souhlasu, 
-            index_nesouhlasu, 
-            len(varianty)
-        )
-        
-        # 4.4 Výpočet Net Flow pro každou variantu
-        net_flows = vypocitej_net_flows(outranking_matrix, varianty)
-        
-        # 4.5 Seřazení variant podle Net Flow
-        results = []
-        for i, (varianta, net_flow) in enumerate(net_flows):
-            results.append((varianta, i+1, net_flow))
-        
-        # Najdeme nejlepší a nejhorší variantu
-        nejlepsi_var = results[0][0]
-        nejhorsi_var = results[-1][0]
-        nejlepsi_score = results[0][2]
-        nejhorsi_score = results[-1][2]
-        
-        # 5. Sestavení strukturovaného výsledku
-        electre_vysledky = {
-            'results': results,
-            'nejlepsi_varianta': nejlepsi_var,
-            'nejhorsi_varianta': nejhorsi_var,
-            'nejlepsi_skore': nejlepsi_score,
-            'nejhorsi_skore': nejhorsi_score,
-            'concordance_matrix': concordance_matrix,
-            'discordance_matrix': discordance_matrix,
-            'outranking_matrix': outranking_matrix,
-            'index_souhlasu': index_souhlasu,
-            'index_nesouhlasu': index_nesouhlasu
-        }
-        
-        vysledek = {
-            'norm_vysledky': norm_vysledky,
-            'vahy': vahy,
-            'electre_vysledky': electre_vysledky,
-            'matice': matice,
-            'typy_kriterii': typy_kriterii,
-            'parametry': {
-                'index_souhlasu': index_souhlasu,
-                'index_nesouhlasu': index_nesouhlasu
-            },
-            'metoda': 'ELECTRE',
-            'popis_metody': 'Elimination Et Choix Traduisant la Réalité'
-        }
-        
-        return vysledek
-        
-    except Exception as e:
-        raise ValueError(f"Chyba při výpočtu ELECTRE analýzy: {str(e)}")
-
-def vypocitej_concordance_matrix(norm_matice, vahy, pocet_variant):
-    """
-    Vypočítá matici souhlasu (concordance matrix) pro metodu ELECTRE.
-    
-    Args:
-        norm_matice: Normalizovaná matice hodnot
-        vahy: Seznam vah kritérií
-        pocet_variant: Počet variant v analýze
-        
-    Returns:
-        2D list: Matice souhlasu
-    """
-    # Inicializace matice souhlasu
-    concordance_matrix = [[0 for _ in range(pocet_variant)] for _ in range(pocet_variant)]
-    
-    # Pro každou dvojici variant i a j
-    for i in range(pocet_variant):
-        for j in range(pocet_variant):
-            if i != j:  # Vynecháme diagonálu
-                # Souhlasná množina - kritéria, ve kterých je varianta i alespoň tak dobrá jako j
-                concordance_sum = 0
-                
-                for k in range(len(vahy)):
-                    # Pokud je varianta i alespoň tak dobrá jako j v kritériu k
-                    if norm_matice[i][k] >= norm_matice[j][k]:
-                        concordance_sum += vahy[k]
-                
-                concordance_matrix[i][j] = concordance_sum
-    
-    return concordance_matrix
-
-def vypocitej_discordance_matrix(norm_matice, pocet_variant):
-    """
-    Vypočítá matici nesouhlasu (discordance matrix) pro metodu ELECTRE.
-    
-    Args:
-        norm_matice: Normalizovaná matice hodnot
-        pocet_variant: Počet variant v analýze
-        
-    Returns:
-        2D list: Matice nesouhlasu
-    """
-    # Inicializace matice nesouhlasu
-    discordance_matrix = [[0 for _ in range(pocet_variant)] for _ in range(pocet_variant)]
-    
-    # Pro každou dvojici variant i a j
-    for i in range(pocet_variant):
-        for j in range(pocet_variant):
-            if i != j:  # Vynecháme diagonálu
-                # Nesouhlasná množina - maximální normalizovaný rozdíl ve prospěch j nad i
-                max_diff = 0
-                
-                for k in range(len(norm_matice[0])):
-                    # Rozdíl mezi j a i v kritériu k (pokud j je lepší než i)
-                    diff = max(0, norm_matice[j][k] - norm_matice[i][k])
-                    max_diff = max(max_diff, diff)
-                
-                # Maximální možný rozdíl v normalizované matici je 1
-                discordance_matrix[i][j] = max_diff
-    
-    return discordance_matrix
-
-def vypocitej_outranking_matrix(concordance_matrix, discordance_matrix, index_souhlasu, index_nesouhlasu, pocet_variant):
-    """
-    Vypočítá matici převahy (outranking matrix) pro metodu ELECTRE.
-    
-    Args:
-        concordance_matrix: Matice souhlasu
-        discordance_matrix: Matice nesouhlasu
-        index_souhlasu: Prahová hodnota indexu souhlasu
-        index_nesouhlasu: Prahová hodnota indexu nesouhlasu
-        pocet_variant: Počet variant v analýze
-        
-    Returns:
-        2D list: Binární matice převahy (0/1)
-    """
-    # Inicializace matice převahy
-    outranking_matrix = [[0 for _ in range(pocet_variant)] for _ in range(pocet_variant)]
-    
-    # Pro každou dvojici variant i a j
-    for i in range(pocet_variant):
-        for j in range(pocet_variant):
-            if i != j:  # Vynecháme diagonálu
-                # Varianta i převyšuje variantu j, pokud:
-                # 1. Index souhlasu je větší nebo roven prahu
-                # 2. Index nesouhlasu je menší nebo roven prahu
-                if (concordance_matrix[i][j] >= index_souhlasu and 
-                    discordance_matrix[i][j] <= index_nesouhlasu):
-                    outranking_matrix[i][j] = 1
-    
-    return outranking_matrix
-
-def vypocitej_net_flows(outranking_matrix, varianty):
-    """
-    Vypočítá Net Flow pro každou variantu na základě matice převahy.
-    
-    Args:
-        outranking_matrix: Binární matice převahy
-        varianty: Seznam názvů variant
-        
-    Returns:
-        list: Seznam dvojic (varianta, net_flow) seřazený sestupně podle net_flow
-    """
-    pocet_variant = len(varianty)
-    net_flows = []
-    
-    for i in range(pocet_variant):
-        # Počet variant, které i převyšuje
-        vychazejici = sum(outranking_matrix[i])
-        
-        # Počet variant, které převyšují i
-        prichazejici = sum(outranking_matrix[j][i] for j in range(pocet_variant))
-        
-        # Net Flow = vychazejici - prichazejici
-        net_flow = vychazejici - prichazejici
-        net_flows.append((varianty[i], net_flow))
-    
-    # Seřazení podle net_flow sestupně
-    return sorted(net_flows, key=lambda x: x[1], reverse=True)
-
-# ========================
-# METODA MABAC
-# ========================
-
-def vypocitej_mabac_analyzu(analyza_data):
-    """
-    Centralizovaná funkce pro výpočet MABAC analýzy z dat.
-    Provádí všechny kroky MABAC analýzy a vrací strukturovaný výsledek.
-    
-    Args:
-        analyza_data: Slovník s daty analýzy
-        
-    Returns:
-        dict: Strukturovaný výsledek s normalizovanou maticí, mezními hodnotami a výsledky
-        
-    Raises:
-        ValueError: Pokud data nejsou validní nebo nelze provést výpočet
-    """
-    try:
-        # Kontrola validity dat
-        je_validni, chyba = validuj_vstupni_data_analyzy(analyza_data)
-        if not je_validni:
-            raise ValueError(f"Neplatná vstupní data: {chyba}")
-            
-        # 1. Příprava dat z JSON formátu
-        matice, typy_kriterii, varianty, kriteria, vahy = priprav_data_z_json(analyza_data)
-        
-        # 2. Normalizace matice pomocí min-max metody
-        norm_vysledky = normalizuj_matici_minmax(matice, typy_kriterii, varianty, kriteria)
-        norm_matice = norm_vysledky['normalizovana_matice']
-        
-        # 3. Výpočet vážené normalizované matice podle specifického vzorce MABAC: v_ij = w_j * (r_ij + 1)
-        vazena_matice = []
-        for i in range(len(varianty)):
-            radek = []
-            for j in range(len(kriteria)):
-                v_ij = vahy[j] * (norm_matice[i][j] + 1)
-                radek.append(v_ij)
-            vazena_matice.append(radek)
-        
-        # 4. Výpočet MABAC výsledků
-        mabac_vysledky = mabac_vypocet(
-            vazena_matice, 
-            vahy, 
-            varianty, 
-            kriteria
-        )
-        
-        # 5. Sestavení strukturovaného výsledku
-        vysledek = {
-            'norm_vysledky': norm_vysledky,
-            'vazena_matice': vazena_matice,
-            'vahy': vahy,
-            'mabac_vysledky': mabac_vysledky,
-            'matice': matice,
-            'typy_kriterii': typy_kriterii,
-            'metoda': 'MABAC',
-            'popis_metody': 'Multi-Attributive Border Approximation area Comparison'
-        }
-        
-        return vysledek
-        
-    except Exception as e:
-        raise ValueError(f"Chyba při výpočtu MABAC analýzy: {str(e)}")
-
-def mabac_vypocet(vazena_matice, vahy, varianty, kriteria):
-    """
-    Vypočítá výsledky metodou MABAC (Multi-Attributive Border Approximation area Comparison).
-    
-    Args:
-        vazena_matice: 2D list vážených normalizovaných hodnot [varianty][kriteria]
-        vahy: List vah kritérií
-        varianty: List názvů variant
-        kriteria: List názvů kritérií
-    
-    Returns:
-        dict: Výsledky analýzy metodou MABAC
-    """
-    try:
-        # 1. Vazená normalizovaná matice už by měla být vypočítaná jako v_ij = w_j * (r_ij + 1)
-        
-        # 2. Výpočet hraničních hodnot pro každé kritérium (G)
-        g_values = []
-        for j in range(len(kriteria)):
-            # Výpočet hraničního aproximačního prostoru pro každé kritérium
-            g = 1
-            for i in range(len(varianty)):
-                g *= vazena_matice[i][j]
-            g = g ** (1/len(varianty))  # Geometrický průměr
-            g_values.append(g)
-            
-        # 3. Výpočet vzdáleností od hraničního aproximačního prostoru (Q)
-        q_matrix = []
-        for i in range(len(varianty)):
-            q_row = []
-            for j in range(len(kriteria)):
-                q = vazena_matice[i][j] - g_values[j]
-                q_row.append(q)
-            q_matrix.append(q_row)
-            
-        # 4. Výpočet celkového hodnocení pro každou variantu
-        skore = []
-        for i, varianta in enumerate(varianty):
-            celkove_skore = sum(q_matrix[i])
-            skore.append((varianta, celkove_skore))
-            
-        # 5. Seřazení variant podle skóre (sestupně)
-        serazene = sorted(skore, key=lambda x: x[1], reverse=True)
-        
-        # 6. Vytvoření seznamu výsledků s pořadím
-        results = []
-        for poradi, (varianta, hodnota) in enumerate(serazene, 1):
-            results.append((varianta, poradi, hodnota))
-            
-        # Zjištění nejlepší a nejhorší varianty
-        nejlepsi_var, _, nejlepsi_skore = results[0]
-        nejhorsi_var, _, nejhorsi_skore = results[-1]
-        rozdil_skore = nejlepsi_skore - nejhorsi_skore
-            
-        # Výsledný slovník
-        return {
-            'results': results,
-            'nejlepsi_varianta': nejlepsi_var,
-            'nejlepsi_skore': nejlepsi_skore,
-            'nejhorsi_varianta': nejhorsi_var,
-            'nejhorsi_skore': nejhorsi_skore,
-            'g_values': g_values,  # Hraniční hodnoty
-            'q_matrix': q_matrix,  # Matice vzdáleností
-            'q_distance_matrix': q_matrix,  # Pro vizualizaci
-            'rozdil_skore': rozdil_skore
-        }
-    except Exception as e:
-        raise ValueError(f"Chyba při výpočtu MABAC: {str(e)}")
@@ -0,0 +1,220 @@
+# -------------------------------------------------------
+# Modul: Format_analyzy
+#
+# Formát uložení dat analýzy ve sloupci data_json.
+#
+# Verze 1 (původní) je vnořený slovník: kritéria jako slovníky
+# {typ, vaha} a každá varianta jako slovník s hodnotou pro každé
+# kritérium, takže se název kritéria opakuje u každé buňky matice.
+#
+# Verze 2 (VERZE_FORMATU) drží názvy kritérií a variant jako
+# seřazené seznamy a celou matici jako jedno pole float64
+# (array('d'), little-endian, base64). Uložená data jsou několikrát
+# menší a serverové výpočty sestaví rozhodovací matici přímo z bajtů
+# pole bez převodu jednotlivých buněk. Celočíselné hodnoty se při
+# rozbalení vrátí jako int - u matice jen z celých čísel podle příznaku
+# cela_cisla, u smíšené matice podle bitové masky maska_celych_cisel.
+#
+# Klient i ostatní moduly dál pracují s formátem verze 1 - převod
+# probíhá jen při zápisu a čtení v CRUD_analyzy. Data, která nelze
+# bezeztrátově zabalit (nečíselné hodnoty, další atributy kritérií
+# nebo variant), se ukládají ve verzi 1 beze změny.
+# -------------------------------------------------------
+import base64
+import sys
+from array import array
+from . import Rozhodovaci_matice, Vypocty
+
+# Aktuální verze kompaktního formátu
+VERZE_FORMATU = 2
+
+# Klíče verze 1, které kompaktní formát nahrazuje vlastní strukturou
+_KLICE_MATICE = ("kriteria", "varianty")
+
+def je_kompaktni(ulozena):
+    """Zjistí, zda jsou uložená data v kompaktním formátu."""
+    return isinstance(ulozena, dict) and ulozena.get("verze") == VERZE_FORMATU
+
+# Největší celé číslo, které float64 vyjádří přesně
+_MAX_PRESNE_CELE_CISLO = 2 ** 53
+
+def _je_cislo(hodnota):
+    """Zjistí, zda lze hodnotu uložit do pole float64 beze ztráty."""
+    if isinstance(hodnota, bool):
+        return False
+    if isinstance(hodnota, int):
+        return abs(hodnota) <= _MAX_PRESNE_CELE_CISLO
+    return isinstance(hodnota, float)
+
+def _pole_na_text(hodnoty):
+    """Zakóduje hodnoty jako base64 pole float64 v pořadí little-endian."""
+    pole = array('d', hodnoty)
+    if sys.byteorder == "big":
+        pole.byteswap()
+    return base64.b64encode(pole.tobytes()).decode("ascii")
+
+def _text_na_pole(text):
+    """Dekóduje base64 pole float64 uložené funkcí _pole_na_text."""
+    pole = array('d')
+    pole.frombytes(base64.b64decode(text))
+    if sys.byteorder == "big":
+        pole.byteswap()
+    return pole
+
+def _maska_na_text(maska):
+    """Zakóduje seznam příznaků jako base64 bitovou mapu (bit i % 8 bajtu i // 8)."""
+    bajty = bytearray((len(maska) + 7) // 8)
+    for i, priznak in enumerate(maska):
+        if priznak:
+            bajty[i >> 3] |= 1 << (i & 7)
+    return base64.b64encode(bytes(bajty)).decode("ascii")
+
+def _text_na_masku(text, pocet):
+    """Dekóduje bitovou mapu uloženou funkcí _maska_na_text na pocet příznaků."""
+    bajty = base64.b64decode(text)
+    return [bool((bajty[i >> 3] >> (i & 7)) & 1) for i in range(pocet)]
+
+def zabal_data(data):
+    """
+    Převede data analýzy do kompaktního formátu.
+
+    Args:
+        data: Data analýzy ve formátu verze 1
+
+    Returns:
+        Dict: Data v kompaktním formátu, nebo původní data, pokud už
+              kompaktní jsou nebo je nelze zabalit bez ztráty informací
+    """
+    if je_kompaktni(data) or not isinstance(data, dict):
+        return data
+    kriteria_dict = data.get("kriteria", {})
+    varianty_dict = data.get("varianty", {})
+    if not isinstance(kriteria_dict, dict) or not isinstance(varianty_dict, dict):
+        return data
+
+    kriteria = list(kriteria_dict)
+    if "popis_varianty" in kriteria:
+        return data
+    for krit_data in kriteria_dict.values():
+        if not isinstance(krit_data, dict) or set(krit_data) != {"typ", "vaha"}:
+            return data
+
+    povolene_klice = set(kriteria) | {"popis_varianty"}
+    hodnoty = []
+    chybejici = []
+    # Příznak celého čísla pro každou hodnotu (chybějící hodnoty nerozhodují)
+    cela_cisla = []
+    for var_data in varianty_dict.values():
+        if not isinstance(var_data, dict) or not set(var_data) <= povolene_klice:
+            return data
+        for krit_nazev in kriteria:
+            if krit_nazev not in var_data:
+                chybejici.append(len(hodnoty))
+                hodnoty.append(0.0)
+                cela_cisla.append(True)
+                continue
+            hodnota = var_data[krit_nazev]
+            if not _je_cislo(hodnota):
+                return data
+            cela_cisla.append(isinstance(hodnota, int))
+            hodnoty.append(hodnota)
+
+    ulozena = {klic: hodnota for klic, hodnota in data.items() if klic not in _KLICE_MATICE}
+    ulozena.update({
+        "verze": VERZE_FORMATU,
+        "kriteria": kriteria,
+        "typy_kriterii": [kriteria_dict[k]["typ"] for k in kriteria],
+        "vahy": [kriteria_dict[k]["vaha"] for k in kriteria],
+        "varianty": list(varianty_dict),
+        "popisy_variant": [var_data.get("popis_varianty") for var_data in varianty_dict.values()],
+        "matice": _pole_na_text(hodnoty),
+        "chybejici": chybejici,
+        # Pouze celočíselné hodnoty se při rozbalení vrátí jako int
+        "cela_cisla": all(cela_cisla) and bool(hodnoty),
+    })
+    if not ulozena["cela_cisla"] and any(cela_cisla):
+        # Smíšená matice - typ se pamatuje pro každou hodnotu
+        ulozena["maska_celych_cisel"] = _maska_na_text(cela_cisla)
+    return ulozena
+
+def rozbal_data(ulozena):
+    """
+    Převede uložená data analýzy do formátu verze 1.
+
+    Args:
+        ulozena: Obsah sloupce data_json (libovolná verze)
+
+    Returns:
+        Dict: Data analýzy ve formátu verze 1
+    """
+    if not je_kompaktni(ulozena):
+        return ulozena
+
+    kriteria = ulozena["kriteria"]
+    hodnoty = _text_na_pole(ulozena["matice"])
+    if ulozena.get("cela_cisla"):
+        hodnoty = [int(h) for h in hodnoty]
+    elif ulozena.get("maska_celych_cisel"):
+        maska = _text_na_masku(ulozena["maska_celych_cisel"], len(hodnoty))
+        hodnoty = [int(h) if cele else h for h, cele in zip(hodnoty, maska)]
+    chybejici = set(ulozena.get("chybejici") or ())
+    pocet_kriterii = len(kriteria)
+
+    varianty = {}
+    for i, (var_nazev, popis) in enumerate(zip(ulozena["varianty"], ulozena["popisy_variant"])):
+        var_data = {} if popis is None else {"popis_varianty": popis}
+        zacatek = i * pocet_kriterii
+        for j, krit_nazev in enumerate(kriteria):
+            if zacatek + j not in chybejici:
+                var_data[krit_nazev] = hodnoty[zacatek + j]
+        varianty[var_nazev] = var_data
+
+    data = {
+        klic: hodnota for klic, hodnota in ulozena.items()
+        if klic not in ("verze", "kriteria", "typy_kriterii", "vahy", "varianty",
+                        "popisy_variant", "matice", "chybejici", "cela_cisla",
+                        "maska_celych_cisel")
+    }
+    data["kriteria"] = {
+        krit_nazev: {"typ": typ, "vaha": vaha}
+        for krit_nazev, typ, vaha in zip(kriteria, ulozena["typy_kriterii"], ulozena["vahy"])
+    }
+    data["varianty"] = varianty
+    return data
+
+def priprav_rozhodovaci_matici(ulozena):
+    """
+    Sestaví rozhodovací matici z uložených dat se stejnou validací jako
+    Vypocty.priprav_rozhodovaci_matici. U kompaktního formátu se matice
+    načte přímo z pole hodnot.
+
+    Args:
+        ulozena: Obsah sloupce data_json (libovolná verze)
+
+    Returns:
+        Rozhodovaci_matice: Sestavená rozhodovací matice
+
+    Raises:
+        ValueError: Pokud data nejsou validní
+    """
+    if not je_kompaktni(ulozena):
+        return Vypocty.priprav_rozhodovaci_matici(ulozena)
+
+    kriteria = ulozena["kriteria"]
+    varianty = ulozena["varianty"]
+    if not kriteria:
+        raise ValueError("Neplatná vstupní data: Analýza musí obsahovat alespoň jedno kritérium")
+    if not varianty:
+        raise ValueError("Neplatná vstupní data: Analýza musí obsahovat alespoň jednu variantu")
+    soucet_vah = sum(float(vaha) for vaha in ulozena["vahy"])
+    if abs(soucet_vah - 1.0) > 0.001:
+        raise ValueError(f"Neplatná vstupní data: Součet vah musí být 1.0 (aktuálně: {soucet_vah:.3f})")
+    if ulozena.get("chybejici"):
+        i, j = divmod(min(ulozena["chybejici"]), len(kriteria))
+        raise ValueError(
+            f"Neplatná vstupní data: Varianta '{varianty[i]}' nemá hodnotu pro kritérium '{kriteria[j]}'"
+        )
+
+    return Rozhodovaci_matice.Rozhodovaci_matice(
+        varianty, kriteria, ulozena["typy_kriterii"], ulozena["vahy"], _text_na_pole(ulozena["matice"])
+    )
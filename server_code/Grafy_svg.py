@@ -0,0 +1,108 @@
+# -------------------------------------------------------
+# Modul: Grafy_svg
+#
+# Statické SVG grafy výsledků pro serverové PDF reporty.
+#
+# Grafy se skládají přímo jako SVG text bez Plotly a prohlížeče, takže
+# se vykreslí jednou na serveru a do HTML reportu se vloží inline.
+# Barvy odpovídají interaktivním grafům v modulu Vizualizace.
+# -------------------------------------------------------
+import html
+
+# Nejvyšší počet variant v jednom grafu (další se vynechají)
+MAX_VARIANT_GRAFU = 30
+
+# Rozměry grafu v pixelech
+SIRKA = 720
+VYSKA_RADKU = 20
+OKRAJ_POPISKU = 200
+OKRAJ_HODNOT = 70
+
+# Barvy sloupců (nejlepší, nejhorší, ostatní) - shodné s Vizualizace
+BARVA_NEJLEPSI = "#2ecc71"
+BARVA_NEJHORSI = "#e74c3c"
+BARVA_OSTATNI = "#3498db"
+
+def formatuj_hodnotu(hodnota):
+    """Zformátuje hodnotu pro popisek sloupce."""
+    if isinstance(hodnota, int):
+        return str(hodnota)
+    return f"{hodnota:.3f}"
+
+def _zkrat(text, max_delka=28):
+    """Zkrátí dlouhý název varianty pro popisek osy."""
+    text = str(text)
+    return text if len(text) <= max_delka else text[:max_delka - 1] + "…"
+
+def vytvor_sloupcovy_graf_svg(results, nazev_grafu, popis_hodnoty="Skóre"):
+    """
+    Vytvoří vodorovný sloupcový graf skóre variant seřazených podle pořadí.
+    Záporná skóre (MABAC, ELECTRE Net Flow) se kreslí vlevo od nulové osy.
+
+    Args:
+        results: List trojic (varianta, pořadí, skóre)
+        nazev_grafu: Nadpis grafu
+        popis_hodnoty: Popisek osy hodnot
+
+    Returns:
+        str: SVG element jako text
+    """
+    serazene = sorted(results, key=lambda x: x[1])
+    vynechano = max(0, len(serazene) - MAX_VARIANT_GRAFU)
+    if vynechano:
+        serazene = serazene[:MAX_VARIANT_GRAFU]
+    if not serazene:
+        return ""
+
+    hodnoty = [skore for _, _, skore in serazene]
+    minimum = min(0, min(hodnoty))
+    maximum = max(0, max(hodnoty))
+    rozsah = (maximum - minimum) or 1
+
+    sirka_oblasti = SIRKA - OKRAJ_POPISKU - OKRAJ_HODNOT
+    x_nuly = OKRAJ_POPISKU + (0 - minimum) / rozsah * sirka_oblasti
+    horni_okraj = 40
+    vyska = horni_okraj + len(serazene) * VYSKA_RADKU + 40
+
+    casti = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{SIRKA}" height="{vyska}" '
+        f'viewBox="0 0 {SIRKA} {vyska}" font-family="Arial, sans-serif" font-size="11">',
+        f'<text x="{SIRKA / 2}" y="20" text-anchor="middle" font-size="14" font-weight="bold">'
+        f'{html.escape(nazev_grafu)}</text>',
+    ]
+
+    posledni = len(results)
+    for i, (varianta, poradi, skore) in enumerate(serazene):
+        y = horni_okraj + i * VYSKA_RADKU
+        if poradi == 1:
+            barva = BARVA_NEJLEPSI
+        elif poradi == posledni:
+            barva = BARVA_NEJHORSI
+        else:
+            barva = BARVA_OSTATNI
+        x_konce = OKRAJ_POPISKU + (skore - minimum) / rozsah * sirka_oblasti
+        x = min(x_nuly, x_konce)
+        sirka_sloupce = max(abs(x_konce - x_nuly), 1)
+        casti.append(
+            f'<text x="{OKRAJ_POPISKU - 6}" y="{y + 14}" text-anchor="end">'
+            f'{poradi}. {html.escape(_zkrat(varianta))}</text>'
+        )
+        casti.append(
+            f'<rect x="{x:.1f}" y="{y + 3}" width="{sirka_sloupce:.1f}" height="{VYSKA_RADKU - 6}" fill="{barva}"/>'
+        )
+        casti.append(
+            f'<text x="{max(x_nuly, x_konce) + 4:.1f}" y="{y + 14}">{formatuj_hodnotu(skore)}</text>'
+        )
+
+    spodni = horni_okraj + len(serazene) * VYSKA_RADKU
+    casti.append(
+        f'<line x1="{x_nuly:.1f}" y1="{horni_okraj}" x2="{x_nuly:.1f}" y2="{spodni}" stroke="#555"/>'
+    )
+    popisek = popis_hodnoty
+    if vynechano:
+        popisek += f" (zobrazeno prvních {MAX_VARIANT_GRAFU} variant, {vynechano} vynecháno)"
+    casti.append(
+        f'<text x="{SIRKA / 2}" y="{spodni + 25}" text-anchor="middle" fill="#555">{html.escape(popisek)}</text>'
+    )
+    casti.append("</svg>")
+    return "".join(casti)
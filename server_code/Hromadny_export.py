@@ -0,0 +1,209 @@
+# -------------------------------------------------------
+# Modul: Hromadny_export
+#
+# Export mnoha analýz do jednoho ZIP archivu (např. čtvrtletní
+# archivace všech analýz administrátorem).
+#
+# Analýzy se načítají, počítají a zapisují postupně po jedné. Každý
+# soubor analýzy (XLSX, JSON, CSV) se hned po vytvoření zapíše do ZIP
+# archivu v dočasném souboru na disku, takže paměť drží jen data
+# a výsledky jedné analýzy bez ohledu na jejich počet. Archiv obsahuje
+# i prehled.csv se stavem každé analýzy - analýza, kterou nelze
+# spočítat, export nezastaví, jen se v přehledu označí chybou.
+#
+# Pro velké počty analýz se export spouští jako úloha na pozadí
+# (Ulohy, typ 'zip').
+# -------------------------------------------------------
+import csv
+import datetime
+import io
+import json
+import logging
+import functools
+import os
+import tempfile
+import zipfile
+import anvil.server
+import anvil.media
+from . import CRUD_analyzy, Export
+
+# Podporované formáty souborů jedné analýzy
+FORMATY = ("xlsx", "json", "csv")
+
+# Nejvyšší počet analýz v jednom archivu
+MAX_POCET_ANALYZ = 10000
+
+def zapsat_info(zprava):
+    """Pomocná funkce pro serverové logování info zpráv"""
+    logging.info(f"[INFO] {zprava}")
+
+def zapsat_chybu(zprava):
+    """Pomocná funkce pro serverové logování chyb"""
+    logging.error(f"[CHYBA] {zprava}")
+
+def handle_errors(func):
+    """
+    Dekorátor pro jednotné zpracování chyb v serverových funkcích.
+    Zachytí výjimky, zaloguje je a přehodí klientovi.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            zprava = f"Chyba v {func.__name__}: {str(e)}"
+            zapsat_chybu(zprava)
+            raise ValueError(zprava) from e
+    return wrapper
+
+def _bezpecny_nazev(nazev):
+    """Upraví název analýzy pro použití v cestě souboru v archivu."""
+    nazev = "".join(znak if znak.isalnum() or znak in "-_." else "_" for znak in (nazev or "Analyza"))
+    return nazev.strip("._")[:80] or "Analyza"
+
+def _csv_vysledku(rozhodovaci_matice, vsechny_vysledky):
+    """
+    Sestaví CSV se srovnáním pořadí a skóre variant ve všech metodách.
+
+    Returns:
+        bytes: CSV v kódování UTF-8 s BOM (správně se otevře v Excelu)
+    """
+    metody = list(vsechny_vysledky)
+    vystup = io.StringIO()
+    zapisovac = csv.writer(vystup, delimiter=";")
+    zapisovac.writerow(["Varianta"] + [f"{m.upper()} {sloupec}" for m in metody for sloupec in ("pořadí", "skóre")])
+
+    podle_metody = {}
+    for metoda in metody:
+        vysledky_metody = vsechny_vysledky[metoda].get(f"{metoda}_vysledky", {})
+        podle_metody[metoda] = {var: (poradi, skore) for var, poradi, skore in vysledky_metody.get('results', [])}
+
+    for varianta in rozhodovaci_matice.varianty:
+        radek = [varianta]
+        for metoda in metody:
+            radek.extend(podle_metody[metoda].get(varianta, ("", "")))
+        zapisovac.writerow(radek)
+    return vystup.getvalue().encode("utf-8-sig")
+
+def _json_analyzy(analyza_data, vsechny_vysledky):
+    """
+    Sestaví JSON se vstupními daty analýzy a souhrnem výsledků metod.
+
+    Returns:
+        bytes: JSON v kódování UTF-8
+    """
+    obsah = {
+        'id': analyza_data.get('id'),
+        'nazev': analyza_data.get('nazev'),
+        'popis_analyzy': analyza_data.get('popis_analyzy', ""),
+        'kriteria': analyza_data.get('kriteria', {}),
+        'varianty': analyza_data.get('varianty', {}),
+        'vysledky': {
+            metoda: Export._kompaktni_vysledek(vysledek, metoda, mezivysledky=False)
+            for metoda, vysledek in vsechny_vysledky.items()
+        }
+    }
+    return json.dumps(obsah, ensure_ascii=False, indent=1, default=str).encode("utf-8")
+
+def _zapis_analyzu(archiv, adresar, analyza_data, rozhodovaci_matice, metody, formaty):
+    """
+    Spočítá jednu analýzu a zapíše její soubory do archivu.
+    """
+    # Bez 'id' se výsledky neukládají do cache - hromadný export by z ní
+    # vytlačil výsledky, se kterými uživatelé právě pracují
+    data_bez_id = {klic: hodnota for klic, hodnota in analyza_data.items() if klic != 'id'}
+    vsechny_vysledky = Export.vypocitej_vsechny_metody(
+        data_bez_id, metody, rozhodovaci_matice=rozhodovaci_matice
+    )['vysledky']
+
+    if "xlsx" in formaty:
+        vystup = io.BytesIO()
+        Export.zapis_excel_report(vystup, analyza_data, rozhodovaci_matice, vsechny_vysledky)
+        archiv.writestr(f"{adresar}/{adresar}.xlsx", vystup.getvalue())
+    if "json" in formaty:
+        archiv.writestr(f"{adresar}/{adresar}.json", _json_analyzy(analyza_data, vsechny_vysledky))
+    if "csv" in formaty:
+        archiv.writestr(f"{adresar}/{adresar}.csv", _csv_vysledku(rozhodovaci_matice, vsechny_vysledky))
+
+def sestav_zip_analyz(analyza_ids, metody=None, formaty=None, nahlas_postup=None):
+    """
+    Spočítá zadané analýzy a zapíše je do jednoho ZIP archivu.
+    Oprávnění k analýzám musí ověřit volající.
+
+    Args:
+        analyza_ids: List ID analýz
+        metody: List kódů metod, výchozí jsou všechny
+        formaty: List formátů ('xlsx', 'json', 'csv'), výchozí je xlsx
+        nahlas_postup: Funkce (podil, zprava) pro hlášení postupu (volitelné)
+
+    Returns:
+        Media: ZIP archiv
+
+    Raises:
+        ValueError: Pokud je seznam prázdný, příliš dlouhý nebo formát neznámý
+    """
+    nahlas_postup = nahlas_postup or Export._bez_hlaseni
+    formaty = [f.lower() for f in (formaty or ["xlsx"])]
+    for format_souboru in formaty:
+        if format_souboru not in FORMATY:
+            raise ValueError(f"Nepodporovaný formát exportu: {format_souboru}")
+    analyza_ids = list(dict.fromkeys(analyza_ids or []))
+    if not analyza_ids:
+        raise ValueError("Není vybrána žádná analýza k exportu.")
+    if len(analyza_ids) > MAX_POCET_ANALYZ:
+        raise ValueError(f"Najednou lze exportovat nejvýše {MAX_POCET_ANALYZ} analýz.")
+
+    docasny = tempfile.NamedTemporaryFile(suffix=".zip", delete=False)
+    docasny.close()
+    try:
+        prehled = io.StringIO()
+        zapisovac = csv.writer(prehled, delimiter=";")
+        zapisovac.writerow(["ID", "Název", "Složka", "Stav"])
+        pouzite_adresare = set()
+        pocet_chyb = 0
+
+        with zipfile.ZipFile(docasny.name, "w", zipfile.ZIP_DEFLATED) as archiv:
+            for poradi, analyza_id in enumerate(analyza_ids):
+                nahlas_postup(poradi / len(analyza_ids), f"Analýza {poradi + 1} z {len(analyza_ids)}")
+                nazev, adresar = "", ""
+                try:
+                    analyza_data, rozhodovaci_matice = CRUD_analyzy.nacti_analyzu_pro_vypocet(analyza_id)
+                    nazev = analyza_data.get("nazev", "")
+                    adresar = _bezpecny_nazev(nazev)
+                    if adresar in pouzite_adresare:
+                        adresar = _bezpecny_nazev(f"{adresar}_{analyza_id}")
+                    pouzite_adresare.add(adresar)
+                    _zapis_analyzu(archiv, adresar, analyza_data, rozhodovaci_matice, metody, formaty)
+                    zapisovac.writerow([analyza_id, nazev, adresar, "OK"])
+                except Exception as e:
+                    pocet_chyb += 1
+                    zapsat_chybu(f"Hromadný export: analýzu {analyza_id} nelze exportovat: {str(e)}")
+                    zapisovac.writerow([analyza_id, nazev, "", f"Chyba: {str(e)}"])
+
+            archiv.writestr("prehled.csv", prehled.getvalue().encode("utf-8-sig"))
+
+        zapsat_info(f"Hromadný export: {len(analyza_ids) - pocet_chyb} analýz, {pocet_chyb} chyb")
+        nahlas_postup(1.0, "Archiv je připraven")
+        datum = datetime.date.today().isoformat()
+        return anvil.media.from_file(docasny.name, "application/zip", f"analyzy_{datum}.zip")
+    finally:
+        os.remove(docasny.name)
+
+@anvil.server.callable
+@handle_errors
+def vytvor_hromadny_export(analyza_ids, metody=None, formaty=None):
+    """
+    Exportuje zadané analýzy do jednoho ZIP archivu v jednom volání.
+    Pro stovky a tisíce analýz je vhodnější úloha na pozadí
+    (Ulohy.zadej_ulohu typu 'zip' se stejnými parametry).
+
+    Args:
+        analyza_ids: List ID analýz
+        metody: List kódů metod, výchozí jsou všechny
+        formaty: List formátů ('xlsx', 'json', 'csv'), výchozí je xlsx
+
+    Returns:
+        Media: ZIP archiv
+    """
+    CRUD_analyzy.over_pristup_k_analyzam(analyza_ids)
+    return sestav_zip_analyz(analyza_ids, metody, formaty)
@@ -0,0 +1,210 @@
+# -------------------------------------------------------
+# Modul: Monte_carlo_numpy
+#
+# Stochastická analýza nejistoty vah kritérií (Monte Carlo).
+#
+# Vylosuje se N vektorů vah - z Dirichletova rozdělení kolem
+# současných vah, nebo rovnoměrně v pásmech +- kolem nich - a pro
+# každý vzorek se ohodnotí všechny varianty všemi metodami. Vzorky se
+# zpracovávají po dávkách, skóre celé dávky je jeden maticový součin
+# [vzorky x kriteria] @ [kriteria x varianty]:
+#
+#   WSM:    skóre = W @ R^T, R je min-max normalizovaná matice
+#   WPM:    log skóre = W @ log(X')^T, X' jsou upravené hodnoty WPM
+#   MABAC:  skóre = W @ (R + 1 - G)^T, G jsou geometrické průměry sloupců R + 1
+#   TOPSIS: pro nezáporné váhy je vážené ideální řešení w_j * ideal_j,
+#           takže čtverce vzdáleností jsou W^2 @ (N - ideal)^2^T
+#
+# Výsledkem jsou indexy akceptovatelnosti pořadí (podíl vzorků, ve
+# kterých varianta obsadila dané pořadí) a pravděpodobnost, že je
+# varianta nejlepší. ELECTRE skóre nemá (jen relaci převahy), proto
+# se v této analýze nepočítá.
+# -------------------------------------------------------
+import numpy as np
+
+from . import Vypocty_numpy
+
+# Podporované metody a výchozí výběr
+PODPOROVANE_METODY = ("wsm", "wpm", "topsis", "mabac")
+
+# Nejvyšší povolený počet vzorků v jednom výpočtu
+MAX_POCET_VZORKU = 1000000
+
+# Horní mez počtu prvků matice skóre jedné dávky [vzorky x varianty]
+MAX_PRVKU_DAVKY = 2000000
+
+def vzorkuj_vahy(vahy, pocet_vzorku, rezim="dirichlet", koncentrace=100.0, pasma=None, generator=None):
+    """
+    Vylosuje vektory vah se součtem 1.
+
+    Args:
+        vahy: Pole současných vah kritérií
+        pocet_vzorku: Počet vylosovaných vektorů
+        rezim: "dirichlet" (rozdělení se středem v současných vahách)
+               nebo "pasma" (rovnoměrně v intervalech vaha +- pásmo)
+        koncentrace: Parametr Dirichletova rozdělení - čím vyšší, tím
+                     menší rozptyl kolem současných vah
+        pasma: Šířka pásma (číslo nebo list pro každé kritérium), jen pro režim "pasma"
+        generator: numpy.random.Generator (volitelné)
+
+    Returns:
+        Pole float64 [pocet_vzorku x kriteria]
+
+    Raises:
+        ValueError: Pokud režim není podporován nebo chybí pásma
+    """
+    generator = generator or np.random.default_rng()
+
+    if rezim == "dirichlet":
+        if koncentrace <= 0:
+            raise ValueError("Koncentrace musí být kladná")
+        # Kritéria s nulovou vahou zůstávají nulová
+        kladne = vahy > 0
+        vzorky = np.zeros((pocet_vzorku, len(vahy)), dtype=np.float64)
+        vzorky[:, kladne] = generator.dirichlet(koncentrace * vahy[kladne], size=pocet_vzorku)
+        return vzorky
+
+    if rezim == "pasma":
+        if pasma is None:
+            raise ValueError("Pro režim 'pasma' je nutné zadat šířku pásem")
+        pasma = np.broadcast_to(np.asarray(pasma, dtype=np.float64), vahy.shape)
+        dolni = np.clip(vahy - pasma, 0.0, None)
+        horni = vahy + pasma
+        vzorky = generator.uniform(dolni, horni, size=(pocet_vzorku, len(vahy)))
+        soucty = vzorky.sum(axis=1, keepdims=True)
+        return vzorky / np.where(soucty > 0, soucty, 1.0)
+
+    raise ValueError(f"Nepodporovaný režim vzorkování vah: {rezim}")
+
+def priprav_skorovani(matice, typy_kriterii, metoda):
+    """
+    Připraví matice, ze kterých se skóre dávky vah spočítá maticovým součinem.
+
+    Returns:
+        tuple: Data pro skoruj_davku
+    """
+    if metoda == "wsm":
+        return (Vypocty_numpy.normalizuj_matici_minmax(matice, typy_kriterii).T,)
+    if metoda == "wpm":
+        return (np.log(Vypocty_numpy._wpm_zaklad(matice, typy_kriterii)).T,)
+    if metoda == "mabac":
+        posunuta = Vypocty_numpy.normalizuj_matici_minmax(matice, typy_kriterii) + 1
+        hranice = np.exp(np.log(posunuta).mean(axis=0))
+        return ((posunuta - hranice).T,)
+    if metoda == "topsis":
+        norm_matice = Vypocty_numpy.normalizuj_vektorove(matice)
+        je_max = Vypocty_numpy._maska_max(typy_kriterii)
+        sloupce_max = norm_matice.max(axis=0)
+        sloupce_min = norm_matice.min(axis=0)
+        ideal = np.where(je_max, sloupce_max, sloupce_min)
+        anti_ideal = np.where(je_max, sloupce_min, sloupce_max)
+        return (((norm_matice - ideal) ** 2).T, ((norm_matice - anti_ideal) ** 2).T)
+    raise ValueError(f"Nepodporovaná metoda analýzy: {metoda}")
+
+def skoruj_davku(metoda, priprava, davka_vah):
+    """
+    Ohodnotí všechny varianty pro celou dávku vektorů vah.
+
+    Args:
+        metoda: Kód metody
+        priprava: Výstup priprav_skorovani
+        davka_vah: Pole [vzorky x kriteria]
+
+    Returns:
+        Pole float64 [vzorky x varianty]; u WPM logaritmus skóre,
+        který dává stejné pořadí
+    """
+    if metoda == "topsis":
+        k_idealu, k_anti_idealu = priprava
+        ctverce_vah = davka_vah ** 2
+        dist_ideal = np.sqrt(ctverce_vah @ k_idealu)
+        dist_anti_ideal = np.sqrt(ctverce_vah @ k_anti_idealu)
+        jmenovatel = dist_ideal + dist_anti_ideal
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(jmenovatel == 0, 0.0, dist_anti_ideal / jmenovatel)
+    return davka_vah @ priprava[0]
+
+def _pricti_poradi(pocty, skore):
+    """
+    Přičte k matici četností [varianty x pořadí] pořadí variant z jedné dávky.
+    Používá se nestabilní (výrazně rychlejší) řazení, pořadí přesně shodných
+    skóre proto není určeno indexem varianty.
+    """
+    pocet_variant = skore.shape[1]
+    serazene = np.argsort(-skore, axis=1)
+    # serazene[s, k] je varianta na pořadí k ve vzorku s
+    indexy = serazene * pocet_variant + np.arange(pocet_variant)[None, :]
+    pocty += np.bincount(indexy.ravel(), minlength=pocet_variant * pocet_variant).reshape(
+        pocet_variant, pocet_variant
+    )
+
+def vypocitej_monte_carlo(matice, typy_kriterii, varianty, kriteria, vahy, metody=None,
+                          pocet_vzorku=10000, rezim="dirichlet", koncentrace=100.0,
+                          pasma=None, seed=None, nahlas_postup=None):
+    """
+    Provede Monte Carlo analýzu nejistoty vah pro zvolené metody.
+    Všechny metody se hodnotí nad stejnými vylosovanými vahami.
+
+    Args:
+        matice, typy_kriterii, varianty, kriteria, vahy: Výstup Vypocty_numpy.priprav_pole
+        metody: List kódů metod ('wsm', 'wpm', 'topsis', 'mabac'), výchozí jsou všechny
+        pocet_vzorku: Počet vylosovaných vektorů vah
+        rezim, koncentrace, pasma: Parametry vzorkování (viz vzorkuj_vahy)
+        seed: Semínko generátoru pro reprodukovatelné výsledky (volitelné)
+        nahlas_postup: Funkce (podil, zprava) volaná po každé dávce (volitelné)
+
+    Returns:
+        dict: Parametry analýzy a pro každou metodu 'akceptovatelnost_poradi'
+              ([varianty x pořadí], podíly vzorků), 'pravdepodobnost_nejlepsi'
+              a 'prumerne_poradi'
+
+    Raises:
+        ValueError: Pokud jsou parametry neplatné
+    """
+    metody = [m.lower() for m in (metody or PODPOROVANE_METODY)]
+    for metoda in metody:
+        if metoda not in PODPOROVANE_METODY:
+            raise ValueError(f"Metoda {metoda.upper()} není v analýze Monte Carlo podporována")
+    if not 0 < pocet_vzorku <= MAX_POCET_VZORKU:
+        raise ValueError(f"Počet vzorků musí být mezi 1 a {MAX_POCET_VZORKU}")
+    if (vahy < 0).any():
+        raise ValueError("Váhy kritérií musí být nezáporné")
+
+    generator = np.random.default_rng(seed)
+    pocet_variant = len(varianty)
+    velikost_davky = max(1, MAX_PRVKU_DAVKY // max(pocet_variant, 1))
+
+    priprava = {metoda: priprav_skorovani(matice, typy_kriterii, metoda) for metoda in metody}
+    pocty = {metoda: np.zeros((pocet_variant, pocet_variant), dtype=np.int64) for metoda in metody}
+
+    zbyva = pocet_vzorku
+    while zbyva > 0:
+        velikost = min(velikost_davky, zbyva)
+        davka_vah = vzorkuj_vahy(vahy, velikost, rezim, koncentrace, pasma, generator)
+        for metoda in metody:
+            _pricti_poradi(pocty[metoda], skoruj_davku(metoda, priprava[metoda], davka_vah))
+        zbyva -= velikost
+        if nahlas_postup:
+            hotovo = pocet_vzorku - zbyva
+            nahlas_postup(hotovo / pocet_vzorku, f"Zpracováno {hotovo} z {pocet_vzorku} vzorků")
+
+    vysledky = {}
+    pozice = np.arange(1, pocet_variant + 1)
+    for metoda in metody:
+        akceptovatelnost = pocty[metoda] / pocet_vzorku
+        vysledky[metoda] = {
+            'akceptovatelnost_poradi': akceptovatelnost.tolist(),
+            'pravdepodobnost_nejlepsi': dict(zip(varianty, akceptovatelnost[:, 0].tolist())),
+            'prumerne_poradi': dict(zip(varianty, (akceptovatelnost @ pozice).tolist())),
+        }
+
+    return {
+        'varianty': varianty,
+        'kriteria': kriteria,
+        'vahy': vahy.tolist(),
+        'pocet_vzorku': pocet_vzorku,
+        'rezim': rezim,
+        'koncentrace': koncentrace if rezim == "dirichlet" else None,
+        'pasma': np.broadcast_to(np.asarray(pasma, dtype=np.float64), vahy.shape).tolist() if rezim == "pasma" else None,
+        'vysledky': vysledky
+    }
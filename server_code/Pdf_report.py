@@ -0,0 +1,199 @@
+# -------------------------------------------------------
+# Modul: Pdf_report
+#
+# Serverový PDF report výsledků analýzy (HTML -> PDF).
+#
+# HTML se skládá přímo na serveru ze stejných šablon jako výstupní
+# formuláře (Generator_html, styly mcapp_styly) a grafy se vloží jako
+# statické SVG (Grafy_svg). Výsledky se nepočítají znovu v prohlížeči
+# a nekreslí se žádné Plotly grafy. Do jednoho PDF lze dát více metod,
+# každá začíná na nové stránce.
+#
+# Převod HTML na PDF:
+# - je-li na serveru WeasyPrint, PDF vznikne přímo z HTML bez prohlížeče,
+# - jinak se HTML vykreslí přes anvil.pdf odlehčeným formulářem
+#   Tisk_html_komp, který jen zobrazí hotové HTML.
+# -------------------------------------------------------
+import html
+import anvil
+import anvil.pdf
+from . import Generator_html, Grafy_svg, mcapp_styly
+
+# WeasyPrint při chybějících systémových knihovnách (Pango) hlásí OSError
+try:
+    import weasyprint
+except (ImportError, OSError):
+    weasyprint = None
+
+# Do tohoto počtu variant obsahuje report i postup výpočtu (tabulky
+# mezivýsledků); u větších analýz jen výsledky, jinak by report měl
+# stovky stran a u ELECTRE by chyběly husté matice
+MAX_VARIANT_PODROBNEHO_REPORTU = 200
+
+# Popisky os grafů podle metody
+_POPIS_SKORE = {
+    'wsm': "Skóre WSM",
+    'wpm': "Skóre WPM (součin)",
+    'topsis': "Relativní blízkost k ideálu",
+    'electre': "Net Flow",
+    'mabac': "Vzdálenost od hraniční oblasti",
+}
+
+# Styly pouze pro serverový report (stránkování, grafy)
+_CSS_REPORTU = """
+    @page { size: A4; margin: 15mm 12mm; }
+    .mcapp-report-metoda { page-break-before: always; break-before: page; }
+    .mcapp-report-metoda:first-child { page-break-before: auto; break-before: auto; }
+    .mcapp-graf { margin: 16px 0; page-break-inside: avoid; break-inside: avoid; }
+    .mcapp-graf svg { max-width: 100%; height: auto; }
+    .toggle-checkbox, .toggle-hint { display: none; }
+    .details-content { display: block !important; }
+"""
+
+def _texty_uzivatele(analyza_data):
+    """
+    Vrátí texty zadané uživatelem (název a popis analýzy, názvy kritérií,
+    názvy a popisy variant), které obsahují znaky se zvláštním významem v HTML.
+    """
+    texty = [analyza_data.get('nazev'), analyza_data.get('popis_analyzy')]
+    texty.extend(analyza_data.get('kriteria', {}))
+    for var_nazev, var_data in analyza_data.get('varianty', {}).items():
+        texty.append(var_nazev)
+        if isinstance(var_data, dict):
+            texty.append(var_data.get('popis_varianty'))
+    return {text for text in texty if isinstance(text, str) and html.escape(text) != text}
+
+def _escapuj_texty(hodnota, texty):
+    """Vrátí kopii struktury, ve které jsou řetězce z množiny texty escapované pro HTML."""
+    if isinstance(hodnota, str):
+        return html.escape(hodnota) if hodnota in texty else hodnota
+    if isinstance(hodnota, dict):
+        return {_escapuj_texty(k, texty): _escapuj_texty(v, texty) for k, v in hodnota.items()}
+    if isinstance(hodnota, (list, tuple)):
+        return type(hodnota)(_escapuj_texty(v, texty) for v in hodnota)
+    return hodnota
+
+def _data_pro_sablony(analyza_data, vysledek):
+    """
+    Připraví data analýzy a výsledek metody pro šablony Generator_html,
+    které vkládají názvy do HTML bez escapování. Názvy se nahradí všude
+    stejně, takže vyhledávání variant podle názvu v šablonách funguje dál.
+
+    Returns:
+        tuple: (analyza_data, vysledek), beze změny pokud žádný text
+               neobsahuje zvláštní znaky HTML
+    """
+    texty = _texty_uzivatele(analyza_data)
+    if not texty:
+        return analyza_data, vysledek
+    return _escapuj_texty(analyza_data, texty), _escapuj_texty(vysledek, texty)
+
+def _html_poradi(vysledky_metody):
+    """
+    Vytvoří stručnou tabulku pořadí variant (pro velké analýzy).
+    """
+    radky = "".join(
+        f"<tr><td>{poradi}.</td><td>{html.escape(str(varianta))}</td><td style='text-align: right;'>{Grafy_svg.formatuj_hodnotu(skore)}</td></tr>"
+        for varianta, poradi, skore in sorted(vysledky_metody['results'], key=lambda x: x[1])
+    )
+    return f"""
+    <div class="mcapp-section mcapp-results">
+        <h2>Výsledky analýzy</h2>
+        <div class="mcapp-card">
+            <p>Nejlepší varianta: <strong>{html.escape(str(vysledky_metody['nejlepsi_varianta']))}</strong>,
+               nejhorší varianta: <strong>{html.escape(str(vysledky_metody['nejhorsi_varianta']))}</strong></p>
+            <div class="mcapp-table-container">
+                <table class="mcapp-table mcapp-results-table">
+                    <thead><tr><th>Pořadí</th><th>Varianta</th><th>Skóre</th></tr></thead>
+                    <tbody>{radky}</tbody>
+                </table>
+            </div>
+        </div>
+    </div>
+    """
+
+def vytvor_html_metody(analyza_data, vysledek, metoda):
+    """
+    Vytvoří HTML část reportu pro jednu metodu včetně SVG grafu.
+
+    Args:
+        analyza_data: Data analýzy
+        vysledek: Strukturovaný výsledek metody (Vypocty.vypocitej_analyzu)
+        metoda: Kód metody
+
+    Returns:
+        str: HTML část reportu
+    """
+    vysledky_metody = vysledek[f"{metoda}_vysledky"]
+    if len(vysledky_metody['results']) <= MAX_VARIANT_PODROBNEHO_REPORTU:
+        obsah = Generator_html.vytvor_kompletni_html_analyzy(
+            *_data_pro_sablony(analyza_data, vysledek), metoda.upper()
+        )
+    else:
+        obsah = f"""
+        <div class="mcapp-wsm-results">
+            {Generator_html.vytvor_hlavicku_analyzy(html.escape(str(analyza_data['nazev'])), metoda.upper())}
+            {_html_poradi(vysledky_metody)}
+        </div>
+        """
+    graf = Grafy_svg.vytvor_sloupcovy_graf_svg(
+        vysledky_metody['results'],
+        f"Výsledky metody {metoda.upper()}",
+        _POPIS_SKORE.get(metoda, "Skóre")
+    )
+    return f"""
+    <div class="mcapp-report-metoda">
+        {obsah}
+        <div class="mcapp-graf">{graf}</div>
+    </div>
+    """
+
+def vytvor_html_reportu(analyza_data, vsechny_vysledky, metody):
+    """
+    Sestaví celý HTML dokument reportu pro zvolené metody.
+
+    Args:
+        analyza_data: Data analýzy
+        vsechny_vysledky: Výsledky podle kódu metody
+        metody: List kódů metod v pořadí, v jakém se mají v reportu objevit
+
+    Returns:
+        str: Kompletní HTML dokument
+    """
+    casti = "".join(vytvor_html_metody(analyza_data, vsechny_vysledky[metoda], metoda) for metoda in metody)
+    return f"""<!DOCTYPE html>
+<html lang="cs">
+<head>
+<meta charset="utf-8">
+<title>{html.escape(str(analyza_data.get('nazev') or 'Analýza'))}</title>
+<style>
+{mcapp_styly.ziskej_css_styly()}
+{_CSS_REPORTU}
+</style>
+</head>
+<body>
+{casti}
+</body>
+</html>"""
+
+def html_na_pdf(html_dokument, nazev_souboru):
+    """
+    Převede HTML dokument na PDF.
+
+    Args:
+        html_dokument: Kompletní HTML dokument
+        nazev_souboru: Název výsledného souboru
+
+    Returns:
+        Media: PDF dokument
+    """
+    if weasyprint is not None:
+        obsah = weasyprint.HTML(string=html_dokument).write_pdf()
+        return anvil.BlobMedia("application/pdf", obsah, name=nazev_souboru)
+
+    pdf_renderer = anvil.pdf.PDFRenderer(
+        filename=nazev_souboru,
+        page_size="A4",
+        landscape=False,
+    )
+    return pdf_renderer.render_form("Tisk_html_komp", html_dokument)
@@ -17,7 +17,7 @@ import anvil.users
 import anvil.tables as tables
 import anvil.tables.query as q
 from anvil.tables import app_tables
-from . import CRUD_analyzy
+from . import CRUD_analyzy, Cache_vysledku
 
 # ============= Konfigurace / konstanty =============
 
@@ -207,6 +207,77 @@ def nacti_vsechny_uzivatele():
         zapsat_chybu(f"Chyba při načítání uživatelů: {str(e)}")
         raise ValueError(f"Chyba při načítání uživatelů: {str(e)}")
         
+# Největší počet uživatelů na jedné stránce přehledu administrace
+MAX_VELIKOST_STRANKY_UZIVATELU = 500
+
+@anvil.server.callable
+@handle_errors
+def nacti_prehled_uzivatelu(offset: int = 0, limit: int = 100) -> Dict:
+    """
+    Načte stránku přehledu uživatelů pro administraci včetně souhrnu
+    jejich analýz (počet, poslední aktivita, velikost dat).
+    Analýzy všech uživatelů na stránce se projdou jedním dotazem
+    a jen přes denormalizované sloupce, bez načítání data_json.
+    Pouze pro administrátory.
+    
+    Args:
+        offset: Počet uživatelů přeskočených od začátku přehledu
+        limit: Počet uživatelů na stránce (nejvýše MAX_VELIKOST_STRANKY_UZIVATELU)
+        
+    Returns:
+        Dict: uzivatele (list slovníků), celkem (počet všech uživatelů)
+              a dalsi_offset (None, pokud další stránka není)
+    """
+    over_admin_prava()
+    
+    offset = max(0, int(offset or 0))
+    limit = min(max(1, int(limit or 1)), MAX_VELIKOST_STRANKY_UZIVATELU)
+    
+    vsichni = app_tables.users.search(
+        q.fetch_only("email", "signed_up", "last_login", "role"),
+        tables.order_by("email")
+    )
+    celkem = len(vsichni)
+    uzivatele = list(vsichni[offset:offset + limit])
+    
+    # Souhrn analýz uživatelů na stránce v jednom průchodu
+    souhrn = {u.get_id(): {"pocet": 0, "aktivita": None, "velikost": 0} for u in uzivatele}
+    if uzivatele:
+        analyzy = app_tables.analyzy.search(
+            q.fetch_only("datum_vytvoreni", "datum_upravy", "velikost_dat", uzivatel=q.fetch_only("email")),
+            uzivatel=q.any_of(*uzivatele)
+        )
+        for analyza in analyzy:
+            CRUD_analyzy.dopln_souhrn_analyzy(analyza)
+            polozka = souhrn[analyza["uzivatel"].get_id()]
+            polozka["pocet"] += 1
+            polozka["velikost"] += analyza["velikost_dat"] or 0
+            datum = analyza["datum_upravy"] or analyza["datum_vytvoreni"]
+            if datum and (polozka["aktivita"] is None or datum > polozka["aktivita"]):
+                polozka["aktivita"] = datum
+    
+    vysledek = []
+    for u in uzivatele:
+        polozka = souhrn[u.get_id()]
+        vysledek.append({
+            "id": u.get_id(),
+            "email": u["email"],
+            "signed_up": u["signed_up"],
+            "last_login": u["last_login"],
+            "role": u["role"],
+            "pocet_analyz": polozka["pocet"],
+            "posledni_aktivita": polozka["aktivita"],
+            "velikost_dat": polozka["velikost"],
+        })
+    
+    dalsi_offset = offset + len(vysledek)
+    zapsat_info(f"Načten přehled {len(vysledek)} z {celkem} uživatelů")
+    return {
+        "uzivatele": vysledek,
+        "celkem": celkem,
+        "dalsi_offset": dalsi_offset if dalsi_offset < celkem else None
+    }
+
 @anvil.server.callable
 @handle_errors
 def vrat_pocet_analyz_pro_uzivatele(uzivatel):
@@ -220,8 +291,8 @@ def vrat_pocet_analyz_pro_uzivatele(uzivatel):
         int: Počet analýz
     """
     try:
-        # Počet analýz podle uživatele
-        pocet = len(list(app_tables.analyzy.search(uzivatel=uzivatel)))
+        # Počet analýz podle uživatele (bez načítání řádků)
+        pocet = len(app_tables.analyzy.search(uzivatel=uzivatel))
         return pocet
     except Exception as e:
         zapsat_chybu(f"Chyba při zjišťování počtu analýz: {str(e)}")
@@ -259,48 +330,159 @@ def nacti_analyzy_uzivatele_admin(email):
         zapsat_chybu(f"Chyba při načítání analýz uživatele: {str(e)}")
         raise ValueError(f"Chyba při načítání analýz uživatele: {str(e)}")
         
-@anvil.server.callable
-@handle_errors
-def smaz_uzivatele(email):
+# Počet řádků smazaných v jedné transakci při mazání uživatelů
+VELIKOST_DAVKY_MAZANI = 200
+
+def _nacti_uzivatele_ke_smazani(emaily):
     """
-    Smaže uživatele a všechny jeho analýzy.
+    Ověří oprávnění a načte uživatele ke smazání.
     
     Args:
-        email: Email uživatele ke smazání
-    
+        emaily: List emailů uživatelů
+        
     Returns:
-        bool: True pokud byl uživatel úspěšně smazán
+        list: Řádky uživatelů
+        
+    Raises:
+        ValueError: Pokud volající není administrátor, seznam obsahuje
+                    jeho vlastní účet nebo některý uživatel neexistuje
     """
-    zapsat_info(f"Mažu uživatele: {email}")
+    over_admin_prava()
+    emaily = list(dict.fromkeys(emaily or []))
+    if not emaily:
+        raise ValueError("Není vybrán žádný uživatel ke smazání.")
     
-    uzivatel = app_tables.users.get(email=email)
-
-    # Kontrola, zda nejde o aktuálně přihlášeného uživatele
     aktualni_uzivatel = anvil.users.get_user()
-    if aktualni_uzivatel and aktualni_uzivatel['email'] == email:
+    if aktualni_uzivatel['email'] in emaily:
         raise ValueError("Nelze smazat vlastní účet, se kterým jste aktuálně přihlášeni.")
     
-    if not uzivatel:
-        raise ValueError(f"Uživatel {email} nebyl nalezen")
+    uzivatele = list(app_tables.users.search(q.fetch_only("email"), email=q.any_of(*emaily)))
+    nalezene = {u['email'] for u in uzivatele}
+    chybejici = [email for email in emaily if email not in nalezene]
+    if chybejici:
+        raise ValueError(f"Uživatelé nebyli nalezeni: {', '.join(chybejici)}")
+    return uzivatele
+
+def _smaz_po_davkach(tabulka, uzivatel, nahlas_smazani, zneplatnit_cache=False, smazat_uzivatele=False):
+    """
+    Smaže všechny řádky uživatele v tabulce po dávkách VELIKOST_DAVKY_MAZANI,
+    každou dávku v jedné transakci.
+    
+    Args:
+        tabulka: Tabulka s odkazem 'uzivatel' (analyzy, ulohy)
+        uzivatel: Řádek uživatele
+        nahlas_smazani: Funkce (pocet) volaná po každé dávce
+        zneplatnit_cache: Po každé dávce zneplatnit cache výsledků
+                          smazaných analýz (jedním dotazem na dávku)
+        smazat_uzivatele: Smazat řádek uživatele v transakci poslední dávky
+        
+    Returns:
+        list: ID smazaných řádků
+    """
+    smazane_ids = []
+    while True:
+        with tables.Transaction():
+            # Ke smazání stačí ID řádků, data se nenačítají
+            davka = list(tabulka.search(q.fetch_only("datum_vytvoreni"), uzivatel=uzivatel)[:VELIKOST_DAVKY_MAZANI])
+            ids_davky = [radek.get_id() for radek in davka]
+            for radek in davka:
+                radek.delete()
+            posledni = len(davka) < VELIKOST_DAVKY_MAZANI
+            if posledni and smazat_uzivatele:
+                uzivatel.delete()
+        smazane_ids.extend(ids_davky)
+        if zneplatnit_cache and ids_davky:
+            Cache_vysledku.zneplatni_analyzy(ids_davky)
+        if davka:
+            nahlas_smazani(len(davka))
+        if posledni:
+            return smazane_ids
+
+def proved_smazani_uzivatelu(emaily, jen_pocet=False, nahlas_postup=None):
+    """
+    Smaže uživatele včetně jejich analýz a úloh na pozadí, nebo jen
+    spočítá, kolik řádků by se smazalo.
+    
+    Analýzy a úlohy se mažou po dávkách v transakcích, samotný uživatel
+    až v transakci poslední dávky úloh. Přeruší-li se mazání, zůstane
+    uživatel zachován a nové spuštění smaže zbytek.
+    
+    Args:
+        emaily: List emailů uživatelů
+        jen_pocet: Pouze spočítat řádky ke smazání (nic nemaže)
+        nahlas_postup: Funkce (podil, zprava) pro hlášení postupu (volitelné)
         
-    # Nejprve získáme všechny analýzy uživatele
-    analyzy = app_tables.analyzy.search(uzivatel=uzivatel)
-    pocet_analyz = 0
+    Returns:
+        Dict: Počty uživatelů, analýz a úloh (smazaných, nebo ke smazání)
+    """
+    nahlas_postup = nahlas_postup or (lambda podil, zprava: None)
+    uzivatele = _nacti_uzivatele_ke_smazani(emaily)
     
-    # Použijeme existující, otestovanou funkci pro mazání jednotlivých analýz
-    for analyza in analyzy:
-        analyza_id = analyza.get_id()
-        try:
-            CRUD_analyzy.smaz_analyzu(analyza_id)
-            pocet_analyz += 1
-        except Exception as e:
-            zapsat_chybu(f"Chyba při mazání analýzy {analyza_id}: {str(e)}")
-            # Pokračujeme s dalšími analýzami
+    pocty = {
+        "uzivatele": len(uzivatele),
+        "analyzy": len(app_tables.analyzy.search(uzivatel=q.any_of(*uzivatele))),
+        "ulohy": len(app_tables.ulohy.search(uzivatel=q.any_of(*uzivatele))),
+    }
+    if jen_pocet:
+        return pocty
+    
+    celkem = sum(pocty.values()) or 1
+    smazano = {"uzivatele": 0, "analyzy": 0, "ulohy": 0}
+    
+    def nahlas(klic):
+        def nahlas_smazani(pocet):
+            smazano[klic] += pocet
+            nahlas_postup(
+                min(sum(smazano.values()) / celkem, 1.0),
+                f"Smazáno {smazano['uzivatele']} z {pocty['uzivatele']} uživatelů, "
+                f"{smazano['analyzy']} z {pocty['analyzy']} analýz"
+            )
+        return nahlas_smazani
+    
+    for uzivatel in uzivatele:
+        email = uzivatel['email']
+        analyza_ids = _smaz_po_davkach(app_tables.analyzy, uzivatel, nahlas("analyzy"), zneplatnit_cache=True)
+        # Úlohy na pozadí včetně uložených souborů, uživatel se smaže
+        # v transakci jejich poslední dávky
+        _smaz_po_davkach(app_tables.ulohy, uzivatel, nahlas("ulohy"), smazat_uzivatele=True)
+        nahlas("uzivatele")(1)
+        zapsat_info(f"Uživatel {email} a {len(analyza_ids)} analýz úspěšně smazáno")
+    
+    return smazano
+
+@anvil.server.callable
+@handle_errors
+def smaz_uzivatele_hromadne(emaily, jen_pocet=False):
+    """
+    Smaže více uživatelů včetně jejich analýz v jednom volání.
+    Pouze pro administrátory. Pro uživatele s tisíci analýz je vhodnější
+    úloha na pozadí (Ulohy.zadej_ulohu typu 'smazani_uzivatelu').
     
-    # Nakonec smažeme samotného uživatele
-    uzivatel.delete()
-    zapsat_info(f"Uživatel {email} a {pocet_analyz} analýz úspěšně smazáno")
+    Args:
+        emaily: List emailů uživatelů ke smazání
+        jen_pocet: Pouze vrátit počty řádků ke smazání (zkušební běh)
+        
+    Returns:
+        Dict: Počty uživatelů, analýz a úloh (smazaných, nebo ke smazání)
+    """
+    zapsat_info(f"Hromadné mazání {len(emaily or [])} uživatelů" + (" (zkušební běh)" if jen_pocet else ""))
+    return proved_smazani_uzivatelu(emaily, jen_pocet)
+
+@anvil.server.callable
+@handle_errors
+def smaz_uzivatele(email):
+    """
+    Smaže uživatele, všechny jeho analýzy a úlohy na pozadí.
+    Pouze pro administrátory.
+    
+    Args:
+        email: Email uživatele ke smazání
     
+    Returns:
+        bool: True pokud byl uživatel úspěšně smazán
+    """
+    zapsat_info(f"Mažu uživatele: {email}")
+    proved_smazani_uzivatelu([email])
     return True
         
 @anvil.server.callable
@@ -375,11 +557,72 @@ def zmen_heslo_uzivatele(email):
 
 # =============== Správa analýz uživatelů ===============
 
+# Největší počet analýz na jedné stránce výpisu
+MAX_VELIKOST_STRANKY = 100
+
+# Povolená pole pro řazení výpisu analýz
+POLE_RAZENI = ("datum_vytvoreni", "datum_upravy", "nazev")
+
+def _hledej_analyzy_uzivatele(uzivatel, sort_by):
+    """
+    Vyhledá analýzy uživatele bez načtení sloupce data_json.
+    
+    Args:
+        uzivatel: Řádek uživatele
+        sort_by: Pole pro řazení (viz POLE_RAZENI), jinak bez řazení
+        
+    Returns:
+        SearchIterator: Líně načítané řádky s metadaty analýz
+    """
+    sloupce = q.fetch_only(*CRUD_analyzy.SLOUPCE_VYPISU)
+    if sort_by in POLE_RAZENI:
+        return app_tables.analyzy.search(
+            sloupce,
+            tables.order_by(sort_by, ascending=(sort_by == "nazev")),
+            uzivatel=uzivatel
+        )
+    return app_tables.analyzy.search(sloupce, uzivatel=uzivatel)
+
+@anvil.server.callable
+@handle_errors
+def nacti_stranku_analyz(offset: int = 0, limit: int = 20, sort_by: str = "datum_vytvoreni") -> Dict:
+    """
+    Načte jednu stránku výpisu analýz přihlášeného uživatele.
+    Vrací jen metadata z denormalizovaných sloupců, data_json se nenačítá.
+    
+    Args:
+        offset: Počet analýz přeskočených od začátku výpisu
+        limit: Počet analýz na stránce (nejvýše MAX_VELIKOST_STRANKY)
+        sort_by: Pole pro řazení ("datum_vytvoreni", "datum_upravy" nebo "nazev")
+        
+    Returns:
+        Dict: analyzy (list metadat), celkem (počet všech analýz uživatele)
+              a dalsi_offset (None, pokud další stránka není)
+    """
+    uzivatel = anvil.users.get_user()
+    if not uzivatel:
+        return {"analyzy": [], "celkem": 0, "dalsi_offset": None}
+        
+    offset = max(0, int(offset or 0))
+    limit = min(max(1, int(limit or 1)), MAX_VELIKOST_STRANKY)
+    
+    vysledky = _hledej_analyzy_uzivatele(uzivatel, sort_by)
+    celkem = len(vysledky)
+    analyzy = [CRUD_analyzy.metadata_analyzy(a) for a in vysledky[offset:offset + limit]]
+    dalsi_offset = offset + len(analyzy)
+    
+    return {
+        "analyzy": analyzy,
+        "celkem": celkem,
+        "dalsi_offset": dalsi_offset if dalsi_offset < celkem else None
+    }
+
 @anvil.server.callable
 @handle_errors
 def nacti_analyzy_uzivatele(limit: Optional[int] = None, sort_by: str = "datum_vytvoreni") -> List[Dict]:
     """
     Načte seznam analýz přihlášeného uživatele.
+    Pro velké počty analýz je vhodnější stránkovaný nacti_stranku_analyz.
     
     Args:
         limit: Maximální počet načtených analýz (volitelný)
@@ -393,39 +636,13 @@ def nacti_analyzy_uzivatele(limit: Optional[int] = None, sort_by: str = "datum_v
         return []
         
     try:
-        # Načtení analýz uživatele podle požadovaného řazení
-        if sort_by == "datum_vytvoreni":
-            analyzy = list(app_tables.analyzy.search(
-                tables.order_by("datum_vytvoreni", ascending=False),
-                uzivatel=uzivatel
-            ))
-        elif sort_by == "datum_upravy":
-            analyzy = list(app_tables.analyzy.search(
-                tables.order_by("datum_upravy", ascending=False),
-                uzivatel=uzivatel
-            ))
-        else:
-            analyzy = list(app_tables.analyzy.search(
-                uzivatel=uzivatel
-            ))
-            
+        analyzy = _hledej_analyzy_uzivatele(uzivatel, sort_by)
+        
         # Omezení počtu výsledků, pokud je požadováno
         if limit is not None:
             analyzy = analyzy[:limit]
             
-        # Sestavení výstupních dat
-        result = []
-        for a in analyzy:
-            item = {
-                "id": a.get_id(),
-                "nazev": a["nazev"],
-                "datum_vytvoreni": a["datum_vytvoreni"],
-                "datum_upravy": a["datum_upravy"],
-                "popis": a["data_json"].get("popis", "")
-            }
-            result.append(item)
-            
-        return result
+        return [CRUD_analyzy.metadata_analyzy(a) for a in analyzy]
         
     except Exception as e:
         zapsat_chybu(f"Chyba při načítání analýz uživatele: {str(e)}")
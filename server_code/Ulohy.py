@@ -0,0 +1,410 @@
+# -------------------------------------------------------
+# Modul: Ulohy
+#
+# Úlohy na pozadí pro náročné exporty a výpočty (Excel report, PDF,
+# hromadný ZIP export, Monte Carlo analýza) a hromadné mazání
+# uživatelů, které by v běžném serverovém volání narazily
+# na časový limit.
+#
+# Klient úlohu zadá (zadej_ulohu), dostane její ID a průběžně se ptá
+# na stav (nacti_stav_ulohy). Stav, postup (0-1) a poslední zpráva
+# se ukládají do tabulky ulohy, takže jsou dostupné z libovolného
+# serverového volání. Hotový soubor zůstává v tabulce jako Media
+# a lze jej stáhnout znovu (stahni_vysledek_ulohy), dokud neuplyne
+# PLATNOST_VYSLEDKU_DNY.
+#
+# Úlohy spouští vyměnitelný spouštěč - výchozí používá Anvil
+# background tasks, spoustec_lokalni provede úlohu synchronně ve
+# stejném procesu (testy, ladění bez Anvil serveru).
+# -------------------------------------------------------
+import datetime
+import json
+import logging
+import functools
+import anvil.server
+import anvil.users
+import anvil.tables as tables
+import anvil.tables.query as q
+from anvil.tables import app_tables
+from . import CRUD_analyzy, Export, Hromadny_export, Sprava_uzivatelu
+
+# Stavy úlohy
+STAV_CEKAJICI = "cekajici"
+STAV_BEZI = "bezi"
+STAV_HOTOVO = "hotovo"
+STAV_CHYBA = "chyba"
+KONECNE_STAVY = (STAV_HOTOVO, STAV_CHYBA)
+
+# Jak dlouho se uchovávají dokončené úlohy a jejich soubory
+PLATNOST_VYSLEDKU_DNY = 7
+
+# Nejvyšší počet souběžně rozpracovaných úloh jednoho uživatele
+MAX_AKTIVNICH_ULOH = 3
+
+# Parametry, které klient smí předat analýze Monte Carlo
+PARAMETRY_MONTE_CARLO = ('analyza_id', 'metody', 'pocet_vzorku', 'rezim', 'koncentrace', 'pasma', 'seed')
+
+# Kolik prvních pořadí akceptovatelnosti se uloží do výsledku úlohy;
+# úplné matice [varianty x pořadí] se ukládají jako soubor JSON
+MAX_ULOZENYCH_PORADI = 10
+
+def zapsat_info(zprava):
+    """Pomocná funkce pro serverové logování info zpráv"""
+    logging.info(f"[INFO] {zprava}")
+
+def zapsat_chybu(zprava):
+    """Pomocná funkce pro serverové logování chyb"""
+    logging.error(f"[CHYBA] {zprava}")
+
+def handle_errors(func):
+    """
+    Dekorátor pro jednotné zpracování chyb v serverových funkcích.
+    Zachytí výjimky, zaloguje je a přehodí klientovi.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            zprava = f"Chyba v {func.__name__}: {str(e)}"
+            zapsat_chybu(zprava)
+            raise ValueError(zprava) from e
+    return wrapper
+
+# =============== Typy úloh ===============
+
+def _uloha_excel(parametry, nahlas_postup):
+    """Komplexní Excel report se všemi metodami."""
+    return Export.sestav_excel_report(
+        parametry['analyza_id'], nahlas_postup, max_radku_metody=parametry.get('max_radku_metody')
+    )
+
+def _uloha_pdf(parametry, nahlas_postup):
+    """PDF s výsledky jedné ('metoda') nebo více ('metody') metod."""
+    metody = parametry.get('metody') or [parametry.get('metoda', "WSM")]
+    return Export.sestav_pdf(parametry['analyza_id'], metody, nahlas_postup)
+
+def _uloha_monte_carlo(parametry, nahlas_postup):
+    """
+    Monte Carlo analýza nejistoty vah. Výsledkem je souhrn s prvními
+    MAX_ULOZENYCH_PORADI pořadími akceptovatelnosti a při větším počtu
+    variant i soubor JSON s úplným výsledkem.
+    """
+    Export._over_numpy("Analýza Monte Carlo")
+    analyza_data, rozhodovaci_matice = CRUD_analyzy.nacti_analyzu_pro_vypocet(parametry['analyza_id'])
+    nastaveni = {k: parametry[k] for k in PARAMETRY_MONTE_CARLO if k in parametry and k != 'analyza_id'}
+    vysledek = Export.Monte_carlo_numpy.vypocitej_monte_carlo(
+        *Export.Vypocty_numpy.priprav_pole(rozhodovaci_matice),
+        nahlas_postup=nahlas_postup,
+        **nastaveni
+    )
+
+    souhrn = dict(vysledek)
+    souhrn['pocet_ulozenych_poradi'] = min(len(vysledek['varianty']), MAX_ULOZENYCH_PORADI)
+    souhrn['vysledky'] = {
+        metoda: dict(vysledky_metody, akceptovatelnost_poradi=[
+            radek[:MAX_ULOZENYCH_PORADI] for radek in vysledky_metody['akceptovatelnost_poradi']
+        ])
+        for metoda, vysledky_metody in vysledek['vysledky'].items()
+    }
+    if len(vysledek['varianty']) <= MAX_ULOZENYCH_PORADI:
+        return souhrn
+
+    soubor = anvil.BlobMedia(
+        'application/json',
+        json.dumps(vysledek, ensure_ascii=False).encode('utf-8'),
+        name=f"monte_carlo_{analyza_data.get('nazev', 'analyza')}.json"
+    )
+    return souhrn, soubor
+
+def _uloha_zip(parametry, nahlas_postup):
+    """Hromadný export více analýz do ZIP archivu."""
+    return Hromadny_export.sestav_zip_analyz(
+        parametry['analyza_ids'], parametry.get('metody'), parametry.get('formaty'), nahlas_postup
+    )
+
+def _uloha_smazani_uzivatelu(parametry, nahlas_postup):
+    """Hromadné smazání uživatelů včetně jejich analýz (jen administrátor)."""
+    return Sprava_uzivatelu.proved_smazani_uzivatelu(parametry['emaily'], nahlas_postup=nahlas_postup)
+
+# Typ úlohy -> funkce(parametry, nahlas_postup); vrací Media, slovník,
+# nebo dvojici (slovník, Media) u výpočtů s doplňkovým souborem
+TYPY_ULOH = {
+    'excel': _uloha_excel,
+    'pdf': _uloha_pdf,
+    'monte_carlo': _uloha_monte_carlo,
+    'zip': _uloha_zip,
+    'smazani_uzivatelu': _uloha_smazani_uzivatelu,
+}
+
+# Typy úloh, které nepracují s analýzami a smí je zadat jen administrátor
+ADMIN_TYPY_ULOH = ('smazani_uzivatelu',)
+
+# =============== Spouštění úloh ===============
+
+@anvil.server.background_task
+def spust_ulohu_na_pozadi(uloha_id):
+    """Vstupní bod Anvil background task."""
+    proved_ulohu(uloha_id)
+
+def spoustec_anvil(uloha_id):
+    """
+    Výchozí spouštěč - spustí úlohu jako Anvil background task.
+
+    Returns:
+        str: ID úlohy Anvilu
+    """
+    return anvil.server.launch_background_task('spust_ulohu_na_pozadi', uloha_id).get_id()
+
+def spoustec_lokalni(uloha_id):
+    """
+    Lokální spouštěč - provede úlohu synchronně v tomto procesu.
+
+    Returns:
+        None: Úloha nemá ID v Anvilu
+    """
+    proved_ulohu(uloha_id)
+    return None
+
+_spoustec = spoustec_anvil
+
+def nastav_spoustec(spoustec):
+    """
+    Nastaví funkci, která spouští zadané úlohy.
+
+    Args:
+        spoustec: Funkce (uloha_id) -> ID úlohy Anvilu nebo None,
+                  např. spoustec_anvil nebo spoustec_lokalni
+
+    Returns:
+        Předchozí spouštěč (pro obnovení)
+    """
+    global _spoustec
+    predchozi = _spoustec
+    _spoustec = spoustec
+    return predchozi
+
+def proved_ulohu(uloha_id):
+    """
+    Provede úlohu a průběžně zapisuje její stav do tabulky.
+    Chyba úlohy se neodesílá dál - zapíše se do řádku úlohy.
+
+    Args:
+        uloha_id: ID řádku v tabulce ulohy
+    """
+    uloha = app_tables.ulohy.get_by_id(uloha_id)
+    if not uloha or uloha['stav'] != STAV_CEKAJICI:
+        return
+
+    def nahlas_postup(podil, zprava=""):
+        uloha['postup'] = min(max(float(podil), 0.0), 1.0)
+        if zprava:
+            uloha['zprava'] = zprava
+
+    uloha['stav'] = STAV_BEZI
+    try:
+        vysledek = TYPY_ULOH[uloha['typ']](dict(uloha['parametry'] or {}), nahlas_postup)
+        if isinstance(vysledek, tuple):
+            uloha['vysledek_data'], uloha['vysledek'] = vysledek
+        elif isinstance(vysledek, dict):
+            uloha['vysledek_data'] = vysledek
+        else:
+            uloha['vysledek'] = vysledek
+        uloha.update(stav=STAV_HOTOVO, postup=1.0, datum_dokonceni=datetime.datetime.now())
+        zapsat_info(f"Úloha {uloha_id} ({uloha['typ']}) dokončena")
+    except Exception as e:
+        zapsat_chybu(f"Úloha {uloha_id} ({uloha['typ']}) selhala: {str(e)}")
+        uloha.update(stav=STAV_CHYBA, chyba=str(e), datum_dokonceni=datetime.datetime.now())
+
+# =============== Pomocné funkce ===============
+
+def _nacti_vlastni_ulohu(uloha_id):
+    """
+    Načte úlohu aktuálního uživatele.
+
+    Raises:
+        ValueError: Pokud úloha neexistuje nebo patří jinému uživateli
+    """
+    uloha = app_tables.ulohy.get_by_id(uloha_id)
+    if not uloha:
+        raise ValueError(f"Úloha s ID {uloha_id} neexistuje.")
+    uzivatel = anvil.users.get_user()
+    if (uzivatel != uloha['uzivatel'] and
+        not (uzivatel and uzivatel.get("role") == "admin")):
+        raise ValueError("Nemáte oprávnění k této úloze.")
+    return uloha
+
+def _over_beh(uloha):
+    """
+    Označí jako chybnou úlohu, jejíž background task skončil bez
+    zápisu výsledku (pád procesu, zrušení, vypršení limitu).
+    """
+    if uloha['stav'] in KONECNE_STAVY or not uloha['id_ulohy_anvil']:
+        return
+    ukonceni = anvil.server.get_background_task(uloha['id_ulohy_anvil']).get_termination_status()
+    if ukonceni in ('failed', 'killed', 'missing'):
+        uloha.update(stav=STAV_CHYBA, chyba=f"Úloha na pozadí neočekávaně skončila ({ukonceni})",
+                     datum_dokonceni=datetime.datetime.now())
+
+def _analyzy_ulohy(uloha):
+    """Vrátí ID analýz, kterých se úloha týká."""
+    parametry = uloha['parametry'] or {}
+    return parametry.get('analyza_ids') or [parametry.get('analyza_id')]
+
+def _stav_ulohy(uloha):
+    """Převede řádek úlohy na slovník pro klienta."""
+    return {
+        'id': uloha.get_id(),
+        'typ': uloha['typ'],
+        'parametry': uloha['parametry'],
+        'stav': uloha['stav'],
+        'postup': uloha['postup'] or 0.0,
+        'zprava': uloha['zprava'] or "",
+        'chyba': uloha['chyba'],
+        'ma_soubor': uloha['vysledek'] is not None,
+        'datum_vytvoreni': uloha['datum_vytvoreni'],
+        'datum_dokonceni': uloha['datum_dokonceni'],
+    }
+
+def smaz_stare_ulohy(uzivatel=None):
+    """
+    Smaže dokončené úlohy starší než PLATNOST_VYSLEDKU_DNY.
+
+    Args:
+        uzivatel: Omezí mazání na úlohy uživatele (volitelné)
+
+    Returns:
+        int: Počet smazaných úloh
+    """
+    hranice = datetime.datetime.now() - datetime.timedelta(days=PLATNOST_VYSLEDKU_DNY)
+    podminky = {'datum_vytvoreni': q.less_than(hranice)}
+    if uzivatel is not None:
+        podminky['uzivatel'] = uzivatel
+    pocet = 0
+    for uloha in app_tables.ulohy.search(**podminky):
+        if uloha['stav'] in KONECNE_STAVY:
+            uloha.delete()
+            pocet += 1
+    return pocet
+
+# =============== Serverová API ===============
+
+@anvil.server.callable
+@handle_errors
+def zadej_ulohu(typ, parametry):
+    """
+    Zadá úlohu na pozadí a hned vrátí její ID.
+
+    Args:
+        typ: Typ úlohy ('excel', 'pdf', 'monte_carlo', 'zip', 'smazani_uzivatelu')
+        parametry: Slovník parametrů včetně 'analyza_id', u typu 'zip'
+                   včetně 'analyza_ids', u typu 'smazani_uzivatelu' 'emaily'
+
+    Returns:
+        str: ID úlohy pro nacti_stav_ulohy
+
+    Raises:
+        ValueError: Pokud typ není podporován, analýza neexistuje, uživatel
+                    nemá oprávnění nebo má příliš mnoho rozpracovaných úloh
+    """
+    if typ not in TYPY_ULOH:
+        raise ValueError(f"Nepodporovaný typ úlohy: {typ}")
+    if typ == 'monte_carlo':
+        nezname = sorted(set(parametry) - set(PARAMETRY_MONTE_CARLO))
+        if nezname:
+            raise ValueError(f"Nepodporované parametry analýzy Monte Carlo: {', '.join(nezname)}")
+    if typ in ADMIN_TYPY_ULOH:
+        Sprava_uzivatelu.over_admin_prava()
+        analyza_ids = []
+    else:
+        analyza_ids = parametry.get('analyza_ids') or [parametry.get('analyza_id')]
+        CRUD_analyzy.over_pristup_k_analyzam(analyza_ids)
+    uzivatel = anvil.users.get_user()
+
+    aktivni = len(app_tables.ulohy.search(
+        uzivatel=uzivatel, stav=q.any_of(STAV_CEKAJICI, STAV_BEZI)
+    ))
+    if aktivni >= MAX_AKTIVNICH_ULOH:
+        raise ValueError("Máte rozpracováno příliš mnoho úloh, počkejte na jejich dokončení.")
+
+    smaz_stare_ulohy(uzivatel)
+
+    uloha = app_tables.ulohy.add_row(
+        uzivatel=uzivatel,
+        typ=typ,
+        parametry=parametry,
+        stav=STAV_CEKAJICI,
+        postup=0.0,
+        zprava="Čeká na spuštění",
+        datum_vytvoreni=datetime.datetime.now()
+    )
+    uloha_id = uloha.get_id()
+    zapsat_info(f"Zadána úloha {uloha_id} ({typ}) pro {len(analyza_ids)} analýz")
+
+    uloha['id_ulohy_anvil'] = _spoustec(uloha_id)
+    return uloha_id
+
+@anvil.server.callable
+@handle_errors
+def nacti_stav_ulohy(uloha_id):
+    """
+    Vrátí stav úlohy pro průběžné dotazování klienta.
+
+    Args:
+        uloha_id: ID úlohy
+
+    Returns:
+        dict: id, typ, parametry, stav, postup (0-1), zprava, chyba,
+              ma_soubor, datum_vytvoreni, datum_dokonceni
+    """
+    uloha = _nacti_vlastni_ulohu(uloha_id)
+    _over_beh(uloha)
+    return _stav_ulohy(uloha)
+
+@anvil.server.callable
+@handle_errors
+def stahni_vysledek_ulohy(uloha_id, soubor=False):
+    """
+    Vrátí výsledek dokončené úlohy - Media souboru, nebo slovník
+    u výpočetních úloh.
+
+    Args:
+        uloha_id: ID úlohy
+        soubor: True = u výpočetní úlohy vrátí místo souhrnu soubor
+                s úplným výsledkem (Monte Carlo s mnoha variantami)
+
+    Raises:
+        ValueError: Pokud úloha ještě není dokončena nebo skončila chybou
+    """
+    uloha = _nacti_vlastni_ulohu(uloha_id)
+    if uloha['stav'] == STAV_CHYBA:
+        raise ValueError(f"Úloha skončila chybou: {uloha['chyba']}")
+    if uloha['stav'] != STAV_HOTOVO:
+        raise ValueError("Úloha ještě není dokončena.")
+    if uloha['vysledek_data'] is not None and not soubor:
+        return uloha['vysledek_data']
+    return uloha['vysledek']
+
+@anvil.server.callable
+@handle_errors
+def seznam_uloh(analyza_id=None):
+    """
+    Vrátí úlohy aktuálního uživatele od nejnovější (pro opakované stažení).
+
+    Args:
+        analyza_id: Omezí seznam na úlohy jedné analýzy (volitelné)
+
+    Returns:
+        list: Stavy úloh (viz nacti_stav_ulohy)
+    """
+    uzivatel = anvil.users.get_user()
+    if not uzivatel:
+        return []
+    ulohy = app_tables.ulohy.search(
+        tables.order_by('datum_vytvoreni', ascending=False),
+        uzivatel=uzivatel
+    )
+    return [
+        _stav_ulohy(uloha) for uloha in ulohy
+        if analyza_id is None or analyza_id in _analyzy_ulohy(uloha)
+    ]
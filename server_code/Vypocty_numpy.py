@@ -0,0 +1,744 @@
+# -------------------------------------------------------
+# Modul: Vypocty_numpy
+#
+# Serverový maticový výpočetní engine nad NumPy pro všech pět metod
+# vícekriteriální analýzy (WSM, WPM, TOPSIS, ELECTRE, MABAC).
+#
+# Rozhodovací matice se připraví jednou jako pole float64 a všechny
+# metody z ní počítají bez vnořených Pythonových cyklů. Výstupní
+# slovníky mají stejnou strukturu jako čistě Pythonové funkce
+# v modulu Vypocty, takže je lze přímo zaměnit.
+#
+# Při výpočtu více metod najednou (vypocitej_metody) se sdílené
+# mezivýsledky - min-max normalizace, vážené matice, produkty WPM,
+# matice souhlasu a nesouhlasu - vyhodnocují líně přes graf závislostí
+# a každý se spočítá jen jednou.
+#
+# Součty a součiny se akumulují po sloupcích/řádcích ve stejném
+# pořadí jako v Pythonové verzi (Vypocty) a mocniny se počítají
+# Pythonovým pow(), takže výsledky jsou s Vypocty na serveru bitově
+# shodné a engine je jen jeho zrychlenou cestou.
+# -------------------------------------------------------
+import numpy as np
+from . import Electre_numpy, Rozhodovaci_matice, Vypocty
+
+# ========================
+# SPOLEČNÉ FUNKCE
+# ========================
+
+def priprav_pole(rozhodovaci_matice):
+    """
+    Připraví NumPy pole z již sestavené rozhodovací matice.
+    Hodnoty se nekopírují, pole je pohled na úložiště matice.
+
+    Args:
+        rozhodovaci_matice: Instance Rozhodovaci_matice
+
+    Returns:
+        tuple: (matice, typy_kriterii, varianty, kriteria, vahy),
+               kde matice je pole float64 [varianty x kriteria] a vahy pole float64
+    """
+    return (
+        rozhodovaci_matice.jako_numpy(),
+        rozhodovaci_matice.typy_kriterii,
+        rozhodovaci_matice.varianty,
+        rozhodovaci_matice.kriteria,
+        np.array(rozhodovaci_matice.vahy, dtype=np.float64)
+    )
+
+def priprav_pole_z_json(analyza_data):
+    """
+    Připraví data z JSON struktury jako NumPy pole pro maticové výpočty.
+
+    Args:
+        analyza_data: Slovník s daty analýzy
+
+    Returns:
+        tuple: Viz priprav_pole
+    """
+    return priprav_pole(Rozhodovaci_matice.Rozhodovaci_matice.z_json(analyza_data))
+
+def _maska_min(typy_kriterii):
+    """Vrátí bool pole, které je True pro minimalizační kritéria."""
+    return np.array([t.lower() in ("min", "cost") for t in typy_kriterii], dtype=bool)
+
+def _maska_max(typy_kriterii):
+    """Vrátí bool pole, které je True pro maximalizační kritéria (pojetí TOPSIS)."""
+    return np.array([t.lower() in ("max", "benefit") for t in typy_kriterii], dtype=bool)
+
+def _soucet_radku(matice):
+    """
+    Sečte každý řádek matice zleva doprava.
+    Pořadí sčítání odpovídá Pythonovému sum() přes řádek.
+    """
+    soucet = np.zeros(matice.shape[0], dtype=np.float64)
+    for j in range(matice.shape[1]):
+        soucet += matice[:, j]
+    return soucet
+
+def _soucin_radku(matice):
+    """Vynásobí hodnoty v každém řádku matice zleva doprava."""
+    soucin = np.ones(matice.shape[0], dtype=np.float64)
+    for j in range(matice.shape[1]):
+        soucin *= matice[:, j]
+    return soucin
+
+def _soucet_sloupcu(matice):
+    """Sečte každý sloupec matice shora dolů."""
+    soucet = np.zeros(matice.shape[1], dtype=np.float64)
+    for i in range(matice.shape[0]):
+        soucet += matice[i]
+    return soucet
+
+def _soucin_sloupcu(matice):
+    """Vynásobí hodnoty v každém sloupci matice shora dolů."""
+    soucin = np.ones(matice.shape[1], dtype=np.float64)
+    for i in range(matice.shape[0]):
+        soucin *= matice[i]
+    return soucin
+
+def _mocnina(zaklad, exponent):
+    """
+    Umocní prvky pole Pythonovým operátorem ** po jednotlivých prvcích.
+    NumPy umocňuje vlastními (vektorovými) rutinami, jejichž výsledky se
+    v posledním bitu liší od Pythonového pow(), proto se mocniny počítají
+    stejně jako ve Vypocty - výsledky obou cest jsou pak bitově shodné.
+    """
+    zaklad, exponent = np.broadcast_arrays(np.asarray(zaklad, dtype=np.float64), exponent)
+    hodnoty = [z ** e for z, e in zip(zaklad.ravel().tolist(), exponent.ravel().tolist())]
+    return np.array(hodnoty, dtype=np.float64).reshape(zaklad.shape)
+
+def _serad_vysledky(skore, varianty):
+    """
+    Seřadí varianty sestupně podle skóre a sestaví seznam výsledků.
+    Stabilní řazení zachovává pořadí shodných skóre jako sorted(..., reverse=True).
+
+    Returns:
+        list: Seznam trojic (varianta, poradi, skore)
+    """
+    poradi_indexu = np.argsort(-skore, kind="stable")
+    hodnoty = skore.tolist()
+    return [(varianty[i], poradi, hodnoty[i]) for poradi, i in enumerate(poradi_indexu.tolist(), 1)]
+
+def _souhrn_vysledku(results, rozdil=True):
+    """Doplní k výsledkům nejlepší a nejhorší variantu."""
+    nejlepsi_var, _, nejlepsi_skore = results[0]
+    nejhorsi_var, _, nejhorsi_skore = results[-1]
+    souhrn = {
+        'results': results,
+        'nejlepsi_varianta': nejlepsi_var,
+        'nejlepsi_skore': nejlepsi_skore,
+        'nejhorsi_varianta': nejhorsi_var,
+        'nejhorsi_skore': nejhorsi_skore,
+    }
+    if rozdil:
+        souhrn['rozdil_skore'] = nejlepsi_skore - nejhorsi_skore
+    return souhrn
+
+def normalizuj_matici_minmax(matice, typy_kriterii):
+    """
+    Provede min-max normalizaci celé matice najednou.
+
+    Args:
+        matice: Pole float64 [varianty x kriteria]
+        typy_kriterii: List typů kritérií ("max" nebo "min")
+
+    Returns:
+        Pole float64 s normalizovanými hodnotami
+    """
+    min_val = matice.min(axis=0)
+    max_val = matice.max(axis=0)
+    rozsah = max_val - min_val
+    konstantni = rozsah == 0
+    bezpecny_rozsah = np.where(konstantni, 1.0, rozsah)
+
+    norm_matice = np.where(
+        _maska_min(typy_kriterii),
+        (max_val - matice) / bezpecny_rozsah,
+        (matice - min_val) / bezpecny_rozsah
+    )
+    # Všechny hodnoty ve sloupci jsou stejné
+    norm_matice[:, konstantni] = 1.0
+    return norm_matice
+
+def _norm_vysledky(norm_matice, varianty, kriteria):
+    """Sestaví slovník norm_vysledky ve formátu Pythonové verze."""
+    return {
+        'nazvy_variant': varianty,
+        'nazvy_kriterii': kriteria,
+        'normalizovana_matice': norm_matice.tolist()
+    }
+
+def _wpm_zaklad(matice, typy_kriterii):
+    """
+    Připraví hodnoty pro WPM - nekladné hodnoty nahradí 0.001
+    a u minimalizačních kritérií použije převrácenou hodnotu.
+    """
+    zaklad = np.where(matice <= 0, 0.001, matice)
+    return np.where(_maska_min(typy_kriterii), 1 / zaklad, zaklad)
+
+# ========================
+# METODA WSM
+# ========================
+
+def wsm_vypocet(norm_matice, vahy, varianty):
+    """
+    Provede výpočet metodou WSM nad polem normalizovaných hodnot.
+
+    Args:
+        norm_matice: Pole float64 normalizovaných hodnot
+        vahy: Pole vah kritérií
+        varianty: List názvů variant
+
+    Returns:
+        dict: Výsledky analýzy metodou WSM
+    """
+    return _wsm_z_vazene_matice(norm_matice * vahy, varianty)
+
+def _wsm_z_vazene_matice(vazena_matice, varianty):
+    """Sestaví výsledky WSM z již vážené normalizované matice."""
+    skore = _soucet_radku(vazena_matice)
+    return _souhrn_vysledku(_serad_vysledky(skore, varianty))
+
+def vypocitej_wsm(matice, typy_kriterii, varianty, kriteria, vahy):
+    """
+    Provede všechny kroky WSM analýzy nad připravenými poli.
+
+    Args:
+        matice, typy_kriterii, varianty, kriteria, vahy: Výstup priprav_pole
+
+    Returns:
+        dict: Strukturovaný výsledek shodný s vypocitej_wsm_analyzu
+    """
+    return vypocitej_metody((matice, typy_kriterii, varianty, kriteria, vahy), ["wsm"])['vysledky']['wsm']
+
+def _sestav_wsm(mezivysledky):
+    """Sestaví strukturovaný výsledek WSM ze sdílených mezivýsledků."""
+    return {
+        'norm_vysledky': mezivysledky['norm_vysledky'],
+        'vazene_matice': mezivysledky['vazena_norm_matice'].tolist(),
+        'vahy': mezivysledky['vahy_seznam'],
+        'wsm_vysledky': mezivysledky['wsm_vysledky'],
+        'matice': mezivysledky['matice_seznam'],
+        'typy_kriterii': mezivysledky['typy_kriterii'],
+        'metoda': 'WSM',
+        'popis_metody': 'Weighted Sum Model'
+    }
+
+# ========================
+# METODA WPM
+# ========================
+
+def wpm_vypocet(matice, vahy, typy_kriterii, varianty):
+    """
+    Vypočítá výsledky metodou WPM nad polem původních hodnot.
+
+    Args:
+        matice: Pole float64 původních hodnot
+        vahy: Pole vah kritérií
+        typy_kriterii: List typů kritérií ("max" nebo "min")
+        varianty: List názvů variant
+
+    Returns:
+        dict: Výsledky analýzy metodou WPM
+    """
+    produkty = _soucin_radku(vypocitej_produktovy_prispevek(matice, vahy, typy_kriterii))
+    return _wpm_z_produktu(produkty, varianty)
+
+def _wpm_z_produktu(produkty, varianty):
+    """Sestaví výsledky WPM z produktových skóre variant."""
+    results = _serad_vysledky(produkty, varianty)
+    souhrn = _souhrn_vysledku(results)
+    if len(results) <= 1:
+        souhrn['rozdil_skore'] = 0
+    return souhrn
+
+def vypocitej_produktovy_prispevek(matice, vahy, typy_kriterii):
+    """
+    Vypočítá příspěvek jednotlivých kritérií pro WPM (hodnoty umocněné na váhy).
+
+    Returns:
+        Pole float64 [varianty x kriteria]
+    """
+    return _mocnina(_wpm_zaklad(matice, typy_kriterii), vahy)
+
+def vypocitej_matici_pomeru_variant(matice, vahy, typy_kriterii):
+    """
+    Vypočítá matici poměrů R(A_i/A_j) produktových skóre variant.
+
+    Returns:
+        Pole float64 [varianty x varianty]
+    """
+    produkty = _soucin_radku(vypocitej_produktovy_prispevek(matice, vahy, typy_kriterii))
+    return _pomery_z_produktu(produkty)
+
+def _pomery_z_produktu(produkty):
+    """Vypočítá matici poměrů z produktových skóre variant."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pomery = produkty[:, None] / produkty[None, :]
+    # Zabránění dělení nulou stejně jako v Pythonové verzi
+    pomery[:, produkty == 0] = float('inf')
+    return pomery
+
+def vypocitej_wpm(matice, typy_kriterii, varianty, kriteria, vahy):
+    """
+    Provede všechny kroky WPM analýzy nad připravenými poli.
+
+    Returns:
+        dict: Strukturovaný výsledek shodný s vypocitej_wpm_analyzu
+    """
+    return vypocitej_metody((matice, typy_kriterii, varianty, kriteria, vahy), ["wpm"])['vysledky']['wpm']
+
+# Do tohoto počtu variant se vrací matice poměrů variant WPM; nad ním by
+# hustá matice [varianty x varianty] jako seznamy zabrala gigabajty paměti
+MAX_VARIANT_POMERU_WPM = 1000
+
+def _sestav_wpm(mezivysledky):
+    """
+    Sestaví strukturovaný výsledek WPM ze sdílených mezivýsledků.
+    U velkých analýz je 'pomery_variant' None.
+    """
+    pomery_variant = None
+    if len(mezivysledky['varianty']) <= MAX_VARIANT_POMERU_WPM:
+        pomery_variant = mezivysledky['pomery_variant'].tolist()
+    return {
+        'norm_vysledky': mezivysledky['norm_vysledky'],
+        'vahy': mezivysledky['vahy_seznam'],
+        'wpm_vysledky': mezivysledky['wpm_vysledky'],
+        'matice': mezivysledky['matice_seznam'],
+        'typy_kriterii': mezivysledky['typy_kriterii'],
+        'produktovy_prispevek': mezivysledky['produktovy_prispevek'].tolist(),
+        'pomery_variant': pomery_variant,
+        'metoda': 'WPM',
+        'popis_metody': 'Weighted Product Model'
+    }
+
+# ========================
+# METODA TOPSIS
+# ========================
+
+def normalizuj_vektorove(matice):
+    """
+    Provede vektorovou (Euklidovskou) normalizaci sloupců.
+    Sloupec s nulovou normou dostane hodnoty 0.
+
+    Returns:
+        Pole float64 normalizovaných hodnot
+    """
+    normy = _mocnina(_soucet_sloupcu(_mocnina(matice, 2.0)), 0.5)
+    nulove = normy == 0
+    norm_matice = matice / np.where(nulove, 1.0, normy)
+    norm_matice[:, nulove] = 0.0
+    return norm_matice
+
+def topsis_vypocet(matice, vahy, varianty, typy_kriterii):
+    """
+    Vypočítá výsledky metodou TOPSIS s normalizací Euklidovskou normou.
+
+    Args:
+        matice: Pole float64 původních (nenormalizovaných) hodnot
+        vahy: Pole vah kritérií
+        varianty: List názvů variant
+        typy_kriterii: List typů kritérií ("max" nebo "min")
+
+    Returns:
+        dict: Výsledky analýzy metodou TOPSIS
+    """
+    return _topsis_z_normalizace(normalizuj_vektorove(matice), vahy, varianty, typy_kriterii)
+
+def _topsis_z_normalizace(norm_matice, vahy, varianty, typy_kriterii):
+    """Provede kroky TOPSIS nad vektorově normalizovanou maticí."""
+    # Vážená normalizovaná matice
+    vazena_matice = norm_matice * vahy
+
+    # Ideální a anti-ideální řešení
+    je_max = _maska_max(typy_kriterii)
+    sloupce_max = vazena_matice.max(axis=0)
+    sloupce_min = vazena_matice.min(axis=0)
+    ideal = np.where(je_max, sloupce_max, sloupce_min)
+    anti_ideal = np.where(je_max, sloupce_min, sloupce_max)
+
+    # Vzdálenosti od ideálního a anti-ideálního řešení
+    dist_ideal = _mocnina(_soucet_radku(_mocnina(vazena_matice - ideal, 2.0)), 0.5)
+    dist_anti_ideal = _mocnina(_soucet_radku(_mocnina(vazena_matice - anti_ideal, 2.0)), 0.5)
+
+    # Relativní blízkost k ideálnímu řešení
+    jmenovatel = dist_ideal + dist_anti_ideal
+    with np.errstate(divide="ignore", invalid="ignore"):
+        relativni_blizkost = np.where(jmenovatel == 0, 0.0, dist_anti_ideal / jmenovatel)
+
+    souhrn = _souhrn_vysledku(_serad_vysledky(relativni_blizkost, varianty), rozdil=False)
+    souhrn.update({
+        'norm_matice': norm_matice.tolist(),
+        'vazena_matice': vazena_matice.tolist(),
+        'ideal': ideal.tolist(),
+        'anti_ideal': anti_ideal.tolist(),
+        'dist_ideal': dist_ideal.tolist(),
+        'dist_anti_ideal': dist_anti_ideal.tolist(),
+        'relativni_blizkost': relativni_blizkost.tolist()
+    })
+    return souhrn
+
+def vypocitej_topsis(matice, typy_kriterii, varianty, kriteria, vahy):
+    """
+    Provede všechny kroky TOPSIS analýzy nad připravenými poli.
+
+    Returns:
+        dict: Strukturovaný výsledek shodný s vypocitej_topsis_analyzu
+    """
+    return vypocitej_metody((matice, typy_kriterii, varianty, kriteria, vahy), ["topsis"])['vysledky']['topsis']
+
+def _sestav_topsis(mezivysledky):
+    """Sestaví strukturovaný výsledek TOPSIS ze sdílených mezivýsledků."""
+    return {
+        'norm_vysledky': mezivysledky['norm_vysledky'],
+        'vahy': mezivysledky['vahy_seznam'],
+        'topsis_vysledky': mezivysledky['topsis_vysledky'],
+        'matice': mezivysledky['matice_seznam'],
+        'typy_kriterii': mezivysledky['typy_kriterii'],
+        'metoda': 'TOPSIS',
+        'popis_metody': 'Technique for Order of Preference by Similarity to Ideal Solution'
+    }
+
+# ========================
+# METODA ELECTRE
+# ========================
+
+# Do tohoto počtu variant se vracejí husté matice souhlasu, nesouhlasu
+# a převahy; nad ním se relace převahy počítá po dlaždicích (Electre_numpy)
+MAX_VARIANT_HUSTE_ELECTRE = 1000
+
+def vypocitej_concordance_matrix(norm_matice, vahy):
+    """
+    Vypočítá matici souhlasu pro všechny dvojice variant najednou.
+
+    Args:
+        norm_matice: Pole float64 normalizovaných hodnot
+        vahy: Pole vah kritérií
+
+    Returns:
+        Pole float64 [varianty x varianty] s nulovou diagonálou
+    """
+    pocet_variant = norm_matice.shape[0]
+    concordance = np.zeros((pocet_variant, pocet_variant), dtype=np.float64)
+    for k in range(norm_matice.shape[1]):
+        sloupec = norm_matice[:, k]
+        concordance += np.where(sloupec[:, None] >= sloupec[None, :], vahy[k], 0.0)
+    np.fill_diagonal(concordance, 0.0)
+    return concordance
+
+def vypocitej_discordance_matrix(norm_matice):
+    """
+    Vypočítá matici nesouhlasu - maximální rozdíl ve prospěch j nad i.
+
+    Args:
+        norm_matice: Pole float64 normalizovaných hodnot
+
+    Returns:
+        Pole float64 [varianty x varianty] s nulovou diagonálou
+    """
+    pocet_variant = norm_matice.shape[0]
+    discordance = np.zeros((pocet_variant, pocet_variant), dtype=np.float64)
+    for k in range(norm_matice.shape[1]):
+        sloupec = norm_matice[:, k]
+        np.maximum(discordance, sloupec[None, :] - sloupec[:, None], out=discordance)
+    np.fill_diagonal(discordance, 0.0)
+    return discordance
+
+def vypocitej_outranking_matrix(concordance, discordance, index_souhlasu, index_nesouhlasu):
+    """
+    Vypočítá binární matici převahy z matic souhlasu a nesouhlasu.
+
+    Returns:
+        Pole int [varianty x varianty] s hodnotami 0/1
+    """
+    outranking = ((concordance >= index_souhlasu) & (discordance <= index_nesouhlasu)).astype(int)
+    np.fill_diagonal(outranking, 0)
+    return outranking
+
+def vypocitej_net_flows(outranking, varianty):
+    """
+    Vypočítá Net Flow (odchozí - příchozí převahy) pro každou variantu.
+
+    Returns:
+        list: Seznam dvojic (varianta, net_flow) seřazený sestupně podle net_flow
+    """
+    net_flows = outranking.sum(axis=1) - outranking.sum(axis=0)
+    poradi_indexu = np.argsort(-net_flows, kind="stable")
+    hodnoty = net_flows.tolist()
+    return [(varianty[i], hodnoty[i]) for i in poradi_indexu.tolist()]
+
+def _electre_vysledky(concordance, discordance, outranking, varianty, index_souhlasu, index_nesouhlasu):
+    """Sestaví výsledky ELECTRE z matic souhlasu, nesouhlasu a převahy."""
+    net_flows = vypocitej_net_flows(outranking, varianty)
+    results = [(varianta, i + 1, net_flow) for i, (varianta, net_flow) in enumerate(net_flows)]
+    return {
+        'results': results,
+        'nejlepsi_varianta': results[0][0],
+        'nejhorsi_varianta': results[-1][0],
+        'nejlepsi_skore': results[0][2],
+        'nejhorsi_skore': results[-1][2],
+        'concordance_matrix': concordance.tolist(),
+        'discordance_matrix': discordance.tolist(),
+        'outranking_matrix': outranking.tolist(),
+        'index_souhlasu': index_souhlasu,
+        'index_nesouhlasu': index_nesouhlasu
+    }
+
+def _electre_vysledky_ridke(prevaha, varianty, index_souhlasu, index_nesouhlasu):
+    """
+    Sestaví výsledky ELECTRE z řídké relace převahy (velké analýzy).
+    Husté matice souhlasu, nesouhlasu a převahy se nevracejí, relace
+    převahy je v 'outranking_relace' jako pole NumPy ve formátu CSR - na
+    seznamy se nepřevádí, klientovi se neposílá (Export._kompaktni_vysledek).
+    Výstupy (HTML, grafy) pracují se 'souhrn_prevahy' ve formátu
+    Vypocty.souhrn_prevahy.
+    """
+    net_flows = Electre_numpy.vypocitej_net_flows_ridce(prevaha, varianty)
+    results = [(varianta, i + 1, net_flow) for i, (varianta, net_flow) in enumerate(net_flows)]
+    uzly = np.sort(np.argsort(-(prevaha['odchozi'] - prevaha['prichozi']), kind="stable")[:Vypocty.POCET_UZLU_SOUHRNU_PREVAHY])
+    return {
+        'results': results,
+        'nejlepsi_varianta': results[0][0],
+        'nejhorsi_varianta': results[-1][0],
+        'nejlepsi_skore': results[0][2],
+        'nejhorsi_skore': results[-1][2],
+        'concordance_matrix': None,
+        'discordance_matrix': None,
+        'outranking_matrix': None,
+        'outranking_relace': {
+            'indptr': prevaha['indptr'],
+            'indices': prevaha['indices']
+        },
+        'souhrn_prevahy': {
+            'prevysuje': prevaha['odchozi'].tolist(),
+            'prevysovano': prevaha['prichozi'].tolist(),
+            'pocet_relaci': len(prevaha['indices']),
+            'uzly': uzly.tolist(),
+            'matice': Electre_numpy.vyber_podgraf(prevaha, uzly).tolist()
+        },
+        'index_souhlasu': index_souhlasu,
+        'index_nesouhlasu': index_nesouhlasu
+    }
+
+def vypocitej_electre(matice, typy_kriterii, varianty, kriteria, vahy,
+                      index_souhlasu=0.7, index_nesouhlasu=0.3):
+    """
+    Provede všechny kroky ELECTRE analýzy nad připravenými poli.
+
+    Args:
+        matice, typy_kriterii, varianty, kriteria, vahy: Výstup priprav_pole
+        index_souhlasu: Prahová hodnota indexu souhlasu
+        index_nesouhlasu: Prahová hodnota indexu nesouhlasu
+
+    Returns:
+        dict: Strukturovaný výsledek shodný s vypocitej_electre_analyzu
+    """
+    return vypocitej_metody(
+        (matice, typy_kriterii, varianty, kriteria, vahy), ["electre"],
+        index_souhlasu, index_nesouhlasu
+    )['vysledky']['electre']
+
+def _sestav_electre(mezivysledky):
+    """Sestaví strukturovaný výsledek ELECTRE ze sdílených mezivýsledků."""
+    return {
+        'norm_vysledky': mezivysledky['norm_vysledky'],
+        'vahy': mezivysledky['vahy_seznam'],
+        'electre_vysledky': mezivysledky[
+            'electre_vysledky' if len(mezivysledky['varianty']) <= MAX_VARIANT_HUSTE_ELECTRE
+            else 'electre_vysledky_ridke'
+        ],
+        'matice': mezivysledky['matice_seznam'],
+        'typy_kriterii': mezivysledky['typy_kriterii'],
+        'parametry': {
+            'index_souhlasu': mezivysledky['index_souhlasu'],
+            'index_nesouhlasu': mezivysledky['index_nesouhlasu']
+        },
+        'metoda': 'ELECTRE',
+        'popis_metody': 'Elimination Et Choix Traduisant la Réalité'
+    }
+
+# ========================
+# METODA MABAC
+# ========================
+
+def mabac_vypocet(vazena_matice, varianty):
+    """
+    Vypočítá výsledky metodou MABAC nad váženou normalizovanou maticí.
+
+    Args:
+        vazena_matice: Pole float64 vážených hodnot v_ij = w_j * (r_ij + 1)
+        varianty: List názvů variant
+
+    Returns:
+        dict: Výsledky analýzy metodou MABAC
+    """
+    # Hraniční hodnoty jako geometrický průměr sloupců
+    g_values = _mocnina(_soucin_sloupcu(vazena_matice), 1 / len(varianty))
+    q_matrix = vazena_matice - g_values
+    skore = _soucet_radku(q_matrix)
+
+    souhrn = _souhrn_vysledku(_serad_vysledky(skore, varianty))
+    q_seznam = q_matrix.tolist()
+    souhrn.update({
+        'g_values': g_values.tolist(),
+        'q_matrix': q_seznam,
+        'q_distance_matrix': q_seznam
+    })
+    return souhrn
+
+def vypocitej_mabac(matice, typy_kriterii, varianty, kriteria, vahy):
+    """
+    Provede všechny kroky MABAC analýzy nad připravenými poli.
+
+    Returns:
+        dict: Strukturovaný výsledek shodný s vypocitej_mabac_analyzu
+    """
+    return vypocitej_metody((matice, typy_kriterii, varianty, kriteria, vahy), ["mabac"])['vysledky']['mabac']
+
+def _sestav_mabac(mezivysledky):
+    """Sestaví strukturovaný výsledek MABAC ze sdílených mezivýsledků."""
+    return {
+        'norm_vysledky': mezivysledky['norm_vysledky'],
+        'vazena_matice': mezivysledky['mabac_vazena_matice'].tolist(),
+        'vahy': mezivysledky['vahy_seznam'],
+        'mabac_vysledky': mezivysledky['mabac_vysledky'],
+        'matice': mezivysledky['matice_seznam'],
+        'typy_kriterii': mezivysledky['typy_kriterii'],
+        'metoda': 'MABAC',
+        'popis_metody': 'Multi-Attributive Border Approximation area Comparison'
+    }
+
+# ========================
+# VÝPOČET VÍCE METOD NAJEDNOU
+# ========================
+
+# Graf mezivýsledků: název -> (závislosti, funkce). Funkce dostane hodnoty
+# závislostí v uvedeném pořadí. Vstupy (matice, typy_kriterii, varianty,
+# kriteria, vahy, index_souhlasu, index_nesouhlasu) se do grafu vkládají přímo.
+GRAF_MEZIVYSLEDKU = {
+    'matice_seznam': (('matice',), lambda matice: matice.tolist()),
+    'vahy_seznam': (('vahy',), lambda vahy: vahy.tolist()),
+    'norm_matice': (('matice', 'typy_kriterii'), normalizuj_matici_minmax),
+    'norm_vysledky': (('norm_matice', 'varianty', 'kriteria'), _norm_vysledky),
+    'vazena_norm_matice': (('norm_matice', 'vahy'), lambda norm_matice, vahy: norm_matice * vahy),
+    'wsm_vysledky': (('vazena_norm_matice', 'varianty'), _wsm_z_vazene_matice),
+    'produktovy_prispevek': (('matice', 'vahy', 'typy_kriterii'), vypocitej_produktovy_prispevek),
+    'wpm_produkty': (('produktovy_prispevek',), _soucin_radku),
+    'wpm_vysledky': (('wpm_produkty', 'varianty'), _wpm_z_produktu),
+    'pomery_variant': (('wpm_produkty',), _pomery_z_produktu),
+    'vektorova_norm_matice': (('matice',), normalizuj_vektorove),
+    'topsis_vysledky': (('vektorova_norm_matice', 'vahy', 'varianty', 'typy_kriterii'), _topsis_z_normalizace),
+    'concordance_matrix': (('norm_matice', 'vahy'), vypocitej_concordance_matrix),
+    'discordance_matrix': (('norm_matice',), vypocitej_discordance_matrix),
+    'outranking_matrix': (
+        ('concordance_matrix', 'discordance_matrix', 'index_souhlasu', 'index_nesouhlasu'),
+        vypocitej_outranking_matrix
+    ),
+    'electre_vysledky': (
+        ('concordance_matrix', 'discordance_matrix', 'outranking_matrix',
+         'varianty', 'index_souhlasu', 'index_nesouhlasu'),
+        _electre_vysledky
+    ),
+    'outranking_ridka': (
+        ('norm_matice', 'vahy', 'index_souhlasu', 'index_nesouhlasu'),
+        Electre_numpy.vypocitej_prevahu_ridce
+    ),
+    'electre_vysledky_ridke': (
+        ('outranking_ridka', 'varianty', 'index_souhlasu', 'index_nesouhlasu'),
+        _electre_vysledky_ridke
+    ),
+    'mabac_vazena_matice': (('norm_matice', 'vahy'), lambda norm_matice, vahy: vahy * (norm_matice + 1)),
+    'mabac_vysledky': (('mabac_vazena_matice', 'varianty'), mabac_vypocet),
+}
+
+class Mezivysledky:
+    """
+    Líně vyhodnocovaný graf mezivýsledků nad jednou rozhodovací maticí.
+
+    Každý mezivýsledek se spočítá nejvýše jednou při prvním požadavku
+    (spolu se svými závislostmi) a dál se sdílí mezi všemi metodami.
+    """
+
+    __slots__ = ('_hodnoty', 'spocitane')
+
+    def __init__(self, matice, typy_kriterii, varianty, kriteria, vahy,
+                 index_souhlasu=0.7, index_nesouhlasu=0.3):
+        self._hodnoty = {
+            'matice': matice,
+            'typy_kriterii': typy_kriterii,
+            'varianty': varianty,
+            'kriteria': kriteria,
+            'vahy': vahy,
+            'index_souhlasu': index_souhlasu,
+            'index_nesouhlasu': index_nesouhlasu,
+        }
+        # Pořadí, ve kterém se mezivýsledky počítaly (pro ladění)
+        self.spocitane = []
+
+    def __getitem__(self, nazev):
+        if nazev not in self._hodnoty:
+            zavislosti, funkce = GRAF_MEZIVYSLEDKU[nazev]
+            self._hodnoty[nazev] = funkce(*[self[zavislost] for zavislost in zavislosti])
+            self.spocitane.append(nazev)
+        return self._hodnoty[nazev]
+
+# Sestavení výsledku každé metody a text chyby, pod kterým se hlásí
+METODY = {
+    'wsm': (_sestav_wsm, "WSM"),
+    'wpm': (_sestav_wpm, "WPM"),
+    'topsis': (_sestav_topsis, "TOPSIS"),
+    'electre': (_sestav_electre, "ELECTRE"),
+    'mabac': (_sestav_mabac, "MABAC"),
+}
+
+def vypocitej_metody(pole, metody=None, index_souhlasu=0.7, index_nesouhlasu=0.3):
+    """
+    Vypočítá zvolené metody nad jednou rozhodovací maticí. Sdílené
+    mezivýsledky (normalizace, vážené matice, produkty WPM, ...) se
+    spočítají jen jednou pro všechny metody.
+
+    Args:
+        pole: Výstup priprav_pole (matice, typy_kriterii, varianty, kriteria, vahy)
+        metody: List kódů metod ('wsm', 'wpm', 'topsis', 'electre', 'mabac'),
+                výchozí jsou všechny
+        index_souhlasu: Prahová hodnota indexu souhlasu pro ELECTRE
+        index_nesouhlasu: Prahová hodnota indexu nesouhlasu pro ELECTRE
+
+    Returns:
+        dict: 'vysledky' (kód metody -> strukturovaný výsledek),
+              'mezivysledky' (sdílená data všech metod) a 'parametry'
+
+    Raises:
+        ValueError: Pokud metoda není podporována nebo výpočet selže
+    """
+    metody = [m.lower() for m in (metody or METODY)]
+    for metoda in metody:
+        if metoda not in METODY:
+            raise ValueError(f"Nepodporovaná metoda analýzy: {metoda}")
+
+    mezivysledky = Mezivysledky(*pole, index_souhlasu=index_souhlasu, index_nesouhlasu=index_nesouhlasu)
+
+    vysledky = {}
+    for metoda in metody:
+        sestav, nazev = METODY[metoda]
+        try:
+            vysledky[metoda] = sestav(mezivysledky)
+        except Exception as e:
+            raise ValueError(f"Chyba při výpočtu {nazev} analýzy: {str(e)}")
+
+    return {
+        'vysledky': vysledky,
+        'mezivysledky': sdilene_mezivysledky(vysledky[metody[0]]),
+        'parametry': {
+            'index_souhlasu': index_souhlasu,
+            'index_nesouhlasu': index_nesouhlasu
+        }
+    }
+
+def sdilene_mezivysledky(vysledek_metody):
+    """
+    Vybere z výsledku libovolné metody data společná všem metodám
+    (viz Vypocty.sdilene_mezivysledky).
+    """
+    return Vypocty.sdilene_mezivysledky(vysledek_metody)
@@ -0,0 +1,46 @@
+# -------------------------------------------------------
+# Konfigurace testů
+#
+# Testy importují moduly aplikace jako balíček MCApp (kořenový
+# __init__.py spojuje server_code a client_code jako v Anvilu).
+# Pokud není nainstalovaný anvil-uplink, zaregistrují se místo modulů
+# anvil.* prázdné moduly - výpočetní moduly je jen importují a při
+# výpočtech je nevolají. Testy modulů, které pracují s tabulkami nebo
+# Media, si potřebné funkce dosadí samy (monkeypatch).
+# -------------------------------------------------------
+import importlib.util
+import os
+import sys
+import types
+
+KOREN = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _zaregistruj_prazdny_anvil():
+    """Zaregistruje prázdné moduly anvil.*, které výpočetní moduly importují."""
+    nazvy = ["anvil", "anvil.server", "anvil.users", "anvil.tables", "anvil.tables.query",
+             "anvil.media", "anvil.email", "anvil.pdf"]
+    for nazev in nazvy:
+        sys.modules[nazev] = types.ModuleType(nazev)
+    anvil = sys.modules["anvil"]
+    for nazev in nazvy[1:]:
+        rodic, _, jmeno = nazev.rpartition(".")
+        setattr(sys.modules[rodic], jmeno, sys.modules[nazev])
+    sys.modules["anvil.server"].callable = lambda f=None, **kwargs: f if f is not None else (lambda g: g)
+    sys.modules["anvil.tables"].app_tables = None
+    anvil.confirm = None
+    anvil.Media = anvil.BlobMedia = None
+
+def _nacti_balicek():
+    """Načte kořen repozitáře jako balíček MCApp."""
+    if "MCApp" in sys.modules:
+        return
+    spec = importlib.util.spec_from_file_location(
+        "MCApp", os.path.join(KOREN, "__init__.py"), submodule_search_locations=[KOREN]
+    )
+    balicek = importlib.util.module_from_spec(spec)
+    sys.modules["MCApp"] = balicek
+    spec.loader.exec_module(balicek)
+
+if importlib.util.find_spec("anvil") is None:
+    _zaregistruj_prazdny_anvil()
+_nacti_balicek()
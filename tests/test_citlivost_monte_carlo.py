@@ -0,0 +1,172 @@
+# -------------------------------------------------------
+# Testy analýzy citlivosti (Citlivost_numpy) a Monte Carlo
+# analýzy nejistoty vah (Monte_carlo_numpy)
+#
+# Přesné váhy změn nejlepší varianty se ověřují proti jemné mřížce
+# vah, skóre na mřížce proti čistě Pythonovému modulu Vypocty.
+# -------------------------------------------------------
+import random
+
+import numpy as np
+import pytest
+
+from MCApp import Citlivost_numpy, Monte_carlo_numpy, Rozhodovaci_matice, Vypocty, Vypocty_numpy
+
+def _analyza(hodnoty, typy=None, vahy=None):
+    """Sestaví data analýzy z matice hodnot [varianty][kriteria]."""
+    pocet_kriterii = len(hodnoty[0])
+    typy = typy or ["max" if j % 2 == 0 else "min" for j in range(pocet_kriterii)]
+    vahy = vahy or [1.0 / pocet_kriterii] * pocet_kriterii
+    kriteria = {f"K{j + 1}": {"typ": typy[j], "vaha": vahy[j]} for j in range(pocet_kriterii)}
+    varianty = {}
+    for i, radek in enumerate(hodnoty):
+        varianta = {"popis_varianty": ""}
+        varianta.update({f"K{j + 1}": hodnota for j, hodnota in enumerate(radek)})
+        varianty[f"V{i + 1}"] = varianta
+    return {"kriteria": kriteria, "varianty": varianty}
+
+def _nahodna_analyza(pocet_variant, pocet_kriterii, seed):
+    """Vrátí analýzu s kladnými náhodnými hodnotami a náhodnými vahami."""
+    r = random.Random(seed)
+    hodnoty = [[r.uniform(1.0, 100.0) for _ in range(pocet_kriterii)] for _ in range(pocet_variant)]
+    vahy = [r.uniform(0.1, 1.0) for _ in range(pocet_kriterii)]
+    return _analyza(hodnoty, vahy=[v / sum(vahy) for v in vahy])
+
+# ============= Analýza citlivosti =============
+
+@pytest.mark.parametrize("metoda", Citlivost_numpy.LINEARNI_METODY)
+@pytest.mark.parametrize("seed", range(5))
+def test_zmeny_nejlepsi_odpovidaji_mrizce(metoda, seed):
+    matice, typy, varianty, kriteria, vahy = Vypocty_numpy.priprav_pole_z_json(_nahodna_analyza(8, 4, seed))
+    vysledek = Citlivost_numpy.vypocitej_citlivost(
+        matice, typy, varianty, kriteria, vahy, metoda, pocet_kroku=2001, vaha_od=0.0, vaha_do=1.0
+    )
+
+    for krit_vysledek in vysledek["kriteria"].values():
+        assert krit_vysledek["presne"]
+        mrizka = krit_vysledek["vahy_rozsah"]
+        skore = np.array(krit_vysledek["citlivost_skore"])
+        zmeny = krit_vysledek["zmeny_nejlepsi"]
+
+        # Nejlepší varianta podle přesných změn se musí shodovat s mřížkou
+        # ve všech bodech mimo bezprostřední okolí průsečíků
+        nejlepsi = varianty[int(np.argmax(skore[0]))]
+        dalsi_zmena = 0
+        for krok, vaha in enumerate(mrizka):
+            while dalsi_zmena < len(zmeny) and zmeny[dalsi_zmena]["vaha"] < vaha:
+                assert zmeny[dalsi_zmena]["puvodni"] == nejlepsi
+                nejlepsi = zmeny[dalsi_zmena]["nova"]
+                dalsi_zmena += 1
+            if any(abs(zmena["vaha"] - vaha) < 1e-9 for zmena in zmeny):
+                continue
+            assert varianty[int(np.argmax(skore[krok]))] == nejlepsi, (vaha, zmeny)
+
+def test_zmena_presne_na_zacatku_rozsahu():
+    a = np.array([1.0, 0.5])
+    b = np.array([0.0, 2.0])
+    # Ve váze 0.25 jsou skóre shodná a druhá varianta roste rychleji
+    assert Citlivost_numpy.vypocitej_zmeny_nejlepsi(a, b, 0.25, 1.0) == [(0.25, 0, 1)]
+    assert Citlivost_numpy.vypocitej_zmeny_nejlepsi(a, b, 0.3, 1.0) == []
+
+@pytest.mark.parametrize("metoda", ["wpm", "mabac"])
+def test_citlivost_shodna_s_vypocty(metoda):
+    analyza_data = _nahodna_analyza(7, 3, seed=11)
+    rozhodovaci_matice = Rozhodovaci_matice.Rozhodovaci_matice.z_json(analyza_data)
+    vysledek = Citlivost_numpy.vypocitej_citlivost(
+        *Vypocty_numpy.priprav_pole(rozhodovaci_matice), metoda
+    )
+
+    for c, krit_vysledek in enumerate(vysledek["kriteria"].values()):
+        ocekavany = Vypocty.vypocitej_analyzu_citlivosti(
+            rozhodovaci_matice, rozhodovaci_matice.vahy, rozhodovaci_matice.varianty,
+            rozhodovaci_matice.kriteria, metoda, vyber_kriteria=c
+        )
+        assert krit_vysledek["zvolene_kriterium"] == ocekavany["zvolene_kriterium"]
+        assert krit_vysledek["vahy_rozsah"] == pytest.approx(ocekavany["vahy_rozsah"], abs=1e-12)
+        assert np.allclose(krit_vysledek["citlivost_skore"], ocekavany["citlivost_skore"], rtol=1e-9, atol=1e-12)
+        assert krit_vysledek["citlivost_poradi"] == ocekavany["citlivost_poradi"]
+
+def test_souhrn_velke_analyzy():
+    pocet_variant = Citlivost_numpy.MAX_VARIANT_SOUHRNU + 10
+    pole = Vypocty_numpy.priprav_pole_z_json(_nahodna_analyza(pocet_variant, 3, seed=5))
+    varianty = pole[2]
+    uplny = Citlivost_numpy.vypocitej_citlivost(*pole, "wsm")
+    souhrnny = Citlivost_numpy.vypocitej_citlivost(*pole, "wsm", souhrn=True)
+
+    for nazev, krit_uplny in uplny["kriteria"].items():
+        krit_souhrn = souhrnny["kriteria"][nazev]
+        zobrazene = krit_souhrn["zobrazene_varianty"]
+        assert len(zobrazene) == Citlivost_numpy.TOP_K_SOUHRNU
+        assert krit_souhrn["zmeny_nejlepsi"] == krit_uplny["zmeny_nejlepsi"]
+
+        skore = np.array(krit_uplny["citlivost_skore"])
+        poradi = np.array(krit_uplny["citlivost_poradi"])
+        indexy = [varianty.index(v) for v in zobrazene]
+        # Zobrazené jsou varianty s nejlepším průměrným pořadím
+        soucty_poradi = poradi.sum(axis=0)
+        assert max(soucty_poradi[indexy]) <= min(np.delete(soucty_poradi, indexy))
+        assert krit_souhrn["citlivost_skore"] == skore[:, indexy].tolist()
+        assert krit_souhrn["citlivost_poradi"] == poradi[:, indexy].tolist()
+
+        ostatni = krit_souhrn["ostatni"]
+        zbyle = np.delete(np.arange(pocet_variant), indexy)
+        assert ostatni["pocet"] == pocet_variant - Citlivost_numpy.TOP_K_SOUHRNU
+        assert ostatni["citlivost_skore_min"] == skore[:, zbyle].min(axis=1).tolist()
+        assert ostatni["citlivost_skore_max"] == skore[:, zbyle].max(axis=1).tolist()
+        assert ostatni["citlivost_poradi_min"] == poradi[:, zbyle].min(axis=1).tolist()
+        assert ostatni["citlivost_poradi_max"] == poradi[:, zbyle].max(axis=1).tolist()
+
+def test_souhrn_male_analyzy_obsahuje_vse():
+    pole = Vypocty_numpy.priprav_pole_z_json(_nahodna_analyza(12, 3, seed=6))
+    uplny = Citlivost_numpy.vypocitej_citlivost(*pole, "topsis")
+    souhrnny = Citlivost_numpy.vypocitej_citlivost(*pole, "topsis", souhrn=True)
+
+    for nazev, krit_souhrn in souhrnny["kriteria"].items():
+        assert krit_souhrn["zobrazene_varianty"] == pole[2]
+        assert "ostatni" not in krit_souhrn
+        assert krit_souhrn["citlivost_skore"] == uplny["kriteria"][nazev]["citlivost_skore"]
+
+@pytest.mark.parametrize("vaha_od, vaha_do", [(0.5, 0.5), (0.6, 0.4), (-0.1, 0.5), (0.2, 1.1)])
+def test_neplatny_rozsah_vah(vaha_od, vaha_do):
+    with pytest.raises(ValueError):
+        Citlivost_numpy.vytvor_rozsah_vah(9, vaha_od, vaha_do)
+
+# ============= Monte Carlo =============
+
+def test_monte_carlo_reprodukovatelne_se_seedem():
+    pole = Vypocty_numpy.priprav_pole_z_json(_nahodna_analyza(6, 4, seed=3))
+    prvni = Monte_carlo_numpy.vypocitej_monte_carlo(*pole, pocet_vzorku=2000, koncentrace=5.0, seed=42)
+    druhy = Monte_carlo_numpy.vypocitej_monte_carlo(*pole, pocet_vzorku=2000, koncentrace=5.0, seed=42)
+    jiny = Monte_carlo_numpy.vypocitej_monte_carlo(*pole, pocet_vzorku=2000, koncentrace=5.0, seed=43)
+
+    assert prvni == druhy
+    assert any(
+        prvni["vysledky"][m]["akceptovatelnost_poradi"] != jiny["vysledky"][m]["akceptovatelnost_poradi"]
+        for m in Monte_carlo_numpy.PODPOROVANE_METODY
+    )
+
+@pytest.mark.parametrize("rezim, pasma", [("dirichlet", None), ("pasma", 0.1)])
+def test_monte_carlo_akceptovatelnost(rezim, pasma):
+    pocet_variant = 6
+    pole = Vypocty_numpy.priprav_pole_z_json(_nahodna_analyza(pocet_variant, 4, seed=4))
+    vysledek = Monte_carlo_numpy.vypocitej_monte_carlo(
+        *pole, pocet_vzorku=1500, rezim=rezim, pasma=pasma, seed=1
+    )
+
+    for metoda in Monte_carlo_numpy.PODPOROVANE_METODY:
+        vysledky_metody = vysledek["vysledky"][metoda]
+        akceptovatelnost = np.array(vysledky_metody["akceptovatelnost_poradi"])
+        # Každá varianta má v každém vzorku právě jedno pořadí a naopak
+        assert np.allclose(akceptovatelnost.sum(axis=1), 1.0)
+        assert np.allclose(akceptovatelnost.sum(axis=0), 1.0)
+        assert sum(vysledky_metody["pravdepodobnost_nejlepsi"].values()) == pytest.approx(1.0)
+        assert all(1 <= p <= pocet_variant for p in vysledky_metody["prumerne_poradi"].values())
+
+def test_monte_carlo_dominantni_varianta():
+    # V1 je nejlepší ve všech kritériích, pořadí nezávisí na vahách
+    hodnoty = [[10.0, 1.0, 10.0], [5.0, 4.0, 2.0], [3.0, 2.0, 6.0], [1.0, 5.0, 1.0]]
+    pole = Vypocty_numpy.priprav_pole_z_json(_analyza(hodnoty))
+    vysledek = Monte_carlo_numpy.vypocitej_monte_carlo(*pole, pocet_vzorku=500, koncentrace=1.0, seed=7)
+
+    for metoda in Monte_carlo_numpy.PODPOROVANE_METODY:
+        assert vysledek["vysledky"][metoda]["pravdepodobnost_nejlepsi"]["V1"] == 1.0
@@ -0,0 +1,320 @@
+# -------------------------------------------------------
+# Testy částečných úprav analýz (CRUD_analyzy) a serverové
+# cache výsledků (Cache_vysledku)
+#
+# Tabulky Anvilu, uživatele a Media nahrazují jednoduché náhrady
+# v paměti dosazené přes monkeypatch.
+# -------------------------------------------------------
+import contextlib
+import copy
+import datetime
+import json
+import types
+
+import numpy as np
+import pytest
+
+from MCApp import CRUD_analyzy, Cache_vysledku, Format_analyzy, Konstanty
+
+class _Radek(dict):
+    """Řádek tabulky v paměti."""
+
+    def __init__(self, tabulka, id_radku, **hodnoty):
+        super().__init__(**hodnoty)
+        self._tabulka = tabulka
+        self._id = id_radku
+
+    def get_id(self):
+        return self._id
+
+    def delete(self):
+        self._tabulka.radky.remove(self)
+
+class _Podminka:
+    """Podmínka dotazu (náhrada anvil.tables.query)."""
+
+    def __init__(self, splnuje):
+        self.splnuje = splnuje
+
+class _Tabulka:
+    """Tabulka v paměti s podmnožinou rozhraní app_tables."""
+
+    def __init__(self):
+        self.radky = []
+
+    def add_row(self, **hodnoty):
+        radek = _Radek(self, f"[{len(self.radky) + 1}]", **hodnoty)
+        self.radky.append(radek)
+        return radek
+
+    def get_by_id(self, id_radku):
+        return next((radek for radek in self.radky if radek.get_id() == id_radku), None)
+
+    def search(self, **podminky):
+        def vyhovuje(radek):
+            return all(
+                podminka.splnuje(radek.get(sloupec)) if isinstance(podminka, _Podminka)
+                else radek.get(sloupec) == podminka
+                for sloupec, podminka in podminky.items()
+            )
+        return [radek for radek in self.radky if vyhovuje(radek)]
+
+    def delete_all_rows(self):
+        del self.radky[:]
+
+class _Media:
+    """Náhrada anvil.BlobMedia."""
+
+    def __init__(self, content_type, obsah, name=None):
+        self.content_type = content_type
+        self.name = name
+        self._obsah = obsah
+
+    def get_bytes(self):
+        return self._obsah
+
+_q = types.SimpleNamespace(
+    any_of=lambda *hodnoty: _Podminka(lambda x: x in hodnoty),
+    less_than=lambda mez: _Podminka(lambda x: x < mez),
+)
+
+# ============= Částečné úpravy analýz =============
+
+VLASTNIK = {"email": "vlastnik@example.com", "role": "uzivatel"}
+
+def _data_analyzy():
+    """Vrátí data analýzy ve formátu verze 1."""
+    return {
+        "popis_analyzy": "Výběr dodavatele",
+        "kriteria": {
+            "Cena": {"typ": "min", "vaha": 0.5},
+            "Kvalita": {"typ": "max", "vaha": 0.3},
+            "Dodání": {"typ": "min", "vaha": 0.2},
+        },
+        "varianty": {
+            "A": {"popis_varianty": "", "Cena": 100, "Kvalita": 7, "Dodání": 5},
+            "B": {"popis_varianty": "Levná", "Cena": 80.5, "Kvalita": 5, "Dodání": 9},
+            "C": {"popis_varianty": "", "Cena": 120, "Kvalita": 9, "Dodání": 3},
+        },
+    }
+
+ZMENY = [
+    {"operace": "nastav_hodnotu", "varianta": "A", "kriterium": "Cena", "hodnota": "95.5"},
+    {"operace": "nastav_kriterium", "kriterium": "Servis", "typ": "max", "vaha": 0.1},
+    {"operace": "zmen_vahu", "kriterium": "Cena", "vaha": 0.4},
+    {"operace": "prejmenuj_kriterium", "puvodni": "Dodání", "novy": "Doba dodání"},
+    {"operace": "pridej_variantu", "varianta": "D", "popis_varianty": "Nová",
+     "hodnoty": {"Cena": 90, "Kvalita": 6, "Doba dodání": 4, "Servis": 8}},
+    {"operace": "prejmenuj_variantu", "puvodni": "B", "novy": "B2"},
+    {"operace": "nastav_popis_varianty", "varianta": "C", "popis_varianty": "Dražší"},
+    {"operace": "odeber_variantu", "varianta": "A"},
+    {"operace": "nastav_hodnotu", "varianta": "B2", "kriterium": "Servis", "hodnota": 3},
+    {"operace": "nastav_hodnotu", "varianta": "C", "kriterium": "Servis", "hodnota": 5},
+    {"operace": "odeber_kriterium", "kriterium": "Kvalita"},
+    {"operace": "zmen_vahu", "kriterium": "Cena", "vaha": 0.7},
+    {"operace": "nastav_popis_analyzy", "popis_analyzy": "Výběr dodavatele 2026"},
+]
+
+@pytest.fixture
+def analyzy(monkeypatch):
+    """Tabulka analýz v paměti; vrací ji spolu se seznamem zneplatněných ID."""
+    tabulka = _Tabulka()
+    zneplatnene = []
+    monkeypatch.setattr(CRUD_analyzy, "app_tables", types.SimpleNamespace(analyzy=tabulka))
+    monkeypatch.setattr(CRUD_analyzy.tables, "Transaction", contextlib.nullcontext, raising=False)
+    monkeypatch.setattr(CRUD_analyzy.anvil.users, "get_user", lambda: VLASTNIK, raising=False)
+    monkeypatch.setattr(CRUD_analyzy.Cache_vysledku, "zneplatni_analyzu", zneplatnene.append)
+    return tabulka, zneplatnene
+
+def _pridej_analyzu(tabulka, data_json, verze=1):
+    """Přidá řádek analýzy a vrátí jeho ID."""
+    return tabulka.add_row(
+        nazev="Analýza", uzivatel=VLASTNIK, data_json=data_json, verze=verze,
+        datum_vytvoreni=datetime.datetime(2026, 1, 1), datum_upravy=None,
+        **CRUD_analyzy.souhrn_dat_analyzy(data_json)
+    ).get_id()
+
+@pytest.mark.parametrize("kompaktni", [True, False])
+def test_zmeny_shodne_s_ulozenim_celych_dat(analyzy, kompaktni):
+    tabulka, zneplatnene = analyzy
+    puvodni = _data_analyzy()
+    ulozena = Format_analyzy.zabal_data(puvodni) if kompaktni else copy.deepcopy(puvodni)
+    id_zmenami = _pridej_analyzu(tabulka, copy.deepcopy(ulozena))
+    id_celkem = _pridej_analyzu(tabulka, copy.deepcopy(ulozena))
+
+    assert CRUD_analyzy.uprav_analyzu_zmenami(id_zmenami, copy.deepcopy(ZMENY), verze=1) == 2
+
+    ocekavana = copy.deepcopy(puvodni)
+    CRUD_analyzy.proved_zmeny(ocekavana, copy.deepcopy(ZMENY))
+    assert CRUD_analyzy.uprav_analyzu(id_celkem, data=ocekavana, verze=1) == 2
+
+    radek_zmenami = tabulka.get_by_id(id_zmenami)
+    radek_celkem = tabulka.get_by_id(id_celkem)
+    assert radek_zmenami["data_json"] == radek_celkem["data_json"]
+    assert Format_analyzy.je_kompaktni(radek_zmenami["data_json"])
+    assert Format_analyzy.rozbal_data(radek_zmenami["data_json"]) == ocekavana
+    assert radek_zmenami["pocet_variant"] == 3 and radek_zmenami["pocet_kriterii"] == 3
+    assert zneplatnene == [id_zmenami, id_celkem]
+
+    # Pořadí variant a kritérií zůstává zachované
+    assert list(ocekavana["varianty"]) == ["B2", "C", "D"]
+    assert list(ocekavana["kriteria"]) == ["Cena", "Doba dodání", "Servis"]
+    assert ocekavana["varianty"]["C"]["Servis"] == 5.0
+
+def test_konflikt_verze(analyzy):
+    tabulka, zneplatnene = analyzy
+    id_analyzy = _pridej_analyzu(tabulka, Format_analyzy.zabal_data(_data_analyzy()), verze=3)
+    ulozena = copy.deepcopy(tabulka.get_by_id(id_analyzy)["data_json"])
+
+    zmena = [{"operace": "nastav_hodnotu", "varianta": "A", "kriterium": "Cena", "hodnota": 1}]
+    with pytest.raises(ValueError) as chyba:
+        CRUD_analyzy.uprav_analyzu_zmenami(id_analyzy, zmena, verze=2)
+    assert Konstanty.ZPRAVY_CHYB["KONFLIKT_VERZE"] in str(chyba.value)
+    with pytest.raises(ValueError) as chyba:
+        CRUD_analyzy.uprav_analyzu(id_analyzy, data=_data_analyzy(), verze=2)
+    assert Konstanty.ZPRAVY_CHYB["KONFLIKT_VERZE"] in str(chyba.value)
+
+    radek = tabulka.get_by_id(id_analyzy)
+    assert radek["verze"] == 3 and radek["data_json"] == ulozena
+    assert zneplatnene == []
+
+    assert CRUD_analyzy.uprav_analyzu_zmenami(id_analyzy, zmena, verze=3) == 4
+
+@pytest.mark.parametrize("zmeny", [
+    [{"operace": "nastav_hodnotu", "varianta": "A", "kriterium": "Cena", "hodnota": 1},
+     {"operace": "nastav_hodnotu", "varianta": "X", "kriterium": "Cena", "hodnota": 1}],
+    [{"operace": "zmen_vahu", "kriterium": "Cena", "vaha": 0.9}],
+    [{"operace": "prejmenuj_variantu", "puvodni": "A", "novy": "B"}],
+    [{"operace": "nastav_hodnotu", "varianta": "A", "kriterium": "Cena", "hodnota": "levná"}],
+    [{"operace": "smaz_vse"}],
+])
+def test_neplatne_zmeny_nic_neulozi(analyzy, zmeny):
+    tabulka, zneplatnene = analyzy
+    id_analyzy = _pridej_analyzu(tabulka, _data_analyzy())
+
+    with pytest.raises(ValueError):
+        CRUD_analyzy.uprav_analyzu_zmenami(id_analyzy, zmeny, verze=1)
+    radek = tabulka.get_by_id(id_analyzy)
+    assert radek["verze"] == 1 and radek["data_json"] == _data_analyzy()
+    assert zneplatnene == []
+
+def test_zmeny_cizi_analyzy_odmitnuty(analyzy, monkeypatch):
+    tabulka, _ = analyzy
+    id_analyzy = _pridej_analyzu(tabulka, _data_analyzy())
+    monkeypatch.setattr(CRUD_analyzy.anvil.users, "get_user", lambda: {"email": "jiny@example.com"})
+
+    with pytest.raises(ValueError, match="oprávnění"):
+        CRUD_analyzy.uprav_analyzu_zmenami(id_analyzy, [], verze=1)
+    monkeypatch.setattr(CRUD_analyzy.anvil.users, "get_user", lambda: {"email": "admin@example.com", "role": "admin"})
+    assert CRUD_analyzy.uprav_analyzu_zmenami(id_analyzy, [], verze=1, nazev="Přejmenovaná") == 2
+    assert tabulka.get_by_id(id_analyzy)["nazev"] == "Přejmenovaná"
+
+# ============= Cache výsledků =============
+
+@pytest.fixture
+def cache(monkeypatch):
+    """Cache nad tabulkou v paměti s nastavitelným časem; vrací [tabulka, hodiny]."""
+    tabulka = _Tabulka()
+    hodiny = [1000.0]
+    monkeypatch.setattr(Cache_vysledku, "app_tables", types.SimpleNamespace(cache_vysledku=tabulka))
+    monkeypatch.setattr(Cache_vysledku, "q", _q)
+    monkeypatch.setattr(Cache_vysledku, "time", types.SimpleNamespace(time=lambda: hodiny[0]))
+    monkeypatch.setattr(Cache_vysledku.anvil, "BlobMedia", _Media, raising=False)
+    Cache_vysledku.vycisti()
+    yield tabulka, hodiny
+    Cache_vysledku.vycisti()
+
+def _vysledek(velikost=50):
+    """Vrátí výsledek, jehož JSON má zhruba zadaný počet bajtů."""
+    return {"results": [["V1", 1, 0.5]], "vypln": "x" * velikost}
+
+def _velikost(vysledek):
+    return len(json.dumps(vysledek, ensure_ascii=False).encode("utf-8"))
+
+def test_klic_a_otisk_dat():
+    data = _data_analyzy()
+    otisk = Cache_vysledku.hash_dat(data)
+    assert Cache_vysledku.hash_dat(dict(data, nazev="Jiný", popis_analyzy="Jiný")) == otisk
+    zmenena = copy.deepcopy(data)
+    zmenena["varianty"]["A"]["Cena"] = 101
+    assert Cache_vysledku.hash_dat(zmenena) != otisk
+
+    assert Cache_vysledku.vytvor_klic("A", otisk, "WSM", 0.7, 0.3) == ("A", otisk, "wsm", None, None)
+    assert Cache_vysledku.vytvor_klic("A", otisk, "electre", 0.7, 0.3) == ("A", otisk, "electre", 0.7, 0.3)
+
+def test_lru_podle_velikosti(cache, monkeypatch):
+    tabulka, _ = cache
+    vysledek = _vysledek()
+    monkeypatch.setattr(Cache_vysledku, "MAX_VELIKOST_PAMETI_B", 2 * _velikost(vysledek))
+    klice = [Cache_vysledku.vytvor_klic("A", "otisk", metoda) for metoda in ("wsm", "wpm", "topsis")]
+
+    Cache_vysledku.uloz(klice[0], vysledek)
+    Cache_vysledku.uloz(klice[1], vysledek)
+    assert Cache_vysledku.nacti(klice[0]) == vysledek
+    Cache_vysledku.uloz(klice[2], vysledek)
+
+    # Z paměti se vytlačí nejdéle nepoužitá položka, v tabulce zůstanou všechny
+    assert list(Cache_vysledku._polozky) == [klice[0], klice[2]]
+    statistiky = Cache_vysledku.statistiky()
+    assert statistiky["vytlacene"] == 1
+    assert statistiky["velikost_b"] <= Cache_vysledku.MAX_VELIKOST_PAMETI_B
+    assert len(tabulka.radky) == 3
+
+    assert Cache_vysledku.nacti(klice[1]) == vysledek
+    assert Cache_vysledku.statistiky()["zasahy_tabulky"] == 1
+
+def test_prilis_velky_vysledek_se_neulozi(cache, monkeypatch):
+    tabulka, _ = cache
+    monkeypatch.setattr(Cache_vysledku, "MAX_VELIKOST_POLOZKY_B", 100)
+    klic = Cache_vysledku.vytvor_klic("A", "otisk", "wsm")
+
+    Cache_vysledku.uloz(klic, _vysledek(200))
+    assert Cache_vysledku.nacti(klic) is None
+    assert tabulka.radky == []
+    assert Cache_vysledku.statistiky()["prilis_velke"] == 1
+
+def test_platnost_vysledku(cache):
+    tabulka, hodiny = cache
+    stary = Cache_vysledku.vytvor_klic("A", "otisk", "wsm")
+    Cache_vysledku.uloz(stary, _vysledek())
+
+    hodiny[0] += Cache_vysledku.PLATNOST_S
+    assert Cache_vysledku.nacti(stary) == _vysledek()
+
+    hodiny[0] += 1
+    novy = Cache_vysledku.vytvor_klic("B", "otisk", "wsm")
+    Cache_vysledku.uloz(novy, _vysledek())
+    # Uložení odstraní z tabulky vypršené položky ostatních analýz
+    assert [radek["analyza_id"] for radek in tabulka.radky] == ["B"]
+    assert Cache_vysledku.nacti(stary) is None
+    assert Cache_vysledku.nacti(novy) == _vysledek()
+
+    hodiny[0] += Cache_vysledku.PLATNOST_S + 1
+    Cache_vysledku._polozky.clear()
+    assert Cache_vysledku.nacti(novy) is None
+    assert tabulka.radky == []
+    assert Cache_vysledku.statistiky()["vyprsene"] == 1
+
+def test_zneplatneni_analyz(cache):
+    tabulka, _ = cache
+    for analyza_id in ("A", "B", "C"):
+        for metoda in ("wsm", "topsis"):
+            Cache_vysledku.uloz(Cache_vysledku.vytvor_klic(analyza_id, "otisk", metoda), _vysledek())
+
+    assert Cache_vysledku.zneplatni_analyzu("A") == 2
+    assert Cache_vysledku.zneplatni_analyzy(["B", "C", "X"]) == 4
+    assert Cache_vysledku.zneplatni_analyzy([]) == 0
+    assert tabulka.radky == [] and not Cache_vysledku._polozky
+    assert Cache_vysledku.nacti(Cache_vysledku.vytvor_klic("A", "otisk", "wsm")) is None
+    assert Cache_vysledku.statistiky()["zneplatnene"] == 6
+
+def test_pole_numpy_se_ulozi_jako_seznamy(cache, monkeypatch):
+    # Paměť pojme jen poslední položku, první se pak načte z tabulky
+    monkeypatch.setattr(Cache_vysledku, "MAX_VELIKOST_PAMETI_B", 1)
+    klic = Cache_vysledku.vytvor_klic("A", "otisk", "electre", 0.7, 0.3)
+    Cache_vysledku.uloz(klic, {"indptr": np.array([0, 1, 3]), "pocet": np.int64(3)})
+    Cache_vysledku.uloz(Cache_vysledku.vytvor_klic("A", "otisk", "wsm"), _vysledek())
+
+    assert Cache_vysledku.nacti(klic) == {"indptr": [0, 1, 3], "pocet": 3}
+    with pytest.raises(TypeError):
+        Cache_vysledku.uloz(klic, {"mnozina": {1, 2}})
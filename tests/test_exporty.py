@@ -0,0 +1,151 @@
+# -------------------------------------------------------
+# Testy exportů - hromadný ZIP export (Hromadny_export),
+# HTML pro PDF report (Pdf_report) a SVG grafy (Grafy_svg)
+# -------------------------------------------------------
+import csv
+import html
+import io
+import json
+import os
+import random
+import xml.etree.ElementTree as ET
+import zipfile
+
+import pytest
+
+from MCApp import Grafy_svg, Hromadny_export, Pdf_report, Rozhodovaci_matice, Vypocty
+
+def _analyza(nazev, pocet_variant, seed, nazvy_variant=None):
+    """Vrátí data analýzy s celočíselnými hodnotami a třemi kritérii."""
+    r = random.Random(seed)
+    kriteria = {
+        "Cena": {"typ": "min", "vaha": 0.5},
+        "Výkon": {"typ": "max", "vaha": 0.3},
+        "Záruka": {"typ": "max", "vaha": 0.2},
+    }
+    nazvy_variant = nazvy_variant or [f"V{i + 1}" for i in range(pocet_variant)]
+    varianty = {}
+    for nazev_varianty in nazvy_variant:
+        varianta = {"popis_varianty": ""}
+        varianta.update({k: r.randint(1, 50) for k in kriteria})
+        varianty[nazev_varianty] = varianta
+    return {"nazev": nazev, "popis_analyzy": "", "kriteria": kriteria, "varianty": varianty}
+
+# ============= Hromadný export =============
+
+@pytest.fixture
+def ulozene_analyzy(monkeypatch):
+    """Dosadí načítání analýz z paměti a Media jako (obsah, typ, název, cesta k souboru)."""
+    analyzy = {
+        "a1": _analyza("Nákup/servery", 5, seed=1),
+        "a2": _analyza("Nákup/servery", 4, seed=2),
+        "a3": _analyza("Dodavatel", 6, seed=3),
+    }
+
+    def nacti_analyzu_pro_vypocet(analyza_id):
+        if analyza_id not in analyzy:
+            raise ValueError(f"Analýza s ID {analyza_id} neexistuje.")
+        analyza_data = dict(analyzy[analyza_id], id=analyza_id)
+        return analyza_data, Rozhodovaci_matice.Rozhodovaci_matice.z_json(analyza_data)
+
+    def from_file(cesta, content_type, nazev):
+        with open(cesta, "rb") as soubor:
+            return soubor.read(), content_type, nazev, cesta
+
+    monkeypatch.setattr(Hromadny_export.CRUD_analyzy, "nacti_analyzu_pro_vypocet", nacti_analyzu_pro_vypocet)
+    monkeypatch.setattr(Hromadny_export.anvil.media, "from_file", from_file, raising=False)
+    return analyzy
+
+def test_zip_analyz(ulozene_analyzy):
+    postup = []
+    obsah, content_type, nazev, cesta = Hromadny_export.sestav_zip_analyz(
+        ["a1", "a2", "chybi", "a3", "a1"], metody=["wsm", "topsis"], formaty=["JSON", "csv", "xlsx"],
+        nahlas_postup=lambda podil, zprava: postup.append(podil)
+    )
+    assert content_type == "application/zip" and nazev.endswith(".zip")
+    assert not os.path.exists(cesta)
+    assert postup == [0.0, 0.25, 0.5, 0.75, 1.0]
+
+    archiv = zipfile.ZipFile(io.BytesIO(obsah))
+    prehled = list(csv.reader(io.StringIO(archiv.read("prehled.csv").decode("utf-8-sig")), delimiter=";"))
+    assert prehled[0] == ["ID", "Název", "Složka", "Stav"]
+    assert prehled[1] == ["a1", "Nákup/servery", "Nákup_servery", "OK"]
+    # Stejný název dostane vlastní složku s ID analýzy
+    assert prehled[2] == ["a2", "Nákup/servery", "Nákup_servery_a2", "OK"]
+    assert prehled[3][:3] == ["chybi", "", ""] and prehled[3][3].startswith("Chyba: ")
+    assert prehled[4] == ["a3", "Dodavatel", "Dodavatel", "OK"]
+    assert len(prehled) == 5
+
+    for adresar in ("Nákup_servery", "Nákup_servery_a2", "Dodavatel"):
+        for pripona in ("xlsx", "json", "csv"):
+            assert f"{adresar}/{adresar}.{pripona}" in archiv.namelist()
+
+    analyza_data = ulozene_analyzy["a3"]
+    ocekavane = Vypocty.vypocitej_wsm_analyzu(analyza_data)["wsm_vysledky"]["results"]
+    ulozeny_json = json.loads(archiv.read("Dodavatel/Dodavatel.json"))
+    assert ulozeny_json["id"] == "a3"
+    assert ulozeny_json["varianty"] == analyza_data["varianty"]
+    assert list(ulozeny_json["vysledky"]) == ["wsm", "topsis"]
+    assert [tuple(r) for r in ulozeny_json["vysledky"]["wsm"]["wsm_vysledky"]["results"]] == [
+        tuple(r) for r in ocekavane
+    ]
+
+    radky_csv = list(csv.reader(io.StringIO(archiv.read("Dodavatel/Dodavatel.csv").decode("utf-8-sig")), delimiter=";"))
+    assert radky_csv[0] == ["Varianta", "WSM pořadí", "WSM skóre", "TOPSIS pořadí", "TOPSIS skóre"]
+    assert [radek[0] for radek in radky_csv[1:]] == list(analyza_data["varianty"])
+    poradi_wsm = {varianta: poradi for varianta, poradi, _ in ocekavane}
+    assert all(int(radek[1]) == poradi_wsm[radek[0]] for radek in radky_csv[1:])
+
+@pytest.mark.parametrize("analyza_ids, formaty", [([], None), (["a1"], ["pdf"])])
+def test_zip_analyz_neplatne_parametry(ulozene_analyzy, analyza_ids, formaty):
+    with pytest.raises(ValueError):
+        Hromadny_export.sestav_zip_analyz(analyza_ids, formaty=formaty)
+
+# ============= SVG grafy a PDF report =============
+
+def test_svg_graf_je_platne_xml():
+    results = [(f"<V{i}> & \"spol\"", i + 1, 1.0 - 0.1 * i) for i in range(Grafy_svg.MAX_VARIANT_GRAFU + 10)]
+    svg = Grafy_svg.vytvor_sloupcovy_graf_svg(list(reversed(results)), "Graf <WSM> & spol", "Skóre")
+
+    koren = ET.fromstring(svg)
+    texty = [prvek.text for prvek in koren.iter("{http://www.w3.org/2000/svg}text")]
+    assert texty[0] == "Graf <WSM> & spol"
+    popisky = [text for text in texty if text.split(". ")[0].isdigit()]
+    assert len(popisky) == Grafy_svg.MAX_VARIANT_GRAFU
+    assert popisky[0] == '1. <V0> & "spol"'
+    assert any("10 vynecháno" in text for text in texty)
+    # Každá zobrazená varianta má jeden sloupec
+    assert len(list(koren.iter("{http://www.w3.org/2000/svg}rect"))) == Grafy_svg.MAX_VARIANT_GRAFU
+
+def test_svg_graf_bez_variant():
+    assert Grafy_svg.vytvor_sloupcovy_graf_svg([], "Graf") == ""
+
+METODY_REPORTU = {
+    "wsm": Vypocty.vypocitej_wsm_analyzu,
+    "wpm": Vypocty.vypocitej_wpm_analyzu,
+    "topsis": Vypocty.vypocitej_topsis_analyzu,
+    "electre": Vypocty.vypocitej_electre_analyzu,
+    "mabac": Vypocty.vypocitej_mabac_analyzu,
+}
+
+@pytest.mark.parametrize("pocet_variant", [5, Pdf_report.MAX_VARIANT_PODROBNEHO_REPORTU + 1])
+def test_html_reportu_escapuje_nazvy(pocet_variant):
+    nazvy = [f"<b>V{i}</b> & co" for i in range(pocet_variant)]
+    analyza_data = _analyza("<script>alert(1)</script> & spol", pocet_variant, seed=4, nazvy_variant=nazvy)
+    analyza_data["kriteria"]["<i>Servis</i>"] = analyza_data["kriteria"].pop("Záruka")
+    for varianta in analyza_data["varianty"].values():
+        varianta["<i>Servis</i>"] = varianta.pop("Záruka")
+        varianta["popis_varianty"] = "<img src='x'>"
+    metody = ["mabac", "wsm"] if pocet_variant > 100 else list(METODY_REPORTU)
+    vsechny_vysledky = {metoda: METODY_REPORTU[metoda](analyza_data) for metoda in metody}
+
+    html_reportu = Pdf_report.vytvor_html_reportu(analyza_data, vsechny_vysledky, metody)
+    assert "<title>&lt;script&gt;alert(1)&lt;/script&gt; &amp; spol</title>" in html_reportu
+    for text in ("<script>", "<b>V", "<i>Servis", "<img"):
+        assert text not in html_reportu
+    assert html.escape(nazvy[0]) in html_reportu
+    assert [html_reportu.index(f"Výsledky metody {m.upper()}") for m in metody] == sorted(
+        html_reportu.index(f"Výsledky metody {m.upper()}") for m in metody
+    )
+    nejlepsi = vsechny_vysledky["wsm"]["wsm_vysledky"]["nejlepsi_varianta"]
+    assert html.escape(nejlepsi) in html_reportu
@@ -0,0 +1,162 @@
+# -------------------------------------------------------
+# Testy kompaktního formátu uložených dat (Format_analyzy)
+# a sdílené normalizační vrstvy (Normalizace)
+#
+# Data verze 1 musí po zabalení a rozbalení vyjít přesně stejná,
+# včetně rozlišení int a float u každé hodnoty.
+# -------------------------------------------------------
+import json
+import random
+
+import numpy as np
+import pytest
+
+from MCApp import Format_analyzy, Normalizace, Vypocty_numpy
+
+def _analyza(hodnoty, typy=None, vahy=None):
+    """Sestaví data analýzy z matice hodnot [varianty][kriteria]."""
+    pocet_kriterii = len(hodnoty[0])
+    typy = typy or ["max" if j % 2 == 0 else "min" for j in range(pocet_kriterii)]
+    vahy = vahy or [1.0 / pocet_kriterii] * pocet_kriterii
+    kriteria = {f"K{j + 1}": {"typ": typy[j], "vaha": vahy[j]} for j in range(pocet_kriterii)}
+    varianty = {}
+    for i, radek in enumerate(hodnoty):
+        varianta = {"popis_varianty": f"Popis {i + 1}"}
+        varianta.update({f"K{j + 1}": hodnota for j, hodnota in enumerate(radek)})
+        varianty[f"V{i + 1}"] = varianta
+    return {"popis_analyzy": "Testovací analýza", "kriteria": kriteria, "varianty": varianty}
+
+def _typy_hodnot(data):
+    """Vrátí typ každé hodnoty matice, aby se rozlišilo 1 a 1.0."""
+    return {
+        (var_nazev, klic): type(hodnota)
+        for var_nazev, var_data in data["varianty"].items()
+        for klic, hodnota in var_data.items()
+    }
+
+def _over_prevod(data):
+    """Ověří, že se data zabalí a po uložení do JSON rozbalí beze změny."""
+    ulozena = Format_analyzy.zabal_data(data)
+    assert Format_analyzy.je_kompaktni(ulozena)
+    assert Format_analyzy.zabal_data(ulozena) is ulozena
+    rozbalena = Format_analyzy.rozbal_data(json.loads(json.dumps(ulozena)))
+    assert rozbalena == data
+    assert list(rozbalena["varianty"]) == list(data["varianty"])
+    assert _typy_hodnot(rozbalena) == _typy_hodnot(data)
+    return ulozena
+
+# ============= Format_analyzy =============
+
+def test_prevod_celociselne_matice():
+    ulozena = _over_prevod(_analyza([[1, 2, 3], [4, 5, 6]]))
+    assert ulozena["cela_cisla"] is True
+    assert "maska_celych_cisel" not in ulozena
+
+def test_prevod_desetinne_matice():
+    r = random.Random(1)
+    ulozena = _over_prevod(_analyza([[r.uniform(-1e6, 1e6) for _ in range(4)] for _ in range(30)]))
+    assert ulozena["cela_cisla"] is False
+    assert "maska_celych_cisel" not in ulozena
+
+def test_prevod_smisene_matice():
+    ulozena = _over_prevod(_analyza([[1, 2.5, 3], [4.0, 5, -6.25], [7, 8, 9.0]]))
+    assert ulozena["cela_cisla"] is False
+    assert "maska_celych_cisel" in ulozena
+
+def test_prevod_chybejicich_hodnot_a_popisu():
+    data = _analyza([[1, 2.5], [3, 4], [5.5, 6]])
+    del data["varianty"]["V1"]["K2"]
+    del data["varianty"]["V3"]["popis_varianty"]
+    data["varianty"]["V2"]["popis_varianty"] = ""
+    ulozena = _over_prevod(data)
+    assert ulozena["chybejici"] == [1]
+
+def test_prevod_prazdne_analyzy():
+    _over_prevod({"popis_analyzy": "", "kriteria": {}, "varianty": {}})
+    _over_prevod({"popis_analyzy": "", "kriteria": {"K1": {"typ": "max", "vaha": 1.0}}, "varianty": {}})
+
+@pytest.mark.parametrize("uprava", [
+    lambda d: d["varianty"]["V1"].update(K1="10"),
+    lambda d: d["varianty"]["V1"].update(K1=True),
+    lambda d: d["varianty"]["V1"].update(K1=2 ** 53 + 1),
+    lambda d: d["varianty"]["V1"].update(poznamka="navíc"),
+    lambda d: d["kriteria"]["K1"].update(jednotka="Kč"),
+    lambda d: d["kriteria"].update(popis_varianty={"typ": "max", "vaha": 0.0}),
+])
+def test_nezabalitelna_data_zustanou_ve_verzi_1(uprava):
+    data = _analyza([[1, 2], [3, 4]])
+    uprava(data)
+    assert Format_analyzy.zabal_data(data) is data
+    assert Format_analyzy.rozbal_data(data) is data
+
+def test_rozhodovaci_matice_shodna_pro_obe_verze():
+    data = _analyza([[1, 2.5, 3], [4.0, 5, -6.25], [7, 8, 9.0]], vahy=[0.5, 0.3, 0.2])
+    z_verze_1 = Format_analyzy.priprav_rozhodovaci_matici(data)
+    z_verze_2 = Format_analyzy.priprav_rozhodovaci_matici(Format_analyzy.zabal_data(data))
+
+    assert z_verze_2.varianty == z_verze_1.varianty
+    assert z_verze_2.kriteria == z_verze_1.kriteria
+    assert z_verze_2.typy_kriterii == z_verze_1.typy_kriterii
+    assert z_verze_2.vahy == z_verze_1.vahy
+    assert z_verze_2.jako_seznam() == z_verze_1.jako_seznam()
+
+def test_chybejici_hodnota_odmitnuta_v_obou_verzich():
+    data = _analyza([[1, 2], [3, 4]])
+    del data["varianty"]["V2"]["K1"]
+    with pytest.raises(ValueError) as verze_1:
+        Format_analyzy.priprav_rozhodovaci_matici(data)
+    with pytest.raises(ValueError) as verze_2:
+        Format_analyzy.priprav_rozhodovaci_matici(Format_analyzy.zabal_data(data))
+    assert "V2" in str(verze_1.value) and "V2" in str(verze_2.value)
+
+# ============= Normalizace =============
+
+def _nahodna_matice(seed, pocet_variant=15, pocet_kriterii=5):
+    """Vrátí náhodnou matici, poslední sloupec má shodné hodnoty."""
+    r = random.Random(seed)
+    return [[r.uniform(-10.0, 50.0) for _ in range(pocet_kriterii - 1)] + [3.0] for _ in range(pocet_variant)]
+
+def test_minmax_shodna_s_numpy():
+    matice = _nahodna_matice(1)
+    typy = ["max", "min", "max", "min", "max"]
+    norm_matice = Normalizace.normalizuj_minmax(matice, typy)
+    ocekavana = Vypocty_numpy.normalizuj_matici_minmax(np.array(matice), typy)
+    assert np.allclose(norm_matice, ocekavana, rtol=0, atol=1e-15)
+    assert all(radek[-1] == 1.0 for radek in norm_matice)
+
+def test_vektorova_normalizace_a_soucty():
+    matice = _nahodna_matice(2)
+    matice.append([0.0] * 4 + [3.0])
+    for radek in matice:
+        radek.append(0.0)
+
+    vektorove = np.array(Normalizace.normalizuj_vektorove(matice))
+    assert np.allclose((vektorove[:, :-1] ** 2).sum(axis=0), 1.0)
+    assert (vektorove[:, -1] == 0).all()
+
+    souctem = np.array(Normalizace.normalizuj_souctem(matice))
+    assert np.allclose(souctem[:, :-1].sum(axis=0), 1.0)
+    assert (souctem[:, -1] == 0).all()
+
+def test_normalizace_maximem():
+    matice = [[2.0, 4.0], [4.0, 2.0], [1.0, 8.0]]
+    assert Normalizace.normalizuj_maximem(matice, ["max", "min"]) == [
+        [0.5, 0.5], [1.0, 1.0], [0.25, 0.25]
+    ]
+
+def test_cache_statistik_podle_identity_matice():
+    Normalizace.vycisti_cache()
+    matice = _nahodna_matice(3)
+    statistiky = Normalizace.ziskej_statistiky_sloupcu(matice)
+    assert statistiky == Normalizace.vypocitej_statistiky_sloupcu(matice)
+    assert Normalizace.ziskej_statistiky_sloupcu(matice) is statistiky
+    # Stejný obsah v jiném objektu se počítá znovu
+    assert Normalizace.ziskej_statistiky_sloupcu([list(r) for r in matice]) is not statistiky
+
+    for seed in range(Normalizace.MAX_POCET_V_CACHE):
+        Normalizace.ziskej_statistiky_sloupcu(_nahodna_matice(seed))
+    assert Normalizace.ziskej_statistiky_sloupcu(matice) is not statistiky
+
+    statistiky = Normalizace.ziskej_statistiky_sloupcu(matice)
+    Normalizace.vycisti_cache()
+    assert Normalizace.ziskej_statistiky_sloupcu(matice) is not statistiky
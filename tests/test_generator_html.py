@@ -0,0 +1,34 @@
+# -------------------------------------------------------
+# Testy HTML výstupů pro velké analýzy
+# -------------------------------------------------------
+import random
+
+from MCApp import Generator_html, Vypocty_numpy
+
+def _velka_analyza(pocet_variant, seed=1):
+    """Vrátí data analýzy s celočíselnými hodnotami a čtyřmi kritérii."""
+    r = random.Random(seed)
+    kriteria = {f"K{j}": {"typ": "max" if j % 2 else "min", "vaha": 0.25} for j in range(4)}
+    varianty = {}
+    for i in range(pocet_variant):
+        varianta = {"popis_varianty": ""}
+        varianta.update({k: r.randint(0, 20) for k in kriteria})
+        varianty[f"V{i}"] = varianta
+    return {"nazev": "Velká analýza", "kriteria": kriteria, "varianty": varianty}
+
+def test_html_electre_bez_hustych_matic():
+    analyza_data = _velka_analyza(Vypocty_numpy.MAX_VARIANT_HUSTE_ELECTRE + 1)
+    vysledky = Vypocty_numpy.vypocitej_electre(*Vypocty_numpy.priprav_pole_z_json(analyza_data))
+    assert vysledky["electre_vysledky"]["outranking_matrix"] is None
+
+    html = Generator_html.vytvor_kompletni_html_analyzy(
+        analyza_data, vysledky, "ELECTRE", Generator_html.MAX_RADKU_TABULKY
+    )
+    souhrn = vysledky["electre_vysledky"]["souhrn_prevahy"]
+    assert "Výpočet relace převahy" in html
+    assert "Matice souhlasu (Concordance matrix)" not in html
+    assert f"Převaha (Ano) platí u {souhrn['pocet_relaci']} z" in html
+    nejlepsi = vysledky["electre_vysledky"]["results"][0][0]
+    index_nejlepsi = vysledky["norm_vysledky"]["nazvy_variant"].index(nejlepsi)
+    assert f"<td>{nejlepsi}</td>" in html
+    assert f"{souhrn['prevysuje'][index_nejlepsi]}</td>" in html
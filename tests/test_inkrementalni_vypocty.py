@@ -0,0 +1,115 @@
+# -------------------------------------------------------
+# Testy přírůstkového přepočtu (Inkrementalni_vypocty)
+#
+# Po libovolné posloupnosti úprav musí přírůstkově udržované skóre
+# WSM a relativní blízkost TOPSIS odpovídat úplnému výpočtu
+# modulem Vypocty nad stejnými daty (až na zaokrouhlení).
+# -------------------------------------------------------
+import random
+
+import pytest
+
+from MCApp import Inkrementalni_vypocty, Rozhodovaci_matice, Vypocty
+
+TOLERANCE = 1e-8
+
+def _nahodna_analyza(r, pocet_variant, pocet_kriterii):
+    """Vrátí analýzu s malými celými hodnotami (častá shoda extrémů sloupců)."""
+    kriteria = {
+        f"K{j + 1}": {"typ": r.choice(["max", "min"]), "vaha": 1.0 / pocet_kriterii}
+        for j in range(pocet_kriterii)
+    }
+    varianty = {}
+    for i in range(pocet_variant):
+        varianta = {"popis_varianty": ""}
+        varianta.update({k: float(r.randint(0, 5)) for k in kriteria})
+        varianty[f"V{i + 1}"] = varianta
+    return {"kriteria": kriteria, "varianty": varianty}
+
+def _skore_podle_variant(vysledky):
+    """Převede 'results' na slovník varianta -> skóre."""
+    return {varianta: skore for varianta, _, skore in vysledky["results"]}
+
+def _over_shodu(stav, analyza_data):
+    """Porovná výsledky stavu s úplným výpočtem nad daty analýzy."""
+    rozhodovaci_matice = Rozhodovaci_matice.Rozhodovaci_matice.z_json(analyza_data)
+    wsm = Vypocty.vypocitej_wsm_analyzu(analyza_data, rozhodovaci_matice)["wsm_vysledky"]
+    topsis = Vypocty.topsis_vypocet(
+        rozhodovaci_matice.jako_seznam(), rozhodovaci_matice.vahy, rozhodovaci_matice.varianty,
+        rozhodovaci_matice.kriteria, rozhodovaci_matice.typy_kriterii
+    )
+    vysledky = stav.vysledky()
+    assert vysledky["pocet_variant"] == len(analyza_data["varianty"])
+
+    for ocekavane, skutecne in ((wsm, vysledky["wsm"]), (topsis, vysledky["topsis"])):
+        ocekavane_skore = _skore_podle_variant(ocekavane)
+        skutecne_skore = _skore_podle_variant(skutecne)
+        assert ocekavane_skore.keys() == skutecne_skore.keys()
+        for varianta, skore in ocekavane_skore.items():
+            assert skutecne_skore[varianta] == pytest.approx(skore, abs=TOLERANCE), varianta
+
+@pytest.mark.parametrize("seed", range(20))
+def test_shoda_po_nahodnych_upravach(seed):
+    r = random.Random(seed)
+    analyza_data = _nahodna_analyza(r, r.randint(1, 12), r.randint(1, 5))
+    stav = Inkrementalni_vypocty.Inkrementalni_stav.z_json(analyza_data)
+    _over_shodu(stav, analyza_data)
+
+    kriteria = list(analyza_data["kriteria"])
+    varianty = analyza_data["varianty"]
+    pocet_novych = 0
+    for _ in range(150):
+        operace = r.random()
+        if operace < 0.6:
+            varianta, kriterium = r.choice(list(varianty)), r.choice(kriteria)
+            hodnota = float(r.randint(-2, 7))
+            varianty[varianta][kriterium] = hodnota
+            stav.zmen_hodnotu(varianta, kriterium, hodnota)
+        elif operace < 0.75:
+            kriterium, typ, vaha = r.choice(kriteria), r.choice(["max", "min"]), r.random()
+            analyza_data["kriteria"][kriterium] = {"typ": typ, "vaha": vaha}
+            stav.zmen_kriterium(kriterium, typ, vaha)
+        elif operace < 0.85:
+            pocet_novych += 1
+            varianta = f"N{pocet_novych}"
+            hodnoty = {k: float(r.randint(0, 5)) for k in kriteria if r.random() < 0.7}
+            varianty[varianta] = dict(hodnoty, popis_varianty="")
+            stav.pridej_variantu(varianta, hodnoty)
+        elif operace < 0.9:
+            pocet_novych += 1
+            puvodni, novy = r.choice(list(varianty)), f"P{pocet_novych}"
+            analyza_data["varianty"] = varianty = {
+                (novy if nazev == puvodni else nazev): data for nazev, data in varianty.items()
+            }
+            stav.prejmenuj_variantu(puvodni, novy)
+        elif len(varianty) > 1:
+            varianta = r.choice(list(varianty))
+            del varianty[varianta]
+            stav.odeber_variantu(varianta)
+        _over_shodu(stav, analyza_data)
+
+def test_uplny_prepocet_jen_pri_zmene_extremu():
+    analyza_data = {
+        "kriteria": {"K1": {"typ": "max", "vaha": 0.5}, "K2": {"typ": "min", "vaha": 0.5}},
+        "varianty": {
+            "A": {"popis_varianty": "", "K1": 1.0, "K2": 4.0},
+            "B": {"popis_varianty": "", "K1": 5.0, "K2": 2.0},
+            "C": {"popis_varianty": "", "K1": 3.0, "K2": 3.0},
+        },
+    }
+    stav = Inkrementalni_vypocty.Inkrementalni_stav.z_json(analyza_data)
+    pocet = stav.pocet_uplnych_prepoctu
+
+    # Hodnota uvnitř rozsahu sloupce ani nový extrém úplný přepočet nevyžadují
+    analyza_data["varianty"]["C"]["K1"] = 4.0
+    stav.zmen_hodnotu("C", "K1", 4.0)
+    analyza_data["varianty"]["C"]["K2"] = 1.0
+    stav.zmen_hodnotu("C", "K2", 1.0)
+    assert stav.pocet_uplnych_prepoctu == pocet
+    _over_shodu(stav, analyza_data)
+
+    # Posunutí maxima dovnitř rozsahu vyžaduje přepočet sloupce
+    analyza_data["varianty"]["B"]["K1"] = 2.0
+    stav.zmen_hodnotu("B", "K1", 2.0)
+    assert stav.pocet_uplnych_prepoctu == pocet + 1
+    _over_shodu(stav, analyza_data)
@@ -0,0 +1,61 @@
+# -------------------------------------------------------
+# Testy Hasseova diagramu relace převahy ELECTRE (Vizualizace)
+#
+# Vizualizace importuje Plotly, bez něj se testy přeskočí.
+# -------------------------------------------------------
+import pytest
+
+pytest.importorskip("plotly")
+
+from MCApp import Vizualizace
+
+def _hasseuv_diagram(outranking_matrix, uzly=None):
+    """Vrátí Hasseův diagram matice převahy zúžený na uzly (výchozí jsou všechny)."""
+    if uzly is None:
+        uzly = list(range(len(outranking_matrix)))
+    return Vizualizace._hasseuv_diagram(Vizualizace._dosazitelnost(outranking_matrix), uzly)
+
+def test_tranzitivni_hrany_se_vynechaji():
+    hrany, vzajemne, uroven, skupina = _hasseuv_diagram([[0, 1, 1], [0, 0, 1], [0, 0, 0]])
+    assert hrany == [(0, 1), (1, 2)]
+    assert vzajemne == []
+    assert uroven == [0, 1, 2]
+    assert skupina == [0, 1, 2]
+
+def test_kosoctverec():
+    hrany, vzajemne, uroven, _ = _hasseuv_diagram([[0, 1, 1, 0], [0, 0, 0, 1], [0, 0, 0, 1], [0, 0, 0, 0]])
+    assert hrany == [(0, 1), (0, 2), (1, 3), (2, 3)]
+    assert vzajemne == []
+    assert uroven == [0, 1, 1, 2]
+
+def test_cesta_pres_skrytou_variantu():
+    hrany, _, uroven, _ = _hasseuv_diagram([[0, 1, 0], [0, 0, 1], [0, 0, 0]], uzly=[0, 2])
+    assert hrany == [(0, 1)]
+    assert uroven == [0, 1]
+
+def test_bez_relaci():
+    assert _hasseuv_diagram([[0, 0], [0, 0]]) == ([], [], [0, 0], [0, 1])
+
+def test_vzajemna_prevaha_se_slouci_do_skupiny():
+    # V1 a V2 se převyšují navzájem, skupina převyšuje V3, ta V5 a ta V4
+    matice = [
+        [0, 1, 1, 1, 0],
+        [1, 0, 1, 1, 0],
+        [0, 0, 0, 1, 1],
+        [0, 0, 0, 0, 0],
+        [0, 0, 0, 1, 0],
+    ]
+    hrany, vzajemne, uroven, skupina = _hasseuv_diagram(matice)
+    assert hrany == [(0, 2), (2, 4), (4, 3)]
+    assert vzajemne == [(0, 1)]
+    assert uroven == [0, 0, 1, 3, 2]
+    assert skupina == [0, 0, 2, 3, 4]
+
+def test_cyklus_tri_variant():
+    hrany, vzajemne, uroven, skupina = _hasseuv_diagram(
+        [[0, 1, 0, 0], [0, 0, 1, 0], [1, 0, 0, 1], [0, 0, 0, 0]]
+    )
+    assert hrany == [(0, 3)]
+    assert vzajemne == [(0, 1), (1, 2)]
+    assert uroven == [0, 0, 0, 1]
+    assert skupina == [0, 0, 0, 3]
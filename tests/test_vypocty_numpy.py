@@ -0,0 +1,145 @@
+# -------------------------------------------------------
+# Testy shody Vypocty_numpy s čistě Pythonovým modulem Vypocty
+#
+# Serverový NumPy engine musí vracet stejné výsledky jako Vypocty
+# (obrazovka, PDF i Excel se počítají oběma cestami), proto se
+# výsledky porovnávají přesně - včetně bitové shody čísel.
+# -------------------------------------------------------
+import math
+import random
+
+import pytest
+
+from MCApp import Vypocty, Vypocty_numpy
+
+METODY = [
+    ("wsm", Vypocty.vypocitej_wsm_analyzu, Vypocty_numpy.vypocitej_wsm),
+    ("wpm", Vypocty.vypocitej_wpm_analyzu, Vypocty_numpy.vypocitej_wpm),
+    ("topsis", Vypocty.vypocitej_topsis_analyzu, Vypocty_numpy.vypocitej_topsis),
+    ("electre", Vypocty.vypocitej_electre_analyzu, Vypocty_numpy.vypocitej_electre),
+    ("mabac", Vypocty.vypocitej_mabac_analyzu, Vypocty_numpy.vypocitej_mabac),
+]
+
+def _analyza(hodnoty, typy=None, vahy=None):
+    """
+    Sestaví data analýzy z matice hodnot [varianty][kriteria].
+
+    Args:
+        hodnoty: 2D list hodnot
+        typy: Typy kritérií (výchozí střídavě max/min)
+        vahy: Váhy kritérií (výchozí rovnoměrné)
+
+    Returns:
+        dict: Data analýzy ve formátu JSON
+    """
+    pocet_kriterii = len(hodnoty[0])
+    typy = typy or ["max" if j % 2 == 0 else "min" for j in range(pocet_kriterii)]
+    vahy = vahy or [1.0 / pocet_kriterii] * pocet_kriterii
+    kriteria = {f"K{j + 1}": {"typ": typy[j], "vaha": vahy[j]} for j in range(pocet_kriterii)}
+    varianty = {}
+    for i, radek in enumerate(hodnoty):
+        varianta = {"popis_varianty": ""}
+        varianta.update({f"K{j + 1}": hodnota for j, hodnota in enumerate(radek)})
+        varianty[f"V{i + 1}"] = varianta
+    return {"kriteria": kriteria, "varianty": varianty}
+
+def _nahodne_hodnoty(pocet_variant, pocet_kriterii, seed, od=-5.0, do=100.0, cela=False):
+    """Vrátí náhodnou matici hodnot (volitelně celočíselnou)."""
+    r = random.Random(seed)
+    if cela:
+        return [[r.randint(int(od), int(do)) for _ in range(pocet_kriterii)] for _ in range(pocet_variant)]
+    return [[r.uniform(od, do) for _ in range(pocet_kriterii)] for _ in range(pocet_variant)]
+
+def _porovnej(ocekavane, skutecne, cesta="vysledek"):
+    """Porovná dvě struktury výsledků přesně, NaN se rovná NaN."""
+    if isinstance(ocekavane, dict):
+        assert isinstance(skutecne, dict), cesta
+        assert ocekavane.keys() == skutecne.keys(), cesta
+        for klic in ocekavane:
+            _porovnej(ocekavane[klic], skutecne[klic], f"{cesta}/{klic}")
+    elif isinstance(ocekavane, (list, tuple)):
+        assert isinstance(skutecne, (list, tuple)), cesta
+        assert len(ocekavane) == len(skutecne), cesta
+        for i, (a, b) in enumerate(zip(ocekavane, skutecne)):
+            _porovnej(a, b, f"{cesta}[{i}]")
+    elif isinstance(ocekavane, float) and math.isnan(ocekavane):
+        assert isinstance(skutecne, float) and math.isnan(skutecne), cesta
+    else:
+        assert ocekavane == skutecne, (cesta, ocekavane, skutecne)
+
+def _over_shodu(analyza_data, vypocet_python, vypocet_numpy):
+    """Ověří, že oba výpočty vrátí stejný výsledek, nebo oba selžou."""
+    try:
+        ocekavane = vypocet_python(analyza_data)
+    except (ValueError, ZeroDivisionError):
+        with pytest.raises((ValueError, ZeroDivisionError, FloatingPointError)):
+            vypocet_numpy(*Vypocty_numpy.priprav_pole_z_json(analyza_data))
+        return
+    skutecne = vypocet_numpy(*Vypocty_numpy.priprav_pole_z_json(analyza_data))
+    _porovnej(ocekavane, skutecne)
+
+PRIPADY = {
+    "nahodna": _nahodne_hodnoty(30, 6, 1),
+    "jedna_varianta": _nahodne_hodnoty(1, 4, 2),
+    "dve_varianty": _nahodne_hodnoty(2, 4, 3),
+    "zaporne": _nahodne_hodnoty(20, 5, 4, od=-100.0, do=-1.0),
+    "cela_cisla": _nahodne_hodnoty(25, 5, 5, od=0, do=5, cela=True),
+    "nulovy_sloupec": [radek[:2] + [0] + radek[2:] for radek in _nahodne_hodnoty(15, 4, 6, od=1.0)],
+}
+
+@pytest.mark.parametrize("pripad", sorted(PRIPADY))
+@pytest.mark.parametrize("metoda, vypocet_python, vypocet_numpy", METODY, ids=[m[0] for m in METODY])
+def test_shoda_metod(pripad, metoda, vypocet_python, vypocet_numpy):
+    _over_shodu(_analyza(PRIPADY[pripad]), vypocet_python, vypocet_numpy)
+
+def test_shoda_nerovnomernych_vah():
+    analyza_data = _analyza(_nahodne_hodnoty(12, 4, 7), typy=["max", "max", "min", "max"],
+                            vahy=[0.1, 0.2, 0.3, 0.4])
+    for _, vypocet_python, vypocet_numpy in METODY:
+        _over_shodu(analyza_data, vypocet_python, vypocet_numpy)
+
+def test_vypocitej_metody_shoda_s_jednotlivymi_metodami():
+    analyza_data = _analyza(_nahodne_hodnoty(20, 5, 8))
+    pole = Vypocty_numpy.priprav_pole_z_json(analyza_data)
+    vysledky = Vypocty_numpy.vypocitej_metody(pole)["vysledky"]
+    for metoda, vypocet_python, _ in METODY:
+        _porovnej(vypocet_python(analyza_data), vysledky[metoda], metoda)
+
+def _radky_prevahy(outranking_relace):
+    """Převede relaci převahy ve formátu CSR na seznam množin převyšovaných variant."""
+    indptr, indices = outranking_relace["indptr"], outranking_relace["indices"]
+    return [set(indices[indptr[i]:indptr[i + 1]]) for i in range(len(indptr) - 1)]
+
+def _over_ridke_electre(analyza_data, ocekavane):
+    """Ověří řídký výsledek ELECTRE proti hustému výsledku."""
+    skutecne = Vypocty_numpy.vypocitej_electre(*Vypocty_numpy.priprav_pole_z_json(analyza_data))
+    husty, ridky = ocekavane["electre_vysledky"], skutecne["electre_vysledky"]
+
+    for klic in ("concordance_matrix", "discordance_matrix", "outranking_matrix"):
+        assert ridky[klic] is None
+    ocekavane_radky = [{j for j, hodnota in enumerate(radek) if hodnota == 1} for radek in husty["outranking_matrix"]]
+    assert _radky_prevahy(ridky["outranking_relace"]) == ocekavane_radky
+
+    souhrn = ridky["souhrn_prevahy"]
+    assert souhrn["prevysuje"] == [len(radek) for radek in ocekavane_radky]
+    assert souhrn["prevysovano"] == [sum(j in radek for radek in ocekavane_radky) for j in range(len(ocekavane_radky))]
+    assert souhrn["pocet_relaci"] == sum(souhrn["prevysuje"])
+    assert souhrn["matice"] == [[int(j in ocekavane_radky[i]) for j in souhrn["uzly"]] for i in souhrn["uzly"]]
+    assert souhrn == Vypocty.souhrn_prevahy(husty["outranking_matrix"], husty["results"],
+                                            ocekavane["norm_vysledky"]["nazvy_variant"])
+
+    for klic in ("results", "nejlepsi_varianta", "nejhorsi_varianta", "nejlepsi_skore",
+                 "nejhorsi_skore", "index_souhlasu", "index_nesouhlasu"):
+        _porovnej(husty[klic], ridky[klic], klic)
+    _porovnej(ocekavane["norm_vysledky"], skutecne["norm_vysledky"], "norm_vysledky")
+
+def test_ridke_electre_nad_limitem_variant():
+    pocet_variant = Vypocty_numpy.MAX_VARIANT_HUSTE_ELECTRE + 1
+    analyza_data = _analyza(_nahodne_hodnoty(pocet_variant, 3, 9, od=0, do=20, cela=True))
+    _over_ridke_electre(analyza_data, Vypocty.vypocitej_electre_analyzu(analyza_data))
+
+def test_ridke_electre_s_nizkym_limitem(monkeypatch):
+    analyza_data = _analyza(_nahodne_hodnoty(60, 5, 10))
+    ocekavane = Vypocty.vypocitej_electre_analyzu(analyza_data)
+    monkeypatch.setattr(Vypocty_numpy, "MAX_VARIANT_HUSTE_ELECTRE", 10)
+    _over_ridke_electre(analyza_data, ocekavane)